@@ -0,0 +1,121 @@
+"""
+Django Admin configuration for the archive manifest.
+
+Lists archive files by dataset and day. Searching by email finds the files
+holding that address, and each file's page shows its records.
+"""
+
+import json
+
+from django.contrib import admin
+from unfold.admin import ModelAdmin
+from django.utils.html import format_html
+
+from .models import ArchiveFile
+
+# Records shown on an archive file's page
+PREVIEW_RECORDS = 50
+
+
+@admin.register(ArchiveFile)
+class ArchiveFileAdmin(ModelAdmin):
+    """
+    Admin interface for ArchiveFile model.
+
+    Files are written by the archiver, so they are read-only here.
+    """
+
+    # Unfold configuration
+    icon_name = "inventory_2"
+
+    list_display = (
+        'path',
+        'dataset',
+        'partition',
+        'id_range_display',
+        'record_count',
+        'size_display',
+        'codec',
+        'created_at',
+    )
+
+    list_filter = (
+        'dataset',
+        'codec',
+    )
+
+    # Exact match on the manifest's email keys
+    search_fields = (
+        '=keys__email',
+    )
+    search_help_text = 'Find the files holding an email address.'
+
+    readonly_fields = (
+        'dataset',
+        'path',
+        'codec',
+        'partition',
+        'first_id',
+        'last_id',
+        'record_count',
+        'size',
+        'records_display',
+        'created_at',
+        'updated_at',
+    )
+
+    date_hierarchy = 'partition'
+
+    ordering = ('-partition', '-id')
+
+    fieldsets = (
+        ('File', {
+            'fields': ('dataset', 'path', 'codec', 'size')
+        }),
+        ('Contents', {
+            'fields': ('partition', 'first_id', 'last_id', 'record_count', 'records_display')
+        }),
+        ('Timestamps', {
+            'fields': ('created_at', 'updated_at'),
+            'classes': ('collapse',)
+        }),
+    )
+
+    def id_range_display(self, obj):
+        """Display the range of archived ids."""
+        return f"{obj.first_id}–{obj.last_id}"
+    id_range_display.short_description = "IDs"
+    id_range_display.admin_order_field = 'first_id'
+
+    def size_display(self, obj):
+        """Display the compressed size in KB."""
+        return f"{obj.size / 1024:.1f} KB"
+    size_display.short_description = "Size"
+    size_display.admin_order_field = 'size'
+
+    def records_display(self, obj):
+        """Display the first records of the file as JSON."""
+        try:
+            records = obj.read_records()
+        except OSError as exc:
+            return format_html('<span style="color: red;">Unreadable: {}</span>', exc)
+        shown = '\n'.join(json.dumps(record, indent=2) for record in records[:PREVIEW_RECORDS])
+        more = len(records) - PREVIEW_RECORDS
+        return format_html(
+            '<pre style="white-space: pre-wrap;">{}</pre>{}',
+            shown,
+            f"… and {more} more" if more > 0 else ""
+        )
+    records_display.short_description = "Records"
+
+    def has_add_permission(self, request):
+        """Disable adding archive files manually through admin."""
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        """Archive files are immutable."""
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        """Keep the manifest in step with the files on disk."""
+        return False
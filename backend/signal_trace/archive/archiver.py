@@ -0,0 +1,216 @@
+"""
+Archival of old rows into compressed NDJSON files.
+
+Each dataset below names a model whose rows are moved out of the primary
+table once they are older than ARCHIVE['policies'][dataset] days. Rows are
+archived in chunks of ARCHIVE['batch_size'], oldest id first. Each chunk
+is one transaction that:
+
+1. selects the rows and locks them (SELECT ... FOR UPDATE SKIP LOCKED), so
+   they cannot change or stop being archivable before they are deleted;
+2. serializes them as NDJSON (one JSON object per line), split by the day
+   they were created, compressed and written to
+   ARCHIVE['root']/<dataset>/<YYYY>/<MM>/<DD>/<first id>-<last id>.ndjson.<zst|gz>
+   (written to a temporary name, fsynced, then renamed into place);
+3. records the files in the manifest (ArchiveFile, ArchiveKey) and deletes
+   exactly the rows written.
+
+Every archived record is thus in exactly one manifest file. If the
+transaction fails, the chunk's files are removed again; a file left behind
+by a crash is in no manifest entry, so lookups never read it. Archived
+records are read back with ArchiveFile.lookup() or `archive_lookup`.
+
+Files are zstd-compressed when the runtime has compression.zstd
+(core/compression.py) and gzip-compressed otherwise.
+"""
+
+import gzip
+import json
+import os
+from datetime import timedelta, timezone as dt_timezone
+
+from django.apps import apps
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from core import compression
+from .models import ArchiveFile, ArchiveKey
+
+EXTENSIONS = {ArchiveFile.Codec.GZIP: 'gz', ArchiveFile.Codec.ZSTD: 'zst'}
+
+
+class Dataset:
+    """
+    A model whose old rows are archived.
+
+    Args:
+        model: App label and model name, e.g. 'support.ContactMessage'
+        condition: Q limiting which old rows are archived
+        exclude: Fields left out of the archive
+        key: Field holding the email archived records are looked up by
+    """
+
+    def __init__(self, model, condition=Q(), exclude=(), key='email'):
+        self.model_label = model
+        self.condition = condition
+        self.exclude = exclude
+        self.key = key
+
+    @property
+    def model(self):
+        return apps.get_model(self.model_label)
+
+    def fields(self):
+        return [
+            field.attname for field in self.model._meta.concrete_fields
+            if field.name not in self.exclude
+        ]
+
+    def archivable(self, older_than):
+        """Rows created more than `older_than` (timedelta) ago that may be archived."""
+        cutoff = timezone.now() - older_than
+        return self.model.objects.filter(self.condition, created_at__lt=cutoff)
+
+
+DATASETS = {
+    # Unread messages are left in the inbox however old they are
+    'support.contactmessage': Dataset('support.ContactMessage', condition=Q(is_read=True)),
+    # Codes are not worth keeping once expired; keyed on the address the
+    # code was sent to, i.e. the user's email
+    'users.otp': Dataset('users.OTP', exclude=('otp_code',), key='email'),
+}
+
+
+def default_codec():
+    return ArchiveFile.Codec.ZSTD if compression.zstd is not None else ArchiveFile.Codec.GZIP
+
+
+def encode(raw, codec):
+    """Compress NDJSON bytes as a standalone .gz or .zst file."""
+    if codec == ArchiveFile.Codec.GZIP:
+        # Fixed mtime: rewriting a chunk produces the same file
+        return gzip.compress(raw, mtime=0)
+    return compression.compress(raw, compression.CODEC_ZSTD)
+
+
+def decode(blob, codec):
+    """Decompress an archive file's bytes."""
+    if codec == ArchiveFile.Codec.GZIP:
+        return gzip.decompress(blob)
+    return compression.decompress(blob, compression.CODEC_ZSTD)
+
+
+def write_file(path, blob):
+    """Write a file atomically: temporary name, fsync, rename."""
+    full_path = os.path.join(settings.ARCHIVE['root'], path)
+    os.makedirs(os.path.dirname(full_path), exist_ok=True)
+    temp_path = f'{full_path}.tmp'
+    with open(temp_path, 'wb') as handle:
+        handle.write(blob)
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(temp_path, full_path)
+
+
+def remove_files(paths):
+    """Delete archive files (of a chunk whose transaction failed)."""
+    for path in paths:
+        try:
+            os.remove(os.path.join(settings.ARCHIVE['root'], path))
+        except FileNotFoundError:
+            pass
+
+
+def write_chunk(dataset, name, rows, codec, written):
+    """
+    Write a chunk of rows to one file per creation day.
+
+    Args:
+        written: List each file's path is appended to as soon as it is written
+
+    Returns:
+        list: (unsaved ArchiveFile, set of emails) per file written
+    """
+    partitions = {}
+    for row in rows:
+        partitions.setdefault(row['created_at'].astimezone(dt_timezone.utc).date(), []).append(row)
+
+    files = []
+    for day, records in sorted(partitions.items()):
+        first_id, last_id = records[0]['id'], records[-1]['id']
+        path = f'{name}/{day:%Y/%m/%d}/{first_id}-{last_id}.ndjson.{EXTENSIONS[codec]}'
+        raw = ''.join(
+            json.dumps(record, cls=DjangoJSONEncoder, separators=(',', ':')) + '\n' for record in records
+        ).encode()
+        blob = encode(raw, codec)
+        write_file(path, blob)
+        written.append(path)
+        archive_file = ArchiveFile(
+            dataset=name,
+            path=path,
+            codec=codec,
+            partition=day,
+            first_id=first_id,
+            last_id=last_id,
+            record_count=len(records),
+            size=len(blob),
+        )
+        emails = {record[dataset.key].lower() for record in records if record.get(dataset.key)}
+        files.append((archive_file, emails))
+    return files
+
+
+def archive(name, older_than=None, batch_size=None, max_batches=None):
+    """
+    Move a dataset's old rows into archive files.
+
+    Args:
+        name: Dataset name (a key of DATASETS)
+        older_than: timedelta; defaults to the dataset's ARCHIVE policy
+        batch_size: Rows per chunk (and transaction)
+        max_batches: Stop after this many chunks (None: until done)
+
+    Returns:
+        dict: Number of records archived and files written
+    """
+    dataset = DATASETS[name]
+    config = settings.ARCHIVE
+    if older_than is None:
+        older_than = timedelta(days=config['policies'][name])
+    batch_size = batch_size or config['batch_size']
+    codec = config['codec'] or default_codec()
+    fields = dataset.fields()
+
+    records = files = batches = 0
+    while max_batches is None or batches < max_batches:
+        written = []
+        try:
+            with transaction.atomic():
+                # Locked until deleted; rows locked by other transactions
+                # are left for a later run rather than waited on
+                rows = list(
+                    dataset.archivable(older_than)
+                    .select_for_update(skip_locked=True, of=('self',))
+                    .order_by('id')
+                    .values(*fields)[:batch_size]
+                )
+                if not rows:
+                    break
+                chunk_files = write_chunk(dataset, name, rows, codec, written)
+                ArchiveFile.objects.bulk_create([archive_file for archive_file, _ in chunk_files])
+                ArchiveKey.objects.bulk_create([
+                    ArchiveKey(file=archive_file, email=email)
+                    for archive_file, emails in chunk_files for email in sorted(emails)
+                ])
+                dataset.model.objects.filter(id__in=[row['id'] for row in rows]).delete()
+        except BaseException:
+            # Rolled back: the rows stay in the table, so their files must go
+            remove_files(written)
+            raise
+        records += len(rows)
+        files += len(chunk_files)
+        batches += 1
+    return {'records': records, 'files': files}
@@ -0,0 +1,34 @@
+"""
+Look up archived records by id or email, without restoring them.
+
+Reads only the archive files the manifest lists for the id or email and
+prints the matching records as NDJSON.
+
+Usage:
+    python manage.py archive_lookup support.contactmessage --id 1234
+    python manage.py archive_lookup users.otp --email jane@example.com
+"""
+
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from archive.archiver import DATASETS
+from archive.models import ArchiveFile
+
+
+class Command(BaseCommand):
+    help = 'Print archived records matching an id or email.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('dataset', choices=sorted(DATASETS))
+        parser.add_argument('--id', type=int, dest='record_id', help='Primary key of the archived row.')
+        parser.add_argument('--email', help='Email address on the archived row.')
+
+    def handle(self, *args, **options):
+        if options['record_id'] is None and not options['email']:
+            raise CommandError('Pass --id and/or --email.')
+        records = ArchiveFile.lookup(options['dataset'], record_id=options['record_id'], email=options['email'])
+        for record in records:
+            self.stdout.write(json.dumps(record))
+        self.stderr.write(f'{len(records)} record(s) found.')
@@ -0,0 +1,47 @@
+"""
+Move old rows into compressed NDJSON archive files.
+
+Archives every dataset in archive/archiver.py (contact messages, OTPs)
+past its ARCHIVE['policies'] window, in chunked transactions. Also run
+nightly by the archive_records periodic task.
+
+Usage:
+    python manage.py archive_records
+    python manage.py archive_records --dataset users.otp --older-than-days 7
+    python manage.py archive_records --dry-run
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from archive.archiver import DATASETS, archive
+
+
+class Command(BaseCommand):
+    help = 'Move rows older than their archival policy into compressed archive files.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dataset', action='append', choices=sorted(DATASETS),
+            help='Dataset to archive (repeatable; default: all).',
+        )
+        parser.add_argument('--older-than-days', type=int, help='Override the policy window.')
+        parser.add_argument('--batch-size', type=int, help='Rows per chunk and transaction.')
+        parser.add_argument('--dry-run', action='store_true', help='Only count the rows that would be archived.')
+
+    def handle(self, *args, **options):
+        for name in options['dataset'] or sorted(DATASETS):
+            days = options['older_than_days']
+            if days is None:
+                days = settings.ARCHIVE['policies'][name]
+            older_than = timedelta(days=days)
+            if options['dry_run']:
+                count = DATASETS[name].archivable(older_than).count()
+                self.stdout.write(f'{name}: {count} row(s) older than {days} day(s) would be archived.')
+                continue
+            result = archive(name, older_than=older_than, batch_size=options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(
+                f"{name}: archived {result['records']} row(s) into {result['files']} file(s)."
+            ))
@@ -0,0 +1,48 @@
+# Generated by Django 5.2 on 2026-10-19 01:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchiveFile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('dataset', models.CharField(help_text='Archived model, e.g. support.contactmessage', max_length=100)),
+                ('path', models.CharField(help_text="Relative to ARCHIVE['root']", max_length=255, unique=True)),
+                ('codec', models.CharField(choices=[('gzip', 'gzip'), ('zstd', 'zstd')], max_length=10)),
+                ('partition', models.DateField(help_text='Day the archived records were created')),
+                ('first_id', models.BigIntegerField()),
+                ('last_id', models.BigIntegerField()),
+                ('record_count', models.PositiveIntegerField()),
+                ('size', models.PositiveIntegerField(help_text='Compressed size in bytes')),
+            ],
+            options={
+                'verbose_name': 'Archive File',
+                'verbose_name_plural': 'Archive Files',
+                'ordering': ['-partition', '-id'],
+                'indexes': [models.Index(fields=['dataset', 'first_id', 'last_id'], name='archive_file_id_range_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchiveKey',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('email', models.CharField(db_index=True, max_length=254)),
+                ('file', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='keys', to='archive.archivefile')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('file', 'email'), name='archive_key_file_email_uniq')],
+            },
+        ),
+    ]
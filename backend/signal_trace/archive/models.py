@@ -0,0 +1,104 @@
+import json
+import os
+
+from django.conf import settings
+from django.db import models
+from core.models import BaseDateTimeModel
+
+
+class ArchiveFile(BaseDateTimeModel):
+    """
+    Manifest entry for one archive file.
+
+    Archived rows (archive/archiver.py) are written as compressed NDJSON,
+    one file per chunk and day, under ARCHIVE['root']. The manifest keeps
+    each file's id range and the emails it contains (ArchiveKey), so a
+    record can be found by id or email by reading only the files that hold
+    it, without restoring anything.
+    """
+    class Codec(models.TextChoices):
+        GZIP = "gzip", "gzip"
+        ZSTD = "zstd", "zstd"
+
+    dataset = models.CharField(max_length=100, help_text="Archived model, e.g. support.contactmessage")
+    path = models.CharField(max_length=255, unique=True, help_text="Relative to ARCHIVE['root']")
+    codec = models.CharField(max_length=10, choices=Codec.choices)
+    partition = models.DateField(help_text="Day the archived records were created")
+    first_id = models.BigIntegerField()
+    last_id = models.BigIntegerField()
+    record_count = models.PositiveIntegerField()
+    size = models.PositiveIntegerField(help_text="Compressed size in bytes")
+
+    class Meta:
+        ordering = ["-partition", "-id"]
+        verbose_name = 'Archive File'
+        verbose_name_plural = 'Archive Files'
+        indexes = [
+            # Lookup by record id
+            models.Index(fields=["dataset", "first_id", "last_id"], name="archive_file_id_range_idx"),
+        ]
+
+    def __str__(self):
+        return self.path
+
+    @property
+    def full_path(self):
+        return os.path.join(settings.ARCHIVE['root'], self.path)
+
+    def read_records(self):
+        """
+        Business logic: Read the records stored in this file.
+
+        Returns:
+            list: Archived records (dicts), in id order
+        """
+        from .archiver import decode
+
+        with open(self.full_path, 'rb') as handle:
+            blob = handle.read()
+        return [json.loads(line) for line in decode(blob, self.codec).splitlines() if line]
+
+    @classmethod
+    def lookup(cls, dataset, record_id=None, email=None):
+        """
+        Business logic: Find archived records by id and/or email.
+
+        Args:
+            dataset: Archived model, e.g. support.contactmessage
+            record_id: Primary key of the archived row
+            email: Email address on the archived row (case-insensitive)
+
+        Returns:
+            list: Matching records (dicts)
+        """
+        from .archiver import DATASETS
+
+        key = DATASETS[dataset].key
+        files = cls.objects.filter(dataset=dataset)
+        if record_id is not None:
+            files = files.filter(first_id__lte=record_id, last_id__gte=record_id)
+        if email is not None:
+            email = email.lower().strip()
+            files = files.filter(keys__email=email)
+        records = []
+        for archive_file in files.order_by('first_id'):
+            records.extend(
+                record for record in archive_file.read_records()
+                if (record_id is None or record['id'] == record_id)
+                and (email is None or (record.get(key) or '').lower() == email)
+            )
+        return records
+
+
+class ArchiveKey(models.Model):
+    """Email found in an archive file; lets lookups by email skip other files."""
+    file = models.ForeignKey(ArchiveFile, on_delete=models.CASCADE, related_name="keys")
+    email = models.CharField(max_length=254, db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["file", "email"], name="archive_key_file_email_uniq"),
+        ]
+
+    def __str__(self):
+        return f"{self.email} in {self.file}"
@@ -0,0 +1,13 @@
+"""
+Periodic archival of old rows (see archive/archiver.py).
+"""
+
+from jobs.registry import periodic
+
+from .archiver import DATASETS, archive
+
+
+@periodic('30 2 * * *', jitter=600)
+def archive_records():
+    """Move rows past their ARCHIVE policy window into archive files."""
+    return {name: archive(name) for name in DATASETS}
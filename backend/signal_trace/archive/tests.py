@@ -0,0 +1,81 @@
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from django.conf import settings
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from support.models import ContactMessage
+from users.models import OTP
+
+from .archiver import archive
+from .models import ArchiveFile, ArchiveKey
+
+
+class ArchiveTests(TestCase):
+    """Every archived record ends up in exactly one manifest file."""
+
+    def setUp(self):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        settings_override = override_settings(ARCHIVE={**settings.ARCHIVE, 'root': root, 'codec': 'gzip'})
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.root = root
+
+    def age(self, model, days=400):
+        model.objects.update(created_at=timezone.now() - timedelta(days=days))
+
+    def message(self, email, is_read=True):
+        message = ContactMessage.build('Ada', 'Lovelace', email, f'Hello from {email}')
+        message.is_read = is_read
+        message.save()
+        return message
+
+    def files_on_disk(self):
+        return [name for _, _, names in os.walk(self.root) for name in names]
+
+    def test_archives_read_messages_once(self):
+        read = self.message('ada@example.com')
+        unread = self.message('grace@example.com', is_read=False)
+        self.age(ContactMessage)
+
+        result = archive('support.contactmessage')
+
+        self.assertEqual(result, {'records': 1, 'files': 1})
+        self.assertEqual(list(ContactMessage.objects.values_list('id', flat=True)), [unread.pk])
+        self.assertEqual(len(ArchiveFile.lookup('support.contactmessage', record_id=read.pk)), 1)
+        records = ArchiveFile.lookup('support.contactmessage', email='ADA@example.com')
+        self.assertEqual([record['id'] for record in records], [read.pk])
+
+    def test_otps_are_found_by_email(self):
+        OTP.generate_otp('Ada@Example.com', 'signup')
+        self.age(OTP)
+
+        archive('users.otp')
+
+        self.assertFalse(OTP.objects.exists())
+        self.assertEqual(list(ArchiveKey.objects.values_list('email', flat=True)), ['ada@example.com'])
+        records = ArchiveFile.lookup('users.otp', email='ada@example.com')
+        self.assertEqual(len(records), 1)
+        self.assertNotIn('otp_code', records[0])
+
+    def test_failed_chunk_keeps_rows_and_removes_files(self):
+        message = self.message('ada@example.com')
+        self.age(ContactMessage)
+
+        with mock.patch.object(ArchiveKey.objects, 'bulk_create', side_effect=RuntimeError('disk full')):
+            with self.assertRaises(RuntimeError):
+                archive('support.contactmessage')
+
+        self.assertTrue(ContactMessage.objects.filter(pk=message.pk).exists())
+        self.assertFalse(ArchiveFile.objects.exists())
+        self.assertEqual(self.files_on_disk(), [])
+
+        # The next run archives the record once
+        archive('support.contactmessage')
+        self.assertEqual(len(ArchiveFile.lookup('support.contactmessage', email='ada@example.com')), 1)
+        self.assertEqual(len(self.files_on_disk()), 1)
@@ -1,3 +1,68 @@
-from unfold.admin import ModelAdmin
+"""
+Admin support for very large tables.
 
-# Register your models here.
+LargeTableAdminMixin keeps changelists responsive on tables with millions
+of rows:
+
+- estimated counts and keyset paging (core.pagination.LargeTablePaginator),
+  and no second COUNT(*) of the unfiltered table
+- foreign key list filters become autocomplete filters, instead of a
+  dropdown listing every related row
+- date_hierarchy is left out once a changelist has at least
+  ADMIN_LARGE_TABLES['date_hierarchy_max_rows'] rows, since it aggregates
+  over the whole result set
+
+List it before ModelAdmin:
+
+    class SignalAdmin(LargeTableAdminMixin, ModelAdmin):
+        ...
+"""
+
+from django.conf import settings
+from django.contrib.admin.utils import get_fields_from_path
+from unfold.contrib.filters.admin import AutocompleteSelectFilter
+from unfold.views import ChangeList
+
+from core.pagination import LargeTablePaginator
+
+
+class LargeTableChangeList(ChangeList):
+    """Changelist that skips date_hierarchy on large result sets."""
+
+    def get_results(self, request):
+        super().get_results(request)
+        if self.date_hierarchy and self.result_count >= settings.ADMIN_LARGE_TABLES['date_hierarchy_max_rows']:
+            self.date_hierarchy = None
+
+
+class LargeTableAdminMixin:
+    """ModelAdmin mixin for changelists over very large tables."""
+
+    paginator = LargeTablePaginator
+    show_full_result_count = False
+    # Autocomplete filters are applied with the filter form's submit button
+    list_filter_submit = True
+
+    def get_changelist(self, request, **kwargs):
+        """Use the changelist that skips date_hierarchy on large result sets."""
+        return LargeTableChangeList
+
+    def get_list_filter(self, request):
+        """Replace foreign key filters with autocomplete filters."""
+        return [
+            (item, AutocompleteSelectFilter) if self.is_autocomplete_filter(item) else item
+            for item in super().get_list_filter(request)
+        ]
+
+    def is_autocomplete_filter(self, item):
+        """
+        True for a list_filter entry naming a foreign key whose model is
+        registered in the admin with search_fields (needed to autocomplete).
+        """
+        if not isinstance(item, str):
+            return False
+        field = get_fields_from_path(self.model, item)[-1]
+        if not (field.many_to_one or field.one_to_one):
+            return False
+        related_admin = self.admin_site._registry.get(field.related_model)
+        return bool(related_admin and related_admin.search_fields)
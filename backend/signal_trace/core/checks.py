@@ -0,0 +1,28 @@
+"""
+System checks for settings that only matter in production.
+
+Deploy checks run with `python manage.py check --deploy`.
+"""
+
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+from .throttling import CACHE_ALIAS
+
+# Backends whose entries live in one process's memory
+PER_PROCESS_CACHE_BACKENDS = {'django.core.cache.backends.locmem.LocMemCache'}
+
+
+@register(Tags.caches, Tags.security, deploy=True)
+def check_ratelimit_cache(app_configs, **kwargs):
+    """Rate limits must be counted in a cache every worker process shares."""
+    backend = settings.CACHES.get(CACHE_ALIAS, {}).get('BACKEND')
+    if backend not in PER_PROCESS_CACHE_BACKENDS:
+        return []
+    return [Warning(
+        f"The '{CACHE_ALIAS}' cache uses {backend}, so every process counts rate limits separately "
+        f"and a client gets each limit once per worker.",
+        hint='Set RATELIMIT_CACHE_BACKEND to a shared backend (Redis, Memcached or DatabaseCache), '
+             'unless the site runs as a single process.',
+        id='core.W001',
+    )]
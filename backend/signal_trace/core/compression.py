@@ -0,0 +1,69 @@
+"""
+Compression codecs shared by storage features.
+
+zstd is used when the standard library provides it (Python 3.14+,
+compression.zstd); otherwise zlib is used. Every blob is stored together
+with the name of its codec, so data written under one runtime can always be
+read back by another that supports the same codec.
+"""
+
+import zlib
+
+try:
+    from compression import zstd
+except ImportError:
+    zstd = None
+
+
+CODEC_NONE = 'none'
+CODEC_ZLIB = 'zlib'
+CODEC_ZSTD = 'zstd'
+
+CODEC_CHOICES = [
+    (CODEC_NONE, 'Uncompressed'),
+    (CODEC_ZLIB, 'zlib'),
+    (CODEC_ZSTD, 'zstd'),
+]
+
+DEFAULT_CODEC = CODEC_ZSTD if zstd is not None else CODEC_ZLIB
+
+
+def compress(raw, codec=DEFAULT_CODEC):
+    """Compress bytes with the given codec."""
+    if codec == CODEC_NONE:
+        return raw
+    if codec == CODEC_ZLIB:
+        return zlib.compress(raw, 6)
+    if codec == CODEC_ZSTD:
+        if zstd is None:
+            raise ValueError('zstd is not available in this Python runtime.')
+        return zstd.compress(raw)
+    raise ValueError(f"Unknown codec '{codec}'.")
+
+
+def decompress(blob, codec):
+    """Decompress bytes written with the given codec."""
+    blob = bytes(blob)
+    if codec == CODEC_NONE:
+        return blob
+    if codec == CODEC_ZLIB:
+        return zlib.decompress(blob)
+    if codec == CODEC_ZSTD:
+        if zstd is None:
+            raise ValueError('zstd is not available in this Python runtime.')
+        return zstd.decompress(blob)
+    raise ValueError(f"Unknown codec '{codec}'.")
+
+
+def compress_if_smaller(raw, threshold, codec=DEFAULT_CODEC):
+    """
+    Compress payloads of at least `threshold` bytes when that saves space.
+
+    Returns:
+        tuple: (codec used, stored bytes)
+    """
+    if len(raw) >= threshold:
+        packed = compress(raw, codec)
+        if len(packed) < len(raw):
+            return codec, packed
+    return CODEC_NONE, raw
@@ -0,0 +1,46 @@
+"""
+API exception handling.
+
+Wraps DRF's handler so that errors raised before a view's handler runs
+(rate limiting, overload) use the standard response envelope
+(users/utils.py).
+"""
+
+from rest_framework import status
+from rest_framework.exceptions import APIException, Throttled
+from rest_framework.views import exception_handler as drf_exception_handler
+
+from users.utils import error_response
+
+
+class Overloaded(APIException):
+    """The server is shedding load; the client should retry after `wait` seconds."""
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'Server is busy. Please try again shortly.'
+    default_code = 'overloaded'
+
+    def __init__(self, wait=None, detail=None, code=None):
+        super().__init__(detail, code)
+        self.wait = wait
+
+
+def exception_handler(exc, context):
+    response = drf_exception_handler(exc, context)
+    if response is None:
+        return response
+    if isinstance(exc, Throttled):
+        message = 'Too many requests. Please try again later.'
+    elif isinstance(exc, Overloaded):
+        message = str(exc.detail)
+        if exc.wait:
+            response['Retry-After'] = str(int(exc.wait))
+    else:
+        return response
+    envelope = error_response(
+        message=message,
+        errors={'retry_after': exc.wait and int(exc.wait + 0.999)},
+        status_code=response.status_code,
+    )
+    for header, value in response.items():
+        envelope[header] = value
+    return envelope
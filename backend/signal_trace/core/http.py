@@ -0,0 +1,304 @@
+"""
+Shared outbound HTTP client for third-party integrations.
+
+Enrichment providers, scrapers, CRMs and webhooks should all go through
+get_client(provider) instead of calling an HTTP library directly, so that:
+- Connections are pooled per provider and per host, and kept alive
+- HTTP/2 is negotiated when the optional 'h2' package is installed
+- Concurrency per provider is bounded
+- Transient failures are retried with exponential backoff and full jitter
+- A per-provider circuit breaker fails fast while a provider is down
+- Latency, retries and open circuits are recorded for operators
+
+Per-provider tuning lives in settings.OUTBOUND_HTTP.
+"""
+
+import email.utils
+import random
+import threading
+import time
+from collections import deque
+
+import httpx
+from django.conf import settings
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+# Statuses worth retrying: throttling and transient upstream failures
+RETRY_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+DEFAULTS = {
+    'timeout': 10.0,
+    'max_connections': 20,
+    'max_keepalive_connections': 10,
+    'keepalive_expiry': 30.0,
+    'max_concurrency': 10,
+    'retries': 3,
+    'backoff_base': 0.2,
+    'backoff_max': 5.0,
+    'failure_threshold': 5,
+    'reset_timeout': 30.0,
+}
+
+
+class CircuitOpenError(Exception):
+    """Raised when a request is refused because the provider's circuit is open."""
+
+    def __init__(self, provider, retry_after):
+        self.provider = provider
+        self.retry_after = retry_after
+        super().__init__(f"Circuit open for provider '{provider}', retry in {retry_after:.1f}s")
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    Opens after `failure_threshold` consecutive failures. While open, calls
+    are refused until `reset_timeout` has elapsed; then a single trial call
+    is let through (half-open) and its outcome closes or re-opens the circuit.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold, reset_timeout):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def before_request(self, provider):
+        """Raise CircuitOpenError unless a request may be attempted now."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+            elapsed = time.monotonic() - self.opened_at
+            if self.state == self.OPEN and elapsed >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                return
+            raise CircuitOpenError(provider, max(self.reset_timeout - elapsed, 0.0))
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        """Record a failed attempt. Returns True if the circuit just opened."""
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                was_open = self.state == self.OPEN
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+                return not was_open
+            return False
+
+
+class ProviderMetrics:
+    """Per-provider counters and a rolling window of request latencies."""
+
+    def __init__(self, window=1000):
+        self.requests = 0
+        self.failures = 0
+        self.retries = 0
+        self.circuit_rejections = 0
+        self.circuit_opens = 0
+        self.latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def observe(self, seconds, failed):
+        with self._lock:
+            self.requests += 1
+            self.latencies.append(seconds)
+            if failed:
+                self.failures += 1
+
+    def incr(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def snapshot(self):
+        with self._lock:
+            latencies = sorted(self.latencies)
+            data = {
+                'requests': self.requests,
+                'failures': self.failures,
+                'retries': self.retries,
+                'circuit_rejections': self.circuit_rejections,
+                'circuit_opens': self.circuit_opens,
+            }
+        if latencies:
+            data['latency_p50_ms'] = latencies[len(latencies) // 2] * 1000
+            data['latency_p99_ms'] = latencies[min(int(len(latencies) * 0.99), len(latencies) - 1)] * 1000
+        return data
+
+
+class OutboundClient:
+    """
+    Pooled, retrying HTTP client for a single provider.
+
+    Thread-safe; one instance is shared per provider via get_client().
+    """
+
+    def __init__(self, provider, base_url='', headers=None, **options):
+        config = {**DEFAULTS, **options}
+        self.provider = provider
+        self.retries = config['retries']
+        self.backoff_base = config['backoff_base']
+        self.backoff_max = config['backoff_max']
+        self.breaker = CircuitBreaker(config['failure_threshold'], config['reset_timeout'])
+        self.metrics = ProviderMetrics()
+        self._semaphore = threading.BoundedSemaphore(config['max_concurrency'])
+        self._client = httpx.Client(
+            base_url=base_url,
+            headers=headers,
+            http2=HTTP2_AVAILABLE,
+            timeout=config['timeout'],
+            limits=httpx.Limits(
+                max_connections=config['max_connections'],
+                max_keepalive_connections=config['max_keepalive_connections'],
+                keepalive_expiry=config['keepalive_expiry'],
+            ),
+        )
+
+    def backoff(self, attempt, response=None):
+        """Seconds to wait before retry `attempt` (1-based), honouring Retry-After."""
+        retry_after = _retry_after_seconds(response) if response is not None else None
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max)
+        # Full jitter: uniform over [0, base * 2^attempt], capped
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def request(self, method, url, **kwargs):
+        """
+        Send a request with retries, backoff and circuit breaking.
+
+        Returns:
+            httpx.Response: The final response (which may still be an error
+            status once retries are exhausted)
+
+        Raises:
+            CircuitOpenError: If the provider's circuit is open
+            httpx.TransportError: If every attempt failed at the transport level
+        """
+        attempt = 0
+        while True:
+            try:
+                self.breaker.before_request(self.provider)
+            except CircuitOpenError:
+                self.metrics.incr('circuit_rejections')
+                raise
+
+            response = None
+            error = None
+            started = time.perf_counter()
+            with self._semaphore:
+                try:
+                    response = self._client.request(method, url, **kwargs)
+                except httpx.TransportError as exc:
+                    error = exc
+                except BaseException:
+                    # Not retried, but it still counts against the circuit;
+                    # a half-open trial must always close or re-open it
+                    self.metrics.observe(time.perf_counter() - started, True)
+                    if self.breaker.record_failure():
+                        self.metrics.incr('circuit_opens')
+                    raise
+            failed = error is not None or response.status_code in RETRY_STATUSES
+            self.metrics.observe(time.perf_counter() - started, failed)
+
+            if not failed:
+                self.breaker.record_success()
+                return response
+
+            circuit_opened = self.breaker.record_failure()
+            if circuit_opened:
+                self.metrics.incr('circuit_opens')
+
+            # Stop retrying once attempts are exhausted or the circuit trips
+            if attempt >= self.retries or circuit_opened:
+                if error is not None:
+                    raise error
+                return response
+
+            attempt += 1
+            self.metrics.incr('retries')
+            time.sleep(self.backoff(attempt, response))
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def close(self):
+        self._client.close()
+
+
+def _retry_after_seconds(response):
+    """Parse a Retry-After header (delta-seconds or HTTP date)."""
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        parsed = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(parsed.timestamp() - time.time(), 0.0)
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(provider):
+    """
+    Return the shared OutboundClient for a provider, creating it on first use.
+
+    Options come from settings.OUTBOUND_HTTP['providers'][provider], layered
+    over settings.OUTBOUND_HTTP['default'].
+    """
+    client = _clients.get(provider)
+    if client is not None:
+        return client
+
+    with _clients_lock:
+        client = _clients.get(provider)
+        if client is None:
+            config = getattr(settings, 'OUTBOUND_HTTP', {})
+            options = {**config.get('default', {}), **config.get('providers', {}).get(provider, {})}
+            client = _clients[provider] = OutboundClient(provider, **options)
+    return client
+
+
+def metrics_snapshot():
+    """Return latency/retry metrics and circuit state for every provider."""
+    with _clients_lock:
+        clients = dict(_clients)
+    return {
+        provider: {**client.metrics.snapshot(), 'circuit': client.breaker.state}
+        for provider, client in clients.items()
+    }
+
+
+def close_all():
+    """Close every pooled client (e.g. at worker shutdown)."""
+    with _clients_lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        client.close()
@@ -0,0 +1,104 @@
+"""
+HTTP load generator for comparing server modes.
+
+Fires authenticated GET requests at a running server with a fixed number of
+concurrent clients and reports throughput and latency percentiles. Used to
+compare the prospect API under sync WSGI, sync views under ASGI, and native
+async views, e.g.:
+
+    gunicorn signal_trace.wsgi -w 4 --threads 8 -b :8001
+    uvicorn signal_trace.asgi:application --workers 4 --port 8002
+    PROSPECTS_ASYNC_VIEWS=True uvicorn signal_trace.asgi:application --workers 4 --port 8003
+
+    python manage.py loadtest --user alice@example.com --concurrency 200 \\
+        --url http://127.0.0.1:8001/api/prospects/ \\
+        --url http://127.0.0.1:8002/api/prospects/ \\
+        --url http://127.0.0.1:8003/api/prospects/
+"""
+
+import asyncio
+import time
+
+import httpx
+from django.core.management.base import BaseCommand, CommandError
+
+from users.models import User
+from users.tokens import AccessToken
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(int(len(sorted_values) * fraction), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+async def run_load(url, headers, concurrency, total_requests, timeout):
+    """
+    Issue total_requests GETs from `concurrency` concurrent clients.
+
+    Returns:
+        dict: requests, errors, elapsed seconds, sorted latencies (seconds)
+    """
+    latencies = []
+    errors = 0
+    remaining = total_requests
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(headers=headers, limits=limits, timeout=timeout) as client:
+        async def client_loop():
+            nonlocal remaining, errors
+            while remaining > 0:
+                remaining -= 1
+                started = time.perf_counter()
+                try:
+                    response = await client.get(url)
+                    ok = response.status_code < 400
+                except httpx.HTTPError:
+                    ok = False
+                latencies.append(time.perf_counter() - started)
+                errors += not ok
+
+        started = time.perf_counter()
+        await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {'requests': len(latencies), 'errors': errors, 'elapsed': elapsed, 'latencies': latencies}
+
+
+class Command(BaseCommand):
+    help = 'Load-test API endpoints and report requests/sec and latency percentiles.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', action='append', required=True, help='Endpoint to test (repeatable).')
+        parser.add_argument('--user', help='Email of the user to mint an access token for.')
+        parser.add_argument('--concurrency', type=int, default=100, help='Concurrent clients.')
+        parser.add_argument('--requests', type=int, default=5000, help='Requests per URL.')
+        parser.add_argument('--warmup', type=int, default=200, help='Untimed requests per URL first.')
+        parser.add_argument('--timeout', type=float, default=30.0, help='Per-request timeout in seconds.')
+
+    def handle(self, *args, **options):
+        headers = {}
+        if options['user']:
+            try:
+                user = User.get_by_email(options['user'])
+            except User.DoesNotExist:
+                raise CommandError(f"No user with email '{options['user']}'.")
+            headers['Authorization'] = f'Bearer {AccessToken.for_user(user)}'
+
+        self.stdout.write(
+            f"{'url':<45} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} {'errors':>7}"
+        )
+        for url in options['url']:
+            if options['warmup']:
+                asyncio.run(run_load(url, headers, options['concurrency'], options['warmup'], options['timeout']))
+            result = asyncio.run(
+                run_load(url, headers, options['concurrency'], options['requests'], options['timeout'])
+            )
+            latencies = result['latencies']
+            self.stdout.write(
+                f"{url:<45} {result['requests'] / result['elapsed']:>9.0f} "
+                f"{percentile(latencies, 0.50) * 1000:>8.1f} {percentile(latencies, 0.99) * 1000:>8.1f} "
+                f"{(latencies[-1] if latencies else 0) * 1000:>8.1f} {result['errors']:>7}"
+            )
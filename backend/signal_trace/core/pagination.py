@@ -0,0 +1,184 @@
+"""
+Paginators for large admin changelists.
+
+Django's changelist pays for an exact COUNT(*) of the filtered queryset
+on every page view. CachedCountPaginator keeps that count in the default
+cache for a short while, keyed by the query's SQL and parameters, so
+paging through a list or re-running a search counts once per timeout. The
+count shown may lag inserts by up to `cache_timeout` seconds.
+
+    class ContactMessageAdmin(ModelAdmin):
+        paginator = CachedCountPaginator
+        show_full_result_count = False
+
+LargeTablePaginator (used by core.admin.LargeTableAdminMixin) goes further
+on tables that are too big to count or page through with OFFSET:
+
+- Counts of at least ADMIN_LARGE_TABLES['estimate_threshold'] rows are
+  PostgreSQL planner estimates: pg_class.reltuples for an unfiltered list,
+  the EXPLAIN row estimate for a filtered one. Smaller counts, and every
+  count on other databases, are exact (and cached).
+- Pages are fetched by keyset where possible. Each page served records the
+  sort key of its last row in the cache, and the next page then starts
+  with WHERE (sort key) < (that key) instead of OFFSET. Paging forward is
+  thus constant-time however deep it goes; jumping straight to a deep page
+  still uses OFFSET once.
+"""
+
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.core.exceptions import EmptyResultSet, FieldDoesNotExist
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+
+class CachedCountPaginator(Paginator):
+    """Paginator whose total count is cached per query."""
+
+    cache_timeout = 60
+
+    @cached_property
+    def count(self):
+        key = self.cache_key()
+        if key is None:
+            return super().count
+        count = cache.get(key)
+        if count is None:
+            count = super().count
+            cache.set(key, count, self.cache_timeout)
+        return count
+
+    def cache_key(self):
+        """Cache key for the object list's query, or None if it has none."""
+        query = getattr(self.object_list, 'query', None)
+        if query is None:
+            return None
+        try:
+            sql, params = query.sql_with_params()
+        except EmptyResultSet:
+            return None
+        digest = hashlib.sha1(f'{sql}|{params!r}'.encode()).hexdigest()
+        return f'admin-count:{query.model._meta.label_lower}:{digest}'
+
+
+def estimate_table_rows(model, using='default'):
+    """
+    Planner estimate of a table's row count (PostgreSQL pg_class.reltuples).
+
+    Returns:
+        int or None: Estimate, or None on other databases or if the table
+            has not been analyzed yet
+    """
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass', [model._meta.db_table])
+        row = cursor.fetchone()
+    # -1 until the first VACUUM/ANALYZE
+    return row[0] if row and row[0] >= 0 else None
+
+
+def estimate_query_rows(queryset):
+    """
+    Planner estimate of a query's row count (PostgreSQL EXPLAIN).
+
+    Returns:
+        int or None: Estimate, or None on other databases
+    """
+    if connections[queryset.db].vendor != 'postgresql':
+        return None
+    plan = json.loads(queryset.order_by().explain(format='json'))
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class LargeTablePaginator(CachedCountPaginator):
+    """Paginator with estimated counts and keyset paging for large tables."""
+
+    # Seconds a page's last sort key is remembered
+    keyset_timeout = 300
+
+    @cached_property
+    def count(self):
+        query = getattr(self.object_list, 'query', None)
+        if query is not None:
+            if query.where:
+                estimate = estimate_query_rows(self.object_list)
+            else:
+                estimate = estimate_table_rows(query.model, using=self.object_list.db)
+            if estimate is not None and estimate >= settings.ADMIN_LARGE_TABLES['estimate_threshold']:
+                return estimate
+        return super().count
+
+    def page(self, number):
+        number = self.validate_number(number)
+        keys = self.keyset_fields()
+        boundary = None
+        if keys is not None and number > 1 and not self.orphans:
+            boundary = cache.get(self.boundary_key(number - 1))
+        if boundary is None:
+            page = super().page(number)
+            page_list = self.object_list[(number - 1) * self.per_page:]
+        else:
+            page_list = self.object_list.filter(self.after(keys, boundary))
+            page = self._get_page(page_list[:self.per_page], number, self)
+        if keys is not None:
+            self.remember_boundary(number, keys, page_list)
+        return page
+
+    def keyset_fields(self):
+        """
+        Sort key of the object list, if it can be paged by keyset.
+
+        The ordering must be plain, non-null columns of the model ending in
+        a unique one (the changelist always appends the primary key).
+
+        Returns:
+            list or None: [(attname, descending), ...]
+        """
+        query = getattr(self.object_list, 'query', None)
+        if query is None or not query.order_by or self.cache_key() is None:
+            return None
+        opts = query.model._meta
+        keys = []
+        for item in query.order_by:
+            if not isinstance(item, str):
+                return None
+            name = item.lstrip('-')
+            try:
+                field = opts.pk if name == 'pk' else opts.get_field(name)
+            except FieldDoesNotExist:
+                return None
+            if not field.concrete or field.null or field.many_to_many:
+                return None
+            if any(attname == field.attname for attname, _ in keys):
+                # Repeated in the ordering; only the first occurrence counts
+                continue
+            keys.append((field.attname, item.startswith('-')))
+            if field.unique:
+                return keys
+        return None
+
+    @staticmethod
+    def after(keys, boundary):
+        """Filter for rows sorting after the given key values."""
+        condition = Q()
+        for position, (attname, descending) in enumerate(keys):
+            lookup = {keys[index][0]: boundary[index] for index in range(position)}
+            lookup[f"{attname}__{'lt' if descending else 'gt'}"] = boundary[position]
+            condition |= Q(**lookup)
+        return condition
+
+    def boundary_key(self, number):
+        return f'{self.cache_key()}:page:{self.per_page}:{number}'
+
+    def remember_boundary(self, number, keys, page_list):
+        """Cache the sort key of the page's last row for the next page."""
+        last = list(page_list.values_list(*[attname for attname, _ in keys])[self.per_page - 1:self.per_page])
+        if last:
+            cache.set(self.boundary_key(number), last[0], self.keyset_timeout)
@@ -1,3 +1,434 @@
-from django.test import TestCase
+import threading
+import time
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
 
-# Create your tests here.
+import httpx
+from django.contrib.admin.sites import site
+from django.core.cache import caches
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.permissions import AllowAny
+from rest_framework.test import APIRequestFactory
+from rest_framework.views import APIView
+
+from prospects.models import Company, Prospect, ProspectEnrichment, Signal
+from users.models import User
+from users.utils import success_response
+
+from .checks import check_ratelimit_cache
+from .admin import AutocompleteSelectFilter
+from .http import CircuitBreaker, CircuitOpenError, OutboundClient
+from .pagination import CachedCountPaginator, LargeTablePaginator
+from .throttling import SlidingWindowThrottle, retry_after
+
+
+class StubServer:
+    """
+    Local HTTP server that plays back scripted responses.
+
+    Each script entry is (status, headers, delay): the server sleeps `delay`
+    seconds before answering. Requests beyond the script get 200.
+    """
+
+    def __init__(self, script=()):
+        server = self
+        self.script = list(script)
+        self.hits = 0
+        self._lock = threading.Lock()
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                status, headers, delay = server.next_response()
+                if delay:
+                    time.sleep(delay)
+                try:
+                    self.send_response(status)
+                    for name, value in headers.items():
+                        self.send_header(name, value)
+                    self.send_header('Content-Length', '2')
+                    self.end_headers()
+                    self.wfile.write(b'ok')
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client gave up (timeout)
+                    pass
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.httpd.server_address[1]}'
+        threading.Thread(target=self.httpd.serve_forever, args=(0.05,), daemon=True).start()
+
+    def next_response(self):
+        with self._lock:
+            self.hits += 1
+            return self.script.pop(0) if self.script else (200, {}, 0)
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class OutboundClientTests(SimpleTestCase):
+    """Retries, backoff and circuit breaking against a stub server."""
+
+    def setUp(self):
+        self.server = StubServer()
+        self.addCleanup(self.server.close)
+
+    def make_client(self, **options):
+        options = {'retries': 3, 'backoff_base': 0.01, 'backoff_max': 5.0, 'timeout': 2.0, **options}
+        client = OutboundClient('stub', base_url=self.server.url, **options)
+        self.addCleanup(client.close)
+        return client
+
+    def respond(self, status=503, headers=None, delay=0):
+        self.server.script.append((status, headers or {}, delay))
+
+    def test_retries_transient_failures_with_backoff(self):
+        self.respond(503)
+        self.respond(502)
+        client = self.make_client()
+
+        with mock.patch('core.http.time.sleep') as sleep:
+            response = client.get('/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.server.hits, 3)
+        self.assertEqual(client.metrics.snapshot()['retries'], 2)
+        # Full jitter: retry n waits at most base * 2^n
+        for attempt, call in enumerate(sleep.call_args_list, start=1):
+            self.assertLessEqual(call.args[0], 0.01 * 2 ** attempt)
+
+    def test_backoff_is_capped(self):
+        client = self.make_client(backoff_base=1.0, backoff_max=3.0)
+        for _ in range(50):
+            self.assertLessEqual(client.backoff(10), 3.0)
+
+    def test_returns_last_response_once_retries_are_exhausted(self):
+        for _ in range(3):
+            self.respond(500)
+        client = self.make_client(retries=2)
+
+        with mock.patch('core.http.time.sleep'):
+            response = client.get('/')
+
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(self.server.hits, 3)
+
+    def test_does_not_retry_client_errors(self):
+        self.respond(404)
+        client = self.make_client()
+
+        response = client.get('/')
+
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(self.server.hits, 1)
+
+    def test_honours_retry_after(self):
+        self.respond(429, {'Retry-After': '2'})
+        client = self.make_client()
+
+        with mock.patch('core.http.time.sleep') as sleep:
+            response = client.get('/')
+
+        self.assertEqual(response.status_code, 200)
+        sleep.assert_called_once_with(2.0)
+
+    def test_retry_after_is_capped_by_backoff_max(self):
+        self.respond(503, {'Retry-After': '120'})
+        client = self.make_client(backoff_max=1.5)
+
+        with mock.patch('core.http.time.sleep') as sleep:
+            client.get('/')
+
+        sleep.assert_called_once_with(1.5)
+
+    def test_retries_slow_responses_then_raises(self):
+        for _ in range(2):
+            self.respond(200, delay=0.5)
+        client = self.make_client(retries=1, timeout=0.1)
+
+        with mock.patch('core.http.random.uniform', return_value=0), self.assertRaises(httpx.TimeoutException):
+            client.get('/')
+
+        self.assertEqual(client.metrics.snapshot()['failures'], 2)
+
+    def test_circuit_opens_after_consecutive_failures(self):
+        self.respond(503)
+        self.respond(503)
+        client = self.make_client(retries=0, failure_threshold=2, reset_timeout=60)
+
+        client.get('/')
+        client.get('/')
+        with self.assertRaises(CircuitOpenError):
+            client.get('/')
+
+        self.assertEqual(self.server.hits, 2)
+        self.assertEqual(client.breaker.state, CircuitBreaker.OPEN)
+        metrics = client.metrics.snapshot()
+        self.assertEqual((metrics['circuit_opens'], metrics['circuit_rejections']), (1, 1))
+
+    def test_half_open_trial_success_closes_circuit(self):
+        self.respond(503)
+        client = self.make_client(retries=0, failure_threshold=1, reset_timeout=0.1)
+        client.get('/')
+        self.assertEqual(client.breaker.state, CircuitBreaker.OPEN)
+
+        time.sleep(0.15)
+        response = client.get('/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(client.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_half_open_trial_failure_reopens_circuit(self):
+        self.respond(503)
+        self.respond(503)
+        client = self.make_client(retries=0, failure_threshold=1, reset_timeout=0.1)
+        client.get('/')
+
+        time.sleep(0.15)
+        client.get('/')
+
+        self.assertEqual(client.breaker.state, CircuitBreaker.OPEN)
+        with self.assertRaises(CircuitOpenError):
+            client.get('/')
+
+    def test_half_open_trial_unexpected_error_reopens_circuit(self):
+        self.respond(503)
+        client = self.make_client(retries=0, failure_threshold=1, reset_timeout=0.1)
+        client.get('/')
+
+        time.sleep(0.15)
+        with mock.patch.object(client._client, 'request', side_effect=RuntimeError('boom')):
+            with self.assertRaises(RuntimeError):
+                client.get('/')
+
+        # Re-opened rather than stuck half-open; recovers after the timeout
+        self.assertEqual(client.breaker.state, CircuitBreaker.OPEN)
+        time.sleep(0.15)
+        self.assertEqual(client.get('/').status_code, 200)
+
+
+class ThrottledView(APIView):
+    authentication_classes = []
+    permission_classes = [AllowAny]
+    throttle_classes = [SlidingWindowThrottle]
+    throttle_scope = 'test'
+
+    def post(self, request):
+        return success_response(message='ok')
+
+
+@override_settings(RATE_LIMITS={'test': {'ip': '10/min', 'email_ip': '3/hour'}})
+class SlidingWindowThrottleTests(SimpleTestCase):
+    """Sliding-window limits, the 429 envelope and Retry-After."""
+
+    def setUp(self):
+        caches['ratelimit'].clear()
+        self.now = 6000.0  # start of a minute window
+        clock = mock.patch('core.throttling.time')
+        clock.start().time.side_effect = lambda: self.now
+        self.addCleanup(clock.stop)
+
+    def send(self, email=None, ip='10.0.0.1'):
+        data = {'email': email} if email else {}
+        request = APIRequestFactory().post('/', data, format='json', REMOTE_ADDR=ip)
+        return ThrottledView.as_view()(request)
+
+    def send_many(self, count, **kwargs):
+        return [self.send(**kwargs).status_code for _ in range(count)]
+
+    def test_rejects_with_envelope_and_retry_after(self):
+        self.assertEqual(self.send_many(10), [200] * 10)
+
+        response = self.send()
+
+        self.assertEqual(response.status_code, 429)
+        self.assertFalse(response.data['success'])
+        self.assertEqual(response.data['message'], 'Too many requests. Please try again later.')
+        self.assertEqual(int(response['Retry-After']), response.data['errors']['retry_after'])
+        self.assertGreaterEqual(int(response['Retry-After']), 1)
+
+    def test_limits_are_per_ip(self):
+        self.send_many(10)
+        self.assertEqual(self.send(ip='10.0.0.2').status_code, 200)
+
+    def test_window_slides(self):
+        self.now += 30
+        self.send_many(10)
+
+        # Half-way into the next window half of the previous count remains
+        self.now += 60
+        self.assertEqual(self.send_many(6), [200] * 5 + [429])
+
+        # Two windows later nothing is left
+        self.now += 120
+        self.assertEqual(self.send_many(10), [200] * 10)
+
+    def test_retry_after_is_honoured_exactly(self):
+        self.now += 20
+        self.send_many(10)
+        # Rejected requests are not counted
+        for _ in range(20):
+            response = self.send()
+        wait = int(response['Retry-After'])
+
+        self.now += wait - 1
+        self.assertEqual(self.send().status_code, 429)
+        self.now += 1
+        self.assertEqual(self.send().status_code, 200)
+
+    def test_retry_after(self):
+        # Full window: it must become the previous one and mostly slide out
+        self.assertEqual(retry_after(0, 10, 0, 60, 10), 66)
+        # Previous window over the limit: wait until enough of it slides out
+        self.assertEqual(retry_after(20, 0, 15, 60, 10), 18)
+        # Rounded up, and never under a second
+        self.assertEqual(retry_after(20, 0, 14.5, 60, 10), 19)
+        self.assertEqual(retry_after(10, 9, 59.9, 60, 10), 1)
+
+    def test_email_limit_is_per_ip(self):
+        # Someone else spends the budget for this address
+        self.assertEqual(self.send_many(4, email='ada@example.com', ip='10.6.6.6'), [200] * 3 + [429])
+
+        # The owner, on another address, is not locked out
+        self.assertEqual(self.send(email='Ada@Example.com', ip='10.0.0.1').status_code, 200)
+
+    @override_settings(RATE_LIMITS={'test': {'email': '3/hour'}})
+    def test_email_limit(self):
+        self.assertEqual(self.send_many(4, email='ada@example.com'), [200] * 3 + [429])
+        self.assertEqual(self.send(email='ADA@example.com ', ip='10.0.0.2').status_code, 429)
+        # Requests without an email skip the limit
+        self.assertEqual(self.send().status_code, 200)
+
+
+class RatelimitCacheCheckTests(SimpleTestCase):
+    """check --deploy warns about per-process rate limit counters."""
+
+    def caches_with(self, backend):
+        return override_settings(CACHES={'ratelimit': {'BACKEND': backend}})
+
+    def test_local_memory_warns(self):
+        with self.caches_with('django.core.cache.backends.locmem.LocMemCache'):
+            self.assertEqual([warning.id for warning in check_ratelimit_cache(None)], ['core.W001'])
+
+    def test_shared_backend_passes(self):
+        with self.caches_with('django.core.cache.backends.redis.RedisCache'):
+            self.assertEqual(check_ratelimit_cache(None), [])
+
+
+class LargeTablePaginatorTests(TestCase):
+    """Cached counts and keyset paging match plain COUNT/OFFSET paging."""
+
+    ordering = ('-intent_score', '-updated_at', '-pk')
+
+    def setUp(self):
+        caches['default'].clear()
+        owner = User.create_user_with_email('owner@example.com', 'pass-12345', is_active=True)
+        now = timezone.now()
+        for i in range(23):
+            prospect = Prospect.objects.create(owner=owner, full_name=f'Prospect {i}', company_name='Acme')
+            # Plenty of ties on the leading sort columns
+            Prospect.objects.filter(pk=prospect.pk).update(
+                intent_score=float(i % 3), updated_at=now - timedelta(minutes=i % 2),
+            )
+        self.queryset = Prospect.objects.order_by(*self.ordering)
+
+    def keys(self, *ordering):
+        return LargeTablePaginator(Prospect.objects.order_by(*ordering), 5).keyset_fields()
+
+    def test_keyset_fields(self):
+        self.assertEqual(
+            self.keys(*self.ordering), [('intent_score', True), ('updated_at', True), ('id', True)],
+        )
+        # Ends at the first unique column; repeats are skipped
+        self.assertEqual(self.keys('status', 'status', 'id', 'full_name'), [('status', False), ('id', False)])
+        self.assertEqual(self.keys('owner', '-pk'), [('owner_id', False), ('id', True)])
+        # Nullable, non-unique or computed orderings can't be paged by keyset
+        self.assertIsNone(self.keys('company', 'pk'))
+        self.assertIsNone(self.keys('status', 'full_name'))
+        self.assertIsNone(self.keys('owner__email', 'pk'))
+        self.assertIsNone(LargeTablePaginator(Prospect.objects.order_by(), 5).keyset_fields())
+        self.assertIsNone(LargeTablePaginator(list(self.queryset), 5).keyset_fields())
+
+    def test_after_on_descending_columns(self):
+        keys = self.keys(*self.ordering)
+        rows = list(self.queryset.values_list('intent_score', 'updated_at', 'id'))
+
+        for position, boundary in enumerate(rows):
+            with self.subTest(position=position):
+                after = self.queryset.filter(LargeTablePaginator.after(keys, boundary))
+                self.assertEqual(list(after.values_list('intent_score', 'updated_at', 'id')), rows[position + 1:])
+
+    def test_keyset_pages_match_offset_pages(self):
+        expected = list(self.queryset.values_list('pk', flat=True))
+        pages = []
+
+        for number in range(1, 6):
+            # A new paginator per page, as for separate changelist requests
+            paginator = LargeTablePaginator(self.queryset, 5)
+            page = paginator.page(number)
+            if number > 1:
+                self.assertNotIn('OFFSET', str(page.object_list.query))
+            pages.append([prospect.pk for prospect in page])
+
+        self.assertEqual(pages, [expected[start:start + 5] for start in range(0, 25, 5)])
+        self.assertEqual(paginator.num_pages, 5)
+
+    def test_jumping_to_a_page_uses_offset_once(self):
+        expected = list(self.queryset.values_list('pk', flat=True))
+
+        page = LargeTablePaginator(self.queryset, 5).page(3)
+        next_page = LargeTablePaginator(self.queryset, 5).page(4)
+
+        self.assertIn('OFFSET', str(page.object_list.query))
+        self.assertNotIn('OFFSET', str(next_page.object_list.query))
+        self.assertEqual([prospect.pk for prospect in next_page], expected[15:20])
+
+    def test_boundary_is_per_query(self):
+        LargeTablePaginator(self.queryset, 5).page(1)
+        filtered = self.queryset.filter(intent_score=2.0)
+
+        page = LargeTablePaginator(filtered, 5).page(2)
+
+        self.assertEqual([prospect.pk for prospect in page], list(filtered.values_list('pk', flat=True))[5:10])
+
+    def test_count_is_cached_per_query(self):
+        self.assertEqual(CachedCountPaginator(self.queryset, 5).count, 23)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(CachedCountPaginator(self.queryset, 5).count, 23)
+        with self.assertNumQueries(1):
+            self.assertEqual(CachedCountPaginator(self.queryset.filter(intent_score=0.0), 5).count, 8)
+        self.assertEqual(LargeTablePaginator(self.queryset, 5).count, 23)
+
+
+class LargeTableAdminMixinTests(TestCase):
+    """Foreign key list filters autocomplete only when the related admin can search."""
+
+    def test_is_autocomplete_filter(self):
+        prospect_admin = site._registry[Prospect]
+
+        self.assertTrue(prospect_admin.is_autocomplete_filter('owner'))
+        self.assertTrue(prospect_admin.is_autocomplete_filter('company'))
+        self.assertFalse(prospect_admin.is_autocomplete_filter('status'))
+        self.assertFalse(prospect_admin.is_autocomplete_filter(('owner', AutocompleteSelectFilter)))
+        self.assertTrue(site._registry[Signal].is_autocomplete_filter('prospect'))
+        self.assertTrue(site._registry[Signal].is_autocomplete_filter('prospect__owner'))
+        # EnrichmentPayload has no admin to autocomplete from
+        self.assertFalse(site._registry[ProspectEnrichment].is_autocomplete_filter('payload'))
+
+    def test_related_admin_without_search_fields(self):
+        with mock.patch.object(site._registry[Company], 'search_fields', ()):
+            self.assertFalse(site._registry[Prospect].is_autocomplete_filter('company'))
+
+    def test_get_list_filter(self):
+        list_filter = site._registry[Prospect].get_list_filter(None)
+
+        self.assertIn(('owner', AutocompleteSelectFilter), list_filter)
+        self.assertIn('status', list_filter)
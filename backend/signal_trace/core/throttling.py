@@ -0,0 +1,155 @@
+"""
+Sliding-window rate limiting for unauthenticated endpoints.
+
+Views opt in with a scope:
+
+    class LoginView(APIView):
+        throttle_classes = [SlidingWindowThrottle]
+        throttle_scope = 'login'
+
+settings.RATE_LIMITS maps each scope to limits per key kind:
+
+    'login': {'ip': '30/min', 'email_ip': '10/hour'}
+
+'ip' is the client address (BaseThrottle.get_ident, honouring NUM_PROXIES),
+'email' the normalized `email` field of the request body and 'email_ip'
+the pair of both. A per-email limit lets anyone lock the owner of an
+address out by spending its budget, so login counts per (email, ip)
+instead; per-email limits suit endpoints whose cost falls on the address
+itself (OTP mails, OTP guesses). A request
+that exceeds any of its scope's limits is rejected with 429 and a
+Retry-After header. DRF checks throttles in APIView.initial(), so a
+rejected request never reaches the serializer, the database or the
+password hasher.
+
+Each limit is a sliding-window counter: requests are counted in fixed
+windows, and the estimate for the last `period` seconds is the current
+window's count plus the previous window's, weighted by how much of it
+still overlaps:
+
+    estimate = previous * (1 - elapsed / period) + current
+
+That costs two integers per key instead of a timestamp per request. All
+counters of a request are read with one get_many; an allowed request then
+increments its current windows. Only allowed requests are counted, so a
+client that keeps hammering is let back in once its rate drops.
+
+Counters live in the 'ratelimit' cache. The default local-memory cache
+limits each process separately; point it at Redis, Memcached or a database
+cache table for limits shared by all workers (`check --deploy` warns
+otherwise, see core/checks.py). A DummyCache disables rate limiting.
+"""
+
+import hashlib
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.throttling import BaseThrottle
+
+CACHE_ALIAS = 'ratelimit'
+
+PERIODS = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 60 * 60 * 24}
+
+
+def parse_rate(rate):
+    """
+    Parse a rate such as '5/min' or '100/day'.
+
+    Returns:
+        tuple: (number of requests, period in seconds)
+    """
+    count, period = rate.split('/')
+    return int(count), PERIODS[period[0]]
+
+
+def estimate(previous, current, elapsed, period):
+    """Requests in the sliding window ending now."""
+    return previous * (1 - elapsed / period) + current
+
+
+def retry_after(previous, current, elapsed, period, limit):
+    """Whole seconds until one more request fits the limit (with no new requests)."""
+    if current < limit and previous:
+        # Wait for enough of the previous window to slide out
+        wait = period * (1 - (limit - 1 - current) / previous) - elapsed
+    else:
+        # The current window becomes the previous one, then slides out
+        wait = (period - elapsed) + period * (1 - (limit - 1) / current)
+    return max(math.ceil(wait), 1)
+
+
+class SlidingWindowThrottle(BaseThrottle):
+    """Throttle a view's scope by the limits in settings.RATE_LIMITS."""
+
+    def __init__(self):
+        self.wait_seconds = None
+
+    def allow_request(self, request, view):
+        limits = settings.RATE_LIMITS.get(getattr(view, 'throttle_scope', None))
+        if not limits:
+            return True
+
+        now = time.time()
+        counters = []
+        for kind, rate in limits.items():
+            ident = self.get_identity(request, kind)
+            if ident is None:
+                continue
+            limit, period = parse_rate(rate)
+            window, elapsed = divmod(now, period)
+            prefix = f'rl:{view.throttle_scope}:{kind}:{ident}:{period}'
+            counters.append((f'{prefix}:{int(window)}', f'{prefix}:{int(window) - 1}', limit, period, elapsed))
+
+        if not counters:
+            return True
+
+        cache = caches[CACHE_ALIAS]
+        found = cache.get_many([key for counter in counters for key in counter[:2]])
+        for current_key, previous_key, limit, period, elapsed in counters:
+            previous, current = found.get(previous_key, 0), found.get(current_key, 0)
+            if estimate(previous, current, elapsed, period) + 1 > limit:
+                self.wait_seconds = retry_after(previous, current, elapsed, period, limit)
+                return False
+
+        for current_key, _, _, period, _ in counters:
+            self.increment(cache, current_key, found.get(current_key) is None, period)
+        return True
+
+    @staticmethod
+    def increment(cache, key, new, period):
+        # The window is read as the previous one for another period
+        if new and cache.add(key, 1, 2 * period):
+            return
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Expired since it was read
+            cache.add(key, 1, 2 * period)
+
+    def get_identity(self, request, kind):
+        """
+        Return the value to count requests under, or None to skip this limit.
+
+        Args:
+            request: DRF Request
+            kind: 'ip', 'email' or 'email_ip'
+        """
+        if kind == 'ip':
+            value = self.get_ident(request)
+        elif kind in ('email', 'email_ip'):
+            data = request.data
+            value = data.get('email') if hasattr(data, 'get') else None
+            if not isinstance(value, str) or not value.strip():
+                return None
+            value = value.lower().strip()
+            if kind == 'email_ip':
+                value = f'{value}\n{self.get_ident(request)}'
+        else:
+            raise ValueError(f'Unknown rate limit key: {kind}')
+        # Fixed-length, cache-safe keys
+        return hashlib.sha1(str(value).encode()).hexdigest()[:20]
+
+    def wait(self):
+        return self.wait_seconds
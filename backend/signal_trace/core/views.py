@@ -1,3 +1,91 @@
-from django.shortcuts import render
+"""
+Base class for native async API views.
 
-# Create your views here.
+DRF's APIView is synchronous, so under ASGI every request is pushed through
+sync_to_async onto a thread. AsyncAPIView is a plain Django View with async
+handlers that keeps the API contract of the DRF views:
+
+- JWT authentication via AsyncJWTAuthentication (no blocking ORM call);
+  public endpoints set authentication_required = False
+- throttle_classes / throttle_scope checked before the handler runs
+- request.data parsed from the JSON body
+- handlers return DRF Responses (success_response / error_response)
+- errors rendered by the API exception handler, so 401/404/400/429 bodies
+  match the sync views exactly
+
+Handlers use the async ORM for reads. Writes that go through model business
+logic (sync by design) are wrapped with sync_to_async.
+"""
+
+import json
+
+from django.http import Http404
+from django.utils.decorators import classonlymethod
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import exceptions
+from rest_framework.renderers import JSONRenderer
+
+from core.exceptions import exception_handler
+from users.authentication import AsyncJWTAuthentication
+
+
+class AsyncAPIView(View):
+    """Async view returning standardized DRF responses."""
+
+    authentication_class = AsyncJWTAuthentication
+    # False for public endpoints (login, signup); the Authorization header
+    # is then ignored, like authentication_classes = [] on an APIView
+    authentication_required = True
+    throttle_classes = []
+
+    @classonlymethod
+    def as_view(cls, **initkwargs):
+        # Token-authenticated API, same as APIView.as_view()
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    async def dispatch(self, request, *args, **kwargs):
+        authenticator = self.authentication_class()
+        try:
+            if self.authentication_required:
+                auth = await authenticator.aauthenticate(request)
+                if auth is None:
+                    raise exceptions.NotAuthenticated()
+                request.user, request.auth = auth
+            request.data = self.parse_body(request)
+            self.check_throttles(request)
+            response = await super().dispatch(request, *args, **kwargs)
+        except (exceptions.APIException, Http404) as exc:
+            response = exception_handler(exc, {'view': self, 'args': args, 'kwargs': kwargs, 'request': request})
+            if response.status_code == 401:
+                response['WWW-Authenticate'] = authenticator.authenticate_header(request)
+        return self.finalize(response)
+
+    def http_method_not_allowed(self, request, *args, **kwargs):
+        raise exceptions.MethodNotAllowed(request.method)
+
+    def check_throttles(self, request):
+        """Reject the request with 429 if any throttle refuses it."""
+        for throttle in [throttle_class() for throttle_class in self.throttle_classes]:
+            if not throttle.allow_request(request, self):
+                raise exceptions.Throttled(throttle.wait())
+
+    @staticmethod
+    def parse_body(request):
+        """Parse a JSON request body (empty body -> {})."""
+        if request.method not in ('POST', 'PUT', 'PATCH') or not request.body:
+            return {}
+        try:
+            return json.loads(request.body)
+        except ValueError as exc:
+            raise exceptions.ParseError(f'JSON parse error - {exc}')
+
+    @staticmethod
+    def finalize(response):
+        """Render DRF Responses returned outside APIView as JSON."""
+        if not hasattr(response, 'data') or hasattr(response, 'accepted_renderer'):
+            return response
+        response.accepted_renderer = JSONRenderer()
+        response.accepted_media_type = JSONRenderer.media_type
+        response.renderer_context = {}
+        return response.render()
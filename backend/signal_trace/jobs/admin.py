@@ -0,0 +1,250 @@
+"""
+Django Admin configuration for the job queue.
+
+Provides visibility into queued, running, succeeded and dead-lettered jobs,
+with a bulk action to requeue dead jobs, and into periodic task schedules
+and run durations.
+"""
+
+from django.contrib import admin
+from unfold.admin import ModelAdmin
+from django.utils.html import format_html
+
+from .models import Job, PeriodicTask
+
+
+@admin.register(Job)
+class JobAdmin(ModelAdmin):
+    """
+    Admin interface for Job model.
+    
+    Jobs are created by the application, so they are read-only here.
+    """
+    
+    # Unfold configuration
+    icon_name = "work"
+    
+    list_display = (
+        'id',
+        'task',
+        'queue',
+        'status_display',
+        'attempts_display',
+        'run_at',
+        'finished_at',
+    )
+    
+    list_filter = (
+        'status',
+        'queue',
+        'task',
+    )
+    
+    search_fields = (
+        'task',
+        'locked_by',
+    )
+    
+    readonly_fields = (
+        'queue',
+        'task',
+        'payload',
+        'status',
+        'priority',
+        'attempts',
+        'max_attempts',
+        'run_at',
+        'locked_by',
+        'locked_until',
+        'result',
+        'last_error',
+        'finished_at',
+        'created_at',
+        'updated_at',
+    )
+    
+    ordering = ('-created_at',)
+    
+    fieldsets = (
+        ('Job', {
+            'fields': ('task', 'queue', 'priority', 'payload')
+        }),
+        ('State', {
+            'fields': (
+                'status',
+                'attempts',
+                'max_attempts',
+                'run_at',
+                'locked_by',
+                'locked_until',
+                'finished_at',
+            )
+        }),
+        ('Outcome', {
+            'fields': ('result', 'last_error')
+        }),
+        ('Timestamps', {
+            'fields': ('created_at', 'updated_at'),
+            'classes': ('collapse',)
+        }),
+    )
+    
+    actions = ['requeue_jobs']
+    
+    def status_display(self, obj):
+        """Display status with color coding."""
+        colors = {
+            'queued': 'blue',
+            'running': 'orange',
+            'succeeded': 'green',
+            'dead': 'red',
+        }
+        return format_html(
+            '<span style="color: {}; font-weight: bold;">● {}</span>',
+            colors.get(obj.status, 'gray'),
+            obj.get_status_display()
+        )
+    status_display.short_description = "Status"
+    status_display.admin_order_field = 'status'
+    
+    def attempts_display(self, obj):
+        """Display attempts used out of the maximum."""
+        return f'{obj.attempts}/{obj.max_attempts}'
+    attempts_display.short_description = "Attempts"
+    
+    @admin.action(description='Requeue selected dead jobs')
+    def requeue_jobs(self, request, queryset):
+        """Bulk action to send dead jobs back to the queue."""
+        dead = queryset.filter(status=Job.Status.DEAD)
+        count = 0
+        for job in dead:
+            job.requeue()
+            count += 1
+        self.message_user(
+            request,
+            f'{count} job(s) were requeued. Jobs that were not dead were skipped.'
+        )
+    
+    def has_add_permission(self, request):
+        """Disable adding jobs manually through admin."""
+        return False
+
+
+
+@admin.register(PeriodicTask)
+class PeriodicTaskAdmin(ModelAdmin):
+    """
+    Admin interface for PeriodicTask model.
+    
+    Rows are created by the scheduler from registered tasks. The load column
+    compares the last run's duration with the schedule interval, so tasks
+    outgrowing their interval stand out.
+    """
+    
+    # Unfold configuration
+    icon_name = "schedule"
+    
+    list_display = (
+        'name',
+        'schedule',
+        'next_run_at',
+        'last_run_at',
+        'outcome_display',
+        'duration_display',
+        'load_display',
+        'leader_display',
+    )
+    
+    list_filter = (
+        'last_outcome',
+    )
+    
+    search_fields = (
+        'name',
+    )
+    
+    readonly_fields = (
+        'name',
+        'schedule',
+        'next_run_at',
+        'lease_owner',
+        'lease_expires_at',
+        'last_run_at',
+        'last_outcome',
+        'last_duration',
+        'interval',
+        'last_error',
+        'run_count',
+        'created_at',
+        'updated_at',
+    )
+    
+    ordering = ('name',)
+    
+    fieldsets = (
+        ('Schedule', {
+            'fields': ('name', 'schedule', 'next_run_at')
+        }),
+        ('Lease', {
+            'fields': ('lease_owner', 'lease_expires_at')
+        }),
+        ('Last Run', {
+            'fields': ('last_run_at', 'last_outcome', 'last_duration', 'interval', 'run_count', 'last_error')
+        }),
+        ('Timestamps', {
+            'fields': ('created_at', 'updated_at'),
+            'classes': ('collapse',)
+        }),
+    )
+    
+    def outcome_display(self, obj):
+        """Display last outcome with color coding."""
+        if not obj.last_outcome:
+            return '-'
+        colors = {
+            'succeeded': 'green',
+            'failed': 'red',
+            'skipped': 'gray',
+        }
+        return format_html(
+            '<span style="color: {}; font-weight: bold;">● {}</span>',
+            colors.get(obj.last_outcome, 'gray'),
+            obj.get_last_outcome_display()
+        )
+    outcome_display.short_description = "Last Outcome"
+    outcome_display.admin_order_field = 'last_outcome'
+    
+    def duration_display(self, obj):
+        """Display last run duration."""
+        if obj.last_duration is None:
+            return '-'
+        return f'{obj.last_duration:.2f}s'
+    duration_display.short_description = "Duration"
+    duration_display.admin_order_field = 'last_duration'
+    
+    def load_display(self, obj):
+        """Display duration as a share of the interval with color coding."""
+        load = obj.load
+        if load is None:
+            return '-'
+        if load >= 1:
+            color = 'red'
+        elif load >= 0.5:
+            color = 'orange'
+        else:
+            color = 'green'
+        return format_html(
+            '<span style="color: {}; font-weight: bold;">{}%</span>',
+            color,
+            f'{load * 100:.1f}'
+        )
+    load_display.short_description = "Load"
+    
+    def leader_display(self, obj):
+        """Display the process currently holding the lease."""
+        return obj.lease_owner or '-'
+    leader_display.short_description = "Running On"
+    
+    def has_add_permission(self, request):
+        """Disable adding periodic tasks manually through admin."""
+        return False
@@ -0,0 +1,105 @@
+"""
+Minimal cron expression support for periodic tasks.
+
+Supports the standard five fields (minute hour day-of-month month
+day-of-week) with '*', lists ('1,15'), ranges ('1-5'), steps ('*/10',
+'0-30/5') and the '@hourly', '@daily', '@weekly' and '@monthly' aliases.
+Day-of-week uses 0-6 with 0 = Sunday (7 is also accepted for Sunday).
+As in standard cron, when both day fields are restricted a day matches if
+either does.
+"""
+
+from datetime import timedelta
+
+ALIASES = {
+    '@hourly': '0 * * * *',
+    '@daily': '0 0 * * *',
+    '@midnight': '0 0 * * *',
+    '@weekly': '0 0 * * 0',
+    '@monthly': '0 0 1 * *',
+}
+
+FIELD_RANGES = (
+    (0, 59),  # minute
+    (0, 23),  # hour
+    (1, 31),  # day of month
+    (1, 12),  # month
+    (0, 7),   # day of week
+)
+
+
+class CronError(ValueError):
+    """Raised for an invalid cron expression."""
+
+
+def _parse_field(spec, low, high):
+    values = set()
+    for part in spec.split(','):
+        step = 1
+        if '/' in part:
+            part, step_spec = part.split('/', 1)
+            step = int(step_spec)
+            if step < 1:
+                raise CronError(f"Invalid step in '{spec}'.")
+        if part == '*':
+            start, end = low, high
+        elif '-' in part:
+            start, end = (int(value) for value in part.split('-', 1))
+        else:
+            start = end = int(part)
+        if start < low or end > high or start > end:
+            raise CronError(f"Value out of range in '{spec}' (allowed {low}-{high}).")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+class CronSchedule:
+    """A parsed cron expression."""
+
+    def __init__(self, expression):
+        self.expression = expression
+        fields = ALIASES.get(expression.strip(), expression).split()
+        if len(fields) != 5:
+            raise CronError(f"Cron expression '{expression}' must have five fields.")
+        try:
+            parsed = [_parse_field(spec, low, high) for spec, (low, high) in zip(fields, FIELD_RANGES)]
+        except CronError:
+            raise
+        except ValueError as exc:
+            raise CronError(f"Invalid cron expression '{expression}': {exc}") from exc
+
+        self.minutes, self.hours, self.days, self.months, weekdays = parsed
+        self.weekdays = {day % 7 for day in weekdays}
+        self.days_restricted = fields[2] != '*'
+        self.weekdays_restricted = fields[4] != '*'
+
+    def _day_matches(self, dt):
+        day_ok = dt.day in self.days
+        # Python: Monday=0; cron: Sunday=0
+        weekday_ok = (dt.weekday() + 1) % 7 in self.weekdays
+        if self.days_restricted and self.weekdays_restricted:
+            return day_ok or weekday_ok
+        return day_ok and weekday_ok
+
+    def next_after(self, dt):
+        """Return the first matching minute strictly after `dt`."""
+        candidate = dt.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        # Bounded search: every valid expression matches within ~4 years
+        limit = candidate + timedelta(days=366 * 4)
+        while candidate < limit:
+            if candidate.month not in self.months:
+                year = candidate.year + (candidate.month == 12)
+                month = candidate.month % 12 + 1
+                candidate = candidate.replace(year=year, month=month, day=1, hour=0, minute=0)
+                continue
+            if not self._day_matches(candidate):
+                candidate = candidate.replace(hour=0, minute=0) + timedelta(days=1)
+                continue
+            if candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + timedelta(hours=1)
+                continue
+            if candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+                continue
+            return candidate
+        raise CronError(f"Cron expression '{self.expression}' never matches.")
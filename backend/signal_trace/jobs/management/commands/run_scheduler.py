@@ -0,0 +1,44 @@
+"""
+Run the periodic task scheduler in the foreground.
+
+Any number of schedulers may run at once (e.g. one per container); each
+periodic task still runs only once per scheduled slot.
+
+Usage:
+    python manage.py run_scheduler
+    python manage.py run_scheduler --once      # run due tasks and exit
+"""
+
+import signal
+import threading
+
+from django.core.management.base import BaseCommand
+
+from jobs.registry import registered_periodic_tasks
+from jobs.scheduler import Scheduler
+
+
+class Command(BaseCommand):
+    help = 'Run registered periodic tasks with leader election.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tick', type=float, default=5.0, help='Seconds between schedule checks.')
+        parser.add_argument('--once', action='store_true', help='Run due tasks once and exit.')
+
+    def handle(self, *args, **options):
+        scheduler = Scheduler(tick=options['tick'])
+        tasks = registered_periodic_tasks()
+        self.stdout.write(f'{len(tasks)} periodic task(s) registered:')
+        for name, spec in tasks.items():
+            self.stdout.write(f"  {name}  [{spec['schedule'].expression}]")
+
+        if options['once']:
+            scheduler.sync()
+            handled = scheduler.run_due()
+            self.stdout.write(self.style.SUCCESS(f'Ran {handled} due task(s).'))
+            return
+
+        stop_event = threading.Event()
+        signal.signal(signal.SIGINT, lambda *args: stop_event.set())
+        signal.signal(signal.SIGTERM, lambda *args: stop_event.set())
+        scheduler.run(should_stop=stop_event.is_set)
@@ -0,0 +1,84 @@
+"""
+Run job queue workers.
+
+Forks N worker processes that claim jobs with SELECT ... FOR UPDATE SKIP
+LOCKED. On SQLite, which has no row-level locking, a single in-process
+worker is run instead.
+
+Usage:
+    python manage.py run_workers --workers 4 --queues default,enrichment
+    python manage.py run_workers --burst        # exit when the queue is empty
+    python manage.py run_workers --with-scheduler   # also run periodic tasks
+"""
+
+import multiprocessing
+import signal
+
+from django.core.management.base import BaseCommand
+from django.db import connection, connections
+
+from jobs.scheduler import start_scheduler
+from jobs.worker import Worker
+
+
+def _run_worker(options, stop_event):
+    signal.signal(signal.SIGINT, lambda *args: stop_event.set())
+    signal.signal(signal.SIGTERM, lambda *args: stop_event.set())
+    Worker(
+        queues=options['queues'],
+        batch_size=options['batch_size'],
+        visibility_timeout=options['visibility_timeout'],
+        poll_interval=options['poll_interval'],
+    ).run(should_stop=stop_event.is_set, burst=options['burst'])
+
+
+class Command(BaseCommand):
+    help = 'Run database-backed job queue workers.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=multiprocessing.cpu_count(), help='Worker processes to fork.')
+        parser.add_argument('--queues', default='default', help='Comma-separated queue names.')
+        parser.add_argument('--batch-size', type=int, default=20, help='Jobs claimed per round trip.')
+        parser.add_argument('--visibility-timeout', type=int, default=300, help='Seconds before an unfinished job is reclaimed.')
+        parser.add_argument('--poll-interval', type=float, default=1.0, help='Seconds to sleep when the queue is empty.')
+        parser.add_argument('--burst', action='store_true', help='Exit once the queue is drained.')
+        parser.add_argument('--with-scheduler', action='store_true', help='Also run the periodic task scheduler in this process.')
+
+    def handle(self, *args, **options):
+        options['queues'] = [queue.strip() for queue in options['queues'].split(',') if queue.strip()]
+        workers = max(options['workers'], 1)
+
+        if not connection.features.has_select_for_update_skip_locked:
+            if workers > 1:
+                self.stdout.write(self.style.WARNING(
+                    f'{connection.vendor} has no SKIP LOCKED support; running a single worker.'
+                ))
+            stop_event = multiprocessing.Event()
+            if options['with_scheduler']:
+                start_scheduler()
+            _run_worker(options, stop_event)
+            return
+
+        # Children must open their own database connections
+        connections.close_all()
+        context = multiprocessing.get_context('fork')
+        stop_event = context.Event()
+        processes = [
+            context.Process(target=_run_worker, args=(options, stop_event), name=f'job-worker-{i}')
+            for i in range(workers)
+        ]
+
+        signal.signal(signal.SIGINT, lambda *args: stop_event.set())
+        signal.signal(signal.SIGTERM, lambda *args: stop_event.set())
+
+        for process in processes:
+            process.start()
+        self.stdout.write(f"Started {workers} worker(s) on queues: {', '.join(options['queues'])}")
+
+        # The scheduler thread starts after forking so children never inherit it
+        if options['with_scheduler']:
+            start_scheduler()
+
+        for process in processes:
+            process.join()
+        self.stdout.write('All workers stopped.')
@@ -0,0 +1,35 @@
+# Generated by Django 5.2 on 2026-10-18 23:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PeriodicTask',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('name', models.CharField(help_text='Registered task name', max_length=200, unique=True)),
+                ('schedule', models.CharField(help_text='Cron expression', max_length=100)),
+                ('next_run_at', models.DateTimeField(db_index=True)),
+                ('lease_owner', models.CharField(blank=True, max_length=100)),
+                ('lease_expires_at', models.DateTimeField(blank=True, null=True)),
+                ('last_run_at', models.DateTimeField(blank=True, null=True)),
+                ('last_outcome', models.CharField(blank=True, choices=[('succeeded', 'Succeeded'), ('failed', 'Failed'), ('skipped', 'Skipped (missed run)')], max_length=10)),
+                ('last_duration', models.FloatField(blank=True, help_text='Seconds taken by the last run', null=True)),
+                ('interval', models.FloatField(blank=True, help_text='Seconds between the last two scheduled slots', null=True)),
+                ('last_error', models.TextField(blank=True)),
+                ('run_count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+    ]
@@ -0,0 +1,366 @@
+"""
+Database-backed job queue.
+
+Jobs are rows in Postgres claimed with SELECT ... FOR UPDATE SKIP LOCKED, so
+any number of worker processes can pull work concurrently without an
+external broker. On SQLite (development) row locking is unavailable and a
+single worker process is used instead.
+
+Lifecycle:
+    queued -> running -> succeeded
+                      -> queued (retry with backoff) -> ... -> dead
+A running job whose visibility timeout expires (e.g. its worker crashed)
+becomes claimable again and counts as a failed attempt.
+"""
+
+import random
+from datetime import timedelta
+
+from django.db import models, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from core.models import BaseDateTimeModel
+
+
+class Job(BaseDateTimeModel):
+    """
+    A unit of background work.
+
+    Business logic for enqueueing, claiming and completing jobs lives here;
+    workers (jobs/worker.py) only loop over these methods.
+    """
+    class Status(models.TextChoices):
+        QUEUED = "queued", "Queued"
+        RUNNING = "running", "Running"
+        SUCCEEDED = "succeeded", "Succeeded"
+        DEAD = "dead", "Dead"
+
+    queue = models.CharField(max_length=50, default="default")
+    task = models.CharField(max_length=200, help_text="Registered task name")
+    payload = models.JSONField(default=dict, blank=True, help_text="Keyword arguments for the task")
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.QUEUED)
+    priority = models.SmallIntegerField(default=0, help_text="Higher runs first")
+
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_at = models.DateTimeField(default=timezone.now, help_text="Not claimable before this time")
+
+    # Visibility timeout: a running job is reclaimable once locked_until passes
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_until = models.DateTimeField(null=True, blank=True)
+
+    result = models.JSONField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=['queue', '-priority', 'run_at'],
+                condition=Q(status='queued'),
+                name='jobs_job_claimable_idx',
+            ),
+            models.Index(
+                fields=['locked_until'],
+                condition=Q(status='running'),
+                name='jobs_job_running_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f"Job({self.task}#{self.pk}, {self.status})"
+
+    @classmethod
+    def enqueue(cls, task, payload=None, queue='default', priority=0, run_at=None, max_attempts=5):
+        """
+        Business logic: Add a job to the queue.
+
+        Call inside the caller's transaction to make the job durable only if
+        that transaction commits.
+
+        Args:
+            task: Registered task name
+            payload: Keyword arguments for the task (JSON-serialisable)
+            queue: Queue name
+            priority: Higher runs first
+            run_at: Earliest run time (default: now)
+            max_attempts: Attempts before the job is dead-lettered
+
+        Returns:
+            Job: Created job instance
+        """
+        return cls.objects.create(
+            task=task,
+            payload=payload or {},
+            queue=queue,
+            priority=priority,
+            run_at=run_at or timezone.now(),
+            max_attempts=max_attempts,
+        )
+
+    @classmethod
+    def enqueue_many(cls, task, payloads, queue='default', priority=0, max_attempts=5, batch_size=1000):
+        """Business logic: Enqueue one job per payload with a bulk insert."""
+        now = timezone.now()
+        return cls.objects.bulk_create(
+            [
+                cls(task=task, payload=payload, queue=queue, priority=priority, run_at=now, max_attempts=max_attempts)
+                for payload in payloads
+            ],
+            batch_size=batch_size,
+        )
+
+    @classmethod
+    def claim(cls, worker_id, queues=('default',), batch_size=10, visibility_timeout=300):
+        """
+        Business logic: Atomically claim up to batch_size runnable jobs.
+
+        Rows locked by other workers are skipped rather than waited on, so
+        concurrent workers never block each other or claim the same job.
+
+        Args:
+            worker_id: Identifier recorded on claimed jobs
+            queues: Queue names to claim from
+            batch_size: Max jobs to claim
+            visibility_timeout: Seconds before an unfinished job is reclaimable
+
+        Returns:
+            list: Claimed Job instances, now in the running state
+        """
+        now = timezone.now()
+        runnable = (
+            Q(status=cls.Status.QUEUED, run_at__lte=now)
+            | Q(status=cls.Status.RUNNING, locked_until__lt=now)
+        )
+
+        with transaction.atomic():
+            ids = list(
+                cls.objects.select_for_update(skip_locked=True)
+                .filter(runnable, queue__in=queues)
+                .order_by('-priority', 'run_at', 'id')
+                .values_list('id', flat=True)[:batch_size]
+            )
+            if not ids:
+                return []
+
+            # Reclaimed jobs that already used every attempt are dead-lettered
+            cls.objects.filter(id__in=ids, attempts__gte=F('max_attempts')).update(
+                status=cls.Status.DEAD,
+                locked_by='',
+                locked_until=None,
+                finished_at=now,
+                last_error='Visibility timeout expired on final attempt.',
+            )
+            cls.objects.filter(id__in=ids, attempts__lt=F('max_attempts')).update(
+                status=cls.Status.RUNNING,
+                attempts=F('attempts') + 1,
+                locked_by=worker_id,
+                locked_until=now + timedelta(seconds=visibility_timeout),
+            )
+
+        return list(
+            cls.objects.filter(id__in=ids, status=cls.Status.RUNNING, locked_by=worker_id)
+            .order_by('-priority', 'run_at', 'id')
+        )
+
+    @classmethod
+    def complete_many(cls, jobs, worker_id):
+        """
+        Business logic: Mark finished jobs as succeeded, storing their results.
+
+        Jobs no longer locked by this worker (their visibility timeout expired
+        and another worker reclaimed them) are left untouched.
+
+        Args:
+            jobs: Job instances with `result` set
+            worker_id: Worker that ran the jobs
+        """
+        now = timezone.now()
+        fields = {'status': cls.Status.SUCCEEDED, 'locked_by': '', 'locked_until': None, 'finished_at': now}
+        owned = cls.objects.filter(status=cls.Status.RUNNING, locked_by=worker_id)
+
+        with transaction.atomic():
+            # Jobs without a result are finished with a single UPDATE
+            no_result = [job.pk for job in jobs if job.result is None]
+            if no_result:
+                owned.filter(pk__in=no_result).update(**fields)
+            for job in jobs:
+                if job.result is not None:
+                    owned.filter(pk=job.pk).update(result=job.result, **fields)
+
+    @classmethod
+    def purge_succeeded(cls, older_than, batch_size=1000):
+        """
+        Business logic: Delete succeeded jobs finished before now - older_than.
+
+        Deletes in primary-key chunks so each statement stays short.
+
+        Args:
+            older_than: timedelta of succeeded jobs to keep
+            batch_size: Rows deleted per statement
+
+        Returns:
+            int: Number of jobs deleted
+        """
+        cutoff = timezone.now() - older_than
+        expired = cls.objects.filter(status=cls.Status.SUCCEEDED, finished_at__lt=cutoff)
+        deleted = 0
+        while True:
+            ids = list(expired.order_by('id').values_list('id', flat=True)[:batch_size])
+            if not ids:
+                return deleted
+            deleted += cls.objects.filter(id__in=ids).delete()[0]
+
+    def fail(self, error, worker_id):
+        """
+        Business logic: Record a failed attempt.
+
+        Retries with exponential backoff and jitter until max_attempts is
+        reached, after which the job is dead-lettered.
+
+        Args:
+            error: Error description
+            worker_id: Worker that ran the job
+        """
+        now = timezone.now()
+        fields = {'last_error': error, 'locked_by': '', 'locked_until': None}
+        if self.attempts >= self.max_attempts:
+            fields.update(status=self.Status.DEAD, finished_at=now)
+        else:
+            delay = min(2 ** self.attempts, 3600) * random.uniform(0.5, 1.5)
+            fields.update(status=self.Status.QUEUED, run_at=now + timedelta(seconds=delay))
+
+        type(self).objects.filter(pk=self.pk, status=self.Status.RUNNING, locked_by=worker_id).update(**fields)
+        for name, value in fields.items():
+            setattr(self, name, value)
+
+    def requeue(self):
+        """Business logic: Send a dead job back to the queue with fresh attempts."""
+        self.status = self.Status.QUEUED
+        self.attempts = 0
+        self.run_at = timezone.now()
+        self.last_error = ''
+        self.finished_at = None
+        self.save(update_fields=['status', 'attempts', 'run_at', 'last_error', 'finished_at', 'updated_at'])
+
+
+class PeriodicTask(BaseDateTimeModel):
+    """
+    Schedule state and leader lease for one periodic task.
+
+    Every process running a scheduler competes for the lease with a single
+    conditional UPDATE; only the process that wins runs the task, so a
+    task fires once per slot no matter how many web or worker containers
+    are up. A crashed leader's lease simply expires.
+    """
+    class Outcome(models.TextChoices):
+        SUCCEEDED = "succeeded", "Succeeded"
+        FAILED = "failed", "Failed"
+        SKIPPED = "skipped", "Skipped (missed run)"
+
+    name = models.CharField(max_length=200, unique=True, help_text="Registered task name")
+    schedule = models.CharField(max_length=100, help_text="Cron expression")
+    next_run_at = models.DateTimeField(db_index=True)
+
+    lease_owner = models.CharField(max_length=100, blank=True)
+    lease_expires_at = models.DateTimeField(null=True, blank=True)
+
+    last_run_at = models.DateTimeField(null=True, blank=True)
+    last_outcome = models.CharField(max_length=10, choices=Outcome.choices, blank=True)
+    last_duration = models.FloatField(null=True, blank=True, help_text="Seconds taken by the last run")
+    interval = models.FloatField(null=True, blank=True, help_text="Seconds between the last two scheduled slots")
+    last_error = models.TextField(blank=True)
+    run_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ["name"]
+
+    def __str__(self):
+        return f"PeriodicTask({self.name}, {self.schedule})"
+
+    @property
+    def load(self):
+        """Fraction of the interval taken by the last run (>= 1 means it is outgrowing it)."""
+        if not self.last_duration or not self.interval:
+            return None
+        return self.last_duration / self.interval
+
+    @classmethod
+    def sync(cls, name, schedule, next_run_at):
+        """
+        Business logic: Ensure a state row exists for a registered task.
+
+        A row whose cron expression changed is rescheduled from now.
+
+        Args:
+            name: Registered task name
+            schedule: Cron expression
+            next_run_at: First run time to use for a new or rescheduled row
+
+        Returns:
+            PeriodicTask: State row
+        """
+        state, created = cls.objects.get_or_create(
+            name=name, defaults={'schedule': schedule, 'next_run_at': next_run_at},
+        )
+        if not created and state.schedule != schedule:
+            state.schedule = schedule
+            state.next_run_at = next_run_at
+            state.save(update_fields=['schedule', 'next_run_at', 'updated_at'])
+        return state
+
+    @classmethod
+    def acquire(cls, name, owner, lease_seconds):
+        """
+        Business logic: Try to take the lease for a due task.
+
+        The check and the claim are one UPDATE, so exactly one contender
+        wins even when several schedulers tick at the same moment.
+
+        Args:
+            name: Registered task name
+            owner: Identifier of the competing scheduler
+            lease_seconds: How long the lease is held if the run never reports back
+
+        Returns:
+            PeriodicTask or None: State row if the lease was acquired
+        """
+        now = timezone.now()
+        acquired = cls.objects.filter(
+            Q(lease_expires_at__isnull=True) | Q(lease_expires_at__lt=now),
+            name=name,
+            next_run_at__lte=now,
+        ).update(lease_owner=owner, lease_expires_at=now + timedelta(seconds=lease_seconds))
+        if not acquired:
+            return None
+        return cls.objects.get(name=name)
+
+    def release(self, owner, next_run_at, outcome, duration=None, interval=None, error=''):
+        """
+        Business logic: Record a run and give up the lease.
+
+        Args:
+            owner: Scheduler that holds the lease
+            next_run_at: Next scheduled run time
+            outcome: Outcome value
+            duration: Seconds the run took (None when skipped)
+            interval: Seconds between this slot and the next
+            error: Error description for failed runs
+        """
+        fields = {
+            'lease_owner': '',
+            'lease_expires_at': None,
+            'next_run_at': next_run_at,
+            'last_outcome': outcome,
+            'last_error': error,
+            'updated_at': timezone.now(),
+        }
+        if outcome != self.Outcome.SKIPPED:
+            fields.update(
+                last_run_at=timezone.now(),
+                last_duration=duration,
+                interval=interval,
+                run_count=F('run_count') + 1,
+            )
+        type(self).objects.filter(pk=self.pk, lease_owner=owner).update(**fields)
@@ -0,0 +1,100 @@
+"""
+Task registry for the job queue.
+
+Declare background tasks in an app's tasks.py (autodiscovered at startup):
+
+    from jobs.registry import task
+
+    @task(queue='enrichment', max_attempts=3)
+    def reenrich(source):
+        ...
+
+    reenrich.enqueue(source='crunchbase')
+
+Task arguments and return values must be JSON-serialisable; the return
+value is stored as the job result.
+
+Periodic tasks run on a cron schedule inside whichever process wins the
+task's lease (see jobs/scheduler.py):
+
+    from jobs.registry import periodic
+
+    @periodic('*/15 * * * *', jitter=60)
+    def purge_expired():
+        ...
+"""
+
+from .cron import CronSchedule
+
+_tasks = {}
+_periodic = {}
+
+
+class UnknownTaskError(LookupError):
+    """Raised when a job references a task that is not registered."""
+
+
+def task(name=None, queue='default', priority=0, max_attempts=5):
+    """Register a function as a background task and attach .enqueue()."""
+    def decorator(func):
+        task_name = name or f'{func.__module__}.{func.__name__}'
+
+        def enqueue(run_at=None, **kwargs):
+            from .models import Job
+            return Job.enqueue(
+                task_name,
+                payload=kwargs,
+                queue=queue,
+                priority=priority,
+                run_at=run_at,
+                max_attempts=max_attempts,
+            )
+
+        func.task_name = task_name
+        func.enqueue = enqueue
+        _tasks[task_name] = func
+        return func
+    return decorator
+
+
+def get_task(name):
+    try:
+        return _tasks[name]
+    except KeyError:
+        raise UnknownTaskError(f"Task '{name}' is not registered.") from None
+
+
+def registered_tasks():
+    return dict(_tasks)
+
+
+def periodic(schedule, name=None, jitter=0, catch_up=True, lease=600):
+    """
+    Register a function as a periodic task.
+
+    Args:
+        schedule: Cron expression (five fields or an @alias)
+        name: Task name (default: module.function)
+        jitter: Max random delay in seconds added to each run, to spread load
+        catch_up: Run once at startup for slots missed while no scheduler ran;
+            when False, missed slots are skipped
+        lease: Seconds the leader's lease lasts if it dies mid-run
+    """
+    cron = CronSchedule(schedule)
+
+    def decorator(func):
+        task_name = name or f'{func.__module__}.{func.__name__}'
+        func.task_name = task_name
+        _periodic[task_name] = {
+            'func': func,
+            'schedule': cron,
+            'jitter': jitter,
+            'catch_up': catch_up,
+            'lease': lease,
+        }
+        return func
+    return decorator
+
+
+def registered_periodic_tasks():
+    return dict(_periodic)
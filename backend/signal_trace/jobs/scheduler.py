@@ -0,0 +1,138 @@
+"""
+In-process periodic task scheduler.
+
+Each process that runs a Scheduler (web processes with
+JOBS_SCHEDULER_IN_WEB=True, `run_workers --with-scheduler`, or the
+`run_scheduler` command) competes for a per-task lease row in
+PeriodicTask. Only the lease winner runs a due task, so adding containers
+never multiplies periodic work. Leases use a conditional UPDATE rather than
+a Postgres advisory lock so the same code works on SQLite in development.
+
+Missed slots (no scheduler was running) are coalesced into a single
+catch-up run, or skipped for tasks registered with catch_up=False. Every run
+records its duration next to the schedule interval, so the admin can show
+tasks that are starting to outgrow their interval.
+"""
+
+import logging
+import random
+import threading
+import time
+import traceback
+from datetime import timedelta
+
+from django.db import close_old_connections, connection
+from django.utils import timezone
+
+from .models import PeriodicTask
+from .registry import registered_periodic_tasks
+from .worker import make_worker_id
+
+logger = logging.getLogger(__name__)
+
+
+def _next_run(spec, after):
+    """Next cron slot after `after` (in local time), plus jitter."""
+    slot = spec['schedule'].next_after(timezone.localtime(after))
+    if spec['jitter']:
+        slot += timedelta(seconds=random.uniform(0, spec['jitter']))
+    return slot
+
+
+class Scheduler:
+    """Runs registered periodic tasks whose lease this process wins."""
+
+    def __init__(self, tick=5.0):
+        self.tick = tick
+        self.owner = make_worker_id()
+
+    def sync(self):
+        """Create or reschedule state rows for every registered periodic task."""
+        now = timezone.now()
+        for name, spec in registered_periodic_tasks().items():
+            PeriodicTask.sync(name, spec['schedule'].expression, _next_run(spec, now))
+
+    def run_due(self):
+        """
+        Run every due task whose lease this process acquires.
+
+        Returns:
+            int: Number of tasks run or skipped
+        """
+        handled = 0
+        for name, spec in registered_periodic_tasks().items():
+            state = PeriodicTask.acquire(name, self.owner, spec['lease'])
+            if state is not None:
+                self._run(state, spec)
+                handled += 1
+        return handled
+
+    def _run(self, state, spec):
+        now = timezone.now()
+        cron = spec['schedule']
+        # Slots missed while no scheduler was running collapse into this run
+        following = cron.next_after(timezone.localtime(now))
+        interval = (cron.next_after(following) - following).total_seconds()
+        missed = (now - state.next_run_at).total_seconds() > interval
+        next_run_at = _next_run(spec, now)
+
+        if missed and not spec['catch_up']:
+            logger.info('Skipping missed run of periodic task %s', state.name)
+            state.release(self.owner, next_run_at, PeriodicTask.Outcome.SKIPPED)
+            return
+
+        started = time.monotonic()
+        try:
+            spec['func']()
+        except Exception:
+            logger.exception('Periodic task %s failed', state.name)
+            outcome, error = PeriodicTask.Outcome.FAILED, traceback.format_exc(limit=20)
+        else:
+            outcome, error = PeriodicTask.Outcome.SUCCEEDED, ''
+        duration = time.monotonic() - started
+
+        if duration >= interval:
+            logger.warning(
+                'Periodic task %s took %.1fs, longer than its %.0fs interval', state.name, duration, interval,
+            )
+        state.release(self.owner, next_run_at, outcome, duration=duration, interval=interval, error=error)
+
+    def run(self, should_stop=lambda: False):
+        """
+        Tick until should_stop() returns True.
+
+        Args:
+            should_stop: Callable polled between ticks
+        """
+        logger.info('Scheduler %s started', self.owner)
+        try:
+            close_old_connections()
+            self.sync()
+            while not should_stop():
+                close_old_connections()
+                try:
+                    self.run_due()
+                except Exception:
+                    logger.exception('Scheduler tick failed')
+                time.sleep(self.tick)
+        finally:
+            connection.close()
+            logger.info('Scheduler %s stopped', self.owner)
+
+
+def start_scheduler(tick=5.0):
+    """
+    Start a Scheduler in a daemon thread of the current process.
+
+    Returns:
+        tuple: (thread, stop event)
+    """
+    stop_event = threading.Event()
+    thread = threading.Thread(
+        target=Scheduler(tick=tick).run,
+        kwargs={'should_stop': stop_event.is_set},
+        name='periodic-scheduler',
+        daemon=True,
+    )
+    thread.start()
+    return thread, stop_event
@@ -0,0 +1,14 @@
+"""
+Periodic housekeeping for the job queue itself.
+"""
+
+from django.conf import settings
+
+from .models import Job
+from .registry import periodic
+
+
+@periodic('0 * * * *', jitter=120)
+def purge_finished_jobs():
+    """Delete succeeded jobs older than JOBS_SUCCEEDED_RETENTION."""
+    return Job.purge_succeeded(settings.JOBS_SUCCEEDED_RETENTION)
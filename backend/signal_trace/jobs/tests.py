@@ -0,0 +1,306 @@
+from datetime import datetime, timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+from django.utils import timezone
+
+from .cron import CronError, CronSchedule
+from .models import Job, PeriodicTask
+from .registry import periodic, registered_periodic_tasks, task
+from .scheduler import Scheduler, _next_run
+from .worker import Worker
+
+
+@task(name='jobs.tests.echo')
+def echo(value=None, fail=False):
+    if fail:
+        raise RuntimeError('boom')
+    return value
+
+
+@periodic('*/15 * * * *', name='jobs.tests.tick', jitter=30)
+def tick():
+    tick.calls += 1
+
+
+tick.calls = 0
+
+
+class JobQueueTests(TestCase):
+    """Claiming, completing, retrying and purging jobs."""
+
+    def enqueue(self, **payload):
+        return Job.enqueue('jobs.tests.echo', payload=payload)
+
+    def expire(self, *jobs):
+        # Make queued jobs runnable and running jobs reclaimable now
+        past = timezone.now() - timedelta(seconds=1)
+        Job.objects.filter(pk__in=[job.pk for job in jobs]).update(run_at=past, locked_until=past)
+
+    def test_claim_orders_by_priority_then_run_at(self):
+        low = self.enqueue()
+        high = Job.enqueue('jobs.tests.echo', priority=5)
+        Job.enqueue('jobs.tests.echo', run_at=timezone.now() + timedelta(hours=1))
+
+        claimed = Job.claim('w1', batch_size=10)
+
+        self.assertEqual([job.pk for job in claimed], [high.pk, low.pk])
+        self.assertTrue(all(job.status == Job.Status.RUNNING and job.attempts == 1 for job in claimed))
+        self.assertTrue(all(job.locked_by == 'w1' and job.locked_until for job in claimed))
+
+    def test_claim_never_hands_out_a_running_job(self):
+        jobs = [self.enqueue(value=i) for i in range(3)]
+
+        first = Job.claim('w1', batch_size=2)
+        second = Job.claim('w2', batch_size=10)
+
+        self.assertEqual(len(first), 2)
+        self.assertEqual([job.pk for job in second], [jobs[2].pk])
+        self.assertEqual(Job.claim('w3'), [])
+
+    def test_expired_visibility_timeout_is_reclaimed(self):
+        job = self.enqueue()
+        Job.claim('w1')
+        self.expire(job)
+
+        [reclaimed] = Job.claim('w2')
+
+        self.assertEqual((reclaimed.locked_by, reclaimed.attempts), ('w2', 2))
+
+    def test_expired_final_attempt_is_dead_lettered(self):
+        job = Job.enqueue('jobs.tests.echo', max_attempts=1)
+        Job.claim('w1')
+        self.expire(job)
+
+        self.assertEqual(Job.claim('w2'), [])
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.DEAD)
+        self.assertIn('Visibility timeout', job.last_error)
+
+    def test_complete_many_stores_results(self):
+        plain, with_result = self.enqueue(), self.enqueue()
+        claimed = {job.pk: job for job in Job.claim('w1')}
+        claimed[with_result.pk].result = {'ok': True}
+
+        Job.complete_many(list(claimed.values()), 'w1')
+
+        plain.refresh_from_db()
+        with_result.refresh_from_db()
+        self.assertEqual((plain.status, plain.result), (Job.Status.SUCCEEDED, None))
+        self.assertEqual((with_result.status, with_result.result), (Job.Status.SUCCEEDED, {'ok': True}))
+        self.assertIsNotNone(with_result.finished_at)
+        self.assertEqual(with_result.locked_by, '')
+
+    def test_complete_many_skips_jobs_reclaimed_by_another_worker(self):
+        job = self.enqueue()
+        [stale] = Job.claim('w1')
+        self.expire(job)
+        Job.claim('w2')
+
+        Job.complete_many([stale], 'w1')
+
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.locked_by), (Job.Status.RUNNING, 'w2'))
+
+    def test_fail_retries_with_backoff(self):
+        self.enqueue()
+        [job] = Job.claim('w1')
+        before = timezone.now()
+
+        job.fail('boom', 'w1')
+
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.last_error, job.locked_by), (Job.Status.QUEUED, 'boom', ''))
+        # First retry waits 2^1 seconds, jittered by +-50%
+        self.assertGreaterEqual(job.run_at, before + timedelta(seconds=1))
+        self.assertLessEqual(job.run_at, timezone.now() + timedelta(seconds=3))
+        self.assertEqual(Job.claim('w1'), [])
+
+    def test_fail_dead_letters_after_max_attempts(self):
+        job = Job.enqueue('jobs.tests.echo', max_attempts=2)
+        for _ in range(2):
+            self.expire(job)
+            [claimed] = Job.claim('w1')
+            claimed.fail('boom', 'w1')
+
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.Status.DEAD, 2))
+        self.assertIsNotNone(job.finished_at)
+        self.expire(job)
+        self.assertEqual(Job.claim('w1'), [])
+
+    def test_fail_ignores_jobs_no_longer_owned(self):
+        job = self.enqueue()
+        [stale] = Job.claim('w1')
+        self.expire(job)
+        Job.claim('w2')
+
+        stale.fail('late', 'w1')
+
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.last_error), (Job.Status.RUNNING, ''))
+
+    def test_purge_succeeded_deletes_old_successes_only(self):
+        old = timezone.now() - timedelta(days=30)
+        for _ in range(3):
+            Job.objects.create(task='jobs.tests.echo', status=Job.Status.SUCCEEDED, finished_at=old)
+        recent = Job.objects.create(task='jobs.tests.echo', status=Job.Status.SUCCEEDED, finished_at=timezone.now())
+        dead = Job.objects.create(task='jobs.tests.echo', status=Job.Status.DEAD, finished_at=old)
+
+        self.assertEqual(Job.purge_succeeded(timedelta(days=7), batch_size=2), 3)
+
+        self.assertEqual(set(Job.objects.values_list('pk', flat=True)), {recent.pk, dead.pk})
+
+    def test_worker_completes_and_fails_a_batch(self):
+        ok = self.enqueue(value=42)
+        bad = self.enqueue(fail=True)
+
+        with self.assertLogs('jobs.worker', 'ERROR'):
+            self.assertEqual(Worker().run_once(), 2)
+
+        ok.refresh_from_db()
+        bad.refresh_from_db()
+        self.assertEqual((ok.status, ok.result), (Job.Status.SUCCEEDED, 42))
+        self.assertEqual(bad.status, Job.Status.QUEUED)
+        self.assertIn('RuntimeError: boom', bad.last_error)
+
+
+class RunWorkersCommandTests(TransactionTestCase):
+    """SQLite has no SKIP LOCKED, so run_workers falls back to one in-process worker."""
+
+    def test_sqlite_runs_a_single_worker(self):
+        for value in range(3):
+            Job.enqueue('jobs.tests.echo', payload={'value': value})
+        out = StringIO()
+
+        with mock.patch('jobs.management.commands.run_workers.signal'), \
+                mock.patch('jobs.management.commands.run_workers.multiprocessing.get_context') as get_context:
+            call_command('run_workers', workers=4, burst=True, stdout=out)
+
+        get_context.assert_not_called()
+        self.assertIn('running a single worker', out.getvalue())
+        self.assertEqual(
+            sorted(Job.objects.filter(status=Job.Status.SUCCEEDED).values_list('result', flat=True)), [0, 1, 2],
+        )
+
+
+class CronScheduleTests(SimpleTestCase):
+    """Next-fire calculations for cron expressions."""
+
+    def next_after(self, expression, dt):
+        return CronSchedule(expression).next_after(dt)
+
+    def test_steps_and_ranges(self):
+        self.assertEqual(self.next_after('*/15 * * * *', datetime(2024, 1, 1, 10, 7, 30)), datetime(2024, 1, 1, 10, 15))
+        # Strictly after: a time on a slot moves to the next one
+        self.assertEqual(self.next_after('*/15 * * * *', datetime(2024, 1, 1, 10, 15)), datetime(2024, 1, 1, 10, 30))
+        self.assertEqual(self.next_after('0 9-17/4 * * *', datetime(2024, 1, 1, 17, 1)), datetime(2024, 1, 2, 9, 0))
+
+    def test_rolls_over_month_and_year(self):
+        self.assertEqual(self.next_after('@monthly', datetime(2024, 12, 15, 8, 0)), datetime(2025, 1, 1, 0, 0))
+        self.assertEqual(self.next_after('0 0 29 2 *', datetime(2024, 3, 1)), datetime(2028, 2, 29, 0, 0))
+
+    def test_day_fields_match_either_when_both_restricted(self):
+        # 1st of the month or any Monday; 2024-01-02 is a Tuesday
+        self.assertEqual(self.next_after('0 0 1 * 1', datetime(2024, 1, 2, 12, 0)), datetime(2024, 1, 8, 0, 0))
+        # Sunday as 7
+        self.assertEqual(self.next_after('0 0 * * 7', datetime(2024, 1, 2)), datetime(2024, 1, 7, 0, 0))
+
+    def test_invalid_expressions(self):
+        for expression in ('* * * *', '60 * * * *', '*/0 * * * *', 'a * * * *', '0 0 31 2 *'):
+            with self.subTest(expression=expression), self.assertRaises(CronError):
+                CronSchedule(expression).next_after(datetime(2024, 1, 1))
+
+    def test_jitter_delays_within_bound(self):
+        spec = {'schedule': CronSchedule('0 * * * *'), 'jitter': 60}
+        now = timezone.now().replace(minute=10)
+        slot = spec['schedule'].next_after(timezone.localtime(now))
+
+        for _ in range(20):
+            delay = (_next_run(spec, now) - slot).total_seconds()
+            self.assertTrue(0 <= delay <= 60)
+
+
+class PeriodicTaskTests(TestCase):
+    """Lease handling and scheduling of periodic tasks."""
+
+    def setUp(self):
+        tick.calls = 0
+        self.state = PeriodicTask.objects.create(
+            name='jobs.tests.tick', schedule='*/15 * * * *', next_run_at=timezone.now() - timedelta(seconds=1),
+        )
+
+    def test_second_acquirer_loses_while_lease_is_live(self):
+        self.assertIsNotNone(PeriodicTask.acquire('jobs.tests.tick', 'a', lease_seconds=60))
+        self.assertIsNone(PeriodicTask.acquire('jobs.tests.tick', 'b', lease_seconds=60))
+
+    def test_expired_lease_can_be_taken_over(self):
+        PeriodicTask.acquire('jobs.tests.tick', 'a', lease_seconds=60)
+        PeriodicTask.objects.filter(pk=self.state.pk).update(lease_expires_at=timezone.now() - timedelta(seconds=1))
+
+        state = PeriodicTask.acquire('jobs.tests.tick', 'b', lease_seconds=60)
+
+        self.assertEqual(state.lease_owner, 'b')
+
+    def test_not_acquired_before_due(self):
+        PeriodicTask.objects.filter(pk=self.state.pk).update(next_run_at=timezone.now() + timedelta(minutes=5))
+        self.assertIsNone(PeriodicTask.acquire('jobs.tests.tick', 'a', lease_seconds=60))
+
+    def test_release_records_run_and_frees_lease(self):
+        state = PeriodicTask.acquire('jobs.tests.tick', 'a', lease_seconds=60)
+        next_run_at = timezone.now() + timedelta(minutes=15)
+
+        # Only the lease holder can release
+        state.release('b', next_run_at, PeriodicTask.Outcome.SUCCEEDED)
+        self.state.refresh_from_db()
+        self.assertEqual(self.state.lease_owner, 'a')
+
+        state.release('a', next_run_at, PeriodicTask.Outcome.SUCCEEDED, duration=3.0, interval=900.0)
+        self.state.refresh_from_db()
+        self.assertEqual((self.state.lease_owner, self.state.lease_expires_at), ('', None))
+        self.assertEqual((self.state.next_run_at, self.state.run_count), (next_run_at, 1))
+        self.assertAlmostEqual(self.state.load, 3.0 / 900.0)
+
+    def test_skipped_run_does_not_count(self):
+        state = PeriodicTask.acquire('jobs.tests.tick', 'a', lease_seconds=60)
+
+        state.release('a', timezone.now() + timedelta(minutes=15), PeriodicTask.Outcome.SKIPPED)
+
+        self.state.refresh_from_db()
+        self.assertEqual((self.state.run_count, self.state.last_run_at), (0, None))
+
+    def test_fires_once_per_slot_across_schedulers(self):
+        schedulers = [Scheduler(), Scheduler()]
+
+        for scheduler in schedulers * 2:
+            scheduler.run_due()
+
+        self.assertEqual(tick.calls, 1)
+        self.state.refresh_from_db()
+        self.assertEqual((self.state.run_count, self.state.last_outcome), (1, PeriodicTask.Outcome.SUCCEEDED))
+        # Rescheduled to the next quarter hour, plus at most 30s of jitter
+        slot = CronSchedule('*/15 * * * *').next_after(timezone.localtime(self.state.last_run_at))
+        self.assertTrue(slot <= self.state.next_run_at <= slot + timedelta(seconds=30))
+
+    def test_missed_slots_collapse_into_one_run(self):
+        PeriodicTask.objects.filter(pk=self.state.pk).update(next_run_at=timezone.now() - timedelta(hours=3))
+
+        Scheduler().run_due()
+        Scheduler().run_due()
+
+        self.assertEqual(tick.calls, 1)
+
+    def test_missed_slot_is_skipped_without_catch_up(self):
+        PeriodicTask.objects.filter(pk=self.state.pk).update(next_run_at=timezone.now() - timedelta(hours=3))
+        specs = {'jobs.tests.tick': {**registered_periodic_tasks()['jobs.tests.tick'], 'catch_up': False}}
+
+        with mock.patch('jobs.scheduler.registered_periodic_tasks', return_value=specs):
+            Scheduler().run_due()
+
+        self.assertEqual(tick.calls, 0)
+        self.state.refresh_from_db()
+        self.assertEqual(self.state.last_outcome, PeriodicTask.Outcome.SKIPPED)
+        self.assertGreater(self.state.next_run_at, timezone.now())
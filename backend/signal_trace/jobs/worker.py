@@ -0,0 +1,88 @@
+"""
+Job queue worker loop.
+
+A Worker claims jobs in batches, runs the registered task for each and
+records the outcome. Successful jobs in a batch are completed together in
+one transaction; failures are retried or dead-lettered individually.
+"""
+
+import json
+import logging
+import os
+import socket
+import time
+import traceback
+import uuid
+
+from django.db import close_old_connections, connection
+
+from .models import Job
+from .registry import get_task
+
+logger = logging.getLogger(__name__)
+
+
+def make_worker_id():
+    return f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}'
+
+
+class Worker:
+    """Claims and runs jobs until stopped."""
+
+    def __init__(self, queues=('default',), batch_size=10, visibility_timeout=300, poll_interval=1.0):
+        self.queues = tuple(queues)
+        self.batch_size = batch_size
+        self.visibility_timeout = visibility_timeout
+        self.poll_interval = poll_interval
+        self.worker_id = make_worker_id()
+
+    def run_once(self):
+        """
+        Claim and run one batch.
+
+        Returns:
+            int: Number of jobs processed
+        """
+        jobs = Job.claim(
+            self.worker_id,
+            queues=self.queues,
+            batch_size=self.batch_size,
+            visibility_timeout=self.visibility_timeout,
+        )
+
+        succeeded = []
+        for job in jobs:
+            try:
+                job.result = get_task(job.task)(**job.payload)
+                json.dumps(job.result)
+            except Exception:
+                logger.exception('Job %s (%s) failed on attempt %s', job.pk, job.task, job.attempts)
+                job.fail(traceback.format_exc(limit=20), self.worker_id)
+            else:
+                succeeded.append(job)
+
+        if succeeded:
+            Job.complete_many(succeeded, self.worker_id)
+        return len(jobs)
+
+    def run(self, should_stop=lambda: False, burst=False):
+        """
+        Process jobs until should_stop() returns True.
+
+        Args:
+            should_stop: Callable polled between batches
+            burst: Exit as soon as the queue is empty
+        """
+        logger.info('Worker %s started on queues %s', self.worker_id, ', '.join(self.queues))
+        try:
+            while not should_stop():
+                close_old_connections()
+                processed = self.run_once()
+                if processed:
+                    continue
+                if burst:
+                    break
+                time.sleep(self.poll_interval)
+        finally:
+            connection.close()
+            logger.info('Worker %s stopped', self.worker_id)
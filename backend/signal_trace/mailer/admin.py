@@ -0,0 +1,118 @@
+"""
+Django Admin configuration for the email outbox.
+
+Provides visibility into queued, sent and dead-lettered emails, with a
+bulk action to requeue dead ones.
+"""
+
+from django.contrib import admin
+from unfold.admin import ModelAdmin
+from django.utils.html import format_html
+
+from .models import OutboundEmail
+
+
+@admin.register(OutboundEmail)
+class OutboundEmailAdmin(ModelAdmin):
+    """
+    Admin interface for OutboundEmail model.
+
+    Emails are written by the application, so they are read-only here.
+    """
+
+    # Unfold configuration
+    icon_name = "mail"
+
+    list_display = (
+        'id',
+        'kind',
+        'recipients_display',
+        'subject',
+        'status_display',
+        'attempts',
+        'created_at',
+        'sent_at',
+    )
+
+    list_filter = (
+        'status',
+        'kind',
+    )
+
+    search_fields = (
+        'subject',
+    )
+
+    readonly_fields = (
+        'kind',
+        'to',
+        'subject',
+        'body',
+        'status',
+        'attempts',
+        'next_attempt_at',
+        'sent_at',
+        'last_error',
+        'lease_owner',
+        'lease_expires_at',
+        'created_at',
+        'updated_at',
+    )
+
+    ordering = ('-id',)
+
+    fieldsets = (
+        ('Email', {
+            'fields': ('kind', 'to', 'subject', 'body')
+        }),
+        ('Delivery', {
+            'fields': (
+                'status',
+                'attempts',
+                'next_attempt_at',
+                'sent_at',
+                'last_error',
+                'lease_owner',
+                'lease_expires_at',
+            )
+        }),
+        ('Timestamps', {
+            'fields': ('created_at', 'updated_at'),
+            'classes': ('collapse',)
+        }),
+    )
+
+    actions = ['requeue_emails']
+
+    def recipients_display(self, obj):
+        """Display recipients as a comma-separated list."""
+        return ', '.join(obj.to)
+    recipients_display.short_description = "To"
+
+    def status_display(self, obj):
+        """Display status with color coding."""
+        colors = {
+            'pending': 'blue',
+            'sent': 'green',
+            'dead': 'red',
+        }
+        return format_html(
+            '<span style="color: {}; font-weight: bold;">● {}</span>',
+            colors.get(obj.status, 'gray'),
+            obj.get_status_display()
+        )
+    status_display.short_description = "Status"
+    status_display.admin_order_field = 'status'
+
+    @admin.action(description='Requeue selected dead emails')
+    def requeue_emails(self, request, queryset):
+        """Bulk action to send dead emails back to the queue."""
+        count = OutboundEmail.requeue(queryset)
+        self.message_user(
+            request,
+            f'{count} email(s) were requeued. Emails that were not dead were skipped.'
+        )
+
+    def has_add_permission(self, request):
+        """Disable adding emails manually through admin."""
+        return False
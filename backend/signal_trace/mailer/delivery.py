@@ -0,0 +1,137 @@
+"""
+Email delivery.
+
+deliver_pending() claims due emails from the outbox in batches of
+EMAIL_OUTBOX['batch_size'] and sends them one by one over this worker's
+SMTP connection, then marks the whole batch's successes with one UPDATE.
+
+The connection is opened on first use and kept open across batches and
+jobs, so a worker sends all of its email over one SMTP session instead of
+connecting (and negotiating TLS and auth) per message. It is reopened after
+EMAIL_OUTBOX['idle_timeout'] idle seconds, since servers drop idle
+sessions, and after any connection error.
+
+Failures are per email: a 5xx reply dead-letters the email at once,
+anything else is retried with backoff (OutboundEmail.record_failure). A
+connection failure ends the batch; the emails not yet tried are released
+without using up an attempt.
+"""
+
+import logging
+import os
+import smtplib
+import socket
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core import mail
+
+from .models import OutboundEmail
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+
+# SMTP errors that mean the session is gone, as opposed to a rejected message
+CONNECTION_ERRORS = (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError)
+
+
+def worker_id():
+    return f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}'
+
+
+def get_connection():
+    """Return this thread's open email connection, (re)opening it when needed."""
+    connection = getattr(_local, 'connection', None)
+    if connection is not None and time.monotonic() - _local.last_used > settings.EMAIL_OUTBOX['idle_timeout']:
+        close_connection()
+        connection = None
+    if connection is None:
+        connection = mail.get_connection(fail_silently=False)
+        connection.open()
+        _local.connection = connection
+    _local.last_used = time.monotonic()
+    return connection
+
+
+def close_connection():
+    """Close this thread's email connection, ignoring errors from a dead session."""
+    connection = getattr(_local, 'connection', None)
+    _local.connection = None
+    if connection is not None:
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+
+def build_message(email, connection):
+    return mail.EmailMessage(
+        subject=email.subject,
+        body=email.body,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=email.to,
+        headers={'X-Outbox-Id': str(email.pk)},
+        connection=connection,
+    )
+
+
+def is_permanent(exc):
+    """True for SMTP rejections that retrying will not fix."""
+    if isinstance(exc, smtplib.SMTPRecipientsRefused):
+        return all(500 <= code < 600 for code, _ in exc.recipients.values())
+    return isinstance(exc, smtplib.SMTPResponseException) and 500 <= exc.smtp_code < 600
+
+
+def deliver_pending(max_batches=None):
+    """
+    Send due emails from the outbox.
+
+    Args:
+        max_batches: Batches to send before handing back (default: EMAIL_OUTBOX['max_batches'])
+
+    Returns:
+        dict: {'sent', 'failed', 'dead', 'more'}; `more` is True when a full
+        batch was sent without a connection failure and more may be due
+    """
+    config = settings.EMAIL_OUTBOX
+    max_batches = max_batches or config['max_batches']
+    owner = worker_id()
+    result = {'sent': 0, 'failed': 0, 'dead': 0, 'more': False}
+
+    for _ in range(max_batches):
+        emails = OutboundEmail.claim(owner, config['batch_size'], config['lease'])
+        if not emails:
+            return result
+
+        sent = []
+        connection_lost = False
+        for index, email in enumerate(emails):
+            try:
+                connection = get_connection()
+                connection.send_messages([build_message(email, connection)])
+            except OSError as exc:  # includes smtplib.SMTPException
+                error = f'{type(exc).__name__}: {exc}'
+                result['failed'] += 1
+                if isinstance(exc, smtplib.SMTPException) and not isinstance(exc, CONNECTION_ERRORS):
+                    # The server refused this message; carry on with the rest
+                    result['dead'] += email.record_failure(error, permanent=is_permanent(exc))
+                    logger.warning('Email #%s was not accepted: %s', email.pk, exc)
+                    continue
+                close_connection()
+                result['dead'] += email.record_failure(error)
+                OutboundEmail.release(emails[index + 1:])
+                logger.warning('Email delivery stopped, connection failed: %s', exc)
+                connection_lost = True
+                break
+            sent.append(email)
+
+        OutboundEmail.record_sent(sent)
+        result['sent'] += len(sent)
+        if connection_lost or len(emails) < config['batch_size']:
+            return result
+
+    result['more'] = True
+    return result
@@ -0,0 +1,105 @@
+"""
+Local SMTP sink for development and testing.
+
+Accepts mail on a local port and prints each message instead of relaying
+it. Every line is tagged with the SMTP session it arrived on, which shows
+whether workers reuse their connection. Failures can be simulated to
+exercise retries and dead-lettering.
+
+Usage:
+    python manage.py smtp_sink --port 1025
+    python manage.py smtp_sink --port 1025 --fail-rate 0.3
+    python manage.py smtp_sink --port 1025 --fail-first 3 --reject
+
+Then run the workers with EMAIL_HOST=127.0.0.1 EMAIL_PORT=1025.
+"""
+
+import email
+import itertools
+import random
+import socketserver
+import threading
+
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = 'Run a local SMTP server that prints the messages it receives.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--port', type=int, default=1025, help='Port to listen on.')
+        parser.add_argument('--fail-rate', type=float, default=0.0, help='Fraction of messages to refuse.')
+        parser.add_argument('--fail-first', type=int, default=0, help='Refuse the first N messages.')
+        parser.add_argument(
+            '--reject', action='store_true',
+            help='Refuse with a permanent 554 instead of a temporary 451.',
+        )
+
+    def handle(self, *args, **options):
+        command = self
+        lock = threading.Lock()
+        state = {'received': 0}
+        sessions = itertools.count(1)
+        refusal = b'554 Message rejected\r\n' if options['reject'] else b'451 Try again later\r\n'
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                session = next(sessions)
+                messages = 0
+                self.reply(b'220 signal-trace smtp sink\r\n')
+                while True:
+                    line = self.rfile.readline()
+                    if not line:
+                        return
+                    verb = line.strip().split(b' ', 1)[0].upper()
+                    if verb == b'EHLO':
+                        self.reply(b'250-smtp-sink\r\n250 8BITMIME\r\n')
+                    elif verb in (b'HELO', b'MAIL', b'RCPT', b'RSET', b'NOOP'):
+                        self.reply(b'250 OK\r\n')
+                    elif verb == b'DATA':
+                        self.reply(b'354 End data with <CR><LF>.<CR><LF>\r\n')
+                        body = self.read_data()
+                        messages += 1
+                        with lock:
+                            state['received'] += 1
+                            fail = state['received'] <= options['fail_first'] or random.random() < options['fail_rate']
+                        message = email.message_from_bytes(body)
+                        if fail:
+                            command.stdout.write(command.style.WARNING(
+                                f"[session {session}] refused: {message['Subject']}"
+                            ))
+                            self.reply(refusal)
+                        else:
+                            command.stdout.write(
+                                f"[session {session} #{messages}] {message['To']}: {message['Subject']}"
+                            )
+                            self.reply(b'250 Queued\r\n')
+                    elif verb == b'QUIT':
+                        self.reply(b'221 Bye\r\n')
+                        return
+                    else:
+                        self.reply(b'502 Command not implemented\r\n')
+
+            def read_data(self):
+                lines = []
+                while True:
+                    line = self.rfile.readline()
+                    if not line or line in (b'.\r\n', b'.\n'):
+                        return b''.join(lines)
+                    # Undo dot-stuffing
+                    lines.append(line[1:] if line.startswith(b'..') else line)
+
+            def reply(self, data):
+                self.wfile.write(data)
+                self.wfile.flush()
+
+        socketserver.ThreadingTCPServer.allow_reuse_address = True
+        server = socketserver.ThreadingTCPServer(('127.0.0.1', options['port']), Handler)
+        server.daemon_threads = True
+        self.stdout.write(f"Listening on 127.0.0.1:{options['port']} (Ctrl+C to stop)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
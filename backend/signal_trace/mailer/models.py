@@ -0,0 +1,205 @@
+import random
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import Q
+from django.utils import timezone
+from core.models import BaseDateTimeModel
+
+
+class OutboundEmail(BaseDateTimeModel):
+    """
+    Outbox row: one email awaiting delivery.
+
+    Rows are written in the same transaction as the change that caused them
+    (an OTP, a contact message), so an email exists if and only if the
+    change committed, and requests never wait on SMTP. Delivery workers
+    (mailer/delivery.py) claim due rows in batches with a lease, send them
+    over a persistent SMTP connection, and retry failures with backoff until
+    EMAIL_OUTBOX['max_attempts'], after which the email is dead-lettered.
+    """
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        SENT = "sent", "Sent"
+        DEAD = "dead", "Dead"
+
+    kind = models.CharField(max_length=50, help_text="What the email is for, e.g. otp.signup")
+    to = models.JSONField(default=list, help_text="Recipient addresses")
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+
+    # Delivery lease: held by the worker currently sending this email
+    lease_owner = models.CharField(max_length=100, blank=True)
+    lease_expires_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-id"]
+        verbose_name = 'Outbound Email'
+        verbose_name_plural = 'Outbound Emails'
+        indexes = [
+            # Queue scan: due pending emails
+            models.Index(fields=["status", "next_attempt_at"], name="mailer_outbox_queue_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} #{self.pk} -> {', '.join(self.to)}"
+
+    @classmethod
+    def queue(cls, kind, to, subject, body):
+        """
+        Business logic: Write an email to the outbox.
+
+        Call inside the transaction that makes the change. A delivery job is
+        enqueued in the same transaction, so nothing is sent if it rolls back.
+
+        Args:
+            kind: What the email is for (shown in the admin)
+            to: List of recipient addresses
+            subject: Subject line
+            body: Plain text body
+
+        Returns:
+            OutboundEmail or None: Queued email (None if there are no recipients)
+        """
+        from .tasks import deliver_emails
+
+        recipients = [address for address in to if address]
+        if not recipients:
+            return None
+        with transaction.atomic():
+            email = cls.objects.create(kind=kind, to=recipients, subject=subject, body=body)
+            deliver_emails.enqueue()
+        return email
+
+    @classmethod
+    def due(cls):
+        """Pending emails whose next attempt is due and that no worker holds."""
+        now = timezone.now()
+        return cls.objects.filter(
+            Q(lease_expires_at__isnull=True) | Q(lease_expires_at__lt=now),
+            status=cls.Status.PENDING,
+            next_attempt_at__lte=now,
+        )
+
+    @classmethod
+    def claim(cls, owner, limit, lease_seconds):
+        """
+        Business logic: Take the delivery lease for a batch of due emails.
+
+        The claim is one conditional UPDATE, so concurrent workers never
+        send the same email; a worker that dies mid-batch loses its lease
+        after lease_seconds.
+
+        Args:
+            owner: Identifier of the delivering worker
+            limit: Max emails to claim
+            lease_seconds: How long the lease is held
+
+        Returns:
+            list: Claimed OutboundEmails, oldest first
+        """
+        now = timezone.now()
+        ids = list(cls.due().order_by('id').values_list('id', flat=True)[:limit])
+        if not ids:
+            return []
+        cls.due().filter(id__in=ids).update(
+            lease_owner=owner, lease_expires_at=now + timedelta(seconds=lease_seconds),
+        )
+        return list(cls.objects.filter(id__in=ids, lease_owner=owner).order_by('id'))
+
+    @classmethod
+    def record_sent(cls, emails):
+        """Business logic: Mark emails as sent and release them."""
+        cls.objects.filter(pk__in=[email.pk for email in emails]).update(
+            status=cls.Status.SENT,
+            attempts=models.F('attempts') + 1,
+            sent_at=timezone.now(),
+            last_error='',
+            lease_owner='',
+            lease_expires_at=None,
+        )
+
+    def record_failure(self, error, permanent=False):
+        """
+        Business logic: Record a failed attempt.
+
+        The email is retried after an exponential backoff, or dead-lettered
+        once it has used up EMAIL_OUTBOX['max_attempts'].
+
+        Args:
+            error: Error description
+            permanent: The server rejected the email outright (5xx); dead-letter it now
+
+        Returns:
+            bool: True if the email was dead-lettered
+        """
+        config = settings.EMAIL_OUTBOX
+        attempts = self.attempts + 1
+        dead = permanent or attempts >= config['max_attempts']
+        delay = min(config['backoff_base'] * 2 ** (attempts - 1), config['backoff_max'])
+        OutboundEmail.objects.filter(pk=self.pk).update(
+            status=self.Status.DEAD if dead else self.Status.PENDING,
+            attempts=attempts,
+            # Jitter spreads retries of emails that failed together
+            next_attempt_at=timezone.now() + timedelta(seconds=delay * random.uniform(0.8, 1.2)),
+            last_error=error[:2000],
+            lease_owner='',
+            lease_expires_at=None,
+        )
+        return dead
+
+    @classmethod
+    def release(cls, emails):
+        """Business logic: Give back claimed emails without counting an attempt."""
+        cls.objects.filter(pk__in=[email.pk for email in emails]).update(lease_owner='', lease_expires_at=None)
+
+    @classmethod
+    def requeue(cls, emails):
+        """
+        Business logic: Put dead emails back in the queue.
+
+        Args:
+            emails: QuerySet of OutboundEmails
+
+        Returns:
+            int: Number of emails requeued
+        """
+        from .tasks import deliver_emails
+
+        with transaction.atomic():
+            count = emails.filter(status=cls.Status.DEAD).update(
+                status=cls.Status.PENDING, attempts=0, next_attempt_at=timezone.now(),
+            )
+            if count:
+                deliver_emails.enqueue()
+        return count
+
+    @classmethod
+    def prune_sent(cls, older_than, batch_size=1000):
+        """
+        Business logic: Delete sent emails older than a cutoff, in chunks.
+
+        Args:
+            older_than: timedelta; emails sent before now - older_than are deleted
+            batch_size: Emails deleted per statement
+
+        Returns:
+            int: Number of emails deleted
+        """
+        cutoff = timezone.now() - older_than
+        deleted = 0
+        while True:
+            ids = list(
+                cls.objects.filter(status=cls.Status.SENT, sent_at__lt=cutoff)
+                .values_list('id', flat=True)[:batch_size]
+            )
+            if not ids:
+                return deleted
+            cls.objects.filter(id__in=ids).delete()
+            deleted += len(ids)
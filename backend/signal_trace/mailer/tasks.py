@@ -0,0 +1,41 @@
+"""
+Background tasks for email delivery.
+
+A delivery job is enqueued with every outbox write; the sweep picks up
+emails whose retry is due and anything a job missed.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+
+from jobs.registry import periodic, task
+
+from .delivery import deliver_pending
+from .models import OutboundEmail
+
+
+# Failures are retried by the outbox (per-email backoff), not the job queue
+@task(max_attempts=1)
+def deliver_emails():
+    """Drain the outbox, re-enqueueing itself while emails remain."""
+    result = deliver_pending()
+    if result['more']:
+        deliver_emails.enqueue()
+    return result
+
+
+@periodic('* * * * *')
+def sweep_emails():
+    """Enqueue delivery when due emails are waiting."""
+    due = OutboundEmail.due().exists()
+    if due:
+        deliver_emails.enqueue()
+    return {'due': due}
+
+
+@periodic('45 3 * * *', jitter=600)
+def prune_emails():
+    """Delete sent emails past the retention period."""
+    retention = timedelta(days=settings.EMAIL_OUTBOX['retention_days'])
+    return {'deleted': OutboundEmail.prune_sent(retention)}
@@ -0,0 +1,164 @@
+import smtplib
+from datetime import timedelta
+from unittest import mock
+
+from django.conf import settings
+from django.core import mail
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from jobs.models import Job
+
+from . import delivery
+from .delivery import deliver_pending, is_permanent
+from .models import OutboundEmail
+
+
+class FakeConnection:
+    """Email connection that raises the scripted error for each send, then succeeds."""
+
+    def __init__(self, errors=()):
+        self.errors = list(errors)
+        self.sent = []
+
+    def open(self):
+        pass
+
+    def close(self):
+        pass
+
+    def send_messages(self, messages):
+        error = self.errors.pop(0) if self.errors else None
+        if error is not None:
+            raise error
+        self.sent.extend(messages)
+        return len(messages)
+
+
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
+class OutboxTests(TestCase):
+    """Claiming, sending, retrying and dead-lettering outbox emails."""
+
+    def setUp(self):
+        delivery.close_connection()
+        self.addCleanup(delivery.close_connection)
+
+    def queue(self, count=1):
+        return [
+            OutboundEmail.queue('test', [f'user{i}@example.com'], 'Subject', 'Body') for i in range(count)
+        ]
+
+    def deliver_with(self, *errors):
+        connection = FakeConnection(errors)
+        with mock.patch('mailer.delivery.mail.get_connection', return_value=connection), \
+                self.assertLogs('mailer.delivery', 'WARNING'):
+            result = deliver_pending()
+        return result, connection
+
+    def statuses(self):
+        return list(OutboundEmail.objects.order_by('id').values_list('status', 'attempts'))
+
+    def test_sends_over_the_configured_backend(self):
+        self.queue(2)
+
+        result = deliver_pending()
+
+        self.assertEqual((result['sent'], result['failed']), (2, 0))
+        self.assertEqual([message.to for message in mail.outbox], [['user0@example.com'], ['user1@example.com']])
+        self.assertEqual(self.statuses(), [(OutboundEmail.Status.SENT, 1)] * 2)
+
+    def test_claim_never_double_claims(self):
+        self.queue(3)
+
+        first = OutboundEmail.claim('a', limit=2, lease_seconds=60)
+        second = OutboundEmail.claim('b', limit=10, lease_seconds=60)
+
+        self.assertEqual(len(first), 2)
+        self.assertEqual(len(second), 1)
+        self.assertFalse({email.pk for email in first} & {email.pk for email in second})
+        self.assertEqual(OutboundEmail.claim('c', limit=10, lease_seconds=60), [])
+
+    def test_expired_lease_is_claimable(self):
+        self.queue()
+        OutboundEmail.claim('a', limit=10, lease_seconds=60)
+        OutboundEmail.objects.update(lease_expires_at=timezone.now() - timedelta(seconds=1))
+
+        [email] = OutboundEmail.claim('b', limit=10, lease_seconds=60)
+
+        self.assertEqual(email.lease_owner, 'b')
+
+    def test_permanent_rejection_dead_letters_at_once(self):
+        self.queue(2)
+        rejected = smtplib.SMTPRecipientsRefused({'user0@example.com': (550, b'No such user')})
+
+        result, connection = self.deliver_with(rejected)
+
+        self.assertEqual((result['sent'], result['dead']), (1, 1))
+        self.assertEqual(len(connection.sent), 1)
+        self.assertEqual(self.statuses(), [(OutboundEmail.Status.DEAD, 1), (OutboundEmail.Status.SENT, 1)])
+
+    def test_is_permanent(self):
+        self.assertTrue(is_permanent(smtplib.SMTPDataError(554, b'Rejected')))
+        self.assertFalse(is_permanent(smtplib.SMTPDataError(451, b'Try again')))
+        self.assertFalse(is_permanent(smtplib.SMTPRecipientsRefused({
+            'a@example.com': (550, b'No such user'), 'b@example.com': (452, b'Mailbox full'),
+        })))
+        self.assertFalse(is_permanent(smtplib.SMTPServerDisconnected()))
+
+    def test_transient_rejection_is_retried(self):
+        self.queue()
+
+        result, _ = self.deliver_with(smtplib.SMTPDataError(451, b'Try again'))
+
+        self.assertEqual((result['failed'], result['dead']), (1, 0))
+        email = OutboundEmail.objects.get()
+        self.assertEqual((email.status, email.attempts, email.lease_owner), (OutboundEmail.Status.PENDING, 1, ''))
+        self.assertGreater(email.next_attempt_at, timezone.now())
+
+    def test_disconnect_releases_rest_of_batch(self):
+        self.queue(3)
+
+        result, connection = self.deliver_with(None, smtplib.SMTPServerDisconnected('gone'))
+
+        self.assertEqual((result['sent'], result['failed'], result['more']), (1, 1, False))
+        self.assertEqual(self.statuses(), [
+            (OutboundEmail.Status.SENT, 1),
+            (OutboundEmail.Status.PENDING, 1),
+            # Never tried: released without using up an attempt
+            (OutboundEmail.Status.PENDING, 0),
+        ])
+        untried = OutboundEmail.objects.order_by('id').last()
+        self.assertEqual((untried.lease_owner, untried.lease_expires_at), ('', None))
+        self.assertIn(untried, OutboundEmail.due())
+
+    def test_record_failure_backs_off_then_dead_letters(self):
+        [email] = self.queue()
+        config = {**settings.EMAIL_OUTBOX, 'max_attempts': 3, 'backoff_base': 10, 'backoff_max': 30}
+        delays = []
+
+        with override_settings(EMAIL_OUTBOX=config), mock.patch('mailer.models.random.uniform', return_value=1.0):
+            for attempts in range(3):
+                email.attempts = attempts
+                before = timezone.now()
+                dead = email.record_failure('timeout')
+                email.refresh_from_db()
+                delays.append(round((email.next_attempt_at - before).total_seconds()))
+
+        self.assertTrue(dead)
+        self.assertEqual((email.status, email.attempts), (OutboundEmail.Status.DEAD, 3))
+        # base * 2^(n-1), capped at backoff_max
+        self.assertEqual(delays[:2], [10, 20])
+
+    def test_queue_writes_nothing_when_outer_transaction_rolls_back(self):
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            OutboundEmail.queue('test', ['user@example.com'], 'Subject', 'Body')
+            raise RuntimeError('rolled back')
+
+        self.assertFalse(OutboundEmail.objects.exists())
+        self.assertFalse(Job.objects.filter(task='mailer.tasks.deliver_emails').exists())
+
+    def test_queue_enqueues_delivery(self):
+        self.queue()
+        self.assertTrue(Job.objects.filter(task='mailer.tasks.deliver_emails').exists())
+        self.assertIsNone(OutboundEmail.queue('test', ['', None], 'Subject', 'Body'))
@@ -9,17 +9,73 @@ Provides a comprehensive admin interface for managing prospects with:
 - User-friendly interface using Unfold
 """
 
+import json
+
 from django.contrib import admin
 from unfold.admin import ModelAdmin
 from django.utils.html import format_html
 from django.urls import reverse
 from django.utils.safestring import mark_safe
 
-from .models import Prospect, ProspectEnrichment, Signal
+from django.db.models import Count
+
+from core.admin import LargeTableAdminMixin
+from .models import Company, Prospect, ProspectEnrichment, Signal
+
+
+@admin.register(Company)
+class CompanyAdmin(ModelAdmin):
+    """
+    Admin interface for Company model.
+    
+    Companies are derived from prospects, so they are read-only here.
+    """
+    
+    # Unfold configuration
+    icon_name = "business"
+    
+    list_display = (
+        'name',
+        'domain',
+        'key',
+        'prospect_count',
+        'created_at',
+    )
+    
+    search_fields = (
+        'name',
+        'domain',
+        'key',
+    )
+    
+    readonly_fields = (
+        'key',
+        'name',
+        'domain',
+        'created_at',
+        'updated_at',
+    )
+    
+    ordering = ('name',)
+    
+    def prospect_count(self, obj):
+        """Display number of prospects linked to the company."""
+        return obj.prospect_count
+    prospect_count.short_description = "Prospects"
+    prospect_count.admin_order_field = 'prospect_count'
+    
+    def has_add_permission(self, request):
+        """Companies are created from prospects, not manually."""
+        return False
+    
+    def get_queryset(self, request):
+        """Annotate prospect counts."""
+        qs = super().get_queryset(request)
+        return qs.annotate(prospect_count=Count('prospects'))
 
 
 @admin.register(Prospect)
-class ProspectAdmin(ModelAdmin):
+class ProspectAdmin(LargeTableAdminMixin, ModelAdmin):
     """
     Admin interface for Prospect model.
     
@@ -63,6 +119,7 @@ class ProspectAdmin(ModelAdmin):
     )
     
     readonly_fields = (
+        'company',
         'intent_score',
         'last_scored_at',
         'is_enriched',
@@ -85,6 +142,7 @@ class ProspectAdmin(ModelAdmin):
             'fields': (
                 'full_name',
                 'company_name',
+                'company',
                 'title',
                 'email',
                 'industry',
@@ -209,7 +267,7 @@ class ProspectAdmin(ModelAdmin):
     def get_queryset(self, request):
         """Optimize queryset."""
         qs = super().get_queryset(request)
-        return qs.select_related('owner')
+        return qs.select_related('owner', 'company')
     
     def formfield_for_foreignkey(self, db_field, request, **kwargs):
         """Filter owner field to show only active users."""
@@ -219,7 +277,7 @@ class ProspectAdmin(ModelAdmin):
 
 
 @admin.register(ProspectEnrichment)
-class ProspectEnrichmentAdmin(ModelAdmin):
+class ProspectEnrichmentAdmin(LargeTableAdminMixin, ModelAdmin):
     """
     Admin interface for ProspectEnrichment model.
     
@@ -233,12 +291,15 @@ class ProspectEnrichmentAdmin(ModelAdmin):
         'prospect_link',
         'source',
         'confidence_display',
+        'is_latest',
+        'payload_size_display',
         'enriched_at',
         'created_at',
     )
     
     list_filter = (
         'source',
+        'is_latest',
         'enriched_at',
         'created_at',
     )
@@ -252,8 +313,11 @@ class ProspectEnrichmentAdmin(ModelAdmin):
     readonly_fields = (
         'prospect',
         'source',
-        'data',
+        'data_display',
+        'payload',
+        'payload_size_display',
         'confidence',
+        'is_latest',
         'enriched_at',
         'created_at',
         'updated_at',
@@ -269,9 +333,17 @@ class ProspectEnrichmentAdmin(ModelAdmin):
             'fields': (
                 'source',
                 'confidence',
-                'data',
+                'is_latest',
+                'data_display',
             )
         }),
+        ('Storage', {
+            'fields': (
+                'payload',
+                'payload_size_display',
+            ),
+            'classes': ('collapse',)
+        }),
         ('Timestamps', {
             'fields': (
                 'enriched_at',
@@ -307,6 +379,19 @@ class ProspectEnrichmentAdmin(ModelAdmin):
     confidence_display.short_description = "Confidence"
     confidence_display.admin_order_field = 'confidence'
     
+    def data_display(self, obj):
+        """Display the decompressed enrichment data as formatted JSON."""
+        return format_html('<pre>{}</pre>', json.dumps(obj.data, indent=2, sort_keys=True))
+    data_display.short_description = "Data"
+    
+    def payload_size_display(self, obj):
+        """Display raw vs stored payload size."""
+        payload = obj.payload
+        if payload.codec == 'none':
+            return f'{payload.raw_size} B'
+        return f'{payload.raw_size} B → {payload.stored_size} B ({payload.codec})'
+    payload_size_display.short_description = "Payload Size"
+    
     def has_add_permission(self, request):
         """Disable adding enrichments manually through admin."""
         return False
@@ -314,11 +399,11 @@ class ProspectEnrichmentAdmin(ModelAdmin):
     def get_queryset(self, request):
         """Optimize queryset."""
         qs = super().get_queryset(request)
-        return qs.select_related('prospect')
+        return qs.select_related('prospect', 'payload').defer('payload__blob')
 
 
 @admin.register(Signal)
-class SignalAdmin(ModelAdmin):
+class SignalAdmin(LargeTableAdminMixin, ModelAdmin):
     """
     Admin interface for Signal model.
     
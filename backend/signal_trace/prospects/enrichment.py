@@ -0,0 +1,161 @@
+"""
+Company-level enrichment for prospects.
+
+Many owners prospect into the same companies, so enrichment results are
+cached per company rather than per prospect. The cache is shared across
+owners and keyed by the company's normalised domain (falling back to its
+normalised name). A provider is therefore called at most once per company
+per cache TTL, and its result is fanned out to every matching prospect with
+a bulk insert via ProspectEnrichment.fan_out().
+
+Providers are configured in settings.ENRICHMENT_PROVIDERS and cached in the
+'enrichment' cache alias (see settings.CACHES for TTL and size bounds).
+"""
+
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+
+from .models import Prospect, ProspectEnrichment
+from .utils import company_key
+
+
+def get_provider(source):
+    """
+    Resolve the provider callable configured for an enrichment source.
+
+    Raises:
+        KeyError: If no provider is configured for the source
+    """
+    return import_string(settings.ENRICHMENT_PROVIDERS[source])
+
+
+class CompanyEnrichmentCache:
+    """
+    Shared enrichment cache keyed by (source, company key).
+
+    Wraps a Django cache alias so TTL and size-bounded eviction are handled
+    by the configured backend. Hit/miss counters are kept per process.
+    """
+
+    def __init__(self, alias='enrichment'):
+        self.alias = alias
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    @staticmethod
+    def make_key(source, key):
+        return f'company-enrichment:{source}:{key}'
+
+    def get(self, source, key):
+        """Return the cached (data, confidence) tuple, or None on a miss."""
+        value = self.cache.get(self.make_key(source, key))
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, source, key, data, confidence):
+        self.cache.set(self.make_key(source, key), (data, confidence))
+
+    def delete(self, source, key):
+        self.cache.delete(self.make_key(source, key))
+
+    def stats(self):
+        """Return hit/miss counters and the hit rate for this process."""
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / lookups if lookups else 0.0,
+        }
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+
+company_cache = CompanyEnrichmentCache()
+
+
+def enrich_prospects(prospects, source, chunk_size=2000):
+    """
+    Enrich prospects from a source, calling the provider once per company.
+
+    Prospects are grouped by company key; each group is served from the
+    shared cache when possible and written with a single bulk insert.
+
+    Args:
+        prospects: Prospect queryset to enrich
+        source: Enrichment source configured in ENRICHMENT_PROVIDERS
+        chunk_size: Rows fetched per database round trip
+
+    Returns:
+        dict: Counts of companies, provider calls and prospects enriched
+    """
+    provider = get_provider(source)
+
+    groups = defaultdict(list)
+    names = {}
+    rows = prospects.values_list('id', 'company_name', 'website').iterator(chunk_size=chunk_size)
+    for prospect_id, company_name, website in rows:
+        key = company_key(company_name, website)
+        if key is None:
+            continue
+        groups[key].append(prospect_id)
+        names.setdefault(key, (company_name, website))
+
+    provider_calls = 0
+    enriched = 0
+    for key, prospect_ids in groups.items():
+        cached = company_cache.get(source, key)
+        if cached is None:
+            data, confidence = provider(*names[key])
+            company_cache.set(source, key, data, confidence)
+            provider_calls += 1
+        else:
+            data, confidence = cached
+        enriched += ProspectEnrichment.fan_out(prospect_ids, source, data, confidence)
+
+    return {
+        'companies': len(groups),
+        'provider_calls': provider_calls,
+        'prospects_enriched': enriched,
+    }
+
+
+def enrich_company(company, source):
+    """
+    Enrich a company once and fan the result out to all of its prospects.
+
+    Covers every owner's prospects linked to the company.
+
+    Args:
+        company: Company instance
+        source: Enrichment source configured in ENRICHMENT_PROVIDERS
+
+    Returns:
+        int: Number of prospects enriched
+    """
+    cached = company_cache.get(source, company.key)
+    if cached is None:
+        data, confidence = get_provider(source)(company.name, company.domain or None)
+        company_cache.set(source, company.key, data, confidence)
+    else:
+        data, confidence = cached
+
+    prospect_ids = Prospect.objects.filter(company=company).values_list('id', flat=True)
+    return ProspectEnrichment.fan_out(prospect_ids, source, data, confidence)
@@ -0,0 +1,141 @@
+"""
+Priority-driven re-enrichment of stale prospects.
+
+Each (prospect, source) pair has a freshness TTL that depends on the
+prospect's status (settings.ENRICHMENT_FRESHNESS_TTL). A prospect becomes
+stale once its latest enrichment from a source is older than that TTL, and
+its priority grows with both how stale it is and its intent score. Each run
+keeps only the `budget` most valuable stale prospects per source in a
+bounded heap and re-enriches them in batches, so hot prospects stay fresh
+while cold ones are refreshed rarely and provider quota is not wasted.
+
+Prospects without a company key (no website and a name that normalises to
+nothing) cannot be enriched, so they are never selected; otherwise they
+would stay stale and take the top of the budget on every run.
+"""
+
+import heapq
+
+from django.conf import settings
+from django.db.models import Max, Q
+from django.utils import timezone
+
+from .enrichment import enrich_prospects
+from .models import Prospect
+from .utils import company_key
+
+
+# Staleness ratio assigned to prospects never enriched from a source, and the
+# cap applied to everything else so intent still matters for very old rows.
+NEVER_ENRICHED_STALENESS = 10.0
+MAX_STALENESS = 10.0
+
+
+def freshness_ttl(status):
+    """Return the freshness TTL (timedelta) for a prospect status."""
+    ttls = settings.ENRICHMENT_FRESHNESS_TTL
+    return ttls.get(status, ttls[Prospect.ProspectStatus.COLD])
+
+
+def priority(last_enriched_at, status, intent_score, now):
+    """
+    Score how valuable re-enriching a prospect is right now.
+
+    Returns:
+        float or None: None if the prospect is still fresh, otherwise
+        staleness (age / TTL, capped) weighted by intent score
+    """
+    if last_enriched_at is None:
+        staleness = NEVER_ENRICHED_STALENESS
+    else:
+        staleness = (now - last_enriched_at) / freshness_ttl(status)
+        if staleness < 1:
+            return None
+        staleness = min(staleness, MAX_STALENESS)
+
+    # Intent weight ranges from 0.5 (score 0) to 1.5 (score 100)
+    return staleness * (0.5 + intent_score / 100)
+
+
+def stale_candidates(source, now):
+    """
+    Prospects whose latest enrichment from `source` is past its TTL.
+
+    Filtering by TTL happens in SQL so fresh prospects are never loaded.
+
+    Returns:
+        QuerySet: values (id, status, intent_score, last_enriched_at,
+        company_name, website)
+    """
+    is_stale = Q(last_enriched_at__isnull=True)
+    for status in Prospect.ProspectStatus.values:
+        is_stale |= Q(status=status, last_enriched_at__lt=now - freshness_ttl(status))
+
+    return (
+        Prospect.objects
+        .annotate(last_enriched_at=Max('enrichments__enriched_at', filter=Q(enrichments__source=source)))
+        .filter(is_stale)
+        .order_by()
+        .values_list('id', 'status', 'intent_score', 'last_enriched_at', 'company_name', 'website')
+    )
+
+
+def select_stale(source, budget, now=None, chunk_size=2000):
+    """
+    Pick the `budget` highest-priority stale prospects for a source.
+
+    Uses a min-heap bounded at `budget` entries, so memory stays constant
+    regardless of how many prospects are stale. Prospects without a company
+    key are skipped, since enrichment would never refresh them.
+
+    Returns:
+        list: (priority, prospect_id) tuples, highest priority first
+    """
+    now = now or timezone.now()
+    heap = []
+    if budget <= 0:
+        return heap
+
+    rows = stale_candidates(source, now).iterator(chunk_size=chunk_size)
+    for prospect_id, status, intent_score, last_enriched_at, company_name, website in rows:
+        value = priority(last_enriched_at, status, intent_score, now)
+        if value is None or company_key(company_name, website) is None:
+            continue
+        if len(heap) < budget:
+            heapq.heappush(heap, (value, prospect_id))
+        elif value > heap[0][0]:
+            heapq.heapreplace(heap, (value, prospect_id))
+
+    return sorted(heap, reverse=True)
+
+
+def reenrich_stale(source, budget=None, batch_size=100, dry_run=False):
+    """
+    Re-enrich the most valuable stale prospects for a source within budget.
+
+    Args:
+        source: Enrichment source configured in ENRICHMENT_PROVIDERS
+        budget: Max prospects to refresh this run
+            (defaults to settings.ENRICHMENT_BUDGETS[source])
+        batch_size: Prospects per enrichment batch
+        dry_run: Only select, do not call providers
+
+    Returns:
+        dict: Selected prospect count and aggregated enrichment counts
+    """
+    if budget is None:
+        budget = settings.ENRICHMENT_BUDGETS.get(source, 0)
+
+    selected = [prospect_id for _, prospect_id in select_stale(source, budget)]
+    totals = {'selected': len(selected), 'provider_calls': 0, 'prospects_enriched': 0}
+    if dry_run:
+        return totals
+
+    for start in range(0, len(selected), batch_size):
+        batch = selected[start:start + batch_size]
+        result = enrich_prospects(Prospect.objects.filter(pk__in=batch), source)
+        totals['provider_calls'] += result['provider_calls']
+        totals['prospects_enriched'] += result['prospects_enriched']
+
+    return totals
+
@@ -0,0 +1,54 @@
+"""
+Link existing prospects to normalised Company rows.
+
+Walks prospects without a company in primary-key order, one chunk per
+transaction, resolving companies in bulk and writing the foreign keys with
+a single bulk UPDATE per chunk. Safe to re-run: already linked prospects
+are skipped.
+
+Usage:
+    python manage.py backfill_companies --chunk-size 1000
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from prospects.models import Company, Prospect
+from prospects.utils import company_key
+
+
+class Command(BaseCommand):
+    help = 'Populate Prospect.company from company_name/website in chunks.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Prospects per transaction.')
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        last_pk = 0
+        linked = 0
+
+        while True:
+            chunk = list(
+                Prospect.objects.filter(company__isnull=True, pk__gt=last_pk)
+                .order_by('pk')
+                .only('id', 'company_name', 'website')[:chunk_size]
+            )
+            if not chunk:
+                break
+            last_pk = chunk[-1].pk
+
+            with transaction.atomic():
+                companies = Company.resolve_many((p.company_name, p.website) for p in chunk)
+                updated = []
+                for prospect in chunk:
+                    company = companies.get(company_key(prospect.company_name, prospect.website))
+                    if company is not None:
+                        prospect.company = company
+                        updated.append(prospect)
+                Prospect.objects.bulk_update(updated, ['company'])
+
+            linked += len(updated)
+            self.stdout.write(f'Linked {linked} prospect(s) so far (last id {last_pk}).')
+
+        self.stdout.write(self.style.SUCCESS(f'Backfill complete: {linked} prospect(s) linked.'))
@@ -0,0 +1,65 @@
+"""
+Benchmark parallel rescoring against a single-process run.
+
+Runs `rescore` at each worker count, checks that every run leaves
+identical scores, and reports speedup. Scores of prospects with a scored
+signal are reset before each run (outside the timing) so every run writes
+every such row. Like `rescore`, this rewrites intent scores.
+
+Usage:
+    python manage.py benchmark_rescore --workers 1,2,4,8 --shard-by pk
+"""
+
+import hashlib
+import time
+
+from django.core.management.base import BaseCommand
+
+from prospects.models import Prospect
+from prospects.scoring import rescore_all
+
+
+def fingerprint():
+    """Digest of every prospect's (id, intent_score)."""
+    digest = hashlib.sha256()
+    rows = Prospect.objects.order_by('id').values_list('id', 'intent_score')
+    for row in rows.iterator(chunk_size=5000):
+        digest.update(repr(row).encode())
+    return digest.hexdigest()
+
+
+class Command(BaseCommand):
+    help = 'Time rescoring at several worker counts and verify identical results.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', default='1,2,4', help='Comma-separated worker counts (first is the baseline).')
+        parser.add_argument('--shard-by', choices=('owner', 'pk'), default='owner')
+        parser.add_argument('--chunk-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        counts = [int(value) for value in options['workers'].split(',') if value.strip()]
+        total = Prospect.objects.count()
+        self.stdout.write(f"Rescoring {total} prospect(s), sharded by {options['shard_by']}")
+
+        baseline = expected = None
+        for workers in counts:
+            # Sentinel score forces every scored row to be rewritten
+            Prospect.objects.filter(signals__absolute_score__isnull=False).update(intent_score=-1)
+            started = time.perf_counter()
+            result = rescore_all(workers=workers, by=options['shard_by'], chunk_size=options['chunk_size'])
+            elapsed = time.perf_counter() - started
+
+            digest = fingerprint()
+            expected = expected or digest
+            baseline = baseline or elapsed
+            rate = total / elapsed if elapsed else 0
+            self.stdout.write(
+                f"  workers={workers:<3} shards={result['shards']:<3} {elapsed:8.2f}s  "
+                f"{rate:10.0f} rows/s  speedup {baseline / elapsed:5.2f}x  "
+                f"{'identical' if digest == expected else 'MISMATCH'}"
+            )
+            if digest != expected:
+                self.stderr.write(self.style.ERROR(f'Results differ from the {counts[0]}-worker run.'))
+                return
+
+        self.stdout.write(self.style.SUCCESS('All runs produced identical scores.'))
@@ -0,0 +1,43 @@
+"""
+Report how much space content-addressed enrichment storage saves.
+
+Compares the logical size (every enrichment row holding its own copy of
+the canonical JSON) with what is actually stored (one, possibly
+compressed, blob per distinct payload).
+
+Usage:
+    python manage.py enrichment_storage
+"""
+
+from django.core.management.base import BaseCommand
+from django.db.models import Count, Sum
+
+from prospects.models import EnrichmentPayload, ProspectEnrichment
+
+
+class Command(BaseCommand):
+    help = 'Report storage saved by payload deduplication and compression.'
+
+    def handle(self, *args, **options):
+        rows = ProspectEnrichment.objects.aggregate(
+            count=Count('id'),
+            logical_bytes=Sum('payload__raw_size'),
+        )
+        payloads = EnrichmentPayload.objects.aggregate(
+            count=Count('id'),
+            raw_bytes=Sum('raw_size'),
+            stored_bytes=Sum('stored_size'),
+        )
+
+        logical = rows['logical_bytes'] or 0
+        deduplicated = payloads['raw_bytes'] or 0
+        stored = payloads['stored_bytes'] or 0
+        saved = logical - stored
+
+        self.stdout.write(f"Enrichment rows:        {rows['count']}")
+        self.stdout.write(f"Distinct payloads:      {payloads['count']}")
+        self.stdout.write(f"Logical size:           {logical} B")
+        self.stdout.write(f"After deduplication:    {deduplicated} B")
+        self.stdout.write(f"Stored (compressed):    {stored} B")
+        ratio = saved / logical if logical else 0.0
+        self.stdout.write(self.style.SUCCESS(f"Saved:                  {saved} B ({ratio:.1%})"))
@@ -0,0 +1,44 @@
+"""
+Re-enrich the most valuable stale prospects within a per-provider budget.
+
+Usage:
+    python manage.py reenrich                      # every configured source
+    python manage.py reenrich --source crunchbase --budget 500
+    python manage.py reenrich --dry-run
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from prospects.freshness import reenrich_stale
+
+
+class Command(BaseCommand):
+    help = 'Re-enrich stale prospects, highest priority first, within each provider budget.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--source', action='append', help='Source to refresh (repeatable). Defaults to all providers.')
+        parser.add_argument('--budget', type=int, help='Override the per-source budget from ENRICHMENT_BUDGETS.')
+        parser.add_argument('--batch-size', type=int, default=100, help='Prospects per enrichment batch.')
+        parser.add_argument('--dry-run', action='store_true', help='Only report how many prospects would be refreshed.')
+
+    def handle(self, *args, **options):
+        sources = options['source'] or list(settings.ENRICHMENT_PROVIDERS)
+        if not sources:
+            raise CommandError('No enrichment providers configured in ENRICHMENT_PROVIDERS.')
+
+        for source in sources:
+            if source not in settings.ENRICHMENT_PROVIDERS:
+                raise CommandError(f"Unknown enrichment source '{source}'.")
+
+            result = reenrich_stale(
+                source,
+                budget=options['budget'],
+                batch_size=options['batch_size'],
+                dry_run=options['dry_run'],
+            )
+            self.stdout.write(
+                f"{source}: {result['selected']} stale prospect(s) selected, "
+                f"{result['provider_calls']} provider call(s), "
+                f"{result['prospects_enriched']} prospect(s) enriched."
+            )
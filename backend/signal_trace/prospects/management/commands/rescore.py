@@ -0,0 +1,40 @@
+"""
+Recompute intent scores for all prospects.
+
+Usage:
+    python manage.py rescore
+    python manage.py rescore --workers 8 --shard-by pk --chunk-size 1000
+"""
+
+from django.core.management.base import BaseCommand
+
+from prospects.scoring import rescore_all
+
+
+class Command(BaseCommand):
+    help = "Recompute intent scores from each prospect's latest scored signal."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=1, help='Worker processes; each shard gets its own DB connection.')
+        parser.add_argument('--shard-by', choices=('owner', 'pk'), default='owner', help='Partition by owner or by primary-key range.')
+        parser.add_argument('--chunk-size', type=int, default=500, help='Prospects per transaction.')
+
+    def handle(self, *args, **options):
+        last_reported = [-1]
+
+        def on_progress(processed, changed, total):
+            percent = processed * 100 // total if total else 100
+            if percent // 10 > last_reported[0]:
+                last_reported[0] = percent // 10
+                self.stdout.write(f'  {processed}/{total} ({percent}%), {changed} changed')
+
+        result = rescore_all(
+            workers=max(options['workers'], 1),
+            by=options['shard_by'],
+            chunk_size=options['chunk_size'],
+            on_progress=on_progress,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Rescored {result['processed']} prospect(s) across {result['shards']} shard(s); "
+            f"{result['changed']} changed."
+        ))
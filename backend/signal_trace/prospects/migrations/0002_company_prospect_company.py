@@ -0,0 +1,34 @@
+# Generated by Django 5.2 on 2026-10-18 23:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prospects', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Company',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('key', models.CharField(help_text='domain:<host> or name:<normalised name>', max_length=255, unique=True)),
+                ('name', models.CharField(max_length=255)),
+                ('domain', models.CharField(blank=True, db_index=True, max_length=255)),
+            ],
+            options={
+                'verbose_name_plural': 'Companies',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.AddField(
+            model_name='prospect',
+            name='company',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='prospects', to='prospects.company'),
+        ),
+    ]
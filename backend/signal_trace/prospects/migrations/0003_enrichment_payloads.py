@@ -0,0 +1,72 @@
+import hashlib
+import json
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+from core.compression import compress_if_smaller
+
+
+def move_data_to_payloads(apps, schema_editor):
+    """Store existing enrichment data as shared payloads and mark latest rows."""
+    ProspectEnrichment = apps.get_model('prospects', 'ProspectEnrichment')
+    EnrichmentPayload = apps.get_model('prospects', 'EnrichmentPayload')
+
+    payload_ids = {}
+    latest_seen = set()
+    rows = ProspectEnrichment.objects.order_by('prospect_id', 'source', '-enriched_at', '-id')
+    for enrichment in rows.iterator(chunk_size=1000):
+        raw = json.dumps(enrichment.data, sort_keys=True, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+        digest = hashlib.sha256(raw).hexdigest()
+        if digest not in payload_ids:
+            codec, blob = compress_if_smaller(raw, settings.ENRICHMENT_PAYLOAD_COMPRESS_THRESHOLD)
+            payload, _ = EnrichmentPayload.objects.get_or_create(
+                digest=digest,
+                defaults={'codec': codec, 'raw_size': len(raw), 'stored_size': len(blob), 'blob': blob},
+            )
+            payload_ids[digest] = payload.pk
+
+        key = (enrichment.prospect_id, enrichment.source)
+        ProspectEnrichment.objects.filter(pk=enrichment.pk).update(
+            payload_id=payload_ids[digest],
+            is_latest=key not in latest_seen,
+        )
+        latest_seen.add(key)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prospects', '0002_company_prospect_company'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EnrichmentPayload',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('digest', models.CharField(help_text='SHA-256 of the canonical JSON', max_length=64, unique=True)),
+                ('codec', models.CharField(choices=[('none', 'Uncompressed'), ('zlib', 'zlib'), ('zstd', 'zstd')], default='none', max_length=10)),
+                ('raw_size', models.PositiveIntegerField(help_text='Canonical JSON size in bytes')),
+                ('stored_size', models.PositiveIntegerField(help_text='Stored blob size in bytes')),
+                ('blob', models.BinaryField()),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.AddField(
+            model_name='prospectenrichment',
+            name='is_latest',
+            field=models.BooleanField(default=True, help_text='Most recent enrichment for this prospect and source'),
+        ),
+        migrations.AddField(
+            model_name='prospectenrichment',
+            name='payload',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='enrichments', to='prospects.enrichmentpayload'),
+        ),
+        migrations.RunPython(move_data_to_payloads, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    """Schema changes split from 0003 so they run after its data migration has committed."""
+
+    dependencies = [
+        ('prospects', '0003_enrichment_payloads'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='prospectenrichment',
+            name='data',
+        ),
+        migrations.AlterField(
+            model_name='prospectenrichment',
+            name='payload',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='enrichments', to='prospects.enrichmentpayload'),
+        ),
+        migrations.AddConstraint(
+            model_name='prospectenrichment',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_latest', True)), fields=('prospect', 'source'), name='prospects_enrichment_one_latest'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-19 01:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prospects', '0004_enrichment_payloads_finalize'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='company',
+            name='key',
+            field=models.CharField(help_text='domain:<host> or name:<normalised name>', max_length=300, unique=True),
+        ),
+    ]
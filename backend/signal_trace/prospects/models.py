@@ -1,5 +1,117 @@
-from django.db import models
+import hashlib
+import json
+
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import Avg, Count, Max, Q
+from django.utils import timezone
+from core.compression import CODEC_CHOICES, CODEC_NONE, compress_if_smaller, decompress
 from core.models import BaseDateTimeModel
+from webhooks.models import EventType, WebhookEvent, funding_signal_payload, prospect_hot_payload
+
+from .stream import prospect_delta, publish_deltas, signal_delta
+from .utils import company_key, normalize_domain
+
+
+class Company(BaseDateTimeModel):
+    """
+    Normalised company shared by every prospect working there.
+
+    Prospects reference a Company through a canonical key derived from their
+    website domain (or, failing that, their normalised company name), so
+    company-level queries are indexed lookups instead of string GROUP BYs.
+    """
+    # Fits the "name:" prefix plus a full-length (255 character) company name
+    key = models.CharField(max_length=300, unique=True, help_text="domain:<host> or name:<normalised name>")
+    name = models.CharField(max_length=255)
+    domain = models.CharField(max_length=255, blank=True, db_index=True)
+
+    class Meta:
+        ordering = ["name"]
+        verbose_name_plural = "Companies"
+
+    def __str__(self):
+        return self.domain or self.name
+
+    @staticmethod
+    def _field_values(company_name, website):
+        """Display name and domain for a newly created company."""
+        domain = normalize_domain(website) or ''
+        return {
+            'name': company_name.strip() if company_name else domain,
+            'domain': domain,
+        }
+
+    @classmethod
+    def resolve(cls, company_name, website=None):
+        """
+        Business logic: Get or create the company for a name/website pair.
+
+        Args:
+            company_name: Free-text company name
+            website: Company website URL (optional)
+
+        Returns:
+            Company or None: None if no key can be derived
+        """
+        key = company_key(company_name, website)
+        if key is None:
+            return None
+
+        company, _ = cls.objects.get_or_create(key=key, defaults=cls._field_values(company_name, website))
+        return company
+
+    @classmethod
+    def resolve_many(cls, pairs):
+        """
+        Business logic: Resolve many (company_name, website) pairs at once.
+
+        Missing companies are created with a single bulk insert; concurrent
+        creators are tolerated through ignore_conflicts on the unique key.
+
+        Args:
+            pairs: Iterable of (company_name, website) tuples
+
+        Returns:
+            dict: Company key -> Company
+        """
+        wanted = {}
+        for company_name, website in pairs:
+            key = company_key(company_name, website)
+            if key is not None and key not in wanted:
+                wanted[key] = cls(key=key, **cls._field_values(company_name, website))
+
+        existing = {company.key: company for company in cls.objects.filter(key__in=wanted)}
+        missing = [company for key, company in wanted.items() if key not in existing]
+        if missing:
+            cls.objects.bulk_create(missing, ignore_conflicts=True)
+            existing.update(
+                (company.key, company)
+                for company in cls.objects.filter(key__in=[company.key for company in missing])
+            )
+        return existing
+
+    @classmethod
+    def with_intent_for_owner(cls, owner):
+        """
+        Business logic: Companies an owner prospects into, with aggregated intent.
+
+        Aggregates only cover the owner's own prospects.
+
+        Args:
+            owner: User instance
+
+        Returns:
+            QuerySet: Companies annotated with prospect_count, hot_count,
+            avg_intent_score and max_intent_score
+        """
+        owned = Q(prospects__owner=owner)
+        return cls.objects.filter(owned).annotate(
+            prospect_count=Count('prospects', filter=owned),
+            hot_count=Count('prospects', filter=owned & Q(prospects__status='hot')),
+            avg_intent_score=Avg('prospects__intent_score', filter=owned),
+            max_intent_score=Max('prospects__intent_score', filter=owned),
+        ).order_by('-max_intent_score', 'name')
 
 
 class Prospect(BaseDateTimeModel):
@@ -9,6 +121,7 @@ class Prospect(BaseDateTimeModel):
         HOT = "hot", "Hot"
 
     owner = models.ForeignKey('users.User', on_delete=models.CASCADE, related_name="prospects")
+    company = models.ForeignKey(Company, on_delete=models.SET_NULL, null=True, blank=True, related_name="prospects")
 
     # Basic prospect info
     full_name = models.CharField(max_length=255)
@@ -46,6 +159,9 @@ class Prospect(BaseDateTimeModel):
         """
         Business logic: Create a new prospect with validation.
         
+        A prospect created hot records a PROSPECT_HOT webhook event, like a
+        status change to hot does, with previous_status None.
+        
         Args:
             owner: User instance who owns this prospect
             full_name: Prospect's full name
@@ -77,7 +193,14 @@ class Prospect(BaseDateTimeModel):
             status=status,
             source='manual'
         )
-        prospect.save()
+        prospect.company = Company.resolve(prospect.company_name, prospect.website)
+        
+        with transaction.atomic():
+            prospect.save()
+            if prospect.status == cls.ProspectStatus.HOT:
+                WebhookEvent.record(EventType.PROSPECT_HOT, {owner.pk: [prospect_hot_payload(
+                    prospect.pk, prospect.full_name, prospect.company_name, prospect.intent_score, None,
+                )]})
         
         return prospect
     
@@ -112,27 +235,177 @@ class Prospect(BaseDateTimeModel):
             self.website = website.strip() if website else None
         if industry is not None:
             self.industry = industry.strip() if industry else ''
+        previous_status = self.status
         if status is not None:
             self.status = status
+
+        # Keep the company link in sync with the free-text fields
+        if company_name is not None or website is not None:
+            self.company = Company.resolve(self.company_name, self.website)
         
-        self.save()
+        with transaction.atomic():
+            self.save()
+            if self.status != previous_status:
+                publish_deltas(self.owner_id, [prospect_delta(self)])
+            if self.status == self.ProspectStatus.HOT and previous_status != self.ProspectStatus.HOT:
+                WebhookEvent.record(EventType.PROSPECT_HOT, {self.owner_id: [prospect_hot_payload(
+                    self.pk, self.full_name, self.company_name, self.intent_score, previous_status,
+                )]})
         return self
 
+class EnrichmentPayload(BaseDateTimeModel):
+    """
+    Content-addressed, optionally compressed enrichment payload.
+
+    Payloads are keyed by the SHA-256 of their canonical JSON, so identical
+    provider responses (e.g. one company fanned out to many prospects, or a
+    re-enrichment that returned the same data) are stored once and shared.
+    Payloads above ENRICHMENT_PAYLOAD_COMPRESS_THRESHOLD bytes are compressed.
+    """
+    digest = models.CharField(max_length=64, unique=True, help_text="SHA-256 of the canonical JSON")
+    codec = models.CharField(max_length=10, choices=CODEC_CHOICES, default=CODEC_NONE)
+    raw_size = models.PositiveIntegerField(help_text="Canonical JSON size in bytes")
+    stored_size = models.PositiveIntegerField(help_text="Stored blob size in bytes")
+    blob = models.BinaryField()
+
+    def __str__(self):
+        return f"Payload({self.digest[:12]}, {self.codec})"
+
+    @staticmethod
+    def canonical_json(data):
+        """Serialize data deterministically (sorted keys, compact separators)."""
+        return json.dumps(data, sort_keys=True, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+    @classmethod
+    def store(cls, data):
+        """
+        Business logic: Get or create the payload holding `data`.
+
+        Args:
+            data: JSON-serialisable enrichment data
+
+        Returns:
+            EnrichmentPayload: Shared payload instance
+        """
+        raw = cls.canonical_json(data)
+        digest = hashlib.sha256(raw).hexdigest()
+
+        payload = cls.objects.filter(digest=digest).first()
+        if payload is None:
+            codec, blob = compress_if_smaller(raw, settings.ENRICHMENT_PAYLOAD_COMPRESS_THRESHOLD)
+            payload, _ = cls.objects.get_or_create(
+                digest=digest,
+                defaults={'codec': codec, 'raw_size': len(raw), 'stored_size': len(blob), 'blob': blob},
+            )
+        payload._data = data
+        return payload
+
+    def load(self):
+        """Return the decompressed, decoded payload data."""
+        if not hasattr(self, '_data'):
+            self._data = json.loads(decompress(self.blob, self.codec))
+        return self._data
+
+
 class ProspectEnrichment(BaseDateTimeModel):
     prospect = models.ForeignKey(Prospect, on_delete=models.CASCADE, related_name="enrichments")
     source = models.CharField(max_length=100, help_text="e.g. crunchbase, careers_page, news_scraper")
-    data = models.JSONField(default=dict, blank=True)
+    payload = models.ForeignKey(EnrichmentPayload, on_delete=models.PROTECT, related_name="enrichments")
     confidence = models.FloatField(default=0.0)
     enriched_at = models.DateTimeField(auto_now_add=True)
+    is_latest = models.BooleanField(default=True, help_text="Most recent enrichment for this prospect and source")
 
 
     class Meta:
         ordering = ["-enriched_at"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['prospect', 'source'],
+                condition=Q(is_latest=True),
+                name='prospects_enrichment_one_latest',
+            ),
+        ]
 
 
     def __str__(self):
         return f"Enrichment({self.source}) for {self.prospect_id}"
 
+    @property
+    def data(self):
+        """Enrichment data, transparently decompressed from the shared payload."""
+        return self.payload.load()
+
+    @classmethod
+    def fan_out(cls, prospect_ids, source, data, confidence=0.0, batch_size=500):
+        """
+        Business logic: Record one enrichment result against many prospects.
+
+        Used for company-level enrichment, where a single provider response
+        applies to every prospect at the same company. The payload is stored
+        once and shared. Prospects whose latest enrichment from this source
+        already holds identical data and confidence only have enriched_at
+        bumped; the rest get a new latest row via a bulk insert.
+
+        The prospect rows are locked (SELECT ... FOR UPDATE, in id order)
+        before their latest enrichments are read. A concurrent fan-out to
+        the same prospects waits for this one to commit, instead of also
+        inserting a latest row and violating prospects_enrichment_one_latest.
+
+        Args:
+            prospect_ids: IDs of the prospects to enrich
+            source: Enrichment source (e.g. 'crunchbase')
+            data: Enrichment payload
+            confidence: Provider confidence (0-1)
+            batch_size: Prospects per statement
+
+        Returns:
+            int: Number of prospects enriched (new rows plus refreshed rows)
+        """
+        # Sorted, so concurrent fan-outs lock prospects in the same order
+        prospect_ids = sorted(set(prospect_ids))
+        if not prospect_ids:
+            return 0
+
+        payload = EnrichmentPayload.store(data)
+        now = timezone.now()
+        enriched = 0
+
+        with transaction.atomic():
+            for start in range(0, len(prospect_ids), batch_size):
+                # Prospects deleted meanwhile drop out here
+                chunk = list(
+                    Prospect.objects.select_for_update()
+                    .filter(pk__in=prospect_ids[start:start + batch_size])
+                    .order_by('pk')
+                    .values_list('pk', flat=True)
+                )
+                latest = cls.objects.filter(prospect_id__in=chunk, source=source, is_latest=True)
+
+                unchanged = {}
+                changed = []
+                for row_id, prospect_id, payload_id, row_confidence in latest.values_list(
+                    'id', 'prospect_id', 'payload_id', 'confidence'
+                ):
+                    if payload_id == payload.pk and row_confidence == confidence:
+                        unchanged[prospect_id] = row_id
+                    else:
+                        changed.append(row_id)
+
+                if unchanged:
+                    cls.objects.filter(pk__in=unchanged.values()).update(enriched_at=now)
+                if changed:
+                    cls.objects.filter(pk__in=changed).update(is_latest=False)
+
+                cls.objects.bulk_create([
+                    cls(prospect_id=prospect_id, source=source, payload=payload, confidence=confidence, is_latest=True)
+                    for prospect_id in chunk
+                    if prospect_id not in unchanged
+                ])
+                Prospect.objects.filter(pk__in=chunk, is_enriched=False).update(is_enriched=True)
+                enriched += len(chunk)
+
+        return enriched
+
 class Signal(BaseDateTimeModel):
     class SignalType(models.TextChoices):
         ENGAGEMENT = "engagement", "Engagement"
@@ -158,4 +431,19 @@ class Signal(BaseDateTimeModel):
 
 
     def __str__(self):
-        return f"Signal({self.signal_type}) for {self.prospect_id}"
\ No newline at end of file
+        return f"Signal({self.signal_type}) for {self.prospect_id}"
+
+    def save(self, *args, **kwargs):
+        """
+        Save the signal, pushing new signals to the owner's live stream and
+        new funding signals to their webhooks.
+        """
+        created = self._state.adding
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if created:
+                publish_deltas(self.prospect.owner_id, [signal_delta(self)])
+                if self.signal_type == self.SignalType.FUNDING:
+                    WebhookEvent.record(EventType.FUNDING_SIGNAL, {
+                        self.prospect.owner_id: [funding_signal_payload(self)],
+                    })
\ No newline at end of file
@@ -0,0 +1,223 @@
+"""
+Intent scoring.
+
+A prospect's intent score is the absolute score carried by its latest
+signal (Signal.absolute_score, the Intent Engine's score after applying
+that signal). rescore_prospects() brings Prospect.intent_score back in line
+with it, e.g. after signals were imported in bulk. Prospects without a
+scored signal keep their current score, and statuses are left alone.
+
+The score depends only on stored signals, so any partitioning of the work
+(see the `rescore` command) produces exactly the same scores as a single
+pass.
+"""
+
+import heapq
+import multiprocessing
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, wait
+
+import django
+from django.db import connection, transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from .models import Prospect, Signal
+from .stream import publish_deltas
+
+
+UPDATE_SCORE_SQL = f'UPDATE {Prospect._meta.db_table} SET intent_score = %s WHERE id = %s'
+
+
+def latest_scores(prospect_ids):
+    """
+    Return the absolute score of each prospect's latest scored signal.
+
+    Args:
+        prospect_ids: Prospect IDs
+
+    Returns:
+        dict: {prospect_id: absolute_score}, only for prospects with a scored signal
+    """
+    scores = {}
+    # Ascending, so the latest signal (ties broken by id) is written last
+    for prospect_id, absolute_score in (
+        Signal.objects.filter(prospect_id__in=prospect_ids, absolute_score__isnull=False)
+        .order_by('prospect_id', 'created_at', 'id')
+        .values_list('prospect_id', 'absolute_score')
+    ):
+        scores[prospect_id] = absolute_score
+    return scores
+
+
+def rescore_prospects(prospect_ids, chunk_size=500, progress=None):
+    """
+    Recompute intent scores for the given prospects.
+
+    Each chunk is committed in its own transaction. Only rows whose score
+    changed are rewritten; last_scored_at is stamped on every scored
+    prospect in the chunk with a single UPDATE.
+
+    Args:
+        prospect_ids: Prospect IDs to rescore
+        chunk_size: Prospects per transaction
+        progress: Optional callable(processed_in_chunk, changed_in_chunk)
+
+    Returns:
+        dict: {'processed': int, 'changed': int}
+    """
+    prospect_ids = sorted(prospect_ids)
+    processed = changed = 0
+
+    for start in range(0, len(prospect_ids), chunk_size):
+        chunk = prospect_ids[start:start + chunk_size]
+        scores = latest_scores(chunk)
+
+        updates = []
+        deltas = defaultdict(list)
+        for prospect_id, owner_id, current_score, status in (
+            Prospect.objects.filter(pk__in=list(scores)).order_by('id').values_list(
+                'id', 'owner_id', 'intent_score', 'status',
+            )
+        ):
+            score = scores[prospect_id]
+            if score != current_score:
+                updates.append((score, prospect_id))
+                deltas[owner_id].append({'t': 'p', 'id': prospect_id, 's': score, 'st': status})
+
+        with transaction.atomic():
+            if updates:
+                # executemany avoids bulk_update's per-row CASE expressions,
+                # which dominate runtime at this volume
+                with connection.cursor() as cursor:
+                    cursor.executemany(UPDATE_SCORE_SQL, updates)
+            if scores:
+                Prospect.objects.filter(pk__in=list(scores)).update(last_scored_at=timezone.now())
+            for owner_id, owner_deltas in deltas.items():
+                publish_deltas(owner_id, owner_deltas)
+
+        processed += len(chunk)
+        changed += len(updates)
+        if progress is not None:
+            progress(len(chunk), len(updates))
+
+    return {'processed': processed, 'changed': changed}
+
+
+def plan_shards(workers, by='owner'):
+    """
+    Partition all prospects into at most `workers` shards.
+
+    Owner sharding keeps each owner's prospects together and balances shards
+    by assigning owners, largest first, to the least-loaded shard. Primary-key
+    sharding splits the id space into contiguous ranges of equal row count,
+    which balances better when a few owners hold most prospects.
+
+    Args:
+        workers: Number of shards wanted
+        by: 'owner' or 'pk'
+
+    Returns:
+        list: Shard specs, ('owners', [owner_id, ...]) or ('range', low, high)
+    """
+    if by == 'owner':
+        counts = (
+            Prospect.objects.values_list('owner_id')
+            .annotate(n=Count('id'))
+            .order_by('-n', 'owner_id')
+        )
+        heap = [(0, index, []) for index in range(workers)]
+        for owner_id, n in counts:
+            load, index, owners = heapq.heappop(heap)
+            owners.append(owner_id)
+            heapq.heappush(heap, (load + n, index, owners))
+        return [('owners', owners) for _, _, owners in sorted(heap, key=lambda item: item[1]) if owners]
+
+    if by == 'pk':
+        ids = Prospect.objects.order_by('id').values_list('id', flat=True)
+        total = ids.count()
+        bounds = [ids[total * index // workers] for index in range(workers) if total * index // workers < total]
+        bounds = sorted(set(bounds))
+        return [
+            ('range', low, bounds[index + 1] if index + 1 < len(bounds) else None)
+            for index, low in enumerate(bounds)
+        ]
+
+    raise ValueError(f"Unknown shard strategy '{by}'.")
+
+
+def shard_prospect_ids(spec):
+    """Return the prospect IDs in a shard."""
+    prospects = Prospect.objects.all()
+    if spec[0] == 'owners':
+        prospects = prospects.filter(owner_id__in=spec[1])
+    else:
+        _, low, high = spec
+        prospects = prospects.filter(pk__gte=low)
+        if high is not None:
+            prospects = prospects.filter(pk__lt=high)
+    return list(prospects.values_list('id', flat=True))
+
+
+def _rescore_shard(spec, chunk_size, progress_queue):
+    """Worker process entry point: rescore one shard on its own connection."""
+    try:
+        return rescore_prospects(
+            shard_prospect_ids(spec),
+            chunk_size=chunk_size,
+            progress=lambda processed, changed: progress_queue.put((processed, changed)),
+        )
+    finally:
+        connection.close()
+
+
+def rescore_all(workers=1, by='owner', chunk_size=500, on_progress=None):
+    """
+    Rescore every prospect, optionally across worker processes.
+
+    Each shard runs in a ProcessPoolExecutor worker with its own database
+    connection; workers report per-chunk progress to the parent through a
+    queue. Workers are spawned rather than forked: the caller may be running
+    background threads (activity flushing, a jobs worker) whose locks a
+    forked child would inherit mid-operation. Each spawned worker sets
+    Django up from DJANGO_SETTINGS_MODULE before taking work.
+
+    Args:
+        workers: Worker processes (1 runs in-process)
+        by: Shard strategy, 'owner' or 'pk'
+        chunk_size: Prospects per transaction
+        on_progress: Optional callable(processed, changed, total), called in the parent
+
+    Returns:
+        dict: {'processed', 'changed', 'shards'}
+    """
+    total = Prospect.objects.count()
+    totals = {'processed': 0, 'changed': 0}
+
+    def report(processed, changed):
+        totals['processed'] += processed
+        totals['changed'] += changed
+        if on_progress is not None:
+            on_progress(totals['processed'], totals['changed'], total)
+
+    shards = plan_shards(workers, by) if workers > 1 else []
+    if len(shards) <= 1:
+        ids = Prospect.objects.values_list('id', flat=True)
+        rescore_prospects(ids, chunk_size=chunk_size, progress=report)
+        return {**totals, 'shards': 1}
+
+    context = multiprocessing.get_context('spawn')
+    with context.Manager() as manager:
+        progress_queue = manager.Queue()
+        with ProcessPoolExecutor(max_workers=len(shards), mp_context=context, initializer=django.setup) as pool:
+            pending = {pool.submit(_rescore_shard, spec, chunk_size, progress_queue) for spec in shards}
+            while pending:
+                finished, pending = wait(pending, timeout=0.5)
+                for future in finished:
+                    future.result()
+                while not progress_queue.empty():
+                    report(*progress_queue.get())
+        while not progress_queue.empty():
+            report(*progress_queue.get())
+
+    return {**totals, 'shards': len(shards)}
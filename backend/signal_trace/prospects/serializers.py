@@ -15,7 +15,7 @@ All API responses use standardized structure via utils.py (success_response/erro
 """
 
 from rest_framework import serializers
-from .models import Prospect
+from .models import Company, Prospect, ProspectEnrichment
 
 
 class ProspectSerializer(serializers.ModelSerializer):
@@ -31,6 +31,7 @@ class ProspectSerializer(serializers.ModelSerializer):
         fields = (
             'id',
             'full_name',
+            'company',
             'company_name',
             'title',
             'email',
@@ -42,7 +43,7 @@ class ProspectSerializer(serializers.ModelSerializer):
             'created_at',
             'updated_at',
         )
-        read_only_fields = ('id', 'intent_score', 'created_at', 'updated_at')
+        read_only_fields = ('id', 'company', 'intent_score', 'created_at', 'updated_at')
         extra_kwargs = {
             'full_name': {'required': True},
             'company_name': {'required': True},
@@ -115,3 +116,43 @@ class ProspectSerializer(serializers.ModelSerializer):
         )
         return instance
 
+
+class CompanySerializer(serializers.ModelSerializer):
+    """
+    Serializer for company-level views.
+
+    Aggregated intent fields are annotated by Company.with_intent_for_owner()
+    and only cover the requesting user's prospects.
+    """
+    prospect_count = serializers.IntegerField(read_only=True)
+    hot_count = serializers.IntegerField(read_only=True)
+    avg_intent_score = serializers.FloatField(read_only=True)
+    max_intent_score = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = Company
+        fields = (
+            'id',
+            'name',
+            'domain',
+            'prospect_count',
+            'hot_count',
+            'avg_intent_score',
+            'max_intent_score',
+        )
+        read_only_fields = fields
+
+
+class ProspectEnrichmentSerializer(serializers.ModelSerializer):
+    """
+    Serializer for enrichment results.
+
+    `data` is read through ProspectEnrichment.data, which transparently
+    decompresses the shared content-addressed payload.
+    """
+    data = serializers.JSONField(read_only=True)
+
+    class Meta:
+        model = ProspectEnrichment
+        fields = ('id', 'source', 'data', 'confidence', 'enriched_at')
+        read_only_fields = fields
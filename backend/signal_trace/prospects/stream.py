@@ -0,0 +1,300 @@
+"""
+Live prospect deltas for the SSE stream (api/prospects/stream/).
+
+Publishing (sync code, any process):
+    publish_deltas(owner_id, [prospect_delta(p), signal_delta(s), ...])
+
+On Postgres deltas go out with pg_notify, which is transactional: listeners
+only see them once the surrounding transaction commits, and every web
+process receives them no matter which process made the change. On SQLite
+(development) they are dispatched on commit to the in-process hub, so only
+streams served by the same process see them.
+
+Receiving (ASGI web process, see stream_application, mounted in front of
+Django by signal_trace/asgi.py): one StreamHub per process holds a single
+LISTEN connection and fans deltas out to per-user subscriber queues. Queues
+are bounded; a subscriber that falls behind gets its backlog replaced by a
+single 'resync' event telling the client to refetch. Heartbeats are pushed
+by the hub on one timer rather than a timer per connection, so idle streams
+cost only a queue and a suspended generator.
+
+Delta format (compact keys keep the payload small):
+    {"t": "p", "id": 12, "s": 72.5, "st": "hot"}            prospect score/status
+    {"t": "s", "id": 90, "p": 12, "ty": "funding", "sc": 20.0}  new signal
+    {"t": "resync"}                                          refetch everything
+Each SSE event carries a JSON list of deltas.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.http.request import split_domain_port, validate_host
+from rest_framework import exceptions
+
+from users.authentication import StreamingJWTAuthentication
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = 'prospect_deltas'
+
+# pg_notify payloads must stay under 8000 bytes
+MAX_NOTIFY_BYTES = 7000
+
+STREAM_PATH = '/api/prospects/stream/'
+
+HEARTBEAT = object()
+CLOSED = object()
+RESYNC = [{'t': 'resync'}]
+
+
+def prospect_delta(prospect):
+    return {'t': 'p', 'id': prospect.pk, 's': prospect.intent_score, 'st': prospect.status}
+
+
+def signal_delta(signal):
+    return {'t': 's', 'id': signal.pk, 'p': signal.prospect_id, 'ty': signal.signal_type, 'sc': signal.score}
+
+
+def _encode(owner_id, deltas):
+    """Yield notify payloads for an owner's deltas, each under MAX_NOTIFY_BYTES."""
+    batch, size = [], 0
+    for delta in deltas:
+        encoded = json.dumps(delta, separators=(',', ':'))
+        if batch and size + len(encoded) > MAX_NOTIFY_BYTES:
+            yield f'{{"o":{owner_id},"d":[{",".join(batch)}]}}'
+            batch, size = [], 0
+        batch.append(encoded)
+        size += len(encoded) + 1
+    if batch:
+        yield f'{{"o":{owner_id},"d":[{",".join(batch)}]}}'
+
+
+def publish_deltas(owner_id, deltas):
+    """
+    Publish deltas for an owner's stream subscribers.
+
+    Call inside the transaction that makes the change; nothing is delivered
+    if it rolls back.
+
+    Args:
+        owner_id: User ID whose streams receive the deltas
+        deltas: Iterable of delta dicts
+    """
+    deltas = list(deltas)
+    if not deltas:
+        return
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            for payload in _encode(owner_id, deltas):
+                cursor.execute('SELECT pg_notify(%s, %s)', [CHANNEL, payload])
+    else:
+        transaction.on_commit(lambda: StreamHub.dispatch_threadsafe(owner_id, deltas))
+
+
+class StreamHub:
+    """Per-process fan-out of deltas to SSE subscribers."""
+
+    _instance = None
+    _lock = threading.Lock()
+
+    def __init__(self, loop):
+        self.loop = loop
+        self.subscribers = {}
+        self.queue_size = settings.PROSPECT_STREAM['queue_size']
+        self.heartbeat = settings.PROSPECT_STREAM['heartbeat']
+        self._tasks = [loop.create_task(self._heartbeat_loop())]
+        if connection.vendor == 'postgresql':
+            self._tasks.append(loop.create_task(self._listen_loop()))
+
+    @classmethod
+    def get(cls):
+        """Return the hub for the running event loop, starting it on first use."""
+        loop = asyncio.get_running_loop()
+        with cls._lock:
+            if cls._instance is None or cls._instance.loop is not loop:
+                cls._instance = cls(loop)
+            return cls._instance
+
+    @classmethod
+    def dispatch_threadsafe(cls, owner_id, deltas):
+        """Deliver deltas from any thread (no-op if no hub runs in this process)."""
+        hub = cls._instance
+        if hub is not None and not hub.loop.is_closed():
+            hub.loop.call_soon_threadsafe(hub.dispatch, owner_id, deltas)
+
+    def subscribe(self, owner_id):
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self.subscribers.setdefault(owner_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, owner_id, queue):
+        queues = self.subscribers.get(owner_id)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self.subscribers[owner_id]
+
+    @property
+    def connection_count(self):
+        return sum(len(queues) for queues in self.subscribers.values())
+
+    def dispatch(self, owner_id, deltas):
+        for queue in self.subscribers.get(owner_id, ()):
+            self._offer(queue, deltas)
+
+    @staticmethod
+    def _offer(queue, item):
+        """Queue a batch; on overflow replace the backlog with one resync."""
+        try:
+            queue.put_nowait(item)
+            return True
+        except asyncio.QueueFull:
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(RESYNC)
+            return False
+
+    async def _heartbeat_loop(self):
+        while True:
+            await asyncio.sleep(self.heartbeat)
+            for queues in list(self.subscribers.values()):
+                for queue in queues:
+                    if queue.empty():
+                        queue.put_nowait(HEARTBEAT)
+
+    async def _listen_loop(self):
+        """Hold one LISTEN connection, reconnecting with backoff."""
+        import psycopg
+
+        db = settings.DATABASES['default']
+        delay = 1
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(
+                    dbname=db['NAME'], user=db['USER'], password=db['PASSWORD'],
+                    host=db['HOST'], port=db['PORT'], autocommit=True,
+                ) as conn:
+                    await conn.execute(f'LISTEN {CHANNEL}')
+                    delay = 1
+                    async for notify in conn.notifies():
+                        message = json.loads(notify.payload)
+                        self.dispatch(message['o'], message['d'])
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception('Prospect stream listener failed; reconnecting in %ss', delay)
+                # Deltas may have been missed while disconnected
+                for queues in list(self.subscribers.values()):
+                    for queue in queues:
+                        self._offer(queue, RESYNC)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30)
+
+
+def _header_list(headers):
+    return [(name.encode('latin-1'), value.encode('latin-1')) for name, value in headers.items()]
+
+
+def _cors_headers(origin):
+    """CORS response headers for an allowed Origin (mirrors the corsheaders settings)."""
+    if not origin or origin.decode('latin-1') not in settings.CORS_ALLOWED_ORIGINS:
+        return {}
+    headers = {'access-control-allow-origin': origin.decode('latin-1'), 'vary': 'origin'}
+    if settings.CORS_ALLOW_CREDENTIALS:
+        headers['access-control-allow-credentials'] = 'true'
+    return headers
+
+
+async def _send_json(send, status, data, headers):
+    body = json.dumps(data).encode()
+    headers = {**headers, 'content-type': 'application/json', 'content-length': str(len(body))}
+    await send({'type': 'http.response.start', 'status': status, 'headers': _header_list(headers)})
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def stream_application(scope, receive, send):
+    """
+    ASGI app serving STREAM_PATH.
+
+    Runs outside Django's request cycle on purpose: Django's ASGI handler
+    keeps a thread alive per in-flight request, which for thousands of idle
+    streams means thousands of idle threads. Here an open stream costs one
+    queue and two suspended coroutines. Host validation, CORS and JWT
+    authentication mirror the API's behaviour.
+    """
+    headers = {name.decode('latin-1').lower(): value for name, value in scope['headers']}
+    host, _ = split_domain_port(headers.get('host', b'').decode('latin-1'))
+    if not validate_host(host, settings.ALLOWED_HOSTS):
+        await _send_json(send, 400, {'detail': 'Invalid host header.'}, {})
+        return
+
+    cors = _cors_headers(headers.get('origin'))
+    if scope['method'] == 'OPTIONS':
+        cors.update({
+            'access-control-allow-methods': 'GET, OPTIONS',
+            'access-control-allow-headers': 'authorization, cache-control, last-event-id',
+            'access-control-max-age': '86400',
+        })
+        await send({'type': 'http.response.start', 'status': 200, 'headers': _header_list(cors)})
+        await send({'type': 'http.response.body', 'body': b''})
+        return
+    if scope['method'] != 'GET':
+        await _send_json(send, 405, {'detail': f'Method "{scope["method"]}" not allowed.'}, cors)
+        return
+
+    authenticator = StreamingJWTAuthentication()
+    try:
+        auth = await authenticator.aauthenticate_header(headers.get('authorization'))
+        if auth is None:
+            raise exceptions.NotAuthenticated()
+    except exceptions.APIException as exc:
+        data = exc.detail if isinstance(exc.detail, (list, dict)) else {'detail': exc.detail}
+        cors['www-authenticate'] = authenticator.authenticate_header(None)
+        await _send_json(send, exc.status_code, data, cors)
+        return
+
+    owner_id = auth[0].pk
+    hub = StreamHub.get()
+    queue = hub.subscribe(owner_id)
+
+    async def watch_disconnect():
+        while (await receive())['type'] != 'http.disconnect':
+            pass
+        hub.unsubscribe(owner_id, queue)
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(CLOSED)
+
+    watcher = asyncio.ensure_future(watch_disconnect())
+    try:
+        await send({
+            'type': 'http.response.start',
+            'status': 200,
+            'headers': _header_list({
+                **cors,
+                'content-type': 'text/event-stream',
+                'cache-control': 'no-cache',
+                'x-accel-buffering': 'no',
+            }),
+        })
+        await send({
+            'type': 'http.response.body',
+            'body': f"retry: {settings.PROSPECT_STREAM['retry_ms']}\n\n".encode(),
+            'more_body': True,
+        })
+        while True:
+            item = await queue.get()
+            if item is CLOSED:
+                break
+            if item is HEARTBEAT:
+                frame = b': ping\n\n'
+            else:
+                frame = f"data: {json.dumps(item, separators=(',', ':'))}\n\n".encode()
+            await send({'type': 'http.response.body', 'body': frame, 'more_body': True})
+    finally:
+        watcher.cancel()
+        hub.unsubscribe(owner_id, queue)
@@ -0,0 +1,22 @@
+"""
+Background tasks for the prospects app (run by jobs workers).
+"""
+
+from django.conf import settings
+
+from jobs.registry import periodic, task
+
+from .freshness import reenrich_stale
+
+
+@task(queue='enrichment', max_attempts=3)
+def reenrich(source, budget=None):
+    """Re-enrich the most valuable stale prospects for a source."""
+    return reenrich_stale(source, budget=budget)
+
+
+@periodic('@hourly', jitter=300)
+def schedule_reenrichment():
+    """Queue a re-enrichment job per configured source (budgets come from ENRICHMENT_BUDGETS)."""
+    for source in settings.ENRICHMENT_PROVIDERS:
+        reenrich.enqueue(source=source)
@@ -1,3 +1,686 @@
-from django.test import TestCase
+import asyncio
+import json
+from datetime import timedelta
+from io import StringIO
 
-# Create your tests here.
+from unittest import mock
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import transaction
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from users.activity import ActivityBuffer
+from users.models import User
+from users.tokens import RefreshToken
+from webhooks.models import EventType, WebhookEndpoint, WebhookEvent
+
+from . import views
+from .enrichment import company_cache, enrich_company, enrich_prospects
+from .freshness import MAX_STALENESS, NEVER_ENRICHED_STALENESS, priority, reenrich_stale, select_stale
+from .models import Company, Prospect, ProspectEnrichment, Signal
+from .scoring import rescore_all
+from .stream import MAX_NOTIFY_BYTES, RESYNC, STREAM_PATH, StreamHub, _encode, publish_deltas, stream_application
+from .utils import company_key, normalize_domain
+
+
+class RescoreTests(TestCase):
+    """Rescoring copies the latest signal's absolute score and nothing else."""
+
+    def setUp(self):
+        self.owner = User.create_user_with_email('owner@example.com', 'pass-12345', is_active=True)
+
+    def prospect(self, **fields):
+        return Prospect.objects.create(owner=self.owner, full_name='Ada', company_name='Acme', **fields)
+
+    def signal(self, prospect, absolute_score, age_days=0):
+        signal = Signal.objects.create(
+            prospect=prospect, signal_type=Signal.SignalType.NEWS, score=5.0,
+            absolute_score=absolute_score, source='test',
+        )
+        Signal.objects.filter(pk=signal.pk).update(created_at=timezone.now() - timedelta(days=age_days))
+
+    def test_uses_latest_scored_signal(self):
+        prospect = self.prospect()
+        self.signal(prospect, 80.0, age_days=2)
+        self.signal(prospect, 55.0, age_days=1)
+        self.signal(prospect, None)
+
+        result = rescore_all()
+
+        prospect.refresh_from_db()
+        self.assertEqual(prospect.intent_score, 55.0)
+        self.assertIsNotNone(prospect.last_scored_at)
+        self.assertEqual(result['changed'], 1)
+
+    def test_leaves_status_and_unscored_prospects_alone(self):
+        hot = self.prospect(status=Prospect.ProspectStatus.HOT, intent_score=90.0)
+        self.signal(hot, 10.0)
+        manual = self.prospect(status=Prospect.ProspectStatus.WARM, intent_score=42.0)
+
+        rescore_all()
+
+        hot.refresh_from_db()
+        manual.refresh_from_db()
+        self.assertEqual((hot.intent_score, hot.status), (10.0, Prospect.ProspectStatus.HOT))
+        self.assertEqual((manual.intent_score, manual.status), (42.0, Prospect.ProspectStatus.WARM))
+        self.assertIsNone(manual.last_scored_at)
+
+
+class FanOutTests(TestCase):
+    """Company-level enrichment keeps one latest row per prospect and source."""
+
+    def setUp(self):
+        owner = User.create_user_with_email('owner@example.com', 'pass-12345', is_active=True)
+        self.prospects = [
+            Prospect.objects.create(owner=owner, full_name=name, company_name='Acme') for name in ('Ada', 'Grace')
+        ]
+        self.ids = [prospect.pk for prospect in self.prospects]
+
+    def latest(self):
+        return ProspectEnrichment.objects.filter(source='crunchbase', is_latest=True)
+
+    def test_repeated_and_duplicate_ids(self):
+        self.assertEqual(ProspectEnrichment.fan_out(self.ids + self.ids[:1], 'crunchbase', {'size': 10}), 2)
+        self.assertEqual(ProspectEnrichment.fan_out(self.ids, 'crunchbase', {'size': 10}), 2)
+
+        self.assertEqual(self.latest().count(), 2)
+        self.assertEqual(ProspectEnrichment.objects.count(), 2)
+
+    def test_new_data_replaces_latest(self):
+        ProspectEnrichment.fan_out(self.ids, 'crunchbase', {'size': 10})
+        ProspectEnrichment.fan_out(self.ids, 'crunchbase', {'size': 20})
+
+        self.assertEqual([row.data for row in self.latest()], [{'size': 20}] * 2)
+        self.assertEqual(ProspectEnrichment.objects.filter(is_latest=False).count(), 2)
+
+    def test_skips_deleted_prospects(self):
+        self.prospects[1].delete()
+
+        self.assertEqual(ProspectEnrichment.fan_out(self.ids, 'crunchbase', {'size': 10}), 1)
+
+
+class CompanyKeyTests(TestCase):
+    """Canonical company keys and bulk resolution."""
+
+    def test_normalize_domain(self):
+        cases = {
+            'https://www.Acme.com/about': 'acme.com',
+            'acme.com': 'acme.com',
+            'http://app.acme.com:8080': 'app.acme.com',
+            '  WWW.acme.com  ': 'acme.com',
+            '': None,
+            None: None,
+        }
+        for website, expected in cases.items():
+            with self.subTest(website=website):
+                self.assertEqual(normalize_domain(website), expected)
+
+    def test_company_key(self):
+        self.assertEqual(company_key('Acme, Inc.', 'https://www.acme.com'), 'domain:acme.com')
+        self.assertEqual(company_key('Acme, Inc.'), 'name:acme')
+        self.assertEqual(company_key('ACME   Corp'), company_key('acme'))
+        self.assertIsNone(company_key('Inc.', ''))
+
+    def test_long_name_fits_the_key(self):
+        name = 'a' * Prospect._meta.get_field('company_name').max_length
+        key = company_key(name)
+
+        self.assertLessEqual(len(key), Company._meta.get_field('key').max_length)
+        self.assertEqual(Company.resolve(name).key, key)
+
+    def test_resolve_many(self):
+        existing = Company.resolve('Acme', 'acme.com')
+
+        companies = Company.resolve_many([
+            ('Acme Inc', 'https://www.acme.com'),
+            ('Globex', None),
+            ('Globex LLC', ''),
+            ('Inc.', None),
+        ])
+
+        self.assertEqual(set(companies), {'domain:acme.com', 'name:globex'})
+        self.assertEqual(companies['domain:acme.com'].pk, existing.pk)
+        self.assertEqual(companies['name:globex'].name, 'Globex')
+        self.assertEqual(Company.objects.count(), 2)
+        # Resolving again creates nothing
+        self.assertEqual(Company.resolve_many([('Globex', None)])['name:globex'].pk, companies['name:globex'].pk)
+        self.assertEqual(Company.objects.count(), 2)
+
+
+class BackfillCompaniesTests(TestCase):
+    """backfill_companies links unlinked prospects in chunks and can be re-run."""
+
+    def test_links_prospects(self):
+        owner = User.create_user_with_email('owner@example.com', 'pass-12345', is_active=True)
+        rows = [('Acme', 'acme.com'), ('Acme Inc', 'https://www.acme.com'), ('Globex', None), ('Inc.', None)]
+        prospects = [
+            Prospect.objects.create(owner=owner, full_name='Ada', company_name=name, website=website)
+            for name, website in rows
+        ]
+
+        call_command('backfill_companies', chunk_size=2, stdout=StringIO())
+        call_command('backfill_companies', chunk_size=2, stdout=StringIO())
+
+        keys = [
+            Prospect.objects.get(pk=prospect.pk).company and Prospect.objects.get(pk=prospect.pk).company.key
+            for prospect in prospects
+        ]
+        self.assertEqual(keys, ['domain:acme.com', 'domain:acme.com', 'name:globex', None])
+        self.assertEqual(Company.objects.count(), 2)
+
+
+class CompanyViewTests(TestCase):
+    """Company endpoints aggregate only the requesting user's prospects."""
+
+    def setUp(self):
+        self.owner = User.create_user_with_email('owner@example.com', 'pass-12345', is_active=True)
+        self.other = User.create_user_with_email('other@example.com', 'pass-12345', is_active=True)
+        for owner, status, score in (
+            (self.owner, Prospect.ProspectStatus.HOT, 90.0),
+            (self.owner, Prospect.ProspectStatus.COLD, 30.0),
+            (self.other, Prospect.ProspectStatus.HOT, 99.0),
+        ):
+            prospect = Prospect.create_prospect(owner, 'Ada', 'Acme', website='https://acme.com', status=status)
+            Prospect.objects.filter(pk=prospect.pk).update(intent_score=score)
+        Prospect.create_prospect(self.other, 'Grace', 'Globex')
+        self.acme = Company.objects.get(key='domain:acme.com')
+
+    def tearDown(self):
+        # Write buffered timestamps inside the test transaction, not at exit
+        ActivityBuffer.get().flush()
+
+    def get(self, url, user):
+        token = RefreshToken.for_user(user).access_token
+        return self.client.get(url, HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def test_list(self):
+        response = self.get('/api/companies/', self.owner)
+
+        self.assertEqual(response.status_code, 200)
+        [company] = response.json()['data']['companies']
+        self.assertEqual(company['id'], self.acme.pk)
+        self.assertEqual((company['prospect_count'], company['hot_count']), (2, 1))
+        self.assertEqual((company['avg_intent_score'], company['max_intent_score']), (60.0, 90.0))
+
+    def test_detail(self):
+        response = self.get(f'/api/companies/{self.acme.pk}/', self.owner)
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()['data']
+        self.assertEqual(data['company']['prospect_count'], 2)
+        self.assertEqual(len(data['prospects']), 2)
+
+    def test_detail_of_unrelated_company_is_404(self):
+        globex = Company.objects.get(key='name:globex')
+        self.assertEqual(self.get(f'/api/companies/{globex.pk}/', self.owner).status_code, 404)
+
+    def test_requires_authentication(self):
+        self.assertEqual(self.client.get('/api/companies/').status_code, 401)
+
+
+class ProspectHotEventTests(TestCase):
+    """A prospect turning hot, on creation or later, records one webhook event."""
+
+    def setUp(self):
+        self.owner = User.create_user_with_email('owner@example.com', 'pass-12345', is_active=True)
+        self.endpoint = WebhookEndpoint.create_endpoint(self.owner, 'https://93.184.216.34/hooks')
+
+    def hot_events(self):
+        return list(WebhookEvent.objects.filter(event_type=EventType.PROSPECT_HOT).values_list('payload', flat=True))
+
+    def test_created_hot(self):
+        prospect = Prospect.create_prospect(self.owner, 'Ada', 'Acme', status=Prospect.ProspectStatus.HOT)
+
+        [payload] = self.hot_events()
+        self.assertEqual(payload['prospect']['id'], prospect.pk)
+        self.assertEqual((payload['prospect']['status'], payload['previous_status']), ('hot', None))
+
+    def test_created_cold_then_turned_hot(self):
+        prospect = Prospect.create_prospect(self.owner, 'Ada', 'Acme')
+        self.assertEqual(self.hot_events(), [])
+
+        prospect.update_prospect(status=Prospect.ProspectStatus.HOT)
+        prospect.update_prospect(title='CTO')
+
+        [payload] = self.hot_events()
+        self.assertEqual(payload['previous_status'], 'cold')
+
+    def test_created_hot_over_the_api(self):
+        token = RefreshToken.for_user(self.owner).access_token
+        self.addCleanup(lambda: ActivityBuffer.get().flush())
+
+        response = self.client.post(
+            '/api/prospects/', {'full_name': 'Ada', 'company_name': 'Acme', 'status': 'hot'},
+            content_type='application/json', HTTP_AUTHORIZATION=f'Bearer {token}',
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(self.hot_events()), 1)
+
+    def test_unsubscribed_endpoint_gets_nothing(self):
+        self.endpoint.update_endpoint(events=[EventType.FUNDING_SIGNAL.value])
+
+        Prospect.create_prospect(self.owner, 'Ada', 'Acme', status=Prospect.ProspectStatus.HOT)
+
+        self.assertEqual(self.hot_events(), [])
+
+
+class AsyncProspectViewTests(TestCase):
+    """The async prospect views answer exactly like the sync ones."""
+
+    def setUp(self):
+        self.owner = User.create_user_with_email('owner@example.com', 'pass-12345', is_active=True)
+        self.other = User.create_user_with_email('other@example.com', 'pass-12345', is_active=True)
+        self.hot = Prospect.create_prospect(self.owner, 'Ada', 'Acme', status=Prospect.ProspectStatus.HOT)
+        self.cold = Prospect.create_prospect(self.owner, 'Grace', 'Globex')
+        self.foreign = Prospect.create_prospect(self.other, 'Alan', 'Acme')
+
+    def tearDown(self):
+        ActivityBuffer.get().flush()
+
+    def call(self, view, method, url, data=None, user=None, **kwargs):
+        extra = {}
+        if user is not None:
+            extra['HTTP_AUTHORIZATION'] = f'Bearer {RefreshToken.for_user(user).access_token}'
+        request = getattr(RequestFactory(), method)(url, data, content_type='application/json', **extra)
+        if view.view_is_async:
+            response = async_to_sync(view.as_view())(request, **kwargs)
+        else:
+            response = view.as_view()(request, **kwargs)
+            response.render()
+        return response.status_code, json.loads(response.content)
+
+    def assert_same(self, sync_view, async_view, *args, **kwargs):
+        sync_result = self.call(sync_view, *args, **kwargs)
+        async_result = self.call(async_view, *args, **kwargs)
+        self.assertEqual(async_result, sync_result)
+        return sync_result
+
+    def assert_same_list(self, *args, **kwargs):
+        return self.assert_same(views.ProspectListView, views.AsyncProspectListView, *args, **kwargs)
+
+    def assert_same_detail(self, *args, **kwargs):
+        return self.assert_same(views.ProspectDetailView, views.AsyncProspectDetailView, *args, **kwargs)
+
+    def test_list_is_scoped_to_owner(self):
+        status, body = self.assert_same_list('get', '/api/prospects/', user=self.owner)
+
+        self.assertEqual(status, 200)
+        self.assertEqual(
+            {prospect['id'] for prospect in body['data']['prospects']}, {self.hot.pk, self.cold.pk},
+        )
+
+    def test_detail(self):
+        status, body = self.assert_same_detail('get', '/api/prospects/', user=self.owner, pk=self.hot.pk)
+
+        self.assertEqual((status, body['data']['prospect']['status']), (200, 'hot'))
+
+    def test_other_owners_prospect_is_404(self):
+        for method in ('get', 'patch', 'delete'):
+            with self.subTest(method=method):
+                status, _ = self.assert_same_detail(
+                    method, '/api/prospects/', {'title': 'CTO'}, user=self.owner, pk=self.foreign.pk,
+                )
+                self.assertEqual(status, 404)
+        self.assertTrue(Prospect.objects.filter(pk=self.foreign.pk).exists())
+
+    def test_requires_authentication(self):
+        status, _ = self.assert_same_list('get', '/api/prospects/')
+        self.assertEqual(status, 401)
+        status, _ = self.assert_same_detail('get', '/api/prospects/', pk=self.hot.pk)
+        self.assertEqual(status, 401)
+
+    def test_create(self):
+        data = {'full_name': 'Linus', 'company_name': 'Initech', 'email': ' Linus@Initech.com '}
+        results = [
+            self.call(view, 'post', '/api/prospects/', data, user=self.owner)
+            for view in (views.ProspectListView, views.AsyncProspectListView)
+        ]
+
+        for status, body in results:
+            self.assertEqual((status, body['message']), (201, 'Prospect created successfully.'))
+            for field in ('id', 'created_at', 'updated_at'):
+                body['data']['prospect'].pop(field)
+        self.assertEqual(results[0], results[1])
+        self.assertEqual(results[0][1]['data']['prospect']['email'], 'linus@initech.com')
+
+    def test_create_validation_errors(self):
+        status, body = self.assert_same_list('post', '/api/prospects/', {'full_name': ' '}, user=self.owner)
+
+        self.assertEqual(status, 400)
+        self.assertEqual(set(body['errors']), {'full_name', 'company_name'})
+
+    def test_update(self):
+        sync_result = self.call(
+            views.ProspectDetailView, 'patch', '/api/prospects/', {'title': 'CTO'}, user=self.owner, pk=self.hot.pk,
+        )
+        async_result = self.call(
+            views.AsyncProspectDetailView, 'patch', '/api/prospects/', {'title': 'CEO'}, user=self.owner,
+            pk=self.cold.pk,
+        )
+
+        self.assertEqual((sync_result[0], async_result[0]), (200, 200))
+        self.assertEqual(async_result[1]['message'], sync_result[1]['message'])
+        self.assertEqual(Prospect.objects.get(pk=self.cold.pk).title, 'CEO')
+
+    def test_delete(self):
+        status, body = self.call(
+            views.AsyncProspectDetailView, 'delete', '/api/prospects/', user=self.owner, pk=self.cold.pk,
+        )
+
+        self.assertEqual((status, body['message']), (200, 'Prospect deleted successfully.'))
+        self.assertFalse(Prospect.objects.filter(pk=self.cold.pk).exists())
+
+
+def fake_provider(company_name, website):
+    fake_provider.calls.append((company_name, website))
+    return {'name': company_name}, 0.9
+
+
+fake_provider.calls = []
+
+
+@override_settings(ENRICHMENT_PROVIDERS={'test': 'prospects.tests.fake_provider'})
+class EnrichmentTests(TestCase):
+    """One provider call per company, shared across owners and fanned out."""
+
+    def setUp(self):
+        caches['enrichment'].clear()
+        company_cache.reset_stats()
+        fake_provider.calls = []
+        self.owners = [
+            User.create_user_with_email(f'owner{i}@example.com', 'pass-12345', is_active=True) for i in range(3)
+        ]
+
+    def prospect(self, owner, company_name='Acme', website='https://acme.com'):
+        return Prospect.objects.create(owner=owner, full_name='Ada', company_name=company_name, website=website)
+
+    def enriched_ids(self):
+        return set(
+            ProspectEnrichment.objects.filter(source='test', is_latest=True).values_list('prospect_id', flat=True)
+        )
+
+    def test_same_company_across_owners_calls_provider_once(self):
+        prospects = [
+            self.prospect(self.owners[0]),
+            self.prospect(self.owners[1], company_name='ACME Inc.', website='http://www.acme.com/about'),
+            self.prospect(self.owners[2], website='acme.com'),
+        ]
+
+        result = enrich_prospects(Prospect.objects.all(), 'test')
+
+        self.assertEqual(result, {'companies': 1, 'provider_calls': 1, 'prospects_enriched': 3})
+        self.assertEqual(len(fake_provider.calls), 1)
+        self.assertEqual(self.enriched_ids(), {prospect.pk for prospect in prospects})
+
+    def test_cache_hit_fans_out_to_every_prospect(self):
+        self.prospect(self.owners[0])
+        enrich_prospects(Prospect.objects.all(), 'test')
+        later = [self.prospect(owner) for owner in self.owners[1:]]
+
+        result = enrich_prospects(Prospect.objects.filter(pk__in=[prospect.pk for prospect in later]), 'test')
+
+        self.assertEqual(result, {'companies': 1, 'provider_calls': 0, 'prospects_enriched': 2})
+        self.assertEqual(len(fake_provider.calls), 1)
+        self.assertEqual(company_cache.stats()['hits'], 1)
+        self.assertEqual(len(self.enriched_ids()), 3)
+        latest = ProspectEnrichment.objects.filter(source='test', is_latest=True)
+        self.assertEqual([row.data for row in latest], [{'name': 'Acme'}] * 3)
+
+    def test_prospects_without_company_key_are_skipped(self):
+        self.prospect(self.owners[0], company_name='  ', website='')
+
+        result = enrich_prospects(Prospect.objects.all(), 'test')
+
+        self.assertEqual(result, {'companies': 0, 'provider_calls': 0, 'prospects_enriched': 0})
+
+    def test_enrich_company_covers_every_owner(self):
+        prospects = [
+            Prospect.create_prospect(owner, 'Ada', 'Acme', website='https://acme.com') for owner in self.owners
+        ]
+        company = Company.objects.get(key='domain:acme.com')
+
+        self.assertEqual(enrich_company(company, 'test'), 3)
+        self.assertEqual(enrich_company(company, 'test'), 3)
+
+        self.assertEqual(len(fake_provider.calls), 1)
+        self.assertEqual(self.enriched_ids(), {prospect.pk for prospect in prospects})
+
+
+@override_settings(ENRICHMENT_PROVIDERS={'test': 'prospects.tests.fake_provider'})
+class FreshnessTests(TestCase):
+    """Stale prospects are re-enriched in priority order within budget."""
+
+    def setUp(self):
+        caches['enrichment'].clear()
+        fake_provider.calls = []
+        self.owner = User.create_user_with_email('owner@example.com', 'pass-12345', is_active=True)
+        self.now = timezone.now()
+
+    def prospect(self, status=Prospect.ProspectStatus.COLD, intent_score=0.0, enriched_days_ago=None, **fields):
+        fields = {'company_name': 'Acme', **fields}
+        prospect = Prospect.objects.create(
+            owner=self.owner, full_name='Ada', status=status, intent_score=intent_score, **fields,
+        )
+        if enriched_days_ago is not None:
+            ProspectEnrichment.fan_out([prospect.pk], 'test', {'name': 'Acme'})
+            ProspectEnrichment.objects.filter(prospect=prospect).update(
+                enriched_at=self.now - timedelta(days=enriched_days_ago),
+            )
+        return prospect
+
+    def selected(self, budget=10):
+        return [prospect_id for _, prospect_id in select_stale('test', budget, now=self.now)]
+
+    def test_priority(self):
+        ttl = settings.ENRICHMENT_FRESHNESS_TTL['warm']
+        self.assertIsNone(priority(self.now - ttl / 2, 'warm', 100.0, self.now))
+        self.assertEqual(priority(self.now - ttl * 2, 'warm', 0.0, self.now), 2 * 0.5)
+        self.assertEqual(priority(self.now - ttl * 2, 'warm', 100.0, self.now), 2 * 1.5)
+        self.assertEqual(priority(self.now - ttl * 1000, 'warm', 0.0, self.now), MAX_STALENESS * 0.5)
+        self.assertEqual(priority(None, 'warm', 50.0, self.now), NEVER_ENRICHED_STALENESS)
+
+    def test_ttl_depends_on_status(self):
+        # Ten days old: stale for hot (3 day TTL), fresh for warm and cold
+        hot = self.prospect(Prospect.ProspectStatus.HOT, enriched_days_ago=10)
+        self.prospect(Prospect.ProspectStatus.WARM, enriched_days_ago=10)
+        self.prospect(Prospect.ProspectStatus.COLD, enriched_days_ago=10)
+        cold = self.prospect(Prospect.ProspectStatus.COLD, enriched_days_ago=90)
+
+        self.assertEqual(self.selected(), [hot.pk, cold.pk])
+
+    def test_budget_keeps_the_highest_priorities(self):
+        prospects = [self.prospect(intent_score=score, enriched_days_ago=120) for score in (10, 90, 50, 70, 30)]
+
+        selected = select_stale('test', 2, now=self.now, chunk_size=2)
+
+        self.assertEqual([prospect_id for _, prospect_id in selected], [prospects[1].pk, prospects[3].pk])
+        self.assertGreater(selected[0][0], selected[1][0])
+        self.assertEqual(select_stale('test', 0, now=self.now), [])
+
+    def test_keyless_prospects_do_not_starve_the_budget(self):
+        # Never enriched and maximally valuable, but has no company key
+        self.prospect(Prospect.ProspectStatus.HOT, intent_score=100.0, company_name='Inc.')
+        enrichable = self.prospect(intent_score=0.0, enriched_days_ago=120)
+
+        self.assertEqual(self.selected(budget=1), [enrichable.pk])
+
+        result = reenrich_stale('test', budget=1)
+
+        self.assertEqual((result['selected'], result['prospects_enriched']), (1, 1))
+        self.assertEqual(fake_provider.calls, [('Acme', None)])
+        self.now = timezone.now()
+        self.assertEqual(self.selected(budget=1), [])
+
+    def test_dry_run_calls_no_provider(self):
+        self.prospect()
+
+        self.assertEqual(reenrich_stale('test', budget=5, dry_run=True)['selected'], 1)
+        self.assertEqual(fake_provider.calls, [])
+
+
+class FakeStream:
+    """Drives stream_application with in-memory ASGI receive/send."""
+
+    def __init__(self, method='GET', **headers):
+        self.scope = {
+            'type': 'http',
+            'method': method,
+            'path': STREAM_PATH,
+            'headers': [(b'host', b'testserver')] + [
+                (name.encode(), value.encode()) for name, value in headers.items()
+            ],
+        }
+        self.incoming = asyncio.Queue()
+        self.sent = []
+        self.read = 0
+        self.sent_event = asyncio.Event()
+
+    async def receive(self):
+        return await self.incoming.get()
+
+    async def send(self, message):
+        self.sent.append(message)
+        self.sent_event.set()
+
+    async def run(self):
+        await stream_application(self.scope, self.receive, self.send)
+        return self.response()
+
+    def start(self):
+        self.task = asyncio.ensure_future(stream_application(self.scope, self.receive, self.send))
+
+    async def next_body(self):
+        """Wait for the next unread body message and return its bytes."""
+        while len(self.bodies()) == self.read:
+            self.sent_event.clear()
+            await asyncio.wait_for(self.sent_event.wait(), 5)
+        self.read += 1
+        return self.bodies()[self.read - 1]
+
+    async def disconnect(self):
+        await self.incoming.put({'type': 'http.disconnect'})
+        await asyncio.wait_for(self.task, 5)
+
+    def bodies(self):
+        return [message['body'] for message in self.sent if message['type'] == 'http.response.body']
+
+    def response(self):
+        start = self.sent[0]
+        return start['status'], dict(start['headers']), b''.join(self.bodies())
+
+
+async def stop_hub():
+    hub, StreamHub._instance = StreamHub._instance, None
+    if hub is not None:
+        for task in hub._tasks:
+            task.cancel()
+        await asyncio.gather(*hub._tasks, return_exceptions=True)
+
+
+class StreamTests(TransactionTestCase):
+    """The SSE stream authenticates, delivers committed deltas and cleans up."""
+
+    def setUp(self):
+        self.owner = User.create_user_with_email('owner@example.com', 'pass-12345', is_active=True)
+        self.token = str(RefreshToken.for_user(self.owner).access_token)
+
+    def tearDown(self):
+        ActivityBuffer.get().flush()
+
+    def authorized_stream(self):
+        return FakeStream(authorization=f'Bearer {self.token}')
+
+    async def test_requires_token(self):
+        status, headers, body = await FakeStream().run()
+
+        self.assertEqual(status, 401)
+        self.assertIn(b'www-authenticate', headers)
+        self.assertIn('detail', json.loads(body))
+        self.assertIsNone(StreamHub._instance)
+
+    async def test_options_answers_cors_preflight(self):
+        status, headers, body = await FakeStream('OPTIONS', origin='http://localhost:3000').run()
+
+        self.assertEqual((status, body), (200, b''))
+        self.assertEqual(headers[b'access-control-allow-origin'], b'http://localhost:3000')
+        self.assertEqual(headers[b'access-control-allow-methods'], b'GET, OPTIONS')
+        self.assertIn(b'authorization', headers[b'access-control-allow-headers'])
+
+    async def test_options_from_unknown_origin_has_no_cors_headers(self):
+        _, headers, _ = await FakeStream('OPTIONS', origin='https://evil.example').run()
+
+        self.assertNotIn(b'access-control-allow-origin', headers)
+
+    async def test_delivers_deltas_after_commit(self):
+        stream = self.authorized_stream()
+        stream.start()
+        try:
+            self.assertTrue((await stream.next_body()).startswith(b'retry: '))
+            deltas = [{'t': 'p', 'id': 1, 's': 80.0, 'st': 'hot'}]
+
+            def publish():
+                with mock.patch.object(StreamHub, 'dispatch_threadsafe', wraps=StreamHub.dispatch_threadsafe) as dispatch:
+                    with transaction.atomic():
+                        publish_deltas(self.owner.pk, deltas)
+                        self.assertFalse(dispatch.called)
+                    dispatch.assert_called_once_with(self.owner.pk, deltas)
+
+            await sync_to_async(publish)()
+
+            frame = await stream.next_body()
+            self.assertEqual(json.loads(frame.removeprefix(b'data: ')), deltas)
+            await stream.disconnect()
+        finally:
+            await stop_hub()
+
+    async def test_rolled_back_deltas_are_not_delivered(self):
+        def publish():
+            with mock.patch.object(StreamHub, 'dispatch_threadsafe') as dispatch:
+                with self.assertRaises(RuntimeError), transaction.atomic():
+                    publish_deltas(self.owner.pk, [{'t': 'resync'}])
+                    raise RuntimeError('rolled back')
+            self.assertFalse(dispatch.called)
+
+        await sync_to_async(publish)()
+
+    async def test_disconnect_unsubscribes(self):
+        stream = self.authorized_stream()
+        stream.start()
+        try:
+            await stream.next_body()
+            hub = StreamHub._instance
+            self.assertEqual(hub.connection_count, 1)
+
+            await stream.disconnect()
+
+            self.assertEqual(hub.connection_count, 0)
+            self.assertEqual(hub.subscribers, {})
+        finally:
+            await stop_hub()
+
+    async def test_overflow_is_replaced_by_one_resync(self):
+        queue = asyncio.Queue(maxsize=2)
+
+        self.assertTrue(StreamHub._offer(queue, [{'t': 'p', 'id': 1}]))
+        self.assertTrue(StreamHub._offer(queue, [{'t': 'p', 'id': 2}]))
+        self.assertFalse(StreamHub._offer(queue, [{'t': 'p', 'id': 3}]))
+
+        self.assertEqual(queue.qsize(), 1)
+        self.assertEqual(queue.get_nowait(), RESYNC)
+
+    def test_encode_splits_at_max_notify_bytes(self):
+        deltas = [{'t': 's', 'id': i, 'p': 12, 'ty': 'funding', 'sc': 20.0} for i in range(500)]
+
+        payloads = list(_encode(7, deltas))
+
+        self.assertGreater(len(payloads), 1)
+        self.assertTrue(all(len(payload) <= MAX_NOTIFY_BYTES + 20 for payload in payloads))
+        messages = [json.loads(payload) for payload in payloads]
+        self.assertEqual({message['o'] for message in messages}, {7})
+        self.assertEqual([delta for message in messages for delta in message['d']], deltas)
+        self.assertEqual(len(list(_encode(7, deltas[:3]))), 1)
@@ -2,15 +2,31 @@
 URL configuration for prospects app API endpoints.
 
 All views are class-based views following Django REST Framework best practices.
+With PROSPECTS_ASYNC_VIEWS enabled (ASGI deployments), the prospect list and
+detail endpoints are served by their native async counterparts.
+
+The live stream at api/prospects/stream/ is not routed here: it is a plain
+ASGI app (prospects.stream.stream_application) mounted in signal_trace/asgi.py.
 """
 
+from django.conf import settings
 from django.urls import path
 from . import views
 
 app_name = 'prospects'
 
+if settings.PROSPECTS_ASYNC_VIEWS:
+    prospect_list_view = views.AsyncProspectListView
+    prospect_detail_view = views.AsyncProspectDetailView
+else:
+    prospect_list_view = views.ProspectListView
+    prospect_detail_view = views.ProspectDetailView
+
 urlpatterns = [
-    path('api/prospects/', views.ProspectListView.as_view(), name='prospect-list'),
-    path('api/prospects/<int:pk>/', views.ProspectDetailView.as_view(), name='prospect-detail'),
+    path('api/prospects/', prospect_list_view.as_view(), name='prospect-list'),
+    path('api/prospects/<int:pk>/', prospect_detail_view.as_view(), name='prospect-detail'),
+    path('api/prospects/<int:pk>/enrichments/', views.ProspectEnrichmentListView.as_view(), name='prospect-enrichments'),
+    path('api/companies/', views.CompanyListView.as_view(), name='company-list'),
+    path('api/companies/<int:pk>/', views.CompanyDetailView.as_view(), name='company-detail'),
 ]
 
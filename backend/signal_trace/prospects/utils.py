@@ -0,0 +1,75 @@
+"""
+Utility helpers for the prospects app.
+
+Company normalisation lives here so that models, enrichment and management
+commands all derive the same canonical company key.
+"""
+
+import re
+from urllib.parse import urlsplit
+
+
+# Legal-entity suffixes ignored when comparing company names
+_COMPANY_SUFFIX_RE = re.compile(
+    r'\b(inc|incorporated|llc|llp|ltd|limited|corp|corporation|co|company|gmbh|plc|sa|ag|bv)\b\.?'
+)
+_NON_ALNUM_RE = re.compile(r'[^a-z0-9]+')
+
+
+def normalize_domain(website):
+    """
+    Normalise a website URL to a bare registrable host.
+
+    "https://www.Acme.com/about" -> "acme.com"
+
+    Returns:
+        str or None: Lowercased host without "www." and port, or None
+    """
+    if not website:
+        return None
+
+    website = website.strip().lower()
+    if '//' not in website:
+        website = f'//{website}'
+
+    host = urlsplit(website).hostname or ''
+    if host.startswith('www.'):
+        host = host[4:]
+    return host or None
+
+
+def normalize_company_name(company_name):
+    """
+    Normalise a free-text company name for comparison.
+
+    "Acme, Inc." -> "acme"
+
+    Returns:
+        str or None: Lowercased name without punctuation or legal suffixes
+    """
+    if not company_name:
+        return None
+
+    name = _COMPANY_SUFFIX_RE.sub(' ', company_name.lower())
+    name = _NON_ALNUM_RE.sub(' ', name).strip()
+    return ' '.join(name.split()) or None
+
+
+def company_key(company_name, website=None):
+    """
+    Build the canonical key identifying a company.
+
+    The website domain is preferred because it is far less ambiguous than
+    a free-text name.
+
+    Returns:
+        str or None: "domain:<host>" or "name:<normalised name>"
+    """
+    domain = normalize_domain(website)
+    if domain:
+        return f'domain:{domain}'
+
+    name = normalize_company_name(company_name)
+    if name:
+        return f'name:{name}'
+    return None
@@ -13,14 +13,16 @@ This keeps views thin and makes the codebase more maintainable.
 Following Django REST Framework best practices with class-based views.
 """
 
+from asgiref.sync import sync_to_async
 from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from django.shortcuts import get_object_or_404
+from django.shortcuts import aget_object_or_404, get_object_or_404
 
-from .serializers import ProspectSerializer
-from .models import Prospect
+from .serializers import CompanySerializer, ProspectEnrichmentSerializer, ProspectSerializer
+from .models import Company, Prospect
+from core.views import AsyncAPIView
 from users.utils import success_response, error_response
 
 
@@ -140,3 +142,162 @@ class ProspectDetailView(APIView):
         return success_response(
             message='Prospect deleted successfully.'
         )
+
+
+class AsyncProspectListView(AsyncAPIView):
+    """
+    Native async version of ProspectListView for ASGI deployments.
+    
+    Reads use the async ORM end to end; creation delegates to the
+    serializer and model exactly like the sync view, on a worker thread.
+    Routed instead of ProspectListView when PROSPECTS_ASYNC_VIEWS is on.
+    """
+
+    async def get(self, request):
+        """Handle GET request to list all prospects for the authenticated user."""
+        prospects = [prospect async for prospect in Prospect.objects.filter(owner=request.user)]
+        serializer = ProspectSerializer(prospects, many=True)
+        
+        return success_response(
+            data={'prospects': serializer.data},
+            message='Prospects retrieved successfully.'
+        )
+    
+    async def post(self, request):
+        """Handle POST request to create a new prospect."""
+        serializer = ProspectSerializer(data=request.data, context={'request': request})
+        
+        if serializer.is_valid():
+            # Serializer delegates to model's create_prospect() method
+            prospect = await sync_to_async(serializer.save)()
+            
+            prospect_serializer = ProspectSerializer(prospect)
+            return success_response(
+                data={'prospect': prospect_serializer.data},
+                message='Prospect created successfully.',
+                status_code=status.HTTP_201_CREATED
+            )
+        
+        return error_response(
+            message='Failed to create prospect. Please check your information.',
+            errors=serializer.errors,
+            status_code=status.HTTP_400_BAD_REQUEST
+        )
+
+
+class AsyncProspectDetailView(AsyncAPIView):
+    """
+    Native async version of ProspectDetailView for ASGI deployments.
+    
+    Routed instead of ProspectDetailView when PROSPECTS_ASYNC_VIEWS is on.
+    """
+
+    async def get(self, request, pk):
+        """Handle GET request to retrieve a specific prospect."""
+        prospect = await aget_object_or_404(Prospect, pk=pk, owner=request.user)
+        serializer = ProspectSerializer(prospect)
+        
+        return success_response(
+            data={'prospect': serializer.data},
+            message='Prospect retrieved successfully.'
+        )
+    
+    async def put(self, request, pk):
+        """Handle PUT request to update a prospect."""
+        return await self._update(request, pk, partial=False)
+    
+    async def patch(self, request, pk):
+        """Handle PATCH request to partially update a prospect."""
+        return await self._update(request, pk, partial=True)
+    
+    async def delete(self, request, pk):
+        """Handle DELETE request to delete a prospect."""
+        prospect = await aget_object_or_404(Prospect, pk=pk, owner=request.user)
+        await prospect.adelete()
+        
+        return success_response(
+            message='Prospect deleted successfully.'
+        )
+    
+    async def _update(self, request, pk, partial):
+        prospect = await aget_object_or_404(Prospect, pk=pk, owner=request.user)
+        serializer = ProspectSerializer(prospect, data=request.data, partial=partial, context={'request': request})
+        
+        if serializer.is_valid():
+            # Serializer delegates to model's update_prospect() method
+            prospect = await sync_to_async(serializer.save)()
+            
+            prospect_serializer = ProspectSerializer(prospect)
+            return success_response(
+                data={'prospect': prospect_serializer.data},
+                message='Prospect updated successfully.'
+            )
+        
+        return error_response(
+            message='Failed to update prospect. Please check your information.',
+            errors=serializer.errors,
+            status_code=status.HTTP_400_BAD_REQUEST
+        )
+
+
+class ProspectEnrichmentListView(APIView):
+    """
+    List the latest enrichment per source for a specific prospect.
+    
+    Pass ?history=true to include superseded enrichments as well.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        """Handle GET request to list a prospect's enrichments."""
+        prospect = get_object_or_404(Prospect, pk=pk, owner=request.user)
+        enrichments = prospect.enrichments.select_related('payload')
+        if request.query_params.get('history') != 'true':
+            enrichments = enrichments.filter(is_latest=True)
+        serializer = ProspectEnrichmentSerializer(enrichments, many=True)
+        
+        return success_response(
+            data={'enrichments': serializer.data},
+            message='Enrichments retrieved successfully.'
+        )
+
+
+class CompanyListView(APIView):
+    """
+    List companies the authenticated user prospects into, with aggregated intent.
+
+    Class-based view that delegates aggregation to the Company model.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        """Handle GET request to list companies with account-level intent."""
+        companies = Company.with_intent_for_owner(request.user)
+        serializer = CompanySerializer(companies, many=True)
+
+        return success_response(
+            data={'companies': serializer.data},
+            message='Companies retrieved successfully.'
+        )
+
+
+class CompanyDetailView(APIView):
+    """
+    Retrieve a company with aggregated intent and the user's prospects there.
+
+    Class-based view that delegates aggregation to the Company model.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        """Handle GET request to retrieve a company and its prospects."""
+        company = get_object_or_404(Company.with_intent_for_owner(request.user), pk=pk)
+        prospects = company.prospects.filter(owner=request.user)
+
+        return success_response(
+            data={
+                'company': CompanySerializer(company).data,
+                'prospects': ProspectSerializer(prospects, many=True).data,
+            },
+            message='Company retrieved successfully.'
+        )
@@ -13,4 +13,18 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'signal_trace.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from django.conf import settings
+from prospects.stream import STREAM_PATH, stream_application
+
+if settings.JOBS_SCHEDULER_IN_WEB:
+    from jobs.scheduler import start_scheduler
+    start_scheduler()
+
+
+async def application(scope, receive, send):
+    # The SSE stream is served outside Django's request cycle (see prospects/stream.py)
+    if scope['type'] == 'http' and scope['path'] == STREAM_PATH:
+        return await stream_application(scope, receive, send)
+    return await django_application(scope, receive, send)
@@ -62,6 +62,10 @@ INSTALLED_APPS = [
     'core',
     'prospects',
     'support',
+    'jobs',
+    'webhooks',
+    'mailer',
+    'archive',
 ]
 
 MIDDLEWARE = [
@@ -119,6 +123,53 @@ else:
     }
 
 
+# Caches
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Company-level enrichment results shared across all owners.
+    # Entries expire after TIMEOUT seconds and are culled once MAX_ENTRIES is reached.
+    'enrichment': {
+        'BACKEND': os.environ.get('ENRICHMENT_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('ENRICHMENT_CACHE_LOCATION', 'enrichment'),
+        'TIMEOUT': int(os.environ.get('ENRICHMENT_CACHE_TTL', 60 * 60 * 24)),
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.environ.get('ENRICHMENT_CACHE_MAX_ENTRIES', 10000)),
+        },
+    },
+    # Users loaded by JWT authentication (see users/auth_cache.py). Keep the
+    # TIMEOUT short: with a per-process backend it bounds how long another
+    # process may serve a user after a change.
+    'auth': {
+        'BACKEND': os.environ.get('AUTH_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('AUTH_CACHE_LOCATION', 'auth'),
+        'TIMEOUT': int(os.environ.get('AUTH_CACHE_TTL', 60)),
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.environ.get('AUTH_CACHE_MAX_ENTRIES', 10000)),
+        },
+    },
+    # Rate limit counters (see core/throttling.py). Use a shared backend
+    # (Redis, Memcached, or DatabaseCache after `createcachetable`) so limits
+    # apply across workers; DummyCache turns rate limiting off.
+    'ratelimit': {
+        'BACKEND': os.environ.get('RATELIMIT_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('RATELIMIT_CACHE_LOCATION', 'ratelimit'),
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.environ.get('RATELIMIT_CACHE_MAX_ENTRIES', 50000)),
+        },
+    },
+    # One-time passwords when OTP_STORE uses the cache backend. Must be shared
+    # by all processes (Redis/Memcached) outside single-process development.
+    'otp': {
+        'BACKEND': os.environ.get('OTP_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('OTP_CACHE_LOCATION', 'otp'),
+    },
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -170,10 +221,54 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 AUTHENTICATION_BACKENDS = ['users.backends.EmailBackend']
 AUTH_USER_MODEL = 'users.User'
 
+# Enrichment providers, keyed by ProspectEnrichment.source.
+# Each value is a dotted path to a callable taking (company_name, website)
+# and returning a (data, confidence) tuple. See prospects/enrichment.py.
+ENRICHMENT_PROVIDERS = {}
+
+# Outbound HTTP client (see core/http.py). 'default' applies to every
+# provider; 'providers' overrides options per provider name.
+OUTBOUND_HTTP = {
+    'default': {
+        'timeout': float(os.environ.get('OUTBOUND_HTTP_TIMEOUT', 10)),
+        'max_concurrency': int(os.environ.get('OUTBOUND_HTTP_MAX_CONCURRENCY', 10)),
+        'retries': int(os.environ.get('OUTBOUND_HTTP_RETRIES', 3)),
+    },
+    'providers': {
+        # Retries and backoff are handled per endpoint by the webhook outbox,
+        # and a shared circuit breaker would let one customer's failing
+        # endpoint block deliveries to everyone else's
+        'webhooks': {
+            'retries': 0,
+            'failure_threshold': 10 ** 9,
+            'timeout': float(os.environ.get('WEBHOOKS_TIMEOUT', 10)),
+        },
+    },
+}
+
+# Outbound webhooks (see webhooks/delivery.py)
+WEBHOOKS = {
+    # Events per signed POST
+    'batch_size': int(os.environ.get('WEBHOOKS_BATCH_SIZE', 100)),
+    # Batches a delivery job sends before re-enqueueing itself
+    'max_batches': 10,
+    # Attempts per event before it is dead-lettered
+    'max_attempts': int(os.environ.get('WEBHOOKS_MAX_ATTEMPTS', 10)),
+    # Endpoint backoff after consecutive failures: base * 2^(n-1) seconds, capped
+    'backoff_base': 30,
+    'backoff_max': 3600,
+    # Seconds a delivery lease is held if the worker dies; must exceed
+    # max_batches * timeout
+    'lease': 120,
+    # Deliver to loopback and private addresses (local development only;
+    # see webhooks/destinations.py)
+    'allow_private_networks': os.environ.get('WEBHOOKS_ALLOW_PRIVATE_NETWORKS', 'False') == 'True',
+}
+
 # Django REST Framework Configuration
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
@@ -184,16 +279,133 @@ REST_FRAMEWORK = {
     'DEFAULT_PARSER_CLASSES': [
         'rest_framework.parsers.JSONParser',
     ],
+    'EXCEPTION_HANDLER': 'core.exceptions.exception_handler',
+}
+
+# Email
+# Messages are queued in the outbox (mailer.OutboundEmail) and sent by
+# background workers over a persistent SMTP connection (see mailer/delivery.py).
+# For local testing run `python manage.py smtp_sink` and set EMAIL_PORT=1025.
+EMAIL_BACKEND = os.environ.get('EMAIL_BACKEND', 'django.core.mail.backends.smtp.EmailBackend')
+EMAIL_HOST = os.environ.get('EMAIL_HOST', 'localhost')
+EMAIL_PORT = int(os.environ.get('EMAIL_PORT', 25))
+EMAIL_HOST_USER = os.environ.get('EMAIL_HOST_USER', '')
+EMAIL_HOST_PASSWORD = os.environ.get('EMAIL_HOST_PASSWORD', '')
+EMAIL_USE_TLS = os.environ.get('EMAIL_USE_TLS', 'False') == 'True'
+EMAIL_TIMEOUT = int(os.environ.get('EMAIL_TIMEOUT', 10))
+DEFAULT_FROM_EMAIL = os.environ.get('DEFAULT_FROM_EMAIL', 'Signal Trace <no-reply@signaltrace.local>')
+
+EMAIL_OUTBOX = {
+    # Emails claimed and sent per batch
+    'batch_size': int(os.environ.get('EMAIL_OUTBOX_BATCH_SIZE', 50)),
+    # Batches a delivery job sends before re-enqueueing itself
+    'max_batches': 10,
+    # Attempts per email before it is dead-lettered
+    'max_attempts': int(os.environ.get('EMAIL_OUTBOX_MAX_ATTEMPTS', 8)),
+    # Retry backoff: base * 2^(n-1) seconds, capped
+    'backoff_base': 30,
+    'backoff_max': 3600,
+    # Seconds a worker holds claimed emails if it never reports back
+    'lease': 300,
+    # Reopen the SMTP connection after this many idle seconds
+    'idle_timeout': 60,
+    # Days sent emails are kept
+    'retention_days': 14,
+}
+
+# Staff addresses notified of new contact messages (comma-separated)
+CONTACT_NOTIFICATION_EMAILS = [
+    address.strip() for address in os.environ.get('CONTACT_NOTIFICATION_EMAILS', '').split(',') if address.strip()
+]
+
+# Contact form ingestion (see support/ingest.py)
+# Submissions are buffered per process and written in bulk every
+# flush_interval seconds (0 writes synchronously). Identical (email, message)
+# submissions within dedup_window seconds are counted on one message.
+CONTACT_INGEST = {
+    'flush_interval': float(os.environ.get('CONTACT_INGEST_FLUSH_INTERVAL', 1)),
+    # Distinct submissions buffered before requests flush it themselves
+    'max_pending': int(os.environ.get('CONTACT_INGEST_MAX_PENDING', 1000)),
+    'dedup_window': int(os.environ.get('CONTACT_INGEST_DEDUP_WINDOW', 3600)),
+    'batch_size': 500,
+}
+
+# Archival of old rows into compressed NDJSON files (see archive/archiver.py)
+ARCHIVE = {
+    'root': os.environ.get('ARCHIVE_ROOT', os.path.join(BASE_DIR, 'var', 'archive')),
+    # Days after creation before rows are archived, per dataset
+    'policies': {
+        'support.contactmessage': int(os.environ.get('ARCHIVE_CONTACT_MESSAGES_DAYS', 365)),
+        'users.otp': int(os.environ.get('ARCHIVE_OTPS_DAYS', 30)),
+    },
+    # Rows per chunk and transaction
+    'batch_size': 1000,
+    # 'zstd' or 'gzip'; empty picks zstd when the runtime has it
+    'codec': os.environ.get('ARCHIVE_CODEC', ''),
+}
+
+# Rate limits for public endpoints, per view throttle_scope (see
+# core/throttling.py). Each limit counts requests per client IP, per email
+# in the request body, or per (email, IP) pair over a sliding window. Login
+# uses the pair so nobody can lock an account out by exhausting its limit.
+RATE_LIMITS = {
+    'login': {'ip': '60/min', 'email_ip': '20/hour'},
+    'signup': {'ip': '20/hour', 'email': '5/hour'},
+    'otp_resend': {'ip': '20/hour', 'email': '5/hour'},
+    'password_forgot': {'ip': '20/hour', 'email': '5/hour'},
+    'otp_verify': {'ip': '60/hour', 'email': '10/hour'},
+    'contact': {'ip': '10/hour', 'email': '5/hour'},
+}
+
+# Admin changelists over large tables (see core/admin.py, core/pagination.py)
+ADMIN_LARGE_TABLES = {
+    # Counts at or above this are PostgreSQL planner estimates, not COUNT(*)
+    'estimate_threshold': int(os.environ.get('ADMIN_ESTIMATE_THRESHOLD', 100000)),
+    # Changelists with at least this many rows get no date_hierarchy
+    'date_hierarchy_max_rows': int(os.environ.get('ADMIN_DATE_HIERARCHY_MAX_ROWS', 100000)),
+}
+
+# Serve the prospect list/detail endpoints with native async views
+# (prospects.views.AsyncProspect*). Enable when running under an ASGI server.
+PROSPECTS_ASYNC_VIEWS = os.environ.get('PROSPECTS_ASYNC_VIEWS', 'False') == 'True'
+
+# Serve signup, signup verification, login and password change with native
+# async views (users.views.Async*) that hash passwords in a bounded pool.
+AUTH_ASYNC_VIEWS = os.environ.get('AUTH_ASYNC_VIEWS', 'False') == 'True'
+
+# Password hashing pool for the async auth views (see users/hashing.py).
+# At most workers + max_queue hashing calls are admitted per process; the
+# rest are refused with 503 and Retry-After instead of piling up.
+PASSWORD_HASHING = {
+    'workers': int(os.environ.get('PASSWORD_HASHING_WORKERS', max(1, (os.cpu_count() or 2) // 2))),
+    'max_queue': int(os.environ.get('PASSWORD_HASHING_MAX_QUEUE', 16)),
+    # Seconds sent in Retry-After when the pool is full
+    'retry_after': 2,
+}
+
+# Live prospect deltas (api/prospects/stream/, see prospects/stream.py)
+PROSPECT_STREAM = {
+    # Seconds between keep-alive comments on idle streams
+    'heartbeat': int(os.environ.get('PROSPECT_STREAM_HEARTBEAT', 15)),
+    # Max undelivered batches per connection before it is told to resync
+    'queue_size': int(os.environ.get('PROSPECT_STREAM_QUEUE_SIZE', 64)),
+    # Client reconnect delay sent in the SSE retry field
+    'retry_ms': 3000,
 }
 
 # Simple JWT Configuration
 from datetime import timedelta
 
+# Tokens are revoked per user by bumping User.token_generation (logout,
+# password change). Turn this on to also record every issued refresh token
+# and blacklist rotated ones (prune those tables with `prune_tokens`).
+JWT_USE_BLACKLIST = os.environ.get('JWT_USE_BLACKLIST', 'False') == 'True'
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(hours=1),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
     'ROTATE_REFRESH_TOKENS': True,
-    'BLACKLIST_AFTER_ROTATION': True,
+    'BLACKLIST_AFTER_ROTATION': JWT_USE_BLACKLIST,
     'UPDATE_LAST_LOGIN': True,
     'ALGORITHM': 'HS256',
     'SIGNING_KEY': SECRET_KEY,
@@ -205,6 +417,53 @@ SIMPLE_JWT = {
     'TOKEN_TYPE_CLAIM': 'token_type',
 }
 
+# Authenticate API requests from the token's signed claims alone, without
+# loading the user. Deactivation then only takes effect when the user's
+# access tokens expire (logout and password changes still revoke them).
+JWT_STATELESS_AUTH = os.environ.get('JWT_STATELESS_AUTH', 'False') == 'True'
+
+# One-time passwords (see users/otp_store.py)
+# 'backend' is DatabaseOTPStore (rows in users_otp, purged by `purge_otps`)
+# or CacheOTPStore (entries in the 'cache' alias, expiring on their own).
+OTP_STORE = {
+    'backend': os.environ.get('OTP_STORE_BACKEND', 'users.otp_store.DatabaseOTPStore'),
+    'cache': 'otp',
+    # Seconds a code stays valid
+    'ttl': int(os.environ.get('OTP_TTL', 600)),
+}
+
+# User activity tracking (see users/activity.py)
+# last_login and last_active_at are buffered per process and written in
+# batches every flush_interval seconds (0 writes synchronously).
+USER_ACTIVITY = {
+    'flush_interval': float(os.environ.get('USER_ACTIVITY_FLUSH_INTERVAL', 5)),
+    'batch_size': 500,
+}
+
+# Enrichment freshness (see prospects/freshness.py)
+# A prospect is re-enriched from a source once its latest enrichment is older
+# than the TTL for its status. Keep these above the 'enrichment' cache TIMEOUT
+# so a refresh actually reaches the provider.
+ENRICHMENT_FRESHNESS_TTL = {
+    'hot': timedelta(days=3),
+    'warm': timedelta(days=14),
+    'cold': timedelta(days=60),
+}
+
+# Max prospects re-enriched per scheduler run, per enrichment source
+ENRICHMENT_BUDGETS = {}
+
+# Enrichment payloads at least this large (bytes of canonical JSON) are compressed
+ENRICHMENT_PAYLOAD_COMPRESS_THRESHOLD = int(os.environ.get('ENRICHMENT_PAYLOAD_COMPRESS_THRESHOLD', 512))
+
+# Background jobs (see jobs/)
+# Succeeded jobs are purged by a periodic task after this long
+JOBS_SUCCEEDED_RETENTION = timedelta(days=int(os.environ.get('JOBS_SUCCEEDED_RETENTION_DAYS', 7)))
+
+# Also run the periodic scheduler in each web process (leader election keeps
+# every task to a single run per slot)
+JOBS_SCHEDULER_IN_WEB = os.environ.get('JOBS_SCHEDULER_IN_WEB', 'False') == 'True'
+
 # Django Unfold Configuration
 from django.urls import reverse_lazy
 
@@ -265,6 +524,64 @@ UNFOLD = {
                     },
                 ],
             },
+            {
+                "title": "Background Jobs",
+                "separator": True,
+                "collapsible": True,
+                "items": [
+                    {
+                        "title": "Jobs",
+                        "icon": "work",
+                        "link": reverse_lazy("admin:jobs_job_changelist"),
+                    },
+                    {
+                        "title": "Periodic Tasks",
+                        "icon": "schedule",
+                        "link": reverse_lazy("admin:jobs_periodictask_changelist"),
+                    },
+                ],
+            },
+            {
+                "title": "Webhooks",
+                "separator": True,
+                "collapsible": True,
+                "items": [
+                    {
+                        "title": "Endpoints",
+                        "icon": "webhook",
+                        "link": reverse_lazy("admin:webhooks_webhookendpoint_changelist"),
+                    },
+                    {
+                        "title": "Events",
+                        "icon": "outbox",
+                        "link": reverse_lazy("admin:webhooks_webhookevent_changelist"),
+                    },
+                ],
+            },
+            {
+                "title": "Email",
+                "separator": True,
+                "collapsible": True,
+                "items": [
+                    {
+                        "title": "Outbox",
+                        "icon": "mail",
+                        "link": reverse_lazy("admin:mailer_outboundemail_changelist"),
+                    },
+                ],
+            },
+            {
+                "title": "Archive",
+                "separator": True,
+                "collapsible": True,
+                "items": [
+                    {
+                        "title": "Archive Files",
+                        "icon": "inventory_2",
+                        "link": reverse_lazy("admin:archive_archivefile_changelist"),
+                    },
+                ],
+            },
             {
                 "title": "Prospects",
                 "separator": True,
@@ -275,6 +592,11 @@ UNFOLD = {
                         "icon": "people",
                         "link": reverse_lazy("admin:prospects_prospect_changelist"),
                     },
+                    {
+                        "title": "Companies",
+                        "icon": "business",
+                        "link": reverse_lazy("admin:prospects_company_changelist"),
+                    },
                     {
                         "title": "Enrichments",
                         "icon": "database",
@@ -29,6 +29,7 @@ urlpatterns = [
     path('', include('users.urls')),
     path('', include('support.urls')),
     path('', include('prospects.urls')),
+    path('', include('webhooks.urls')),
 ]
 
 # Serve media files in development
@@ -14,3 +14,9 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'signal_trace.settings')
 
 application = get_wsgi_application()
+
+from django.conf import settings
+
+if settings.JOBS_SCHEDULER_IN_WEB:
+    from jobs.scheduler import start_scheduler
+    start_scheduler()
@@ -3,17 +3,32 @@ Django Admin configuration for ContactMessage model.
 
 Provides a comprehensive admin interface for managing contact form submissions with:
 - Custom list display and filters
-- Search functionality
+- Full-text search, ranked (support/search.py)
+- Unread-first inbox ordering and cached result counts
 - Organized fieldsets
 - Bulk actions (mark as read/unread, mark as responded)
 - User-friendly interface using Unfold
 """
 
 from django.contrib import admin
+from django.contrib.admin.views.main import ORDER_VAR
 from unfold.admin import ModelAdmin
+from unfold.views import ChangeList
 from django.utils.html import format_html
 
+from core.pagination import CachedCountPaginator
 from .models import ContactMessage
+from . import search
+
+
+class ContactMessageChangeList(ChangeList):
+    """Changelist that orders full-text matches by rank, still unread first."""
+    
+    def get_ordering(self, request, queryset):
+        # A column picked in the header still takes precedence
+        if 'search_rank' in queryset.query.annotations and not self.params.get(ORDER_VAR):
+            return ['is_read', '-search_rank', '-created_at', '-pk']
+        return super().get_ordering(request, queryset)
 
 
 @admin.register(ContactMessage)
@@ -33,6 +48,7 @@ class ContactMessageAdmin(ModelAdmin):
         'email',
         'phone_number_display',
         'message_preview',
+        'submission_count_display',
         'is_read_display',
         'responded_at_display',
         'created_at',
@@ -44,6 +60,8 @@ class ContactMessageAdmin(ModelAdmin):
         'responded_at',
     )
     
+    # Searched through the full-text index where the database has one
+    # (see get_search_results); these are the fallback
     search_fields = (
         'first_name',
         'last_name',
@@ -51,16 +69,24 @@ class ContactMessageAdmin(ModelAdmin):
         'phone_number',
         'message',
     )
+    search_help_text = 'Search names, email and message text.'
     
     readonly_fields = (
         'created_at',
         'updated_at',
         'responded_at',
+        'submission_count',
+        'last_submitted_at',
     )
     
     date_hierarchy = 'created_at'
     
-    ordering = ('-created_at',)
+    # Unread first, newest first
+    ordering = ('is_read', '-created_at')
+    
+    # Cached counts instead of an exact COUNT(*) per page view
+    paginator = CachedCountPaginator
+    show_full_result_count = False
     
     # Fieldsets for add/edit forms
     fieldsets = (
@@ -68,7 +94,7 @@ class ContactMessageAdmin(ModelAdmin):
             'fields': ('first_name', 'last_name', 'email', 'phone_number')
         }),
         ('Message', {
-            'fields': ('message',)
+            'fields': ('message', 'submission_count', 'last_submitted_at')
         }),
         ('Status', {
             'fields': ('is_read', 'responded_at')
@@ -103,6 +129,17 @@ class ContactMessageAdmin(ModelAdmin):
         return "-"
     message_preview.short_description = "Message Preview"
     
+    def submission_count_display(self, obj):
+        """Display how many times the message was submitted, highlighting repeats."""
+        if obj.submission_count > 1:
+            return format_html(
+                '<span style="color: red; font-weight: bold;">×{}</span>',
+                obj.submission_count
+            )
+        return "1"
+    submission_count_display.short_description = "Submissions"
+    submission_count_display.admin_order_field = 'submission_count'
+    
     def is_read_display(self, obj):
         """Display read status with color coding."""
         if obj.is_read:
@@ -158,6 +195,17 @@ class ContactMessageAdmin(ModelAdmin):
         """Disable adding contact messages manually through admin."""
         return False
     
+    def get_search_results(self, request, queryset, search_term):
+        """Search the full-text index, annotating each match's search_rank."""
+        search_term = search_term.strip()
+        if search_term and search.is_supported():
+            return search.search(queryset, search_term), False
+        return super().get_search_results(request, queryset, search_term)
+    
+    def get_changelist(self, request, **kwargs):
+        """Use the changelist that orders search results by rank."""
+        return ContactMessageChangeList
+    
     def get_queryset(self, request):
         """Optimize queryset."""
         qs = super().get_queryset(request)
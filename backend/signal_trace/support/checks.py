@@ -0,0 +1,37 @@
+"""
+System checks for the contact message search index.
+
+Database checks run with `python manage.py check --database default` and
+before `migrate`.
+"""
+
+from django.core.checks import Tags, Warning, register
+from django.db import connections
+
+from .search import FTS_TABLE, FTS_TRIGGERS
+
+
+@register(Tags.database)
+def check_search_triggers(app_configs, databases=None, **kwargs):
+    """The SQLite search index must still have its triggers."""
+    warnings = []
+    for alias in databases or ():
+        connection = connections[alias]
+        if connection.vendor != 'sqlite':
+            continue
+        with connection.cursor() as cursor:
+            # Not migrated yet
+            if FTS_TABLE not in connection.introspection.table_names(cursor):
+                continue
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")
+            missing = set(FTS_TRIGGERS) - {name for name, in cursor.fetchall()}
+        if missing:
+            warnings.append(Warning(
+                f"Database '{alias}' is missing the triggers that keep {FTS_TABLE} up to date "
+                f"({', '.join(sorted(missing))}), so contact message search silently goes stale.",
+                hint='A migration that rebuilt support_contactmessage dropped them. Recreate them as in '
+                     "support/migrations/0003_contactmessage_search.py, then run INSERT INTO "
+                     f"{FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild').",
+                id='support.W001',
+            ))
+    return warnings
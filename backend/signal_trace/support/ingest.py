@@ -0,0 +1,165 @@
+"""
+Buffered contact form ingestion.
+
+ContactMessage.submit() hands each submission to a per-process buffer
+instead of inserting it. A daemon thread flushes the buffer every
+CONTACT_INGEST['flush_interval'] seconds, and once more at interpreter
+exit, through ContactMessage.ingest(): one bulk_create for the new messages
+and one UPDATE for the duplicates, in a single transaction.
+
+Submissions are keyed by a hash of (email, message). Repeats within the
+buffer collapse into one entry with a count, and entries matching a
+message created within CONTACT_INGEST['dedup_window'] seconds increment
+that message's submission_count instead of adding a row. A spam burst of
+thousands of identical submissions is therefore one row and one write per
+interval.
+
+The buffer holds at most CONTACT_INGEST['max_pending'] distinct
+submissions. When it is full the submitting request flushes it; if that
+fails too (database down), the request is refused with 503 rather than
+growing the buffer. A failed background flush keeps its submissions for the
+next attempt. Submissions still buffered when a process is killed are lost,
+so keep the interval short. With flush_interval 0 (handy in tests)
+submissions are written synchronously and keep their id.
+"""
+
+import atexit
+import logging
+import os
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection
+
+from core.exceptions import Overloaded
+
+logger = logging.getLogger(__name__)
+
+
+class ContactBuffer:
+    """Per-process buffer of contact submissions, flushed in the background."""
+
+    _instance = None
+    _lock = threading.Lock()
+
+    def __init__(self, interval, max_pending):
+        self.interval = interval
+        self.max_pending = max_pending
+        self.pid = os.getpid()
+        self._pending = {}
+        self._pending_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        if interval > 0:
+            self._thread = threading.Thread(target=self._run, name='contact-ingest-flush', daemon=True)
+            self._thread.start()
+            atexit.register(self.shutdown)
+
+    @classmethod
+    def get(cls):
+        """Return this process's buffer, starting it on first use (and after a fork)."""
+        instance = cls._instance
+        if instance is not None and instance.pid == os.getpid():
+            return instance
+        with cls._lock:
+            if cls._instance is None or cls._instance.pid != os.getpid():
+                config = settings.CONTACT_INGEST
+                cls._instance = cls(config['flush_interval'], config['max_pending'])
+            return cls._instance
+
+    def submit(self, contact_message):
+        """
+        Buffer a submission (or write it now when ingestion is synchronous).
+
+        Raises:
+            Overloaded: If the buffer is full and cannot be flushed
+        """
+        entry = {
+            'message': contact_message,
+            'count': 1,
+            'last_submitted_at': contact_message.last_submitted_at,
+        }
+        if self._thread is None:
+            written = self.write({contact_message.content_hash: entry})
+            contact_message.pk = written[contact_message.content_hash]
+            return
+        if self._add(entry):
+            return
+        # Full: write it out from this request, then try again
+        self.flush()
+        if not self._add(entry):
+            raise Overloaded(wait=self.interval)
+
+    def _add(self, entry):
+        """Merge an entry into the buffer; False if the buffer is full."""
+        content_hash = entry['message'].content_hash
+        with self._pending_lock:
+            pending = self._pending.get(content_hash)
+            if pending is not None:
+                pending['count'] += entry['count']
+                pending['last_submitted_at'] = max(pending['last_submitted_at'], entry['last_submitted_at'])
+                return True
+            if len(self._pending) >= self.max_pending:
+                return False
+            self._pending[content_hash] = entry
+            return True
+
+    def flush(self):
+        """
+        Write buffered submissions.
+
+        Returns:
+            int: Number of distinct submissions written
+        """
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+        try:
+            self.write(pending)
+        except Exception:
+            logger.exception('Failed to write %s contact submissions; keeping them for the next flush', len(pending))
+            with self._pending_lock:
+                for content_hash, entry in pending.items():
+                    newer = self._pending.pop(content_hash, None)
+                    self._pending[content_hash] = entry
+                    if newer is not None:
+                        entry['count'] += newer['count']
+                        entry['last_submitted_at'] = max(entry['last_submitted_at'], newer['last_submitted_at'])
+            return 0
+        return len(pending)
+
+    @staticmethod
+    def write(submissions):
+        from .models import ContactMessage
+
+        config = settings.CONTACT_INGEST
+        return ContactMessage.ingest(
+            submissions,
+            window=timedelta(seconds=config['dedup_window']),
+            batch_size=config['batch_size'],
+        )
+
+    def shutdown(self):
+        """Stop the flush thread and write what is left."""
+        self._stop.set()
+        self.flush()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.flush()
+            finally:
+                # Don't hold a connection open between flushes
+                connection.close()
+
+
+def submit(contact_message):
+    """Buffer a contact submission (see ContactBuffer.submit)."""
+    ContactBuffer.get().submit(contact_message)
+
+
+def flush():
+    """Write this process's buffered submissions now."""
+    return ContactBuffer.get().flush()
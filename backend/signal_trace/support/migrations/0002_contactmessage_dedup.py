@@ -0,0 +1,52 @@
+# Generated by Django 5.2 on 2026-10-19 01:00
+
+import hashlib
+
+from django.db import migrations, models
+
+
+def backfill_content_hashes(apps, schema_editor):
+    """Hash existing messages so new submissions deduplicate against them."""
+    ContactMessage = apps.get_model('support', 'ContactMessage')
+    batch = []
+    for contact_message in ContactMessage.objects.only('email', 'message', 'created_at').iterator(chunk_size=1000):
+        contact_message.content_hash = hashlib.sha256(
+            f"{contact_message.email}\n{contact_message.message}".encode()
+        ).hexdigest()
+        contact_message.last_submitted_at = contact_message.created_at
+        batch.append(contact_message)
+        if len(batch) == 1000:
+            ContactMessage.objects.bulk_update(batch, ['content_hash', 'last_submitted_at'])
+            batch = []
+    if batch:
+        ContactMessage.objects.bulk_update(batch, ['content_hash', 'last_submitted_at'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('support', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contactmessage',
+            name='content_hash',
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='contactmessage',
+            name='last_submitted_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='contactmessage',
+            name='submission_count',
+            field=models.PositiveIntegerField(default=1),
+        ),
+        migrations.AddIndex(
+            model_name='contactmessage',
+            index=models.Index(fields=['content_hash', 'created_at'], name='support_contact_dedup_idx'),
+        ),
+        migrations.RunPython(backfill_content_hashes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,86 @@
+# Generated by Django 5.2 on 2026-10-19 01:10
+
+from django.db import migrations, models
+
+TABLE = 'support_contactmessage'
+FTS_TABLE = 'support_contactmessage_fts'
+FTS_COLUMNS = 'first_name, last_name, email, message'
+
+POSTGRES_INSTALL = [
+    f"""
+    ALTER TABLE {TABLE} ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', first_name || ' ' || last_name || ' ' || email), 'A')
+        || setweight(to_tsvector('english', message), 'B')
+    ) STORED
+    """,
+    f"CREATE INDEX support_contact_search_idx ON {TABLE} USING GIN (search_vector)",
+]
+
+POSTGRES_REMOVE = [
+    f"ALTER TABLE {TABLE} DROP COLUMN search_vector",
+]
+
+SQLITE_INSTALL = [
+    f"""
+    CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+        {FTS_COLUMNS}, content='{TABLE}', content_rowid='id', tokenize='porter unicode61'
+    )
+    """,
+    f"""
+    CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON {TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, {FTS_COLUMNS})
+        VALUES (new.id, new.first_name, new.last_name, new.email, new.message);
+    END
+    """,
+    f"""
+    CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON {TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {FTS_COLUMNS})
+        VALUES ('delete', old.id, old.first_name, old.last_name, old.email, old.message);
+    END
+    """,
+    f"""
+    CREATE TRIGGER {FTS_TABLE}_au AFTER UPDATE OF {FTS_COLUMNS} ON {TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {FTS_COLUMNS})
+        VALUES ('delete', old.id, old.first_name, old.last_name, old.email, old.message);
+        INSERT INTO {FTS_TABLE}(rowid, {FTS_COLUMNS})
+        VALUES (new.id, new.first_name, new.last_name, new.email, new.message);
+    END
+    """,
+    # Index existing messages
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+]
+
+SQLITE_REMOVE = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ai",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_au",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+
+def run_for_vendor(postgres, sqlite):
+    def operation(apps, schema_editor):
+        statements = {'postgresql': postgres, 'sqlite': sqlite}.get(schema_editor.connection.vendor, [])
+        for statement in statements:
+            schema_editor.execute(statement)
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('support', '0002_contactmessage_dedup'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='contactmessage',
+            index=models.Index(fields=['is_read', '-created_at'], name='support_contact_inbox_idx'),
+        ),
+        # Search index outside the model (see support/search.py); other
+        # databases get none and the admin falls back to icontains
+        migrations.RunPython(
+            run_for_vendor(POSTGRES_INSTALL, SQLITE_INSTALL),
+            run_for_vendor(POSTGRES_REMOVE, SQLITE_REMOVE),
+        ),
+    ]
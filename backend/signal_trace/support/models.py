@@ -1,4 +1,8 @@
-from django.db import models
+import hashlib
+
+from django.conf import settings
+from django.db import models, transaction
+from django.utils import timezone
 from core.models import BaseDateTimeModel
 
 
@@ -18,19 +22,86 @@ class ContactMessage(BaseDateTimeModel):
     is_read = models.BooleanField(default=False)
     responded_at = models.DateTimeField(null=True, blank=True)
     
+    # Deduplication: identical (email, message) submissions within
+    # CONTACT_INGEST['dedup_window'] are counted on one row
+    content_hash = models.CharField(max_length=64, blank=True, editable=False)
+    submission_count = models.PositiveIntegerField(default=1)
+    last_submitted_at = models.DateTimeField(null=True, blank=True)
+    
     class Meta:
         ordering = ['-created_at']
         verbose_name = 'Contact Message'
         verbose_name_plural = 'Contact Messages'
+        indexes = [
+            # Duplicate lookup: recent rows with a given content hash
+            models.Index(fields=['content_hash', 'created_at'], name='support_contact_dedup_idx'),
+            # Admin inbox: unread first, newest first
+            models.Index(fields=['is_read', '-created_at'], name='support_contact_inbox_idx'),
+        ]
+        # Full-text search index: see support/search.py
     
     def __str__(self):
         return f"Contact from {self.first_name} {self.last_name} ({self.email})"
     
+    @staticmethod
+    def compute_content_hash(email, message):
+        """Hash identifying duplicate submissions (normalized email and message)."""
+        return hashlib.sha256(f"{email}\n{message}".encode()).hexdigest()
+    
+    @classmethod
+    def build(cls, first_name, last_name, email, message, phone_number=''):
+        """
+        Business logic: Build a normalized, unsaved contact message.
+        
+        Returns:
+            ContactMessage: Unsaved instance with its content hash set
+        """
+        # Normalize email
+        email = email.lower().strip() if email else None
+        message = message.strip()
+        
+        return cls(
+            first_name=first_name.strip(),
+            last_name=last_name.strip(),
+            email=email,
+            phone_number=phone_number.strip() if phone_number else '',
+            message=message,
+            content_hash=cls.compute_content_hash(email, message),
+            last_submitted_at=timezone.now(),
+        )
+    
+    @classmethod
+    def submit(cls, first_name, last_name, email, message, phone_number=''):
+        """
+        Business logic: Accept a contact form submission.
+        
+        The submission is buffered and written in bulk (see support/ingest.py);
+        duplicates of a recent message only increment its submission_count.
+        
+        Args:
+            first_name: Contact's first name
+            last_name: Contact's last name
+            email: Contact's email address
+            message: Contact's message
+            phone_number: Optional phone number
+        
+        Returns:
+            ContactMessage: The submission; its id is None until written,
+                so it is only set when ingestion is synchronous
+        """
+        from . import ingest
+        
+        contact_message = cls.build(first_name, last_name, email, message, phone_number)
+        ingest.submit(contact_message)
+        return contact_message
+    
     @classmethod
     def create_contact_message(cls, first_name, last_name, email, message, phone_number=''):
         """
         Business logic: Create a new contact message with validation.
         
+        Writes the message immediately, without buffering or deduplication.
+        
         Args:
             first_name: Contact's first name
             last_name: Contact's last name
@@ -41,20 +112,122 @@ class ContactMessage(BaseDateTimeModel):
         Returns:
             ContactMessage: Created contact message instance
         """
-        # Normalize email
-        email = email.lower().strip() if email else None
+        contact_message = cls.build(first_name, last_name, email, message, phone_number)
+        # Staff are notified through the email outbox, written in the same
+        # transaction as the message
+        with transaction.atomic():
+            contact_message.save()
+            contact_message.queue_staff_notification()
         
-        # Create and save the contact message
-        contact_message = cls(
-            first_name=first_name.strip(),
-            last_name=last_name.strip(),
-            email=email,
-            phone_number=phone_number.strip() if phone_number else '',
-            message=message.strip()
+        return contact_message
+    
+    @classmethod
+    def ingest(cls, submissions, window, batch_size=500):
+        """
+        Business logic: Write buffered submissions in bulk.
+        
+        A submission whose content hash matches a message created within
+        `window` is added to that message's submission_count (one UPDATE per
+        batch); the rest are inserted with bulk_create. Staff get one
+        notification for all new messages.
+        
+        Args:
+            submissions: {content_hash: {'message': unsaved ContactMessage,
+                'count': int, 'last_submitted_at': datetime}}
+            window: timedelta within which duplicates are collapsed
+            batch_size: Rows per query
+        
+        Returns:
+            dict: {content_hash: id of the row the submissions were written to}
+        """
+        hashes = list(submissions)
+        written = {}
+        with transaction.atomic():
+            since = timezone.now() - window
+            for start in range(0, len(hashes), batch_size):
+                recent = cls.objects.filter(
+                    content_hash__in=hashes[start:start + batch_size], created_at__gte=since,
+                ).order_by('created_at').values_list('content_hash', 'id')
+                # The newest match wins
+                written.update(recent)
+            
+            duplicates = [content_hash for content_hash in hashes if content_hash in written]
+            for start in range(0, len(duplicates), batch_size):
+                batch = duplicates[start:start + batch_size]
+                cls.objects.filter(pk__in=[written[content_hash] for content_hash in batch]).update(
+                    submission_count=models.F('submission_count') + models.Case(*[
+                        models.When(pk=written[content_hash], then=models.Value(submissions[content_hash]['count']))
+                        for content_hash in batch
+                    ], default=models.Value(0)),
+                    last_submitted_at=models.Case(*[
+                        models.When(pk=written[content_hash], then=models.Value(
+                            submissions[content_hash]['last_submitted_at']
+                        ))
+                        for content_hash in batch
+                    ], default=models.F('last_submitted_at')),
+                )
+            
+            new_messages = []
+            for content_hash in hashes:
+                if content_hash in written:
+                    continue
+                contact_message = submissions[content_hash]['message']
+                contact_message.submission_count = submissions[content_hash]['count']
+                contact_message.last_submitted_at = submissions[content_hash]['last_submitted_at']
+                new_messages.append(contact_message)
+            cls.objects.bulk_create(new_messages, batch_size=batch_size)
+            written.update((contact_message.content_hash, contact_message.pk) for contact_message in new_messages)
+            cls.queue_staff_notifications(new_messages)
+        return written
+    
+    @classmethod
+    def queue_staff_notifications(cls, contact_messages):
+        """
+        Business logic: Queue one email to staff about new messages.
+        
+        Returns:
+            OutboundEmail or None: Queued email
+        """
+        from mailer.models import OutboundEmail
+        
+        if len(contact_messages) == 1:
+            return contact_messages[0].queue_staff_notification()
+        if not contact_messages:
+            return None
+        return OutboundEmail.queue(
+            kind='contact.notification',
+            to=settings.CONTACT_NOTIFICATION_EMAILS,
+            subject=f"{len(contact_messages)} new contact messages",
+            body="\n---\n\n".join(
+                f"From: {contact_message.first_name} {contact_message.last_name} <{contact_message.email}>\n"
+                f"Phone: {contact_message.phone_number or '-'}\n\n"
+                f"{contact_message.message}\n"
+                for contact_message in contact_messages
+            ),
         )
-        contact_message.save()
+    
+    def queue_staff_notification(self):
+        """
+        Business logic: Queue an email to staff about this message.
         
-        return contact_message
+        Sent to settings.CONTACT_NOTIFICATION_EMAILS; nothing is queued if
+        that is empty.
+        
+        Returns:
+            OutboundEmail or None: Queued email
+        """
+        from mailer.models import OutboundEmail
+        
+        return OutboundEmail.queue(
+            kind='contact.notification',
+            to=settings.CONTACT_NOTIFICATION_EMAILS,
+            subject=f"New contact message from {self.first_name} {self.last_name}",
+            body=(
+                f"From: {self.first_name} {self.last_name} <{self.email}>\n"
+                f"Phone: {self.phone_number or '-'}\n\n"
+                f"{self.message}\n"
+            ),
+        )
     
     def mark_as_read(self):
         """Mark the contact message as read."""
@@ -0,0 +1,85 @@
+"""
+Full-text search over contact messages.
+
+The index covers first_name, last_name, email and message, and is kept up
+to date by the database itself (installed by migration 0003):
+
+PostgreSQL
+    A stored generated tsvector column, search_vector, with a GIN index.
+    Names and email are weighted above the message body. Terms are parsed
+    with websearch_to_tsquery (quoted phrases, -exclusions, 'or').
+
+SQLite
+    An FTS5 external-content table, support_contactmessage_fts, maintained
+    by insert/update/delete triggers and ranked with bm25(). Each search
+    word must match (porter-stemmed). Django rebuilds a SQLite table when
+    some migrations alter it, which drops the triggers; run
+    `INSERT INTO support_contactmessage_fts(support_contactmessage_fts)
+    VALUES('rebuild')` and recreate them if a later migration does. The
+    support.W001 check (support/checks.py) reports missing triggers.
+
+Other databases have no index; search() returns None and callers fall back
+to a plain icontains search.
+"""
+
+from django.db import connection
+from django.db.models import FloatField
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = 'support_contactmessage_fts'
+
+# Triggers keeping FTS_TABLE in step with inserts, deletes and updates
+FTS_TRIGGERS = (f'{FTS_TABLE}_ai', f'{FTS_TABLE}_ad', f'{FTS_TABLE}_au')
+
+# bm25() column weights: first_name, last_name, email, message
+FTS_WEIGHTS = '10.0, 10.0, 10.0, 1.0'
+
+
+def is_supported():
+    """True if the database has a contact message search index."""
+    return connection.vendor in ('postgresql', 'sqlite')
+
+
+def fts5_query(term):
+    """Quote each word of a user-supplied term as an FTS5 string (ANDed)."""
+    return ' '.join('"{}"'.format(word.replace('"', '""')) for word in term.split())
+
+
+def search(queryset, term):
+    """
+    Filter contact messages matching a search term and annotate their rank.
+
+    Args:
+        queryset: ContactMessage QuerySet
+        term: User-supplied search term
+
+    Returns:
+        QuerySet or None: Matches annotated with search_rank (higher is
+            better), or None if the database has no search index
+    """
+    table = queryset.model._meta.db_table
+    if connection.vendor == 'postgresql':
+        matches = RawSQL(
+            f"SELECT id FROM {table} WHERE search_vector @@ websearch_to_tsquery('english', %s)",
+            [term],
+        )
+        rank = RawSQL(
+            f"ts_rank({table}.search_vector, websearch_to_tsquery('english', %s))",
+            [term],
+            output_field=FloatField(),
+        )
+    elif connection.vendor == 'sqlite':
+        query = fts5_query(term)
+        if not query:
+            return queryset.none()
+        matches = RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [query])
+        # bm25() is lower for better matches
+        rank = RawSQL(
+            f"(SELECT -bm25({FTS_TABLE}, {FTS_WEIGHTS}) FROM {FTS_TABLE}"
+            f" WHERE {FTS_TABLE} MATCH %s AND rowid = {table}.id)",
+            [query],
+            output_field=FloatField(),
+        )
+    else:
+        return None
+    return queryset.filter(id__in=matches).annotate(search_rank=rank)
@@ -23,7 +23,7 @@ class ContactMessageSerializer(serializers.ModelSerializer):
     Serializer for contact form submissions.
     
     Handles validation and data transformation for contact messages.
-    Delegates actual creation to ContactMessage.create_contact_message() model method.
+    Delegates actual creation to ContactMessage.submit() model method.
     """
     
     class Meta:
@@ -63,11 +63,12 @@ class ContactMessageSerializer(serializers.ModelSerializer):
     
     def create(self, validated_data):
         """
-        Create contact message using model's business logic.
+        Submit contact message using model's business logic.
         
-        Delegates to ContactMessage.create_contact_message() for actual creation.
+        Delegates to ContactMessage.submit(), which buffers the message and
+        writes it in bulk, so the returned instance may not have an id yet.
         """
-        return ContactMessage.create_contact_message(
+        return ContactMessage.submit(
             first_name=validated_data['first_name'],
             last_name=validated_data['last_name'],
             email=validated_data['email'],
@@ -1,3 +1,276 @@
-from django.test import TestCase
+import atexit
+import unittest
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from core.exceptions import Overloaded
+
+from . import search
+from .checks import check_search_triggers
+from .ingest import ContactBuffer
+from .models import ContactMessage
+
+WINDOW = timedelta(hours=1)
+
+
+def submission(email='ada@example.com', message='Hello', count=1, submitted_at=None):
+    contact_message = ContactMessage.build('Ada', 'Lovelace', email, message)
+    if submitted_at:
+        contact_message.last_submitted_at = submitted_at
+    return {
+        'message': contact_message,
+        'count': count,
+        'last_submitted_at': contact_message.last_submitted_at,
+    }
+
+
+def keyed(*entries):
+    return {entry['message'].content_hash: entry for entry in entries}
+
+
+class IngestTests(TestCase):
+    """ContactMessage.ingest inserts new messages and folds in recent duplicates."""
+
+    def test_inserts_new_messages_with_their_count(self):
+        entry = submission(count=3)
+
+        written = ContactMessage.ingest(keyed(entry, submission(message='Other')), window=WINDOW)
+
+        self.assertEqual(len(written), 2)
+        message = ContactMessage.objects.get(pk=written[entry['message'].content_hash])
+        self.assertEqual(message.submission_count, 3)
+
+    def test_duplicate_within_window_increments_count(self):
+        [first_id] = ContactMessage.ingest(keyed(submission()), window=WINDOW).values()
+        later = timezone.now() + timedelta(minutes=5)
+
+        written = ContactMessage.ingest(keyed(submission(count=2, submitted_at=later)), window=WINDOW)
+
+        self.assertEqual(list(written.values()), [first_id])
+        message = ContactMessage.objects.get()
+        self.assertEqual((message.submission_count, message.last_submitted_at), (3, later))
+
+    def test_duplicate_outside_window_is_inserted(self):
+        ContactMessage.ingest(keyed(submission()), window=WINDOW)
+        ContactMessage.objects.update(created_at=timezone.now() - WINDOW - timedelta(minutes=1))
+
+        ContactMessage.ingest(keyed(submission()), window=WINDOW)
+
+        self.assertEqual(ContactMessage.objects.count(), 2)
+        self.assertEqual(set(ContactMessage.objects.values_list('submission_count', flat=True)), {1})
+
+    def test_batches_duplicates_and_inserts(self):
+        existing = [submission(message=f'Old {i}') for i in range(3)]
+        ContactMessage.ingest(keyed(*existing), window=WINDOW)
+        repeats = [submission(message=f'Old {i}') for i in range(3)]
+        fresh = [submission(message=f'New {i}') for i in range(3)]
+
+        written = ContactMessage.ingest(keyed(*repeats, *fresh), window=WINDOW, batch_size=2)
+
+        self.assertEqual(len(written), 6)
+        self.assertEqual(ContactMessage.objects.count(), 6)
+        self.assertEqual(ContactMessage.objects.filter(submission_count=2).count(), 3)
+
+
+class ContactBufferTests(TestCase):
+    """Buffered submissions collapse, survive failed writes and are bounded."""
+
+    def make_buffer(self, max_pending=100):
+        # A long interval keeps the flush thread idle; tests flush explicitly
+        buffer = ContactBuffer(interval=3600, max_pending=max_pending)
+        atexit.unregister(buffer.shutdown)
+        self.addCleanup(buffer._stop.set)
+        return buffer
+
+    def test_buffered_duplicates_collapse_into_count(self):
+        buffer = self.make_buffer()
+        first, later = timezone.now(), timezone.now() + timedelta(seconds=30)
+
+        for submitted_at in (later, first, first):
+            buffer.submit(submission(submitted_at=submitted_at)['message'])
+
+        self.assertEqual(buffer.flush(), 1)
+        message = ContactMessage.objects.get()
+        self.assertEqual((message.submission_count, message.last_submitted_at), (3, later))
+
+    def test_failed_write_keeps_and_merges_submissions(self):
+        buffer = self.make_buffer()
+        buffer.submit(submission()['message'])
+
+        with mock.patch.object(ContactBuffer, 'write', side_effect=RuntimeError('database down')), \
+                self.assertLogs('support.ingest', 'ERROR'):
+            self.assertEqual(buffer.flush(), 0)
+        # Arrived while the failed write was in flight
+        buffer.submit(submission()['message'])
+        buffer.submit(submission(message='Other')['message'])
+
+        self.assertEqual(buffer.flush(), 2)
+        counts = dict(ContactMessage.objects.values_list('message', 'submission_count'))
+        self.assertEqual(counts, {'Hello': 2, 'Other': 1})
+
+    def test_full_buffer_flushes_from_the_request(self):
+        buffer = self.make_buffer(max_pending=1)
+        buffer.submit(submission()['message'])
+
+        buffer.submit(submission(message='Other')['message'])
+
+        self.assertEqual(ContactMessage.objects.count(), 1)
+        self.assertEqual(buffer.flush(), 1)
+
+    def test_full_buffer_that_cannot_flush_is_overloaded(self):
+        buffer = self.make_buffer(max_pending=1)
+        buffer.submit(submission()['message'])
+
+        with mock.patch.object(ContactBuffer, 'write', side_effect=RuntimeError('database down')), \
+                self.assertLogs('support.ingest', 'ERROR'), self.assertRaises(Overloaded) as raised:
+            buffer.submit(submission(message='Other')['message'])
+
+        self.assertEqual(raised.exception.status_code, 503)
+        self.assertEqual(raised.exception.wait, 3600)
+        # Duplicates of a buffered submission are still accepted
+        buffer.submit(submission()['message'])
+        self.assertEqual(buffer._pending[submission()['message'].content_hash]['count'], 2)
+
+
+class ContactMessageViewTests(TestCase):
+    """The contact endpoint answers with a receipt, buffered or not."""
+
+    data = {'first_name': 'Ada', 'last_name': 'Lovelace', 'email': 'Ada@Example.com', 'message': 'Hello'}
+
+    def setUp(self):
+        caches['ratelimit'].clear()
+        self.reset_buffer()
+        self.addCleanup(self.reset_buffer)
+
+    def reset_buffer(self):
+        buffer = ContactBuffer._instance
+        ContactBuffer._instance = None
+        if buffer is not None and buffer._thread is not None:
+            atexit.unregister(buffer.shutdown)
+            buffer._stop.set()
+
+    def ingest_settings(self, flush_interval):
+        return override_settings(CONTACT_INGEST={**settings.CONTACT_INGEST, 'flush_interval': flush_interval})
+
+    def post(self):
+        return self.client.post('/api/support/contact/', self.data, content_type='application/json')
+
+    def test_synchronous_ingest(self):
+        with self.ingest_settings(0):
+            response = self.post()
+
+        self.assertEqual(response.status_code, 201)
+        receipt = response.json()['data']['receipt']
+        self.assertEqual(ContactMessage.objects.get().content_hash, receipt)
+
+    def test_buffered_ingest(self):
+        with self.ingest_settings(3600):
+            first = self.post()
+            second = self.post()
+            self.assertFalse(ContactMessage.objects.exists())
+            ContactBuffer.get().flush()
+
+        self.assertEqual(first.status_code, 201)
+        # Resubmitting the same message gives the same receipt
+        self.assertEqual(first.json()['data']['receipt'], second.json()['data']['receipt'])
+        message = ContactMessage.objects.get()
+        self.assertEqual((message.content_hash, message.submission_count), (first.json()['data']['receipt'], 2))
+
+    def test_overloaded_buffer_returns_503(self):
+        with mock.patch('support.ingest.submit', side_effect=Overloaded(wait=1)):
+            response = self.post()
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], '1')
+        self.assertEqual(response.json()['errors'], {'retry_after': 1})
+
+
+@unittest.skipUnless(connection.vendor == 'sqlite', 'SQLite FTS5 index')
+class SQLiteSearchTests(TestCase):
+    """The FTS5 index follows writes, ranks matches and treats input as words."""
+
+    def message(self, first_name='Ada', last_name='Lovelace', email='ada@example.com', message='Hello'):
+        contact_message = ContactMessage.build(first_name, last_name, email, message)
+        contact_message.save()
+        return contact_message
+
+    def search(self, term):
+        return sorted(search.search(ContactMessage.objects.all(), term), key=lambda message: -message.search_rank)
+
+    def indexed_ids(self, term):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT rowid FROM {search.FTS_TABLE} WHERE {search.FTS_TABLE} MATCH %s',
+                [search.fts5_query(term)],
+            )
+            return {row[0] for row in cursor.fetchall()}
+
+    def test_insert_is_indexed(self):
+        message = self.message(message='Our pipelines keep breaking')
+
+        self.assertEqual(self.search('lovelace'), [message])
+        self.assertEqual(self.search('ada@example.com'), [message])
+        # Porter stemming and every word must match
+        self.assertEqual(self.search('pipeline break'), [message])
+        self.assertEqual(self.search('pipeline invoices'), [])
+
+    def test_update_reindexes(self):
+        message = self.message(message='Pricing question')
+
+        message.message = 'Billing question'
+        message.save()
+
+        self.assertEqual(self.search('billing'), [message])
+        self.assertEqual(self.search('pricing'), [])
+
+    def test_delete_is_forgotten(self):
+        message = self.message(message='Pricing question')
+
+        message.delete()
+
+        self.assertEqual(self.indexed_ids('pricing'), set())
+        self.assertEqual(self.search('pricing'), [])
+
+    def test_names_rank_above_message_body(self):
+        in_body = self.message('Grace', 'Hopper', 'grace@example.com', 'Please ask Turing about this')
+        in_name = self.message('Alan', 'Turing', 'alan@example.com', 'Hello')
+
+        results = self.search('turing')
+
+        self.assertEqual(results, [in_name, in_body])
+        self.assertGreater(results[0].search_rank, results[1].search_rank)
+
+    def test_fts5_query_quotes_each_word(self):
+        self.assertEqual(search.fts5_query('ada  lovelace'), '"ada" "lovelace"')
+        self.assertEqual(search.fts5_query('say "hi'), '"say" """hi"')
+        self.assertEqual(search.fts5_query('   '), '')
+
+    def test_operators_and_quotes_are_plain_words(self):
+        message = self.message(message='Either this OR that, NOT both')
+
+        for term in ('OR', 'NOT both', 'this OR', '"that', 'email:x', 'lov*', 'a AND (b', '-both'):
+            with self.subTest(term=term):
+                # Would be a syntax error if passed to MATCH unquoted
+                search.search(ContactMessage.objects.all(), term).count()
+        self.assertEqual(self.search('NOT both'), [message])
+        self.assertEqual(self.search('  '), [])
+
+    def test_triggers_exist_after_migrating(self):
+        self.assertEqual(check_search_triggers(None, databases=['default']), [])
+
+    def test_check_reports_missing_triggers(self):
+        # DDL is transactional in SQLite; the test rollback restores the trigger
+        with connection.cursor() as cursor:
+            cursor.execute(f'DROP TRIGGER {search.FTS_TABLE}_au')
+
+        [warning] = check_search_triggers(None, databases=['default'])
+
+        self.assertEqual(warning.id, 'support.W001')
+        self.assertIn(f'{search.FTS_TABLE}_au', warning.msg)
+        self.assertEqual(check_search_triggers(None), [])
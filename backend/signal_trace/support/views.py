@@ -20,6 +20,7 @@ from rest_framework.response import Response
 
 from .serializers import ContactMessageSerializer
 from users.utils import success_response, error_response
+from core.throttling import SlidingWindowThrottle
 
 
 class ContactMessageView(APIView):
@@ -30,19 +31,24 @@ class ContactMessageView(APIView):
     and model method for business logic.
     """
     permission_classes = [AllowAny]
+    throttle_classes = [SlidingWindowThrottle]
+    throttle_scope = 'contact'
 
     def post(self, request):
         """Handle POST request for contact form submission."""
         serializer = ContactMessageSerializer(data=request.data)
         
         if serializer.is_valid():
-            # Serializer delegates to model's create_contact_message() method
+            # Serializer delegates to model's submit() method; the message
+            # is written in bulk shortly after, so it has no id yet. The
+            # content hash is returned instead: a receipt that is the same
+            # for a resubmission of the same message.
             contact_message = serializer.save()
             
             # Return standardized success response
             return success_response(
                 data={
-                    'id': contact_message.id,
+                    'receipt': contact_message.content_hash,
                     'message': 'Your message has been received. We will get back to you soon.'
                 },
                 message='Contact message submitted successfully.',
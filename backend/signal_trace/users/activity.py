@@ -0,0 +1,124 @@
+"""
+Buffered user activity tracking.
+
+Logins and authenticated API requests record a timestamp (User.last_login,
+User.last_active_at) into a per-process buffer instead of writing the user
+row. A daemon thread flushes the buffer every USER_ACTIVITY['flush_interval']
+seconds, and once more at interpreter exit, with one UPDATE per batch of
+users:
+
+    UPDATE users_user SET
+        last_login = CASE WHEN id = 1 THEN MAX(COALESCE(last_login, t1), t1) ... ELSE last_login END,
+        last_active_at = CASE ...
+    WHERE id IN (1, 2, ...)
+
+Repeated activity by the same user within an interval collapses into one
+entry, so each process writes a user's row at most once per interval. Other
+processes may flush older timestamps later; the GREATEST() keeps the stored
+value from moving backwards.
+
+Timestamps are best effort: a process that is killed loses its last
+interval, and a failed flush is logged and dropped. With flush_interval 0
+(handy in tests) records are written synchronously.
+"""
+
+import atexit
+import logging
+import os
+import threading
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+TRACKED_FIELDS = ('last_login', 'last_active_at')
+
+
+class ActivityBuffer:
+    """Per-process buffer of activity timestamps, flushed in the background."""
+
+    _instance = None
+    _lock = threading.Lock()
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.pid = os.getpid()
+        self._pending = {}
+        self._pending_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        if interval > 0:
+            self._thread = threading.Thread(target=self._run, name='user-activity-flush', daemon=True)
+            self._thread.start()
+            atexit.register(self.shutdown)
+
+    @classmethod
+    def get(cls):
+        """Return this process's buffer, starting it on first use (and after a fork)."""
+        instance = cls._instance
+        if instance is not None and instance.pid == os.getpid():
+            return instance
+        with cls._lock:
+            if cls._instance is None or cls._instance.pid != os.getpid():
+                cls._instance = cls(settings.USER_ACTIVITY['flush_interval'])
+            return cls._instance
+
+    def record(self, user_id, field, when):
+        """Buffer a timestamp, keeping the latest one per user and field."""
+        with self._pending_lock:
+            entry = self._pending.setdefault(user_id, {})
+            if entry.get(field) is None or entry[field] < when:
+                entry[field] = when
+        if self._thread is None:
+            self.flush()
+
+    def flush(self):
+        """
+        Write buffered timestamps.
+
+        Returns:
+            int: Number of users written
+        """
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+
+        from .models import User
+
+        try:
+            User.apply_activity(pending, batch_size=settings.USER_ACTIVITY['batch_size'])
+        except Exception:
+            logger.exception('Dropped activity timestamps for %s users', len(pending))
+            return 0
+        return len(pending)
+
+    def shutdown(self):
+        """Stop the flush thread and write what is left."""
+        self._stop.set()
+        self.flush()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.flush()
+            finally:
+                # Don't hold a connection open between flushes
+                connection.close()
+
+
+def record_login(user_id, when=None):
+    """Buffer a login for user_id (at `when`, default now)."""
+    ActivityBuffer.get().record(user_id, 'last_login', when or timezone.now())
+
+
+def record_activity(user_id, when=None):
+    """Buffer an authenticated request by user_id (at `when`, default now)."""
+    ActivityBuffer.get().record(user_id, 'last_active_at', when or timezone.now())
+
+
+def flush():
+    """Write this process's buffered timestamps now."""
+    return ActivityBuffer.get().flush()
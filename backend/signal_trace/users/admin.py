@@ -16,11 +16,12 @@ from django.utils.html import format_html
 from django.urls import reverse
 from django.utils.safestring import mark_safe
 
+from core.admin import LargeTableAdminMixin
 from .models import User, OTP
 
 
 @admin.register(User)
-class UserAdmin(BaseUserAdmin, ModelAdmin):
+class UserAdmin(LargeTableAdminMixin, BaseUserAdmin, ModelAdmin):
     """
     Admin interface for User model.
     
@@ -41,6 +42,7 @@ class UserAdmin(BaseUserAdmin, ModelAdmin):
         'is_superuser',
         'date_joined',
         'last_login',
+        'last_active_at',
     )
     
     list_filter = (
@@ -78,7 +80,7 @@ class UserAdmin(BaseUserAdmin, ModelAdmin):
             ),
         }),
         ('Important Dates', {
-            'fields': ('last_login', 'date_joined')
+            'fields': ('last_login', 'last_active_at', 'date_joined')
         }),
     )
     
@@ -94,7 +96,7 @@ class UserAdmin(BaseUserAdmin, ModelAdmin):
         }),
     )
     
-    readonly_fields = ('date_joined', 'last_login')
+    readonly_fields = ('date_joined', 'last_login', 'last_active_at')
     
     # Actions
     actions = ['activate_users', 'deactivate_users', 'make_staff', 'remove_staff']
@@ -106,10 +108,16 @@ class UserAdmin(BaseUserAdmin, ModelAdmin):
         return "-"
     full_name.short_description = "Full Name"
     
+    # Each action reads the selected ids before updating: re-running a
+    # changelist queryset filtered on the updated field would match nothing,
+    # leaving stale users in the auth cache.
+
     @admin.action(description='Activate selected users')
     def activate_users(self, request, queryset):
         """Bulk action to activate users."""
-        updated = queryset.update(is_active=True)
+        ids = list(queryset.values_list('id', flat=True))
+        updated = User.objects.filter(pk__in=ids).update(is_active=True)
+        User.invalidate_auth_cache(ids)
         self.message_user(
             request,
             f'{updated} user(s) were successfully activated.'
@@ -118,7 +126,9 @@ class UserAdmin(BaseUserAdmin, ModelAdmin):
     @admin.action(description='Deactivate selected users')
     def deactivate_users(self, request, queryset):
         """Bulk action to deactivate users."""
-        updated = queryset.update(is_active=False)
+        ids = list(queryset.values_list('id', flat=True))
+        updated = User.objects.filter(pk__in=ids).update(is_active=False)
+        User.invalidate_auth_cache(ids)
         self.message_user(
             request,
             f'{updated} user(s) were successfully deactivated.'
@@ -127,7 +137,9 @@ class UserAdmin(BaseUserAdmin, ModelAdmin):
     @admin.action(description='Make selected users staff')
     def make_staff(self, request, queryset):
         """Bulk action to make users staff."""
-        updated = queryset.update(is_staff=True)
+        ids = list(queryset.values_list('id', flat=True))
+        updated = User.objects.filter(pk__in=ids).update(is_staff=True)
+        User.invalidate_auth_cache(ids)
         self.message_user(
             request,
             f'{updated} user(s) were successfully made staff.'
@@ -137,8 +149,9 @@ class UserAdmin(BaseUserAdmin, ModelAdmin):
     def remove_staff(self, request, queryset):
         """Bulk action to remove staff status."""
         # Prevent removing staff status from superusers
-        non_superusers = queryset.filter(is_superuser=False)
-        updated = non_superusers.update(is_staff=False)
+        ids = list(queryset.filter(is_superuser=False).values_list('id', flat=True))
+        updated = User.objects.filter(pk__in=ids).update(is_staff=False)
+        User.invalidate_auth_cache(ids)
         self.message_user(
             request,
             f'{updated} user(s) had staff status removed. Superusers were skipped.'
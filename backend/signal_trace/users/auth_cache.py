@@ -0,0 +1,144 @@
+"""
+Short-lived cache of users for JWT authentication.
+
+Authenticating a request needs the user row, and loading it by user_id was
+the most frequent query in the system. Users are cached in the 'auth' cache
+(short TIMEOUT, bounded MAX_ENTRIES) under these keys:
+
+    auth-version:<user_id>     -> current version stamp (random token)
+    auth-user:<user_id>        -> (version stamp, User)
+    auth-generation:<user_id>  -> (version stamp, token generation)
+
+An entry and the stamp are fetched with one get_many; the entry is only
+used if its stamp matches the current one. Invalidation replaces the stamp, so a
+request that read the old row just before a change can at worst cache it
+under a stamp that is already dead. Stamps are random rather than counters,
+so an evicted or expired stamp can never come back and revive an old entry.
+
+With a per-process cache (locmem) an invalidation only reaches the process
+that made the change; other processes see it within TIMEOUT seconds. Point
+the 'auth' cache at Redis or Memcached for immediate invalidation everywhere.
+"""
+
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import transaction
+
+CACHE_ALIAS = 'auth'
+
+# Stamps outlive the cached users they guard; a lost stamp only costs a miss
+VERSION_TIMEOUT = 60 * 60 * 24
+
+
+def _version_key(user_id):
+    return f'auth-version:{user_id}'
+
+
+def _entry_key(user_id, kind):
+    return f'auth-{kind}:{user_id}'
+
+
+def _new_version():
+    return uuid.uuid4().hex[:12]
+
+
+def _cached(user_id, kind, found):
+    """Return the cached value if its stamp is current, plus the current stamp."""
+    version = found.get(_version_key(user_id))
+    entry = found.get(_entry_key(user_id, kind))
+    if version is not None and entry is not None and entry[0] == version:
+        return entry[1], version
+    return None, version
+
+
+def _get(user_id, kind, load):
+    cache = caches[CACHE_ALIAS]
+    found = cache.get_many([_version_key(user_id), _entry_key(user_id, kind)])
+    value, version = _cached(user_id, kind, found)
+    if value is not None:
+        return value
+
+    if version is None:
+        cache.add(_version_key(user_id), _new_version(), VERSION_TIMEOUT)
+        version = cache.get(_version_key(user_id))
+    value = load()
+    cache.set(_entry_key(user_id, kind), (version, value))
+    return value
+
+
+async def _aget(user_id, kind, aload):
+    cache = caches[CACHE_ALIAS]
+    found = await cache.aget_many([_version_key(user_id), _entry_key(user_id, kind)])
+    value, version = _cached(user_id, kind, found)
+    if value is not None:
+        return value
+
+    if version is None:
+        await cache.aadd(_version_key(user_id), _new_version(), VERSION_TIMEOUT)
+        version = await cache.aget(_version_key(user_id))
+    value = await aload()
+    await cache.aset(_entry_key(user_id, kind), (version, value))
+    return value
+
+
+def get_user(user_id):
+    """
+    Return the user with this id, from cache when possible.
+
+    Args:
+        user_id: User primary key (from the token's user_id claim)
+
+    Returns:
+        User
+
+    Raises:
+        User.DoesNotExist: If there is no such user
+    """
+    return _get(user_id, 'user', lambda: get_user_model().objects.get(pk=user_id))
+
+
+async def aget_user(user_id):
+    """Async version of get_user()."""
+    return await _aget(user_id, 'user', lambda: get_user_model().objects.aget(pk=user_id))
+
+
+def get_token_generation(user_id):
+    """
+    Return the user's current token generation, from cache when possible.
+
+    Cached separately from the user so stateless authentication can check
+    revocation without loading the whole row.
+
+    Raises:
+        User.DoesNotExist: If there is no such user
+    """
+    users = get_user_model().objects.values_list('token_generation', flat=True)
+    return _get(user_id, 'generation', lambda: users.get(pk=user_id))
+
+
+async def aget_token_generation(user_id):
+    """Async version of get_token_generation()."""
+    users = get_user_model().objects.values_list('token_generation', flat=True)
+    return await _aget(user_id, 'generation', lambda: users.aget(pk=user_id))
+
+
+def invalidate(*user_ids):
+    """
+    Drop cached users once the current transaction commits.
+
+    Invalidating before the commit would let a concurrent request re-cache
+    the old row under the new stamp.
+
+    Args:
+        *user_ids: User primary keys
+    """
+    def replace_stamps():
+        caches[CACHE_ALIAS].set_many(
+            {_version_key(user_id): _new_version() for user_id in user_ids},
+            VERSION_TIMEOUT,
+        )
+
+    if user_ids:
+        transaction.on_commit(replace_stamps)
@@ -0,0 +1,179 @@
+"""
+JWT authentication.
+
+simplejwt's JWTAuthentication loads the user row on every request.
+CachedJWTAuthentication (the API default) resolves it from the versioned
+user cache in users/auth_cache.py instead, so an authenticated request
+normally makes no query for its user. With settings.JWT_STATELESS_AUTH it
+skips the lookup altogether and builds the user from the token's signed
+claims (users/tokens.py); fields not in the token are loaded lazily if a
+view touches them. Stateless tokens stay valid until they expire even if
+the user is deactivated in the meantime.
+
+Either way, tokens from an old token generation (the user logged out or
+changed their password) are rejected; the generation is cached alongside
+the user. Successful authentications are recorded as user activity, which
+is buffered and written in batches (users/activity.py).
+
+DRF authentication classes are synchronous: the user lookup runs a blocking
+ORM query, which raises SynchronousOnlyOperation inside an event loop.
+AsyncJWTAuthentication reuses simplejwt's header parsing and token
+validation (pure CPU, no I/O) and replaces only the user lookup with the
+async cache and ORM, so async views authenticate without blocking the
+event loop.
+"""
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from . import activity, auth_cache
+from .tokens import USER_CLAIMS, is_current_generation
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication that serves users from cache or from token claims."""
+
+    def get_user(self, validated_token):
+        user_id = self.get_user_id(validated_token)
+        user = self.get_stateless_user(user_id, validated_token)
+        try:
+            if user is None:
+                user = auth_cache.get_user(user_id)
+                generation = user.token_generation
+            else:
+                generation = auth_cache.get_token_generation(user_id)
+        except self.user_model.DoesNotExist:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        self.check_generation(validated_token, generation)
+        user = self.check_user(user, validated_token)
+        activity.record_activity(user_id)
+        return user
+
+    @staticmethod
+    def get_user_id(validated_token):
+        try:
+            return validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+    def get_stateless_user(self, user_id, validated_token):
+        """
+        Build the user from token claims when stateless mode is on.
+
+        Returns:
+            User or None: Instance with only the claimed fields loaded (the
+            rest are deferred), or None if stateless mode is off or the
+            token predates the claims
+        """
+        if not settings.JWT_STATELESS_AUTH or any(claim not in validated_token for claim in USER_CLAIMS):
+            return None
+        # Only active users are issued tokens
+        values = {'id': user_id, 'is_active': True, **{claim: validated_token[claim] for claim in USER_CLAIMS}}
+        names = [field.attname for field in self.user_model._meta.concrete_fields if field.attname in values]
+        return self.user_model.from_db(DEFAULT_DB_ALIAS, names, [values[name] for name in names])
+
+    @staticmethod
+    def check_generation(validated_token, generation):
+        """Reject tokens issued before the user's tokens were last revoked."""
+        if not is_current_generation(validated_token, generation):
+            raise AuthenticationFailed(_("Token has been revoked"), code="token_revoked")
+
+    @staticmethod
+    def check_user(user, validated_token):
+        """Apply simplejwt's active and revoked-password checks."""
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN and not settings.JWT_STATELESS_AUTH:
+            if validated_token.get(
+                api_settings.REVOKE_TOKEN_CLAIM
+            ) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code="password_changed"
+                )
+
+        return user
+
+
+class AsyncJWTAuthentication(CachedJWTAuthentication):
+    """Async counterpart of CachedJWTAuthentication."""
+
+    async def aauthenticate(self, request):
+        """
+        Authenticate a Django request from its Authorization header.
+
+        Args:
+            request: Django HttpRequest
+
+        Returns:
+            tuple or None: (user, validated token), or None if no JWT was sent
+
+        Raises:
+            AuthenticationFailed: If the token or its user is invalid
+        """
+        return await self.aauthenticate_header(self.get_header(request))
+
+    async def aauthenticate_header(self, header):
+        """
+        Authenticate from a raw Authorization header value.
+
+        Args:
+            header: Header value as bytes, or None
+
+        Returns:
+            tuple or None: (user, validated token), or None if no JWT was sent
+        """
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        """Async version of CachedJWTAuthentication.get_user()."""
+        user_id = self.get_user_id(validated_token)
+        user = self.get_stateless_user(user_id, validated_token)
+        try:
+            if user is None:
+                user = await auth_cache.aget_user(user_id)
+                generation = user.token_generation
+            else:
+                generation = await auth_cache.aget_token_generation(user_id)
+        except self.user_model.DoesNotExist:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        self.check_generation(validated_token, generation)
+        user = self.check_user(user, validated_token)
+        activity.record_activity(user_id)
+        return user
+
+
+class StreamingJWTAuthentication(AsyncJWTAuthentication):
+    """
+    AsyncJWTAuthentication for long-lived connections served outside
+    Django's request cycle (the SSE stream in prospects/stream.py).
+
+    There is no per-request thread-sensitive executor there, so the async
+    ORM would funnel every lookup through one process-wide thread. The user
+    is looked up on the shared thread pool instead, and that thread's
+    database connection is closed straight away so an open stream never
+    holds one.
+    """
+
+    async def aget_user(self, validated_token):
+        return await sync_to_async(self._get_user_and_close, thread_sensitive=False)(validated_token)
+
+    def _get_user_and_close(self, validated_token):
+        try:
+            return self.get_user(validated_token)
+        finally:
+            connections.close_all()
@@ -5,7 +5,7 @@ class EmailBackend(ModelBackend):
     def authenticate(self, request, username=None, password=None, **kwargs):
         UserModel = get_user_model()
         try:
-            user = UserModel.objects.get(email=username)
+            user = UserModel.get_by_email(username)
         except UserModel.DoesNotExist:
             return None
         else:
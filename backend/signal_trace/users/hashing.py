@@ -0,0 +1,87 @@
+"""
+Bounded pool for password hashing in async views.
+
+Checking or setting a password runs the hasher (PBKDF2 by default) for
+100+ ms of CPU. The async auth views (AUTH_ASYNC_VIEWS) run that work
+here instead of on the event loop, or on the single thread that
+sync_to_async(thread_sensitive=True) shares with every other view:
+
+    valid = await hashing.run(serializer.is_valid)
+
+The pool has PASSWORD_HASHING['workers'] threads (hashlib releases the GIL
+while hashing, so threads use real cores) and admits at most
+PASSWORD_HASHING['max_queue'] more calls waiting for a thread. Anything
+beyond that is refused straight away with 503 and Retry-After, so a login
+storm is bounded to the pool's cores and a short queue, and the rest of
+the API keeps its share of the machine.
+
+Callables may use the ORM; each call closes its thread's database
+connection if it is past CONN_MAX_AGE, like a request would.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from core.exceptions import Overloaded
+
+_lock = threading.Lock()
+_pool = None
+
+
+class HashingPool:
+    """Thread pool with a hard cap on running plus waiting calls."""
+
+    def __init__(self, workers, max_queue):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hashing')
+        self.slots = threading.BoundedSemaphore(workers + max_queue)
+        self.retry_after = settings.PASSWORD_HASHING['retry_after']
+
+    async def run(self, func, *args, **kwargs):
+        if not self.slots.acquire(blocking=False):
+            raise Overloaded(wait=self.retry_after)
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self.executor, self._call, func, args, kwargs,
+            )
+        finally:
+            self.slots.release()
+
+    @staticmethod
+    def _call(func, args, kwargs):
+        close_old_connections()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            close_old_connections()
+
+
+def get_pool():
+    """Return this process's hashing pool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        with _lock:
+            if _pool is None:
+                config = settings.PASSWORD_HASHING
+                _pool = HashingPool(config['workers'], config['max_queue'])
+    return _pool
+
+
+async def run(func, *args, **kwargs):
+    """
+    Run a password-hashing callable in the pool.
+
+    Args:
+        func: Sync callable (may hash passwords and use the ORM)
+        *args, **kwargs: Arguments for func
+
+    Returns:
+        Whatever func returns
+
+    Raises:
+        Overloaded: If the pool and its queue are full
+    """
+    return await get_pool().run(func, *args, **kwargs)
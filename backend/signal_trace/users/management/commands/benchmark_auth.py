@@ -0,0 +1,65 @@
+"""
+Benchmark JWT authentication backends.
+
+Authenticates the same request repeatedly with simplejwt's
+JWTAuthentication, CachedJWTAuthentication, and CachedJWTAuthentication in
+stateless mode, and reports the database queries and time per request:
+
+    python manage.py benchmark_auth --user alice@example.com --requests 5000
+
+For end-to-end numbers run the `loadtest` command against a server started
+with each configuration.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.request import Request
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from users.authentication import CachedJWTAuthentication
+from users.models import User
+from users.tokens import AccessToken
+
+
+class Command(BaseCommand):
+    help = 'Compare queries and latency per request for JWT authentication backends.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help='Email of the user to authenticate as (default: first active user).')
+        parser.add_argument('--requests', type=int, default=5000, help='Authentications per backend.')
+
+    def handle(self, *args, **options):
+        users = User.objects.filter(is_active=True)
+        if options['user']:
+            users = User.with_email(options['user']).filter(is_active=True)
+        user = users.order_by('id').first()
+        if user is None:
+            raise CommandError('No matching active user.')
+
+        request = Request(RequestFactory().get(
+            '/api/prospects/', HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}',
+        ))
+        backends = [
+            ('JWTAuthentication', JWTAuthentication, False),
+            ('CachedJWTAuthentication', CachedJWTAuthentication, False),
+            ('CachedJWTAuthentication (stateless)', CachedJWTAuthentication, True),
+        ]
+
+        self.stdout.write(f"{'backend':<38} {'queries/req':>12} {'us/req':>9}")
+        for label, backend_class, stateless in backends:
+            with override_settings(JWT_STATELESS_AUTH=stateless):
+                backend = backend_class()
+                backend.authenticate(request)  # warm the cache
+                with CaptureQueriesContext(connection) as queries:
+                    started = time.perf_counter()
+                    for _ in range(options['requests']):
+                        backend.authenticate(request)
+                    elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f"{label:<38} {len(queries) / options['requests']:>12.2f} "
+                f"{elapsed / options['requests'] * 1e6:>9.1f}"
+            )
@@ -0,0 +1,95 @@
+"""
+Benchmark token refresh throughput.
+
+Runs chains of token refreshes (each refresh uses the token issued by the
+previous one, like a real client) through two implementations and reports
+refreshes/sec and queries per refresh:
+
+- simplejwt's TokenRefreshSerializer with rotation and the blacklist
+  (outstanding + blacklisted rows written per rotation)
+- TokenRefreshSerializer from users/serializers.py (token families, one
+  conditional UPDATE per rotation)
+
+Each thread refreshes its own chain on its own connection; use several
+threads against Postgres to measure contention:
+
+    POSTGRES_HOST=localhost python manage.py benchmark_refresh --threads 8 --refreshes 2000
+"""
+
+import threading
+import time
+from unittest import mock
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer as SimpleJWTRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken as SimpleJWTRefreshToken
+
+from users.models import User
+from users.serializers import TokenRefreshSerializer
+from users.tokens import RefreshToken
+
+
+def run_chain(serializer_class, token, refreshes):
+    for _ in range(refreshes):
+        serializer = serializer_class(data={'refresh': token})
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        token = data['tokens']['refresh'] if 'tokens' in data else data['refresh']
+
+
+class Command(BaseCommand):
+    help = 'Compare refreshes/sec for the blacklist and token-family refresh implementations.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help='Email of the user to refresh for (default: first active user).')
+        parser.add_argument('--refreshes', type=int, default=1000, help='Refreshes per thread.')
+        parser.add_argument('--threads', type=int, default=1, help='Concurrent refresh chains.')
+
+    def handle(self, *args, **options):
+        users = User.objects.filter(is_active=True)
+        if options['user']:
+            users = User.with_email(options['user']).filter(is_active=True)
+        user = users.order_by('id').first()
+        if user is None:
+            raise CommandError('No matching active user.')
+
+        implementations = [
+            ('simplejwt + blacklist', SimpleJWTRefreshSerializer, SimpleJWTRefreshToken, True),
+            ('token families', TokenRefreshSerializer, RefreshToken, False),
+        ]
+        self.stdout.write(f"{'implementation':<24} {'refreshes/s':>12} {'queries/refresh':>16}")
+        for label, serializer_class, token_class, use_blacklist in implementations:
+            # simplejwt modules hold on to the api_settings object, so patch it
+            # rather than overriding SIMPLE_JWT
+            with override_settings(JWT_USE_BLACKLIST=use_blacklist), \
+                    mock.patch.object(api_settings, 'BLACKLIST_AFTER_ROTATION', use_blacklist):
+                # Queries are counted on a short single-threaded chain
+                with CaptureQueriesContext(connection) as queries:
+                    run_chain(serializer_class, str(token_class.for_user(user)), 50)
+                per_refresh = len(queries) / 50
+
+                tokens = [str(token_class.for_user(user)) for _ in range(options['threads'])]
+                threads = [
+                    threading.Thread(target=self.run_thread, args=(serializer_class, token, options['refreshes']))
+                    for token in tokens
+                ]
+                started = time.perf_counter()
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+                elapsed = time.perf_counter() - started
+
+            total = options['refreshes'] * options['threads']
+            self.stdout.write(f"{label:<24} {total / elapsed:>12.0f} {per_refresh:>16.1f}")
+
+    @staticmethod
+    def run_thread(serializer_class, token, refreshes):
+        try:
+            run_chain(serializer_class, token, refreshes)
+        finally:
+            connections.close_all()
@@ -0,0 +1,32 @@
+"""
+Delete expired refresh token state.
+
+Removes refresh token families whose latest token has expired and, for
+deployments with JWT_USE_BLACKLIST on (where every issued refresh token is
+recorded in OutstandingToken), expired outstanding and blacklisted tokens.
+Unlike simplejwt's flushexpiredtokens, rows are deleted in chunks so a
+large backlog never holds long locks.
+
+Usage:
+    python manage.py prune_tokens
+    python manage.py prune_tokens --batch-size 5000
+"""
+
+from django.core.management.base import BaseCommand
+
+from users.models import RefreshTokenFamily
+from users.tokens import prune_expired_tokens
+
+
+class Command(BaseCommand):
+    help = 'Delete expired refresh token families and outstanding/blacklisted tokens in chunks.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Tokens deleted per statement.')
+
+    def handle(self, *args, **options):
+        families = RefreshTokenFamily.prune_expired(batch_size=options['batch_size'])
+        deleted = prune_expired_tokens(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Deleted {families} expired token family(ies) and {deleted} expired outstanding token(s).'
+        ))
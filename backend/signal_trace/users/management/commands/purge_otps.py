@@ -0,0 +1,26 @@
+"""
+Delete expired one-time passwords.
+
+Removes OTP rows past their expiry (used or not) in chunks, so purging a
+large backlog never holds long locks. With the cache OTP store there is
+nothing to purge; entries expire on their own.
+
+Usage:
+    python manage.py purge_otps
+    python manage.py purge_otps --batch-size 5000
+"""
+
+from django.core.management.base import BaseCommand
+
+from users.otp_store import get_store
+
+
+class Command(BaseCommand):
+    help = 'Delete expired one-time passwords in chunks.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='OTPs deleted per statement.')
+
+    def handle(self, *args, **options):
+        deleted = get_store().purge(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} expired OTP(s).'))
@@ -0,0 +1,29 @@
+# Generated by Django 5.2 on 2026-10-19 00:42
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_user_token_generation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RefreshTokenFamily',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('id', models.CharField(help_text="jti of the family's first refresh token", max_length=64, primary_key=True, serialize=False)),
+                ('sequence', models.PositiveIntegerField(default=0, help_text='Position of the latest token in the chain')),
+                ('expires_at', models.DateTimeField(db_index=True, help_text='Expiry of the latest token')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='refresh_token_families', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
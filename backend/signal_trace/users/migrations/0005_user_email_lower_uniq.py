@@ -0,0 +1,38 @@
+# Generated by Django 5.2 on 2026-10-19 00:45
+
+import django.db.models.functions.text
+from django.db import migrations, models
+from django.db.models.functions import Lower
+
+
+def check_duplicate_emails(apps, schema_editor):
+    """Fail with a readable list instead of an opaque IntegrityError."""
+    User = apps.get_model('users', 'User')
+    duplicates = list(
+        User.objects.exclude(email='')
+        .values(email_lower=Lower('email'))
+        .annotate(count=models.Count('id'))
+        .filter(count__gt=1)
+        .values_list('email_lower', flat=True)[:20]
+    )
+    if duplicates:
+        raise RuntimeError(
+            'Users share these emails (ignoring case); merge or rename them '
+            'before migrating: ' + ', '.join(duplicates)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('users', '0004_refreshtokenfamily'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_duplicate_emails, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='user',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('email'), condition=models.Q(('email', ''), _negated=True), name='users_user_email_lower_uniq', violation_error_message='A user with this email already exists.'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-19 00:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0005_user_email_lower_uniq'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='last_active_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
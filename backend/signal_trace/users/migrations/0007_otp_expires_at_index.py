@@ -0,0 +1,17 @@
+# Generated by Django 5.2 on 2026-10-19 00:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0006_user_last_active_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='otp',
+            index=models.Index(fields=['expires_at'], name='users_otp_expires_8f43b7_idx'),
+        ),
+    ]
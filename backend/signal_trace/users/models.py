@@ -11,13 +11,57 @@ This project follows Django best practices where:
 - This ensures separation of concerns and makes code more maintainable and testable
 """
 
-from django.db import models
+import re
+
+from django.conf import settings
+from django.db import IntegrityError, models, transaction
+from django.contrib.auth import password_validation
 from django.contrib.auth.models import AbstractUser
 from django.core.exceptions import ValidationError
+from django.db.models.functions import Coalesce, Greatest, Lower
 from core.models import BaseDateTimeModel
 from django.utils import timezone
 from datetime import timedelta
 
+from . import auth_cache, otp_store
+
+EMAIL_TAKEN_MESSAGE = "A user with this email already exists."
+
+# Fields whose writes can violate a unique constraint (see User.save)
+UNIQUE_FIELDS = frozenset({'email', 'username'})
+
+# Unique constraints on users_user, by the name the database reports, and
+# the field each one protects. PostgreSQL reports the constraint name (the
+# username column's is named by PostgreSQL itself); SQLite names the index,
+# or table.column for a column constraint.
+UNIQUE_CONSTRAINTS = {
+    'users_user_email_lower_uniq': 'email',
+    'users_user_username_key': 'username',
+    'users_user.username': 'username',
+}
+
+_SQLITE_UNIQUE_RE = re.compile(r"^UNIQUE constraint failed: (?:index '(?P<index>[^']+)'|(?P<columns>[\w.]+))$")
+
+
+def violated_constraint(exc):
+    """
+    Name of the unique constraint an IntegrityError violated.
+
+    Read from the driver error Django wraps (exc.__cause__): psycopg exposes
+    it as diag.constraint_name, SQLite only in its message.
+
+    Returns:
+        str or None: Constraint, index or table.column name, None if unknown
+    """
+    cause = exc.__cause__
+    diag = getattr(cause, 'diag', None)
+    if diag is not None:
+        return diag.constraint_name
+    match = _SQLITE_UNIQUE_RE.match(str(cause if cause is not None else exc))
+    if match is None:
+        return None
+    return match['index'] or match['columns']
+
 
 class User(AbstractUser):
     """
@@ -26,6 +70,23 @@ class User(AbstractUser):
     Business logic methods are defined here to keep views minimal.
     All user-related operations should be handled through model methods.
     """
+    # Embedded in every JWT issued to the user; tokens from an older
+    # generation are rejected (see users/tokens.py)
+    token_generation = models.PositiveIntegerField(default=0)
+    # Last authenticated API request; written in batches (see users/activity.py)
+    last_active_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta(AbstractUser.Meta):
+        constraints = [
+            # Case-insensitive uniqueness, enforced by the database. The same
+            # index serves every lookup by email (see with_email()).
+            models.UniqueConstraint(
+                Lower('email'),
+                condition=~models.Q(email=''),
+                name='users_user_email_lower_uniq',
+                violation_error_message=EMAIL_TAKEN_MESSAGE,
+            ),
+        ]
     
     def __str__(self):
         return self.email or self.username
@@ -37,11 +98,193 @@ class User(AbstractUser):
             self.email = self.email.lower().strip()
     
     def save(self, *args, **kwargs):
-        """Override save to ensure email is normalized."""
-        self.full_clean()
+        """
+        Override save to ensure email is normalized and drop the cached user.
+        
+        Email and username uniqueness are left to the database rather than
+        checked with a query first, which two concurrent signups could both
+        pass; violations are mapped back to the usual messages.
+        
+        Saves with update_fields are targeted writes of values that were
+        validated upstream, so they skip full_clean() and, unless they touch
+        a unique field, cost a single UPDATE.
+        
+        Raises:
+            ValidationError: If another user already has this email or username
+        """
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None:
+            self.full_clean(validate_unique=False, validate_constraints=False)
         if self.email:
             self.email = self.email.lower().strip()
-        super().save(*args, **kwargs)
+        if update_fields is not None and not UNIQUE_FIELDS.intersection(update_fields):
+            super().save(*args, **kwargs)
+            auth_cache.invalidate(self.pk)
+            return
+        try:
+            with transaction.atomic():
+                super().save(*args, **kwargs)
+        except IntegrityError as exc:
+            field = UNIQUE_CONSTRAINTS.get(violated_constraint(exc))
+            if field == 'email':
+                raise ValidationError({'email': [EMAIL_TAKEN_MESSAGE]})
+            if field == 'username':
+                raise ValidationError({'username': [self._meta.get_field('username').error_messages['unique']]})
+            raise
+        auth_cache.invalidate(self.pk)
+    
+    def delete(self, *args, **kwargs):
+        """Override delete to drop the cached user."""
+        user_id = self.pk
+        result = super().delete(*args, **kwargs)
+        auth_cache.invalidate(user_id)
+        return result
+    
+    def set_password(self, raw_password):
+        """Set the password and revoke every token issued under the old one."""
+        super().set_password(raw_password)
+        if self.pk is not None:
+            self.token_generation += 1
+    
+    def change_password(self, raw_password):
+        """
+        Business logic: Set a new password and revoke the user's tokens.
+        
+        Writes the hash and the next token generation with one UPDATE,
+        conditional on the generation not having moved concurrently.
+        
+        Args:
+            raw_password: New plain text password (already validated)
+        """
+        super().set_password(raw_password)
+        users = User.objects.filter(pk=self.pk)
+        if users.filter(token_generation=self.token_generation).update(
+            password=self.password, token_generation=self.token_generation + 1
+        ):
+            self.token_generation += 1
+        else:
+            # Tokens were revoked in the meantime; bump from the stored value
+            users.update(password=self.password, token_generation=models.F('token_generation') + 1)
+            self.refresh_from_db(fields=['token_generation'])
+        self._password = None
+        password_validation.password_changed(raw_password, self)
+        auth_cache.invalidate(self.pk)
+    
+    def activate(self):
+        """
+        Business logic: Mark the account as verified with one UPDATE.
+        """
+        User.objects.filter(pk=self.pk).update(is_active=True)
+        self.is_active = True
+        auth_cache.invalidate(self.pk)
+    
+    def record_login(self):
+        """
+        Business logic: Stamp last_login.
+        
+        The write is buffered and batched with other users' (see
+        users/activity.py), so logging in does not lock the user row.
+        """
+        from . import activity
+        
+        self.last_login = timezone.now()
+        activity.record_login(self.pk, self.last_login)
+    
+    @classmethod
+    def apply_activity(cls, timestamps, batch_size=500):
+        """
+        Business logic: Write buffered activity timestamps.
+        
+        One UPDATE per batch of users; a stored timestamp never moves
+        backwards, since another process may flush an older one later.
+        
+        Args:
+            timestamps: {user_id: {field: datetime}}, fields being
+                last_login and/or last_active_at
+            batch_size: Users per UPDATE
+        
+        Returns:
+            int: Number of rows updated
+        """
+        user_ids = list(timestamps)
+        updated = 0
+        for start in range(0, len(user_ids), batch_size):
+            batch = user_ids[start:start + batch_size]
+            values = {}
+            for field in ('last_login', 'last_active_at'):
+                whens = [
+                    models.When(pk=user_id, then=Greatest(
+                        Coalesce(field, models.Value(timestamps[user_id][field])),
+                        models.Value(timestamps[user_id][field]),
+                    ))
+                    for user_id in batch if timestamps[user_id].get(field)
+                ]
+                if whens:
+                    values[field] = models.Case(*whens, default=models.F(field))
+            updated += cls.objects.filter(pk__in=batch).update(**values)
+        return updated
+    
+    def revoke_tokens(self):
+        """
+        Business logic: Revoke every token issued to this user so far.
+        
+        Logs the user out everywhere with a single-row UPDATE; tokens
+        issued afterwards carry the new generation.
+        
+        Returns:
+            int: The new token generation
+        """
+        User.objects.filter(pk=self.pk).update(token_generation=models.F('token_generation') + 1)
+        auth_cache.invalidate(self.pk)
+        self.refresh_from_db(fields=['token_generation'])
+        return self.token_generation
+    
+    @classmethod
+    def with_email(cls, email):
+        """
+        Business logic: Users whose email matches, ignoring case.
+        
+        Every lookup by email goes through here. The filter is written on
+        lower(email), matching the unique index, so it is a single index
+        probe on PostgreSQL and SQLite alike (email__iexact compiles to
+        UPPER() or LIKE and would scan the table).
+        
+        Args:
+            email: Email address as entered
+        
+        Returns:
+            QuerySet: At most one user
+        """
+        email = (email or '').lower().strip()
+        return (
+            cls.objects.alias(email_lower=Lower('email'))
+            .filter(email_lower=email)
+            # Repeats the index condition so the partial index applies
+            .exclude(email='')
+        )
+    
+    @classmethod
+    def get_by_email(cls, email):
+        """
+        Business logic: Fetch the user with this email, ignoring case.
+        
+        Raises:
+            User.DoesNotExist: If no user has this email
+        """
+        return cls.with_email(email).get()
+    
+    @classmethod
+    def invalidate_auth_cache(cls, user_ids):
+        """
+        Business logic: Drop cached users after a bulk update.
+        
+        QuerySet.update() bypasses save(), so call this after bulk changes
+        to is_active, passwords or anything else authentication relies on.
+        
+        Args:
+            user_ids: Iterable of user IDs
+        """
+        auth_cache.invalidate(*user_ids)
     
     @classmethod
     def create_user_with_email(cls, email, password, first_name=None, last_name=None, **extra_fields):
@@ -71,12 +314,9 @@ class User(AbstractUser):
         if not email:
             raise ValidationError("Email is required")
         
-        # Check if user with this email already exists
-        if cls.objects.filter(email=email).exists():
-            raise ValidationError("A user with this email already exists.")
-        
         # Set username from email if not provided
-        if not extra_fields.get('username'):
+        username_from_email = not extra_fields.get('username')
+        if username_from_email:
             extra_fields['username'] = email
         
         # Set is_active=False by default - user must verify OTP to activate account
@@ -90,7 +330,13 @@ class User(AbstractUser):
             **extra_fields
         )
         user.set_password(password)
-        user.save()
+        try:
+            user.save()
+        except ValidationError as exc:
+            # A username derived from a taken email means the email is taken
+            if username_from_email and 'username' in exc.message_dict:
+                raise ValidationError({'email': [EMAIL_TAKEN_MESSAGE]})
+            raise
         return user
     
     def authenticate_user(self, password):
@@ -106,12 +352,79 @@ class User(AbstractUser):
         return self.check_password(password) and self.is_active
 
 
+class RefreshTokenFamily(BaseDateTimeModel):
+    """
+    Rotation state of a chain of refresh tokens descending from one login.
+    
+    Refresh tokens carry their family id and position in the chain. Each
+    rotation advances the family with one conditional UPDATE; presenting a
+    token that is no longer the latest in its chain means it was replayed,
+    and the user's tokens are revoked. Rows are created lazily on the first
+    refresh, so logging in writes nothing.
+    """
+    id = models.CharField(primary_key=True, max_length=64, help_text="jti of the family's first refresh token")
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='refresh_token_families')
+    sequence = models.PositiveIntegerField(default=0, help_text="Position of the latest token in the chain")
+    expires_at = models.DateTimeField(db_index=True, help_text="Expiry of the latest token")
+    
+    def __str__(self):
+        return f"{self.user_id} - {self.id} #{self.sequence}"
+    
+    @classmethod
+    def advance(cls, family_id, user_id, sequence, expires_at):
+        """
+        Business logic: Rotate a family from `sequence` to `sequence + 1`.
+        
+        Args:
+            family_id: Family id from the presented token
+            user_id: Token owner
+            sequence: Position of the presented token
+            expires_at: Expiry of the replacement token
+        
+        Returns:
+            bool: True if the presented token was the latest in its chain,
+            False if it had already been rotated (reuse)
+        """
+        now = timezone.now()
+        if sequence == 0:
+            try:
+                with transaction.atomic():
+                    cls.objects.create(id=family_id, user_id=user_id, sequence=1, expires_at=expires_at)
+                return True
+            except IntegrityError:
+                return False
+        return bool(cls.objects.filter(id=family_id, user_id=user_id, sequence=sequence).update(
+            sequence=sequence + 1, expires_at=expires_at, updated_at=now,
+        ))
+    
+    @classmethod
+    def prune_expired(cls, batch_size=1000):
+        """
+        Business logic: Delete families whose latest token has expired, in chunks.
+        
+        Returns:
+            int: Number of families deleted
+        """
+        now = timezone.now()
+        deleted = 0
+        while True:
+            ids = list(cls.objects.filter(expires_at__lt=now).values_list('id', flat=True)[:batch_size])
+            if not ids:
+                return deleted
+            cls.objects.filter(id__in=ids).delete()
+            deleted += len(ids)
+
+
 class OTP(BaseDateTimeModel):
     """
     OTP Model for email verification and password reset.
     
     Stores OTP codes for signup verification and password reset flows.
     Uses fixed OTP code "123456" for now (will integrate email service later).
+    
+    Rows are written by the database OTP store; with the cache store
+    (settings.OTP_STORE) codes live in the cache instead (see
+    users/otp_store.py).
     """
     OTP_TYPE_CHOICES = [
         ('signup', 'Signup'),
@@ -128,6 +441,7 @@ class OTP(BaseDateTimeModel):
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['email', 'otp_type', 'is_verified']),
+            models.Index(fields=['expires_at']),
         ]
     
     def __str__(self):
@@ -153,68 +467,84 @@ class OTP(BaseDateTimeModel):
             otp_type: Type of OTP ('signup' or 'password_reset')
         
         Returns:
-            OTP instance
+            OTP instance (unsaved when the cache store is configured)
         """
         email = email.lower().strip()
         
-        # Invalidate any existing unverified OTPs for this email and type
-        cls.objects.filter(
-            email=email,
-            otp_type=otp_type,
-            is_verified=False
-        ).update(is_verified=True)
-        
         # Fixed OTP code for now
         otp_code = "123456"
         
-        # OTP expires in 10 minutes
-        expires_at = timezone.now() + timedelta(minutes=10)
+        expires_at = timezone.now() + timedelta(seconds=settings.OTP_STORE['ttl'])
         
-        otp = cls.objects.create(
-            email=email,
-            otp_code=otp_code,
-            otp_type=otp_type,
-            expires_at=expires_at
-        )
-        
-        # TODO: Send OTP via email service
-        # For now, we just store it with fixed code
+        # The email is queued in the same transaction as the OTP and sent in
+        # the background, so the request never waits on SMTP
+        with transaction.atomic():
+            # Supersedes any earlier OTP for this email and type
+            otp = otp_store.get_store().issue(email, otp_type, otp_code, expires_at)
+            otp.queue_email()
         
         return otp
     
+    def queue_email(self):
+        """
+        Business logic: Queue the email that delivers this OTP.
+        
+        Returns:
+            OutboundEmail: Queued email
+        """
+        from mailer.models import OutboundEmail
+        
+        subjects = {
+            'signup': 'Verify your email address',
+            'password_reset': 'Reset your password',
+        }
+        minutes = max(round((self.expires_at - timezone.now()).total_seconds() / 60), 1)
+        return OutboundEmail.queue(
+            kind=f'otp.{self.otp_type}',
+            to=[self.email],
+            subject=subjects.get(self.otp_type, 'Your verification code'),
+            body=(
+                f"Your verification code is {self.otp_code}.\n\n"
+                f"It expires in {minutes} minutes. If you did not request it, you can ignore this email.\n"
+            ),
+        )
+    
     @classmethod
     def verify_otp(cls, email, otp_code, otp_type):
         """
         Business logic: Verify OTP code.
         
+        Checks and consumes the code in one atomic step, so a code can only
+        ever be verified once.
+        
         Args:
             email: User's email address
             otp_code: OTP code to verify
             otp_type: Type of OTP ('signup' or 'password_reset')
         
         Returns:
-            tuple: (success: bool, otp_instance: OTP or None)
+            tuple: (success: bool, otp_instance: OTP or None); the instance
+            describes the consumed code and is not saved
         """
         email = email.lower().strip()
         
-        try:
-            otp = cls.objects.filter(
-                email=email,
-                otp_type=otp_type,
-                is_verified=False
-            ).latest('created_at')
-            
-            if not otp.is_valid():
-                return False, None
-            
-            if otp.otp_code != otp_code:
-                return False, None
-            
-            # Mark as verified
-            otp.is_verified = True
-            otp.save()
-            
-            return True, otp
-            
-        except cls.DoesNotExist:
-            return False, None
\ No newline at end of file
+        if not otp_store.get_store().consume(email, otp_type, otp_code):
+            return False, None
+        return True, cls(email=email, otp_code=otp_code, otp_type=otp_type, is_verified=True)
+    
+    @classmethod
+    def prune_expired(cls, batch_size=1000):
+        """
+        Business logic: Delete expired OTPs, in chunks.
+        
+        Returns:
+            int: Number of OTPs deleted
+        """
+        now = timezone.now()
+        deleted = 0
+        while True:
+            ids = list(cls.objects.filter(expires_at__lt=now).values_list('id', flat=True)[:batch_size])
+            if not ids:
+                return deleted
+            cls.objects.filter(id__in=ids).delete()
+            deleted += len(ids)
\ No newline at end of file
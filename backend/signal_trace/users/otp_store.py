@@ -0,0 +1,142 @@
+"""
+Pluggable storage for one-time passwords.
+
+OTP.generate_otp() and OTP.verify_otp() delegate to the store named by
+settings.OTP_STORE['backend']. A store issues codes and consumes them: a
+code is valid until it expires, is consumed, or a newer code is issued for
+the same email and purpose. Consuming checks and invalidates the code in one
+atomic round trip, so two concurrent verifications can never both succeed.
+
+DatabaseOTPStore (default)
+    Rows in users_otp (visible in the admin). Issuing is one INSERT;
+    consuming is one conditional UPDATE on the newest row. Expired rows are
+    deleted in chunks by `purge_otps` (also run periodically).
+
+CacheOTPStore
+    Entries in the cache named by OTP_STORE['cache'], expiring natively
+    after the TTL, so nothing needs purging. Keys hold an HMAC of the code,
+    never the code itself, and consuming is a single delete on Redis and
+    Memcached. The cache
+    must be shared between processes (Redis, Memcached) in production; the
+    default local-memory cache only works with one process.
+"""
+
+import hashlib
+import hmac
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.memcached import PyLibMCCache, PyMemcacheCache
+from django.core.cache.backends.redis import RedisCache
+from django.db import models
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+# Cache backends whose delete() only reports live (unexpired) keys
+EXPIRING_DELETE_BACKENDS = (RedisCache, PyMemcacheCache, PyLibMCCache)
+
+
+class DatabaseOTPStore:
+    """OTPs as rows of the OTP model."""
+
+    def issue(self, email, otp_type, code, expires_at):
+        """
+        Store a new code, superseding earlier ones for this email and type.
+
+        Returns:
+            OTP: The saved row
+        """
+        from .models import OTP
+
+        return OTP.objects.create(email=email, otp_code=code, otp_type=otp_type, expires_at=expires_at)
+
+    def consume(self, email, otp_type, code):
+        """
+        Mark the code verified if it is the newest, unused and unexpired one.
+
+        Returns:
+            bool: True if the code was valid (and is now used up)
+        """
+        from .models import OTP
+
+        newest = OTP.objects.filter(email=email, otp_type=otp_type).order_by('-id').values('id')[:1]
+        return bool(OTP.objects.filter(
+            id=models.Subquery(newest),
+            otp_code=code,
+            is_verified=False,
+            expires_at__gt=timezone.now(),
+        ).update(is_verified=True))
+
+    def purge(self, batch_size=1000):
+        """
+        Delete expired rows in chunks.
+
+        Returns:
+            int: Number of rows deleted
+        """
+        from .models import OTP
+
+        return OTP.prune_expired(batch_size=batch_size)
+
+
+class CacheOTPStore:
+    """OTPs as self-expiring cache entries."""
+
+    def __init__(self):
+        self.cache = caches[settings.OTP_STORE['cache']]
+
+    @staticmethod
+    def _digest(email, otp_type, code):
+        message = f'{otp_type}:{email}:{code}'.encode()
+        return hmac.new(settings.SECRET_KEY.encode(), message, hashlib.sha256).hexdigest()
+
+    @staticmethod
+    def _current_key(email, otp_type):
+        # Emails may contain characters memcached rejects in keys
+        return f'otp-current:{hashlib.sha256(f"{otp_type}:{email}".encode()).hexdigest()}'
+
+    @staticmethod
+    def _code_key(digest):
+        return f'otp-code:{digest}'
+
+    def issue(self, email, otp_type, code, expires_at):
+        """
+        Store a new code, superseding earlier ones for this email and type.
+
+        Returns:
+            OTP: Unsaved instance describing the code
+        """
+        from .models import OTP
+
+        timeout = max(int((expires_at - timezone.now()).total_seconds()), 1)
+        digest = self._digest(email, otp_type, code)
+        current_key = self._current_key(email, otp_type)
+        previous = self.cache.get(current_key)
+        self.cache.set_many({current_key: digest, self._code_key(digest): 1}, timeout)
+        if previous and previous != digest:
+            self.cache.delete(self._code_key(previous))
+        return OTP(email=email, otp_code=code, otp_type=otp_type, expires_at=expires_at)
+
+    def consume(self, email, otp_type, code):
+        """
+        Use up the code if it is current and unexpired.
+
+        Returns:
+            bool: True if the code was valid (and is now used up)
+        """
+        key = self._code_key(self._digest(email, otp_type, code))
+        if not isinstance(self.cache, EXPIRING_DELETE_BACKENDS) and self.cache.get(key) is None:
+            # Local-memory, file and database caches delete expired entries
+            # that have not been culled yet and report them as present
+            return False
+        # Only one of several concurrent deletes of a key succeeds
+        return self.cache.delete(key)
+
+    def purge(self, batch_size=1000):
+        """Entries expire on their own; nothing to delete."""
+        return 0
+
+
+def get_store():
+    """Return an instance of the configured OTP store."""
+    return import_string(settings.OTP_STORE['backend'])()
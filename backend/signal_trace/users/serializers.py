@@ -17,8 +17,12 @@ All API responses use standardized structure via utils.py (success_response/erro
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
-from rest_framework_simplejwt.tokens import RefreshToken
-from .models import OTP
+from django.core.exceptions import ValidationError as DjangoValidationError
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from . import auth_cache
+from .models import EMAIL_TAKEN_MESSAGE, OTP
+from .tokens import RefreshToken
 
 User = get_user_model()
 
@@ -56,8 +60,10 @@ class UserSignupSerializer(serializers.ModelSerializer):
         value = value.lower().strip() if value else None
         if not value:
             raise serializers.ValidationError("Email is required.")
-        if User.objects.filter(email=value).exists():
-            raise serializers.ValidationError("A user with this email already exists.")
+        # Early answer before an OTP is sent; the database constraint is
+        # what actually keeps emails unique (see User.save)
+        if User.with_email(value).exists():
+            raise serializers.ValidationError(EMAIL_TAKEN_MESSAGE)
         return value
     
     def validate(self, attrs):
@@ -112,7 +118,7 @@ class UserLoginSerializer(serializers.Serializer):
             raise serializers.ValidationError("Email and password are required.")
         
         try:
-            user = User.objects.get(email=email)
+            user = User.get_by_email(email)
         except User.DoesNotExist:
             raise serializers.ValidationError("Invalid email or password.")
         
@@ -131,6 +137,39 @@ class UserLoginSerializer(serializers.Serializer):
         return attrs
 
 
+class TokenRefreshSerializer(serializers.Serializer):
+    """
+    Serializer for exchanging a refresh token for new tokens.
+    
+    Validates the refresh token (signature, expiry, token generation) and,
+    when ROTATE_REFRESH_TOKENS is on, delegates rotation and reuse detection
+    to RefreshToken.rotate(). The user comes from the auth cache, so a
+    refresh normally costs a single UPDATE.
+    """
+    refresh = serializers.CharField(required=True)
+    
+    def validate(self, attrs):
+        """Validate the refresh token and issue replacements."""
+        try:
+            refresh = RefreshToken(attrs['refresh'])
+            try:
+                user = auth_cache.get_user(refresh[jwt_settings.USER_ID_CLAIM])
+            except (KeyError, User.DoesNotExist):
+                raise TokenError("Token is invalid or expired")
+            if not user.is_active:
+                raise TokenError("User is inactive")
+            
+            if jwt_settings.ROTATE_REFRESH_TOKENS:
+                refresh = refresh.rotate(user)
+                attrs['tokens'] = {'refresh': str(refresh), 'access': str(refresh.access_token)}
+            else:
+                attrs['tokens'] = {'access': str(refresh.access_token)}
+        except TokenError as e:
+            raise serializers.ValidationError({"refresh": [str(e)]}, code='token_not_valid')
+        
+        return attrs
+
+
 class UserSerializer(serializers.ModelSerializer):
     """
     Serializer for user data representation.
@@ -156,17 +195,17 @@ class UserUpdateSerializer(serializers.ModelSerializer):
         fields = ('email', 'first_name', 'last_name')
     
     def validate_email(self, value):
-        """Validate email format and uniqueness."""
-        value = value.lower().strip() if value else None
-        if value and User.objects.filter(email=value).exclude(pk=self.instance.pk).exists():
-            raise serializers.ValidationError("A user with this email already exists.")
-        return value
+        """Normalize email; uniqueness is checked by the database on save."""
+        return value.lower().strip() if value else None
     
     def update(self, instance, validated_data):
         """Update user profile information."""
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
-        instance.save()
+        try:
+            instance.save(update_fields=list(validated_data))
+        except DjangoValidationError as exc:
+            raise serializers.ValidationError(exc.message_dict)
         return instance
 
 
@@ -209,8 +248,7 @@ class PasswordChangeSerializer(serializers.Serializer):
     def save(self):
         """Update user password."""
         user = self.context['request'].user
-        user.set_password(self.validated_data['new_password'])
-        user.save()
+        user.change_password(self.validated_data['new_password'])
         return user
 
 
@@ -258,12 +296,12 @@ class ResendOTPSerializer(serializers.Serializer):
         if otp_type == 'signup':
             # For signup, check if active user already exists
             # Allow if user exists but is inactive (for verification resend)
-            active_user = User.objects.filter(email=email, is_active=True).exists()
+            active_user = User.with_email(email).filter(is_active=True).exists()
             if active_user:
                 raise serializers.ValidationError("User with this email already exists and is verified.")
         elif otp_type == 'password_reset':
             # For password reset, check if user exists
-            if not User.objects.filter(email=email).exists():
+            if not User.with_email(email).exists():
                 raise serializers.ValidationError("No user found with this email address.")
         
         return attrs
@@ -281,7 +319,7 @@ class ForgotPasswordSerializer(serializers.Serializer):
         if not value:
             raise serializers.ValidationError("Email is required.")
         
-        if not User.objects.filter(email=value).exists():
+        if not User.with_email(value).exists():
             raise serializers.ValidationError("No user found with this email address.")
         
         return value
@@ -357,9 +395,8 @@ class ResetPasswordSerializer(serializers.Serializer):
         password = self.validated_data['password']
         
         try:
-            user = User.objects.get(email=email)
-            user.set_password(password)
-            user.save()
+            user = User.get_by_email(email)
+            user.change_password(password)
             return user
         except User.DoesNotExist:
             raise serializers.ValidationError({"email": "User not found."})
@@ -0,0 +1,24 @@
+"""
+Periodic housekeeping for authentication.
+"""
+
+from jobs.registry import periodic
+
+from .models import RefreshTokenFamily
+from .otp_store import get_store
+from .tokens import prune_expired_tokens
+
+
+@periodic('30 4 * * *', jitter=600)
+def prune_tokens():
+    """Delete expired refresh token families and outstanding/blacklisted tokens."""
+    return {
+        'families': RefreshTokenFamily.prune_expired(),
+        'outstanding': prune_expired_tokens(),
+    }
+
+
+@periodic('15 * * * *', jitter=300)
+def purge_otps():
+    """Delete expired one-time passwords."""
+    return {'otps': get_store().purge()}
@@ -1,3 +1,706 @@
-from django.test import TestCase
+import asyncio
+import atexit
+import json
+import time
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.contrib.admin.sites import site
+from django.core.cache import caches
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from django.utils import timezone
+
+from core.exceptions import Overloaded
+
+from . import auth_cache, hashing, otp_store, views
+from .activity import ActivityBuffer
+from .admin import UserAdmin
+from .models import EMAIL_TAKEN_MESSAGE, OTP, RefreshTokenFamily, User, violated_constraint
+from .serializers import UserSignupSerializer
+from .tokens import FAMILY_CLAIM, SEQUENCE_CLAIM, RefreshToken, prune_expired_tokens
+
+PASSWORD = 'Str0ng-pass!'
+
+
+class UserAdminActionTests(TestCase):
+    """Bulk actions must invalidate the auth cache for every updated user."""
+
+    def setUp(self):
+        caches[auth_cache.CACHE_ALIAS].clear()
+        self.admin = UserAdmin(User, site)
+        self.request = RequestFactory().post('/admin/users/user/')
+        self.user = User.create_user_with_email('member@example.com', PASSWORD, is_active=True)
+
+    def run_action(self, action, queryset):
+        with mock.patch.object(UserAdmin, 'message_user'), self.captureOnCommitCallbacks(execute=True):
+            getattr(self.admin, action)(self.request, queryset)
+
+    def test_deactivate_filtered_on_is_active(self):
+        self.assertTrue(auth_cache.get_user(self.user.pk).is_active)
+
+        # As selected from a changelist filtered on "Active: Yes"
+        self.run_action('deactivate_users', User.objects.filter(is_active=True, pk=self.user.pk))
+
+        self.assertFalse(auth_cache.get_user(self.user.pk).is_active)
+
+    def test_remove_staff_filtered_on_is_staff(self):
+        User.objects.filter(pk=self.user.pk).update(is_staff=True)
+        self.assertTrue(auth_cache.get_user(self.user.pk).is_staff)
+
+        self.run_action('remove_staff', User.objects.filter(is_staff=True, pk=self.user.pk))
+
+        self.assertFalse(auth_cache.get_user(self.user.pk).is_staff)
+
+
+class AuthQueryBudgetTests(TestCase):
+    """
+    Pin the number of queries each auth endpoint runs.
+
+    Budgets assume a cold auth cache. last_login is written by the activity
+    buffer, off the request path. Inside a test, a transaction shows up as
+    SAVEPOINT and RELEASE statements.
+    """
+
+    def setUp(self):
+        for alias in caches:
+            caches[alias].clear()
+        self.user = User.create_user_with_email(
+            'member@example.com', PASSWORD, first_name='Ada', last_name='Lovelace', is_active=True,
+        )
+
+    def tearDown(self):
+        # Write buffered timestamps inside the test transaction, not at exit
+        ActivityBuffer.get().flush()
+
+    def post(self, url, data, method='post', **extra):
+        return getattr(self.client, method)(url, data, content_type='application/json', **extra)
+
+    def authorization(self):
+        token = RefreshToken.for_user(self.user).access_token
+        caches[auth_cache.CACHE_ALIAS].clear()
+        return {'HTTP_AUTHORIZATION': f'Bearer {token}'}
+
+    def test_login(self):
+        # Load the user
+        with self.assertNumQueries(1):
+            response = self.post('/api/auth/login/', {'email': 'member@example.com', 'password': PASSWORD})
+        self.assertEqual(response.status_code, 200)
+
+    def test_profile_update(self):
+        headers = self.authorization()
+        # Load the user, UPDATE the submitted fields
+        with self.assertNumQueries(2):
+            response = self.post('/api/auth/profile/', {'first_name': 'Grace'}, method='put', **headers)
+        self.assertEqual(response.status_code, 200)
+
+    def test_password_change(self):
+        headers = self.authorization()
+        # Load the user, UPDATE password and token generation
+        with self.assertNumQueries(2):
+            response = self.post('/api/auth/password/change/', {
+                'old_password': PASSWORD,
+                'new_password': 'N3w-pass-word!',
+                'new_password_confirm': 'N3w-pass-word!',
+            }, **headers)
+        self.assertEqual(response.status_code, 200)
+
+    def test_signup_verify(self):
+        OTP.generate_otp('new@example.com', 'signup')
+        # Consume the OTP, check the email is free, INSERT the active user
+        # (plus SAVEPOINT and RELEASE)
+        with self.assertNumQueries(5):
+            response = self.post('/api/auth/signup/verify/', {
+                'email': 'new@example.com',
+                'otp_code': '123456',
+                'password': PASSWORD,
+                'password_confirm': PASSWORD,
+                'first_name': 'New',
+                'last_name': 'User',
+            })
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(User.objects.get(email='new@example.com').is_active)
+
+    def test_verify_inactive_account(self):
+        User.create_user_with_email('idle@example.com', PASSWORD)
+        OTP.generate_otp('idle@example.com', 'signup')
+        # Consume the OTP, load the user, UPDATE is_active
+        with self.assertNumQueries(3):
+            response = self.post('/api/auth/verify/otp/', {'email': 'idle@example.com', 'otp_code': '123456'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(User.objects.get(email='idle@example.com').is_active)
+
+
+class EmailUniquenessTests(TestCase):
+    """Emails are unique ignoring case, and violations come back as 400 envelopes."""
+
+    def setUp(self):
+        for alias in caches:
+            caches[alias].clear()
+        self.user = User.create_user_with_email('member@example.com', PASSWORD, is_active=True)
+        # A row stored before emails were normalised
+        User.objects.filter(pk=self.user.pk).update(email='Member@Example.com')
+
+    def tearDown(self):
+        ActivityBuffer.get().flush()
+
+    def post(self, url, data, method='post', **extra):
+        return getattr(self.client, method)(url, data, content_type='application/json', **extra)
+
+    def assert_email_taken(self, response):
+        self.assertEqual(response.status_code, 400)
+        body = response.json()
+        self.assertFalse(body['success'])
+        self.assertEqual(body['errors']['email'], [EMAIL_TAKEN_MESSAGE])
+
+    def test_signup_with_other_case(self):
+        self.assert_email_taken(self.post('/api/auth/signup/', {
+            'email': 'member@example.com', 'password': PASSWORD, 'password_confirm': PASSWORD,
+            'first_name': 'Ada', 'last_name': 'Lovelace',
+        }))
+
+    def test_signup_verify_race_caught_by_the_database(self):
+        OTP.generate_otp('member@example.com', 'signup')
+
+        # As if the other signup committed after this one was validated
+        with mock.patch.object(UserSignupSerializer, 'validate_email', lambda serializer, value: value.lower()):
+            response = self.post('/api/auth/signup/verify/', {
+                'email': 'member@example.com', 'otp_code': '123456', 'password': PASSWORD,
+                'password_confirm': PASSWORD, 'first_name': 'Ada', 'last_name': 'Lovelace',
+            })
+
+        self.assert_email_taken(response)
+        self.assertEqual(User.objects.count(), 1)
+
+    def test_profile_email_change_conflict(self):
+        other = User.create_user_with_email('other@example.com', PASSWORD, is_active=True)
+        token = RefreshToken.for_user(other).access_token
+
+        response = self.post(
+            '/api/auth/profile/', {'email': 'MEMBER@example.com'}, method='put', HTTP_AUTHORIZATION=f'Bearer {token}',
+        )
+
+        self.assert_email_taken(response)
+        self.assertEqual(User.objects.get(pk=other.pk).email, 'other@example.com')
+
+    def test_login_with_mixed_case_in_one_query(self):
+        with self.assertNumQueries(1):
+            response = self.post('/api/auth/login/', {'email': 'mEmBeR@example.COM', 'password': PASSWORD})
+        self.assertEqual(response.status_code, 200)
+
+    def test_duplicate_username(self):
+        other = User.create_user_with_email('other@example.com', PASSWORD)
+        other.username = self.user.username
+
+        with self.assertRaises(ValidationError) as raised:
+            other.save()
+
+        self.assertEqual(list(raised.exception.message_dict), ['username'])
+
+    def test_other_integrity_errors_are_raised_unchanged(self):
+        error = IntegrityError('NOT NULL constraint failed: users_user.password')
+
+        with mock.patch('django.contrib.auth.models.AbstractUser.save', side_effect=error), \
+                self.assertRaises(IntegrityError) as raised:
+            self.user.save()
+
+        self.assertIs(raised.exception, error)
+
+    def test_violated_constraint(self):
+        def wrapped(cause):
+            exc = IntegrityError(str(cause))
+            exc.__cause__ = cause
+            return exc
+
+        psycopg_error = Exception('duplicate key value violates unique constraint')
+        psycopg_error.diag = SimpleNamespace(constraint_name='users_user_email_lower_uniq')
+        self.assertEqual(violated_constraint(wrapped(psycopg_error)), 'users_user_email_lower_uniq')
+        self.assertEqual(
+            violated_constraint(wrapped(Exception("UNIQUE constraint failed: index 'users_user_email_lower_uniq'"))),
+            'users_user_email_lower_uniq',
+        )
+        self.assertEqual(
+            violated_constraint(wrapped(Exception('UNIQUE constraint failed: users_user.username'))),
+            'users_user.username',
+        )
+        self.assertIsNone(violated_constraint(wrapped(Exception('FOREIGN KEY constraint failed'))))
+
+
+class OTPStoreTestsMixin:
+    """Behaviour every OTP store shares."""
+
+    email = 'ada@example.com'
+
+    def issue(self, code, ttl=600):
+        return self.store.issue(self.email, 'signup', code, timezone.now() + timedelta(seconds=ttl))
+
+    def consume(self, code, email=None):
+        return self.store.consume(email or self.email, 'signup', code)
+
+    def test_consumed_once(self):
+        self.issue('111111')
+
+        self.assertFalse(self.consume('999999'))
+        self.assertTrue(self.consume('111111'))
+        self.assertFalse(self.consume('111111'))
+
+    def test_scoped_to_email_and_type(self):
+        self.issue('111111')
+
+        self.assertFalse(self.consume('111111', email='grace@example.com'))
+        self.assertFalse(self.store.consume(self.email, 'password_reset', '111111'))
+        self.assertTrue(self.consume('111111'))
+
+    def test_newer_code_supersedes_older(self):
+        self.issue('111111')
+        self.issue('222222')
+
+        self.assertFalse(self.consume('111111'))
+        self.assertTrue(self.consume('222222'))
+
+    def test_expired_code_is_rejected(self):
+        self.issue('111111', ttl=5)
+
+        with self.later(seconds=10):
+            self.assertFalse(self.consume('111111'))
+
+
+class DatabaseOTPStoreTests(OTPStoreTestsMixin, TestCase):
+
+    def setUp(self):
+        self.store = otp_store.DatabaseOTPStore()
+
+    def later(self, seconds):
+        return mock.patch('users.otp_store.timezone.now', return_value=timezone.now() + timedelta(seconds=seconds))
+
+    def test_prune_expired(self):
+        now = timezone.now()
+        for minutes in (-30, -20, -10, 10):
+            OTP.objects.create(email=self.email, otp_code='111111', otp_type='signup',
+                               expires_at=now + timedelta(minutes=minutes))
+
+        self.assertEqual(OTP.prune_expired(batch_size=2), 3)
+
+        self.assertEqual(OTP.objects.count(), 1)
+        self.assertEqual(self.store.purge(), 0)
+
+
+@override_settings(OTP_STORE={**settings.OTP_STORE, 'backend': 'users.otp_store.CacheOTPStore'})
+class CacheOTPStoreTests(OTPStoreTestsMixin, TestCase):
+
+    def setUp(self):
+        self.cache = caches[settings.OTP_STORE['cache']]
+        self.cache.clear()
+        self.store = otp_store.get_store()
+
+    def later(self, seconds):
+        # Local-memory entries expire by time.time()
+        clock = mock.Mock(time=mock.Mock(return_value=timezone.now().timestamp() + seconds))
+        return mock.patch('django.core.cache.backends.locmem.time', clock)
+
+    def test_keys_never_hold_the_email_or_code(self):
+        self.issue('314159')
+
+        entries = list(self.cache._cache.items())
+        self.assertEqual(len(entries), 2)
+        for key, value in entries:
+            for secret in (self.email, '314159'):
+                self.assertNotIn(secret, key)
+                self.assertNotIn(secret.encode(), value)
+
+    def test_otp_model_uses_the_store(self):
+        OTP.generate_otp('Ada@Example.com', 'signup')
+
+        self.assertFalse(OTP.objects.exists())
+        self.assertEqual(OTP.verify_otp(' ADA@example.com', '123456', 'signup')[0], True)
+        self.assertEqual(OTP.verify_otp('ada@example.com', '123456', 'signup'), (False, None))
+
+
+class TokenRevocationTests(TestCase):
+    """Logout and password change reject tokens issued before them."""
+
+    def setUp(self):
+        for alias in caches:
+            caches[alias].clear()
+        self.user = User.create_user_with_email('member@example.com', PASSWORD, is_active=True)
+
+    def tearDown(self):
+        ActivityBuffer.get().flush()
+
+    def tokens(self):
+        self.user.refresh_from_db()
+        refresh = RefreshToken.for_user(self.user)
+        return str(refresh.access_token), str(refresh)
+
+    def post(self, url, data, access=None):
+        extra = {'HTTP_AUTHORIZATION': f'Bearer {access}'} if access else {}
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(url, data, content_type='application/json', **extra)
+
+    def profile(self, access):
+        return self.client.get('/api/auth/profile/', HTTP_AUTHORIZATION=f'Bearer {access}').status_code
+
+    def refresh(self, refresh):
+        return self.post('/api/auth/token/refresh/', {'refresh': refresh}).status_code
+
+    def assert_rejected(self, access, refresh):
+        self.assertEqual(self.profile(access), 401)
+        self.assertEqual(self.refresh(refresh), 401)
+
+    def test_logout_revokes_every_session(self):
+        access, refresh = self.tokens()
+        other_access, other_refresh = self.tokens()
+        self.assertEqual(self.profile(access), 200)
+
+        self.assertEqual(self.post('/api/auth/logout/', {}, access).status_code, 200)
+
+        self.assert_rejected(access, refresh)
+        self.assert_rejected(other_access, other_refresh)
+        # A new login works
+        self.assertEqual(self.profile(self.tokens()[0]), 200)
+
+    def test_password_change_revokes_old_tokens(self):
+        access, refresh = self.tokens()
+
+        response = self.post('/api/auth/password/change/', {
+            'old_password': PASSWORD, 'new_password': 'N3w-pass-word!', 'new_password_confirm': 'N3w-pass-word!',
+        }, access)
+
+        self.assertEqual(response.status_code, 200)
+        self.assert_rejected(access, refresh)
+        tokens = response.json()['data']['tokens']
+        self.assertEqual(self.profile(tokens['access']), 200)
+        self.assertEqual(self.refresh(tokens['refresh']), 200)
+
+    @override_settings(JWT_STATELESS_AUTH=True)
+    def test_stateless_auth_rejects_revoked_tokens(self):
+        access, refresh = self.tokens()
+
+        self.post('/api/auth/logout/', {}, access)
+
+        self.assert_rejected(access, refresh)
+
+    @override_settings(JWT_USE_BLACKLIST=True)
+    def test_blacklist_logout_revokes_only_the_given_refresh_token(self):
+        access, refresh = self.tokens()
+        _, other_refresh = self.tokens()
+
+        self.assertEqual(self.post('/api/auth/logout/', {}, access).status_code, 400)
+        self.assertEqual(self.post('/api/auth/logout/', {'refresh_token': 'garbage'}, access).status_code, 400)
+        self.assertEqual(self.post('/api/auth/logout/', {'refresh_token': refresh}, access).status_code, 200)
+
+        self.assertEqual(self.refresh(refresh), 401)
+        self.assertEqual(self.refresh(other_refresh), 200)
+
+
+class RefreshRotationTests(TestCase):
+    """Refresh tokens rotate along a family; a replayed token revokes everything."""
+
+    def setUp(self):
+        for alias in caches:
+            caches[alias].clear()
+        self.user = User.create_user_with_email('member@example.com', PASSWORD, is_active=True)
+
+    def refresh(self, token):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post('/api/auth/token/refresh/', {'refresh': str(token)}, content_type='application/json')
+
+    def test_rotate_advances_the_family(self):
+        first = RefreshToken.for_user(self.user)
+
+        second = first.rotate(self.user)
+        third = second.rotate(self.user)
+
+        self.assertEqual(third[FAMILY_CLAIM], first[FAMILY_CLAIM])
+        self.assertEqual((first[SEQUENCE_CLAIM], second[SEQUENCE_CLAIM], third[SEQUENCE_CLAIM]), (0, 1, 2))
+        family = RefreshTokenFamily.objects.get()
+        self.assertEqual((family.id, family.sequence), (first[FAMILY_CLAIM], 2))
+
+    def test_replay_revokes_the_family(self):
+        first = RefreshToken.for_user(self.user)
+        second = first.rotate(self.user)
+
+        with self.captureOnCommitCallbacks(execute=True), self.assertRaises(TokenError):
+            first.rotate(self.user)
+
+        # The thief's replay also kills the legitimate holder's token
+        with self.assertRaises(TokenError):
+            RefreshToken(str(second))
+        self.assertEqual(User.objects.get(pk=self.user.pk).token_generation, 1)
+
+    def test_refresh_endpoint(self):
+        original = RefreshToken.for_user(self.user)
+
+        response = self.refresh(original)
+
+        self.assertEqual(response.status_code, 200)
+        rotated = response.json()['data']['tokens']['refresh']
+        self.assertEqual(self.refresh(original).status_code, 401)
+        self.assertEqual(self.refresh(rotated).status_code, 401)
+        self.assertEqual(self.refresh('not-a-token').status_code, 401)
+        self.assertEqual(self.client.post('/api/auth/token/refresh/', {}, content_type='application/json').status_code, 400)
+
+    def test_families_are_independent(self):
+        laptop, phone = RefreshToken.for_user(self.user), RefreshToken.for_user(self.user)
+
+        laptop.rotate(self.user)
+        phone.rotate(self.user)
+
+        self.assertEqual(RefreshTokenFamily.objects.count(), 2)
+
+    def test_advance(self):
+        expires_at = timezone.now() + timedelta(days=7)
+
+        self.assertTrue(RefreshTokenFamily.advance('fam', self.user.pk, 0, expires_at))
+        self.assertFalse(RefreshTokenFamily.advance('fam', self.user.pk, 0, expires_at))
+        self.assertFalse(RefreshTokenFamily.advance('fam', self.user.pk, 5, expires_at))
+        self.assertTrue(RefreshTokenFamily.advance('fam', self.user.pk, 1, expires_at))
+        # Another user cannot advance the family
+        other = User.create_user_with_email('other@example.com', PASSWORD, is_active=True)
+        self.assertFalse(RefreshTokenFamily.advance('fam', other.pk, 2, expires_at))
+
+    def test_prune_expired(self):
+        now = timezone.now()
+        for index, days in enumerate((-2, -1, 1)):
+            RefreshTokenFamily.objects.create(id=f'fam-{index}', user=self.user, expires_at=now + timedelta(days=days))
+            token = OutstandingToken.objects.create(
+                user=self.user, jti=f'jti-{index}', token='token', expires_at=now + timedelta(days=days),
+            )
+            BlacklistedToken.objects.create(token=token)
+
+        self.assertEqual(RefreshTokenFamily.prune_expired(batch_size=1), 2)
+        self.assertEqual(prune_expired_tokens(batch_size=1), 2)
+
+        self.assertEqual(list(RefreshTokenFamily.objects.values_list('id', flat=True)), ['fam-2'])
+        self.assertEqual(list(OutstandingToken.objects.values_list('jti', flat=True)), ['jti-2'])
+        self.assertEqual(BlacklistedToken.objects.count(), 1)
+
+
+class ApplyActivityTests(TestCase):
+    """Buffered timestamps merge out of order and never move backwards."""
+
+    def setUp(self):
+        self.user = User.create_user_with_email('member@example.com', PASSWORD, is_active=True)
+        self.t0 = timezone.now().replace(microsecond=0)
+
+    def at(self, minutes):
+        return self.t0 + timedelta(minutes=minutes)
+
+    def stored(self, user=None):
+        return User.objects.values_list('last_login', 'last_active_at').get(pk=(user or self.user).pk)
+
+    def test_never_moves_backwards(self):
+        User.apply_activity({self.user.pk: {'last_login': self.at(10), 'last_active_at': self.at(10)}})
+
+        # A slower process flushes older timestamps afterwards
+        User.apply_activity({self.user.pk: {'last_login': self.at(5), 'last_active_at': self.at(20)}})
+
+        self.assertEqual(self.stored(), (self.at(10), self.at(20)))
+
+    def test_fields_are_independent(self):
+        User.apply_activity({self.user.pk: {'last_login': self.at(1)}})
+        User.apply_activity({self.user.pk: {'last_active_at': self.at(2)}})
+
+        self.assertEqual(self.stored(), (self.at(1), self.at(2)))
+
+    def test_batches(self):
+        users = [self.user] + [
+            User.create_user_with_email(f'user{i}@example.com', PASSWORD, is_active=True) for i in range(2)
+        ]
+
+        updated = User.apply_activity(
+            {user.pk: {'last_active_at': self.at(index)} for index, user in enumerate(users)}, batch_size=2,
+        )
+
+        self.assertEqual(updated, 3)
+        self.assertEqual([self.stored(user)[1] for user in users], [self.at(0), self.at(1), self.at(2)])
+
+
+@override_settings(USER_ACTIVITY={**settings.USER_ACTIVITY, 'flush_interval': 0})
+class ActivityBufferTests(TestCase):
+    """Recording collapses to the latest timestamp per user and field."""
+
+    def setUp(self):
+        self.user = User.create_user_with_email('member@example.com', PASSWORD, is_active=True)
+        self.t0 = timezone.now().replace(microsecond=0)
+
+    def make_buffer(self, interval=3600):
+        # A long interval keeps the flush thread idle; tests flush explicitly
+        buffer = ActivityBuffer(interval)
+        atexit.unregister(buffer.shutdown)
+        self.addCleanup(buffer._stop.set)
+        return buffer
+
+    def test_out_of_order_records_keep_the_latest(self):
+        buffer = self.make_buffer()
+        for minutes in (5, 1, 3):
+            buffer.record(self.user.pk, 'last_active_at', self.t0 + timedelta(minutes=minutes))
+        buffer.record(self.user.pk, 'last_login', self.t0)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(buffer.flush(), 1)
+
+        self.user.refresh_from_db()
+        self.assertEqual((self.user.last_login, self.user.last_active_at), (self.t0, self.t0 + timedelta(minutes=5)))
+        self.assertEqual(buffer.flush(), 0)
+
+    def test_synchronous_when_interval_is_zero(self):
+        buffer = ActivityBuffer(0)
+
+        buffer.record(self.user.pk, 'last_login', self.t0)
+
+        self.assertIsNone(buffer._thread)
+        self.assertEqual(User.objects.get(pk=self.user.pk).last_login, self.t0)
+
+    def test_failed_flush_is_dropped(self):
+        buffer = self.make_buffer()
+        buffer.record(self.user.pk, 'last_login', self.t0)
+
+        with mock.patch.object(User, 'apply_activity', side_effect=RuntimeError('database down')), \
+                self.assertLogs('users.activity', 'ERROR'):
+            self.assertEqual(buffer.flush(), 0)
+
+        self.assertEqual(buffer.flush(), 0)
+        self.assertIsNone(User.objects.get(pk=self.user.pk).last_login)
+
+    def test_new_buffer_after_fork(self):
+        buffer = ActivityBuffer.get()
+        self.assertIs(ActivityBuffer.get(), buffer)
+
+        with mock.patch('users.activity.os.getpid', return_value=buffer.pid + 1):
+            self.assertIsNot(ActivityBuffer.get(), buffer)
+        self.addCleanup(setattr, ActivityBuffer, '_instance', None)
+
+
+class ActivityFlushThreadTests(TransactionTestCase):
+    """The background thread writes buffered timestamps on its own."""
+
+    def test_flushes_in_the_background(self):
+        user = User.create_user_with_email('member@example.com', PASSWORD, is_active=True)
+        buffer = ActivityBuffer(0.05)
+        atexit.unregister(buffer.shutdown)
+        self.addCleanup(buffer.shutdown)
+        when = timezone.now().replace(microsecond=0)
+
+        buffer.record(user.pk, 'last_active_at', when)
+
+        deadline = time.monotonic() + 5
+        while User.objects.get(pk=user.pk).last_active_at is None and time.monotonic() < deadline:
+            time.sleep(0.02)
+        self.assertEqual(User.objects.get(pk=user.pk).last_active_at, when)
+        self.assertEqual(buffer._pending, {})
+
+
+class HashingPoolTests(TestCase):
+    """A full hashing pool refuses calls instead of queueing them."""
+
+    def saturated_pool(self):
+        pool = hashing.HashingPool(workers=1, max_queue=0)
+        self.addCleanup(pool.executor.shutdown)
+        # Stands in for a call holding the only slot
+        pool.slots.acquire()
+        return pool
+
+    def test_runs_calls_in_the_pool(self):
+        pool = hashing.HashingPool(workers=1, max_queue=0)
+        self.addCleanup(pool.executor.shutdown)
+
+        self.assertEqual(async_to_sync(pool.run)(sum, [1, 2]), 3)
+        # The slot is released afterwards
+        self.assertEqual(async_to_sync(pool.run)(sum, [3]), 3)
+
+    def test_saturated_pool_raises_overloaded(self):
+        pool = self.saturated_pool()
+
+        with self.assertRaises(Overloaded) as raised:
+            async_to_sync(pool.run)(sum, [1, 2])
+
+        self.assertEqual(raised.exception.wait, settings.PASSWORD_HASHING['retry_after'])
+        pool.slots.release()
+        self.assertEqual(async_to_sync(pool.run)(sum, [1, 2]), 3)
+
+    def test_saturated_pool_returns_503_envelope(self):
+        caches['ratelimit'].clear()
+        request = RequestFactory().post(
+            '/api/auth/login/', {'email': 'member@example.com', 'password': PASSWORD},
+            content_type='application/json',
+        )
+
+        with mock.patch('users.hashing._pool', self.saturated_pool()):
+            response = async_to_sync(views.AsyncLoginView.as_view())(request)
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], str(settings.PASSWORD_HASHING['retry_after']))
+        body = json.loads(response.content)
+        self.assertEqual((body['success'], body['errors']), (False, {'retry_after': 2}))
+
+
+class AsyncAuthViewTests(TransactionTestCase):
+    """The async auth views answer exactly like the sync ones."""
+
+    def setUp(self):
+        for alias in caches:
+            caches[alias].clear()
+        User.create_user_with_email('member@example.com', PASSWORD, is_active=True)
+
+    def tearDown(self):
+        ActivityBuffer.get().flush()
+
+    def call(self, view, url, data):
+        request = RequestFactory().post(url, data, content_type='application/json')
+        if asyncio.iscoroutinefunction(view):
+            response = async_to_sync(view)(request)
+        else:
+            response = view(request)
+            response.render()
+        return response.status_code, json.loads(response.content)
+
+    def assert_same(self, sync_view, async_view, url, data):
+        sync_result = self.call(sync_view.as_view(), url, data)
+        async_result = self.call(async_view.as_view(), url, data)
+        self.assertEqual(mask_tokens(async_result), mask_tokens(sync_result))
+        return sync_result
+
+    def test_login(self):
+        url = '/api/auth/login/'
+
+        status, body = self.assert_same(
+            views.LoginView, views.AsyncLoginView, url, {'email': 'Member@Example.com', 'password': PASSWORD},
+        )
+        self.assertEqual((status, body['data']['user']['email']), (200, 'member@example.com'))
+
+        status, _ = self.assert_same(
+            views.LoginView, views.AsyncLoginView, url, {'email': 'member@example.com', 'password': 'wrong'},
+        )
+        self.assertEqual(status, 400)
+
+    def test_signup(self):
+        url = '/api/auth/signup/'
+        data = {
+            'email': 'new@example.com', 'password': PASSWORD, 'password_confirm': PASSWORD,
+            'first_name': 'Ada', 'last_name': 'Lovelace',
+        }
+
+        status, _ = self.assert_same(views.SignupView, views.AsyncSignupView, url, data)
+        self.assertEqual(status, 200)
+
+        status, body = self.assert_same(
+            views.SignupView, views.AsyncSignupView, url, {**data, 'email': 'member@example.com'},
+        )
+        self.assertEqual(status, 400)
+        self.assertIn('email', body['errors'])
+
+
+def mask_tokens(result):
+    """Blank out issued tokens, which differ between any two logins."""
+    status, body = result
+    tokens = (body.get('data') or {}).get('tokens')
+    if tokens:
+        body['data']['tokens'] = dict.fromkeys(tokens, '<token>')
+    return status, body
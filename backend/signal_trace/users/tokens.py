@@ -0,0 +1,159 @@
+"""
+JWT token classes.
+
+Tokens carry a few user claims besides user_id so that, with
+JWT_STATELESS_AUTH enabled, requests can be authenticated from the token
+alone (see users.authentication.CachedJWTAuthentication). Mint tokens
+through these classes rather than simplejwt's.
+
+Revocation: every token embeds the user's token generation (GENERATION_CLAIM).
+Logging out or changing the password bumps User.token_generation, which
+revokes all of the user's tokens at once; the current generation is read
+from the auth cache (users/auth_cache.py), so checking it costs no query.
+
+Rotation: refresh tokens carry the id of their family (the jti of the
+first token issued at login) and their position in it. Rotating advances
+the family's row with one conditional UPDATE (RefreshTokenFamily.advance);
+a token that was already rotated fails that UPDATE, which means it was
+replayed, and all of the user's tokens are revoked.
+
+The token blacklist (OutstandingToken/BlacklistedToken rows for every issued
+and rotated refresh token) is only used when JWT_USE_BLACKLIST is on.
+`prune_tokens` deletes expired rows from both schemes.
+"""
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt import tokens
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+from . import auth_cache
+
+# User fields copied into tokens, in addition to simplejwt's user_id
+USER_CLAIMS = ('email', 'is_staff')
+
+GENERATION_CLAIM = 'gen'
+FAMILY_CLAIM = 'fam'
+SEQUENCE_CLAIM = 'seq'
+
+
+def is_current_generation(payload, generation):
+    """Tokens issued before generations existed count as generation 0."""
+    return payload.get(GENERATION_CLAIM, 0) == generation
+
+
+class UserClaimsMixin:
+    @classmethod
+    def for_user(cls, user):
+        if issubclass(cls, tokens.BlacklistMixin) and not settings.JWT_USE_BLACKLIST:
+            # Skip BlacklistMixin.for_user, which writes an OutstandingToken row
+            token = super(tokens.BlacklistMixin, cls).for_user(user)
+        else:
+            token = super().for_user(user)
+        for claim in USER_CLAIMS:
+            token[claim] = getattr(user, claim)
+        token[GENERATION_CLAIM] = user.token_generation
+        return token
+
+
+class RefreshToken(UserClaimsMixin, tokens.RefreshToken):
+    """
+    Refresh token with user claims (copied into its access tokens).
+
+    Verification rejects tokens from an old generation, and only consults
+    the blacklist table when JWT_USE_BLACKLIST is on.
+    """
+    no_copy_claims = (*tokens.RefreshToken.no_copy_claims, FAMILY_CLAIM, SEQUENCE_CLAIM)
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token[FAMILY_CLAIM] = token[api_settings.JTI_CLAIM]
+        token[SEQUENCE_CLAIM] = 0
+        return token
+
+    def rotate(self, user):
+        """
+        Exchange this token for the next one in its family.
+
+        Args:
+            user: Token owner (current state, so fresh claims are issued)
+
+        Returns:
+            RefreshToken: Replacement token
+
+        Raises:
+            TokenError: If this token was already rotated; every token the
+                user holds is revoked
+        """
+        from .models import RefreshTokenFamily
+
+        family = self.payload.get(FAMILY_CLAIM, self.payload[api_settings.JTI_CLAIM])
+        sequence = self.payload.get(SEQUENCE_CLAIM, 0)
+
+        replacement = type(self).for_user(user)
+        replacement[FAMILY_CLAIM] = family
+        replacement[SEQUENCE_CLAIM] = sequence + 1
+
+        expires_at = datetime_from_epoch(replacement['exp'])
+        if not RefreshTokenFamily.advance(family, user.pk, sequence, expires_at):
+            user.revoke_tokens()
+            raise TokenError(_("Refresh token reuse detected; all sessions have been revoked"))
+
+        if settings.JWT_USE_BLACKLIST:
+            self.blacklist()
+        return replacement
+
+    def verify(self, *args, **kwargs):
+        if settings.JWT_USE_BLACKLIST:
+            super().verify(*args, **kwargs)
+        else:
+            super(tokens.BlacklistMixin, self).verify(*args, **kwargs)
+        self.check_generation()
+
+    def check_generation(self):
+        """Raise TokenError if the user's tokens were revoked since this one was issued."""
+        try:
+            generation = auth_cache.get_token_generation(self.payload[api_settings.USER_ID_CLAIM])
+        except (KeyError, get_user_model().DoesNotExist):
+            raise TokenError(_("Token is invalid or expired"))
+        if not is_current_generation(self.payload, generation):
+            raise TokenError(_("Token has been revoked"))
+
+
+class AccessToken(UserClaimsMixin, tokens.AccessToken):
+    """Access token with user claims (generation checked at authentication)."""
+
+
+def prune_expired_tokens(batch_size=1000):
+    """
+    Delete expired outstanding tokens and their blacklist entries in chunks.
+
+    Each chunk is its own short DELETE, so pruning a large backlog never
+    holds long locks on the token tables.
+
+    Args:
+        batch_size: Outstanding tokens deleted per statement
+
+    Returns:
+        int: Number of outstanding tokens deleted
+    """
+    from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+
+    now = timezone.now()
+    deleted = 0
+    while True:
+        ids = list(
+            OutstandingToken.objects.filter(expires_at__lt=now)
+            .order_by('id')
+            .values_list('id', flat=True)[:batch_size]
+        )
+        if not ids:
+            return deleted
+        # Cascades to BlacklistedToken with one DELETE ... WHERE token_id IN
+        OutstandingToken.objects.filter(id__in=ids).delete()
+        deleted += len(ids)
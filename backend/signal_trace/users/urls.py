@@ -2,21 +2,36 @@
 URL configuration for users app API endpoints.
 
 All views are class-based views following Django REST Framework best practices.
+With AUTH_ASYNC_VIEWS enabled (ASGI deployments), the endpoints that hash
+passwords are served by their native async counterparts.
 """
 
+from django.conf import settings
 from django.urls import path
 from . import views
 
 app_name = 'users'
 
+if settings.AUTH_ASYNC_VIEWS:
+    signup_view = views.AsyncSignupView
+    signup_verify_view = views.AsyncSignupOTPVerificationView
+    login_view = views.AsyncLoginView
+    password_change_view = views.AsyncPasswordChangeView
+else:
+    signup_view = views.SignupView
+    signup_verify_view = views.SignupOTPVerificationView
+    login_view = views.LoginView
+    password_change_view = views.PasswordChangeView
+
 urlpatterns = [
-    path('api/auth/signup/', views.SignupView.as_view(), name='signup'),
-    path('api/auth/signup/verify/', views.SignupOTPVerificationView.as_view(), name='signup-verify'),
+    path('api/auth/signup/', signup_view.as_view(), name='signup'),
+    path('api/auth/signup/verify/', signup_verify_view.as_view(), name='signup-verify'),
     path('api/auth/signup/otp/resend/', views.ResendOTPView.as_view(), name='signup-resend-otp'),
-    path('api/auth/login/', views.LoginView.as_view(), name='login'),
+    path('api/auth/login/', login_view.as_view(), name='login'),
+    path('api/auth/token/refresh/', views.TokenRefreshView.as_view(), name='token-refresh'),
     path('api/auth/logout/', views.LogoutView.as_view(), name='logout'),
     path('api/auth/profile/', views.UserProfileView.as_view(), name='profile'),
-    path('api/auth/password/change/', views.PasswordChangeView.as_view(), name='password-change'),
+    path('api/auth/password/change/', password_change_view.as_view(), name='password-change'),
     path('api/auth/password/forgot/', views.ForgotPasswordView.as_view(), name='forgot-password'),
     path('api/auth/password/forgot/verify/', views.VerifyPasswordResetOTPView.as_view(), name='verify-password-reset-otp'),
     path('api/auth/password/forgot/otp/resend/', views.ResendOTPView.as_view(), name='password-reset-resend-otp'),
@@ -13,16 +13,24 @@ This keeps views thin and makes the codebase more maintainable.
 Following Django REST Framework best practices with class-based views.
 """
 
+from asgiref.sync import sync_to_async
 from rest_framework import status
 from rest_framework.views import APIView
+from rest_framework.exceptions import ValidationError as DRFValidationError
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import RefreshToken
+from core.throttling import SlidingWindowThrottle
+from core.views import AsyncAPIView
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from .tokens import RefreshToken
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
 
 from .serializers import (
     UserSignupSerializer,
     UserLoginSerializer,
+    TokenRefreshSerializer,
     UserSerializer,
     UserUpdateSerializer,
     PasswordChangeSerializer,
@@ -33,6 +41,7 @@ from .serializers import (
     ResetPasswordSerializer
 )
 from .utils import success_response, error_response
+from . import hashing
 
 User = get_user_model()
 
@@ -45,6 +54,8 @@ class SignupView(APIView):
     and model method for business logic.
     """
     permission_classes = [AllowAny]
+    throttle_classes = [SlidingWindowThrottle]
+    throttle_scope = 'signup'
 
     def post(self, request):
         """Handle POST request for user registration - generates OTP."""
@@ -84,6 +95,8 @@ class LoginView(APIView):
     and model method for authentication business logic.
     """
     permission_classes = [AllowAny]
+    throttle_classes = [SlidingWindowThrottle]
+    throttle_scope = 'login'
 
     def post(self, request):
         """Handle POST request for user login."""
@@ -92,6 +105,8 @@ class LoginView(APIView):
         if serializer.is_valid():
             # Serializer validates and gets user using model's authenticate_user()
             user = serializer.validated_data['user']
+            if jwt_settings.UPDATE_LAST_LOGIN:
+                user.record_login()
             
             # Generate JWT tokens
             refresh = RefreshToken.for_user(user)
@@ -117,16 +132,58 @@ class LoginView(APIView):
         )
 
 
+class TokenRefreshView(APIView):
+    """
+    Token refresh endpoint.
+    
+    Class-based view that exchanges a refresh token for a new access token
+    (and, with rotation on, a new refresh token) without re-running the
+    password hasher.
+    """
+    permission_classes = [AllowAny]
+    authentication_classes = []
+
+    def post(self, request):
+        """Handle POST request to refresh tokens."""
+        serializer = TokenRefreshSerializer(data=request.data)
+        
+        if serializer.is_valid():
+            return success_response(
+                data={'tokens': serializer.validated_data['tokens']},
+                message='Token refreshed successfully.'
+            )
+        
+        # Invalid, expired or revoked tokens are 401; malformed requests 400
+        token_rejected = serializer.errors.get('refresh', [None])[0]
+        return error_response(
+            message='Token refresh failed.',
+            errors=serializer.errors,
+            status_code=(
+                status.HTTP_401_UNAUTHORIZED
+                if getattr(token_rejected, 'code', None) == 'token_not_valid'
+                else status.HTTP_400_BAD_REQUEST
+            )
+        )
+
+
 class LogoutView(APIView):
     """
     User logout endpoint.
     
-    Class-based view that blacklists the refresh token to invalidate the session.
+    Class-based view that revokes the user's tokens by bumping their token
+    generation, which logs them out on every device with one UPDATE. With
+    JWT_USE_BLACKLIST on, only the given refresh token is blacklisted.
     """
     permission_classes = [IsAuthenticated]
 
     def post(self, request):
         """Handle POST request for user logout."""
+        if not settings.JWT_USE_BLACKLIST:
+            request.user.revoke_tokens()
+            return success_response(
+                message='Logout successful.'
+            )
+        
         try:
             refresh_token = request.data.get('refresh_token')
             if refresh_token:
@@ -168,7 +225,15 @@ class UserProfileView(APIView):
         serializer = UserUpdateSerializer(request.user, data=request.data, partial=True)
         
         if serializer.is_valid():
-            serializer.save()
+            try:
+                serializer.save()
+            except DRFValidationError as exc:
+                # Email taken, detected by the database on save
+                return error_response(
+                    message='Profile update failed. Please check your information.',
+                    errors=exc.detail,
+                    status_code=status.HTTP_400_BAD_REQUEST
+                )
             user_serializer = UserSerializer(request.user)
             return success_response(
                 data={'user': user_serializer.data},
@@ -195,8 +260,17 @@ class PasswordChangeView(APIView):
         serializer = PasswordChangeSerializer(data=request.data, context={'request': request})
         
         if serializer.is_valid():
-            serializer.save()
+            # Changing the password revokes every existing token, including
+            # the one used for this request, so hand back a fresh pair
+            user = serializer.save()
+            refresh = RefreshToken.for_user(user)
             return success_response(
+                data={
+                    'tokens': {
+                        'refresh': str(refresh),
+                        'access': str(refresh.access_token),
+                    }
+                },
                 message='Password changed successfully.'
             )
         
@@ -215,6 +289,8 @@ class SignupOTPVerificationView(APIView):
     Accepts signup data along with OTP for verification.
     """
     permission_classes = [AllowAny]
+    throttle_classes = [SlidingWindowThrottle]
+    throttle_scope = 'otp_verify'
 
     def post(self, request):
         """Handle POST request for OTP verification and user creation."""
@@ -246,16 +322,22 @@ class SignupOTPVerificationView(APIView):
             validated_data.pop('password_confirm')
             password = validated_data.pop('password')
             
-            user = User.create_user_with_email(
-                email=validated_data['email'],
-                password=password,
-                first_name=validated_data.get('first_name'),
-                last_name=validated_data.get('last_name')
-            )
-            
-            # Activate user after OTP verification
-            user.is_active = True
-            user.save()
+            try:
+                # The OTP is verified, so the user is created active
+                user = User.create_user_with_email(
+                    email=validated_data['email'],
+                    password=password,
+                    first_name=validated_data.get('first_name'),
+                    last_name=validated_data.get('last_name'),
+                    is_active=True
+                )
+            except ValidationError as exc:
+                # The email was taken between validation and the insert
+                return error_response(
+                    message='User creation failed. Please check your information.',
+                    errors=exc.message_dict,
+                    status_code=status.HTTP_400_BAD_REQUEST
+                )
             
             # Generate JWT tokens
             refresh = RefreshToken.for_user(user)
@@ -288,6 +370,8 @@ class ResendOTPView(APIView):
     Class-based view that resends OTP for signup or password reset.
     """
     permission_classes = [AllowAny]
+    throttle_classes = [SlidingWindowThrottle]
+    throttle_scope = 'otp_resend'
 
     def post(self, request):
         """Handle POST request to resend OTP."""
@@ -320,6 +404,8 @@ class ForgotPasswordView(APIView):
     Class-based view that generates OTP for password reset.
     """
     permission_classes = [AllowAny]
+    throttle_classes = [SlidingWindowThrottle]
+    throttle_scope = 'password_forgot'
 
     def post(self, request):
         """Handle POST request to send password reset OTP."""
@@ -351,6 +437,8 @@ class VerifyPasswordResetOTPView(APIView):
     Class-based view that verifies OTP for password reset.
     """
     permission_classes = [AllowAny]
+    throttle_classes = [SlidingWindowThrottle]
+    throttle_scope = 'otp_verify'
 
     def post(self, request):
         """Handle POST request to verify password reset OTP."""
@@ -376,6 +464,8 @@ class ResetPasswordView(APIView):
     Class-based view that resets password after OTP verification.
     """
     permission_classes = [AllowAny]
+    throttle_classes = [SlidingWindowThrottle]
+    throttle_scope = 'otp_verify'
 
     def post(self, request):
         """Handle POST request to reset password with OTP."""
@@ -401,6 +491,8 @@ class VerifyInactiveUserOTPView(APIView):
     This allows users to verify their email and activate their account later.
     """
     permission_classes = [AllowAny]
+    throttle_classes = [SlidingWindowThrottle]
+    throttle_scope = 'otp_verify'
 
     def post(self, request):
         """Handle POST request to verify OTP for inactive user."""
@@ -416,7 +508,7 @@ class VerifyInactiveUserOTPView(APIView):
         email = serializer.validated_data['email']
         
         try:
-            user = User.objects.get(email=email)
+            user = User.get_by_email(email)
             
             # Check if user is already active
             if user.is_active:
@@ -426,8 +518,7 @@ class VerifyInactiveUserOTPView(APIView):
                 )
             
             # Activate user after OTP verification
-            user.is_active = True
-            user.save()
+            user.activate()
             
             # Generate JWT tokens
             refresh = RefreshToken.for_user(user)
@@ -451,3 +542,189 @@ class VerifyInactiveUserOTPView(APIView):
                 message='No user found with this email address.',
                 status_code=status.HTTP_404_NOT_FOUND
             )
+
+
+class AsyncSignupView(AsyncAPIView):
+    """
+    Native async version of SignupView for ASGI deployments.
+    
+    Password validation runs in the password hashing pool (users/hashing.py).
+    Routed instead of SignupView when AUTH_ASYNC_VIEWS is on.
+    """
+    authentication_required = False
+    throttle_classes = [SlidingWindowThrottle]
+    throttle_scope = 'signup'
+
+    async def post(self, request):
+        """Handle POST request for user registration - generates OTP."""
+        serializer = UserSignupSerializer(data=request.data)
+        
+        if await hashing.run(serializer.is_valid):
+            result = await sync_to_async(serializer.save)()
+            
+            return success_response(
+                data={
+                    'email': result['email'],
+                    'message': 'OTP sent to your email. Please verify to complete registration.'
+                },
+                message='OTP sent successfully. Please check your email.',
+                status_code=status.HTTP_200_OK
+            )
+        
+        return error_response(
+            message='Registration failed. Please check your information.',
+            errors=serializer.errors,
+            status_code=status.HTTP_400_BAD_REQUEST
+        )
+
+
+class AsyncLoginView(AsyncAPIView):
+    """
+    Native async version of LoginView for ASGI deployments.
+    
+    The credential check runs in the password hashing pool (users/hashing.py),
+    so a burst of logins neither blocks the event loop nor takes over the
+    threads other views run on; past the pool's queue, logins get a 503.
+    Routed instead of LoginView when AUTH_ASYNC_VIEWS is on.
+    """
+    authentication_required = False
+    throttle_classes = [SlidingWindowThrottle]
+    throttle_scope = 'login'
+
+    async def post(self, request):
+        """Handle POST request for user login."""
+        serializer = UserLoginSerializer(data=request.data)
+        
+        if await hashing.run(serializer.is_valid):
+            user = serializer.validated_data['user']
+            if jwt_settings.UPDATE_LAST_LOGIN:
+                user.record_login()
+            
+            refresh = await sync_to_async(RefreshToken.for_user)(user)
+            
+            user_serializer = UserSerializer(user)
+            return success_response(
+                data={
+                    'user': user_serializer.data,
+                    'tokens': {
+                        'refresh': str(refresh),
+                        'access': str(refresh.access_token),
+                    }
+                },
+                message='Login successful.'
+            )
+        
+        return error_response(
+            message='Login failed. Please check your credentials.',
+            errors=serializer.errors,
+            status_code=status.HTTP_400_BAD_REQUEST
+        )
+
+
+class AsyncPasswordChangeView(AsyncAPIView):
+    """
+    Native async version of PasswordChangeView for ASGI deployments.
+    
+    Checking the old password and hashing the new one run in the password
+    hashing pool (users/hashing.py).
+    Routed instead of PasswordChangeView when AUTH_ASYNC_VIEWS is on.
+    """
+
+    async def post(self, request):
+        """Handle POST request to change password."""
+        serializer = PasswordChangeSerializer(data=request.data, context={'request': request})
+        
+        if await hashing.run(serializer.is_valid):
+            user = await hashing.run(serializer.save)
+            refresh = await sync_to_async(RefreshToken.for_user)(user)
+            return success_response(
+                data={
+                    'tokens': {
+                        'refresh': str(refresh),
+                        'access': str(refresh.access_token),
+                    }
+                },
+                message='Password changed successfully.'
+            )
+        
+        return error_response(
+            message='Password change failed. Please check your information.',
+            errors=serializer.errors,
+            status_code=status.HTTP_400_BAD_REQUEST
+        )
+
+
+class AsyncSignupOTPVerificationView(AsyncAPIView):
+    """
+    Native async version of SignupOTPVerificationView for ASGI deployments.
+    
+    Password validation and hashing for the new account run in the password
+    hashing pool (users/hashing.py).
+    Routed instead of SignupOTPVerificationView when AUTH_ASYNC_VIEWS is on.
+    """
+    authentication_required = False
+    throttle_classes = [SlidingWindowThrottle]
+    throttle_scope = 'otp_verify'
+
+    async def post(self, request):
+        """Handle POST request for OTP verification and user creation."""
+        otp_serializer = OTPVerificationSerializer(data=request.data)
+        
+        if not await sync_to_async(otp_serializer.is_valid)():
+            return error_response(
+                message='OTP verification failed.',
+                errors=otp_serializer.errors,
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+        
+        signup_data = {
+            'email': request.data.get('email'),
+            'password': request.data.get('password'),
+            'password_confirm': request.data.get('password_confirm'),
+            'first_name': request.data.get('first_name'),
+            'last_name': request.data.get('last_name'),
+        }
+        
+        signup_serializer = UserSignupSerializer(data=signup_data)
+        
+        if await hashing.run(signup_serializer.is_valid):
+            validated_data = signup_serializer.validated_data
+            validated_data.pop('password_confirm')
+            password = validated_data.pop('password')
+            
+            try:
+                user = await hashing.run(
+                    User.create_user_with_email,
+                    email=validated_data['email'],
+                    password=password,
+                    first_name=validated_data.get('first_name'),
+                    last_name=validated_data.get('last_name'),
+                    is_active=True
+                )
+            except ValidationError as exc:
+                return error_response(
+                    message='User creation failed. Please check your information.',
+                    errors=exc.message_dict,
+                    status_code=status.HTTP_400_BAD_REQUEST
+                )
+            
+            refresh = await sync_to_async(RefreshToken.for_user)(user)
+            
+            user_serializer = UserSerializer(user)
+            return success_response(
+                data={
+                    'user': user_serializer.data,
+                    'tokens': {
+                        'refresh': str(refresh),
+                        'access': str(refresh.access_token),
+                    }
+                },
+                message='User registered successfully.',
+                status_code=status.HTTP_201_CREATED
+            )
+        
+        return error_response(
+            message='User creation failed. Please check your information.',
+            errors=signup_serializer.errors,
+            status_code=status.HTTP_400_BAD_REQUEST
+        )
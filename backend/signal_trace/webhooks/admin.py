@@ -0,0 +1,184 @@
+"""
+Django Admin configuration for webhooks.
+
+Provides visibility into registered endpoints and their delivery health,
+and into the outbox, with a bulk action to requeue dead-lettered events.
+"""
+
+from django.contrib import admin
+from unfold.admin import ModelAdmin
+from django.utils.html import format_html
+
+from .models import WebhookEndpoint, WebhookEvent
+
+
+@admin.register(WebhookEndpoint)
+class WebhookEndpointAdmin(ModelAdmin):
+    """
+    Admin interface for WebhookEndpoint model.
+
+    The health column shows whether an endpoint is delivering, backing off
+    after failures, or disabled.
+    """
+
+    # Unfold configuration
+    icon_name = "webhook"
+
+    list_display = (
+        'url',
+        'owner',
+        'events',
+        'health_display',
+        'last_delivery_at',
+        'created_at',
+    )
+
+    list_filter = (
+        'is_active',
+    )
+
+    search_fields = (
+        'url',
+        'owner__email',
+    )
+
+    readonly_fields = (
+        'secret',
+        'consecutive_failures',
+        'retry_at',
+        'last_delivery_at',
+        'last_error',
+        'lease_owner',
+        'lease_expires_at',
+        'created_at',
+        'updated_at',
+    )
+
+    ordering = ('-created_at',)
+
+    fieldsets = (
+        ('Endpoint', {
+            'fields': ('owner', 'url', 'events', 'is_active', 'secret')
+        }),
+        ('Delivery', {
+            'fields': (
+                'consecutive_failures',
+                'retry_at',
+                'last_delivery_at',
+                'last_error',
+                'lease_owner',
+                'lease_expires_at',
+            )
+        }),
+        ('Timestamps', {
+            'fields': ('created_at', 'updated_at'),
+            'classes': ('collapse',)
+        }),
+    )
+
+    def health_display(self, obj):
+        """Display delivery health with color coding."""
+        if not obj.is_active:
+            color, label = 'gray', 'Disabled'
+        elif obj.consecutive_failures:
+            color, label = 'red', f'Failing ({obj.consecutive_failures})'
+        else:
+            color, label = 'green', 'Healthy'
+        return format_html(
+            '<span style="color: {}; font-weight: bold;">● {}</span>',
+            color,
+            label
+        )
+    health_display.short_description = "Health"
+    health_display.admin_order_field = 'consecutive_failures'
+
+
+@admin.register(WebhookEvent)
+class WebhookEventAdmin(ModelAdmin):
+    """
+    Admin interface for WebhookEvent model.
+
+    Events are written by the application, so they are read-only here.
+    """
+
+    # Unfold configuration
+    icon_name = "outbox"
+
+    list_display = (
+        'id',
+        'event_type',
+        'endpoint',
+        'status_display',
+        'attempts',
+        'created_at',
+        'delivered_at',
+    )
+
+    list_filter = (
+        'status',
+        'event_type',
+    )
+
+    search_fields = (
+        'endpoint__url',
+        'endpoint__owner__email',
+    )
+
+    list_select_related = ('endpoint',)
+
+    readonly_fields = (
+        'endpoint',
+        'event_type',
+        'payload',
+        'status',
+        'attempts',
+        'delivered_at',
+        'last_error',
+        'created_at',
+        'updated_at',
+    )
+
+    ordering = ('-id',)
+
+    fieldsets = (
+        ('Event', {
+            'fields': ('endpoint', 'event_type', 'payload')
+        }),
+        ('Delivery', {
+            'fields': ('status', 'attempts', 'delivered_at', 'last_error')
+        }),
+        ('Timestamps', {
+            'fields': ('created_at', 'updated_at'),
+            'classes': ('collapse',)
+        }),
+    )
+
+    actions = ['requeue_events']
+
+    def status_display(self, obj):
+        """Display status with color coding."""
+        colors = {
+            'pending': 'blue',
+            'delivered': 'green',
+            'dead': 'red',
+        }
+        return format_html(
+            '<span style="color: {}; font-weight: bold;">● {}</span>',
+            colors.get(obj.status, 'gray'),
+            obj.get_status_display()
+        )
+    status_display.short_description = "Status"
+    status_display.admin_order_field = 'status'
+
+    @admin.action(description='Requeue selected dead events')
+    def requeue_events(self, request, queryset):
+        """Bulk action to send dead events back to their endpoint's queue."""
+        count = WebhookEvent.requeue(queryset)
+        self.message_user(
+            request,
+            f'{count} event(s) were requeued. Events that were not dead were skipped.'
+        )
+
+    def has_add_permission(self, request):
+        """Disable adding events manually through admin."""
+        return False
@@ -0,0 +1,123 @@
+"""
+Webhook delivery.
+
+deliver_endpoint() drains one endpoint's outbox: it takes the endpoint's
+lease, then POSTs pending events in id order, up to WEBHOOKS['batch_size']
+per request, as one signed JSON body:
+
+    {"endpoint": 3, "delivery": "<uuid>", "events": [
+        {"id": 41, "type": "prospect.hot", "created_at": "...", "data": {...}},
+        ...
+    ]}
+
+Any 2xx response acknowledges the whole batch. Anything else leaves the
+batch pending and backs the endpoint off (see WebhookEndpoint.record_failure),
+so a batch is retried until it succeeds or is dead-lettered before any
+later event is sent. Receivers should de-duplicate on event id: a batch
+whose acknowledgement was lost is delivered again.
+
+The endpoint's host is resolved and checked before every batch and the
+request goes to the checked address (see destinations.py). Only the status
+code or the error class is recorded as the failure, never the response
+body, since endpoint owners can read it back.
+"""
+
+import json
+import logging
+import os
+import socket
+import uuid
+
+import httpx
+from django.conf import settings
+
+from core.http import CircuitOpenError, get_client
+
+from .destinations import UnsafeDestination, pinned, resolve
+from .models import WebhookEndpoint
+from .signing import DELIVERY_HEADER, SIGNATURE_HEADER, sign
+
+logger = logging.getLogger(__name__)
+
+
+def worker_id():
+    return f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}'
+
+
+def post_batch(endpoint, events):
+    """
+    Send one signed batch.
+
+    Returns:
+        str: Empty string on success, otherwise an error description
+    """
+    delivery = str(uuid.uuid4())
+    body = json.dumps({
+        'endpoint': endpoint.pk,
+        'delivery': delivery,
+        'events': [event.as_message() for event in events],
+    }, separators=(',', ':')).encode()
+    headers = {
+        'Content-Type': 'application/json',
+        'User-Agent': 'SignalTrace-Webhooks/1.0',
+        SIGNATURE_HEADER: sign(endpoint.secret, body),
+        DELIVERY_HEADER: delivery,
+    }
+    try:
+        url, host_header, extensions = pinned(endpoint.url, resolve(endpoint.url))
+    except UnsafeDestination as exc:
+        return f'{type(exc).__name__}: {exc}'
+    try:
+        response = get_client('webhooks').post(
+            url, content=body, headers={**headers, **host_header}, extensions=extensions,
+        )
+    except (httpx.HTTPError, CircuitOpenError) as exc:
+        return type(exc).__name__
+    if not 200 <= response.status_code < 300:
+        return f'HTTP {response.status_code}'
+    return ''
+
+
+def deliver_endpoint(endpoint_id, max_batches=None):
+    """
+    Deliver pending events for one endpoint.
+
+    Args:
+        endpoint_id: Endpoint ID
+        max_batches: Batches to send before handing back (default: WEBHOOKS['max_batches'])
+
+    Returns:
+        dict: {'acquired', 'delivered', 'failed', 'dead', 'more'}; `more` is
+        True when events are left and the endpoint is not backing off
+    """
+    config = settings.WEBHOOKS
+    max_batches = max_batches or config['max_batches']
+    owner = worker_id()
+    result = {'acquired': False, 'delivered': 0, 'failed': 0, 'dead': 0, 'more': False}
+
+    endpoint = WebhookEndpoint.acquire(endpoint_id, owner, config['lease'])
+    if endpoint is None:
+        return result
+    result['acquired'] = True
+
+    try:
+        for _ in range(max_batches):
+            events = endpoint.pending_events(config['batch_size'])
+            if not events:
+                return result
+            error = post_batch(endpoint, events)
+            if error:
+                result['failed'] += len(events)
+                result['dead'] += endpoint.record_failure(events, error)
+                logger.warning(
+                    'Webhook delivery to endpoint %s failed (%s consecutive): %s',
+                    endpoint.pk, endpoint.consecutive_failures, error,
+                )
+                return result
+            endpoint.record_success(events)
+            endpoint.consecutive_failures = 0
+            result['delivered'] += len(events)
+        result['more'] = bool(endpoint.pending_events(1))
+        return result
+    finally:
+        endpoint.release(owner)
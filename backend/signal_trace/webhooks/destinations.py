@@ -0,0 +1,84 @@
+"""
+Destination checks for webhook URLs.
+
+Webhook URLs are supplied by users, so without a check any account could
+make the delivery worker POST to loopback, the private network or the cloud
+metadata address. resolve() looks up a URL's host and refuses it unless
+every address it resolves to is public. It runs when an endpoint is
+registered and again before every delivery, since DNS can change in
+between; the delivery then connects to the address that was checked
+(pinned()) instead of resolving the name a second time.
+
+WEBHOOKS['allow_private_networks'] turns the check off for local development
+(e.g. `manage.py webhook_receiver` on 127.0.0.1).
+"""
+
+import ipaddress
+import socket
+
+import httpx
+from django.conf import settings
+
+
+class UnsafeDestination(Exception):
+    """Raised for a webhook URL that does not resolve to public addresses only."""
+
+
+def is_public(address):
+    """True for a globally routable unicast address."""
+    ip = ipaddress.ip_address(address)
+    if ip.version == 6 and ip.ipv4_mapped is not None:
+        ip = ip.ipv4_mapped
+    return ip.is_global and not (ip.is_multicast or ip.is_reserved)
+
+
+def resolve(url):
+    """
+    Resolve a webhook URL's host and check every address is public.
+
+    Args:
+        url: Webhook URL
+
+    Returns:
+        str: Address to connect to
+
+    Raises:
+        UnsafeDestination: If the host cannot be resolved or any of its
+            addresses is private, loopback, link-local, reserved or multicast
+    """
+    try:
+        parsed = httpx.URL(url)
+    except httpx.InvalidURL:
+        raise UnsafeDestination("URL is not valid.")
+    if parsed.scheme not in ('http', 'https') or not parsed.host:
+        raise UnsafeDestination("URL must be an http(s) URL with a host.")
+    port = parsed.port or (443 if parsed.scheme == 'https' else 80)
+    try:
+        infos = socket.getaddrinfo(parsed.raw_host.decode('ascii'), port, type=socket.SOCK_STREAM)
+    except (socket.gaierror, UnicodeError):
+        raise UnsafeDestination("Host could not be resolved.")
+    # Scope ids ('fe80::1%eth0') are dropped; such addresses are link-local anyway
+    addresses = list(dict.fromkeys(info[4][0].split('%')[0] for info in infos))
+    if not addresses:
+        raise UnsafeDestination("Host could not be resolved.")
+    if not settings.WEBHOOKS['allow_private_networks'] and not all(map(is_public, addresses)):
+        raise UnsafeDestination("Host resolves to a private or reserved address.")
+    return addresses[0]
+
+
+def pinned(url, address):
+    """
+    Request arguments that connect to `address` on behalf of `url`.
+
+    The Host header and the TLS server name (SNI and certificate check) stay
+    those of the URL's host.
+
+    Returns:
+        tuple: (url, headers, extensions)
+    """
+    parsed = httpx.URL(url)
+    return (
+        parsed.copy_with(host=address),
+        {'Host': parsed.netloc.decode('ascii')},
+        {'sni_hostname': parsed.raw_host.decode('ascii')},
+    )
@@ -0,0 +1,93 @@
+"""
+Local webhook receiver for development and testing.
+
+Listens for deliveries, verifies their signatures, and prints each batch.
+It also checks per-endpoint ordering: event ids must increase, and a
+redelivered batch (ids already seen) is reported as a duplicate. Failures
+can be simulated to exercise retries and backoff.
+
+Usage:
+    python manage.py webhook_receiver --port 9000 --secret <endpoint secret>
+    python manage.py webhook_receiver --port 9000 --secret ... --fail-rate 0.3
+    python manage.py webhook_receiver --port 9000 --secret ... --fail-first 3
+
+Register http://127.0.0.1:9000/ as the endpoint URL (DEBUG allows plain HTTP;
+WEBHOOKS_ALLOW_PRIVATE_NETWORKS=True allows the loopback address).
+"""
+
+import json
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.core.management.base import BaseCommand
+
+from webhooks.signing import DELIVERY_HEADER, SIGNATURE_HEADER, verify_signature
+
+
+class Command(BaseCommand):
+    help = 'Run a local HTTP server that verifies and prints webhook deliveries.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--port', type=int, default=9000, help='Port to listen on.')
+        parser.add_argument('--secret', required=True, help="Endpoint signing secret.")
+        parser.add_argument('--fail-rate', type=float, default=0.0, help='Fraction of deliveries to answer with 500.')
+        parser.add_argument('--fail-first', type=int, default=0, help='Answer the first N deliveries with 500.')
+
+    def handle(self, *args, **options):
+        command = self
+        lock = threading.Lock()
+        state = {'received': 0, 'last_event_id': {}}
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                if not verify_signature(options['secret'], self.headers.get(SIGNATURE_HEADER, ''), body):
+                    command.stdout.write(command.style.ERROR('Rejected delivery: bad signature'))
+                    return self.reply(401)
+
+                with lock:
+                    state['received'] += 1
+                    fail = state['received'] <= options['fail_first'] or random.random() < options['fail_rate']
+                    message = json.loads(body)
+                    if fail:
+                        command.stdout.write(command.style.WARNING(
+                            f"Failing delivery {self.headers.get(DELIVERY_HEADER)} "
+                            f"({len(message['events'])} events)"
+                        ))
+                        return self.reply(500)
+                    command.report(message, state['last_event_id'])
+                return self.reply(200)
+
+            def reply(self, status):
+                self.send_response(status)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(('127.0.0.1', options['port']), Handler)
+        self.stdout.write(f"Listening on http://127.0.0.1:{options['port']}/ (Ctrl+C to stop)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+
+    def report(self, message, last_event_id):
+        """Print a batch and check its ordering against earlier batches."""
+        endpoint = message['endpoint']
+        ids = [event['id'] for event in message['events']]
+        last = last_event_id.get(endpoint, 0)
+        if ids and ids[0] <= last:
+            note = self.style.WARNING(' duplicate (redelivered batch)')
+        elif ids != sorted(ids):
+            note = self.style.ERROR(' OUT OF ORDER')
+        else:
+            note = ''
+        last_event_id[endpoint] = max([last, *ids])
+        self.stdout.write(f"endpoint {endpoint}: {len(ids)} events {ids[:1]}..{ids[-1:]}{note}")
+        for event in message['events']:
+            self.stdout.write(f"  #{event['id']} {event['type']} {json.dumps(event['data'])[:200]}")
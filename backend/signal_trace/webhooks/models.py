@@ -0,0 +1,360 @@
+import random
+import secrets
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+from core.models import BaseDateTimeModel
+
+
+def generate_secret():
+    return secrets.token_urlsafe(32)
+
+
+class EventType(models.TextChoices):
+    PROSPECT_HOT = "prospect.hot", "Prospect turned hot"
+    FUNDING_SIGNAL = "signal.funding", "Funding signal received"
+    PING = "ping", "Ping"
+
+
+# Event types an endpoint can subscribe to (ping is only sent on request)
+SUBSCRIBABLE_EVENTS = [EventType.PROSPECT_HOT.value, EventType.FUNDING_SIGNAL.value]
+
+
+def default_events():
+    return list(SUBSCRIBABLE_EVENTS)
+
+
+class WebhookEndpoint(BaseDateTimeModel):
+    """
+    A user's callback URL and the events it subscribes to.
+
+    The endpoint row also carries delivery state: a lease so that only one
+    worker delivers to an endpoint at a time (which is what keeps events in
+    order), and the backoff applied after failed deliveries.
+    """
+    owner = models.ForeignKey('users.User', on_delete=models.CASCADE, related_name="webhook_endpoints")
+    url = models.URLField(max_length=500)
+    secret = models.CharField(max_length=64, default=generate_secret, help_text="HMAC signing secret")
+    events = models.JSONField(default=default_events, help_text="Subscribed event types")
+    is_active = models.BooleanField(default=True)
+
+    # Backoff: no delivery is attempted before retry_at
+    consecutive_failures = models.PositiveIntegerField(default=0)
+    retry_at = models.DateTimeField(null=True, blank=True)
+    last_delivery_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+
+    # Delivery lease: held by the worker currently delivering to this endpoint
+    lease_owner = models.CharField(max_length=100, blank=True)
+    lease_expires_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return self.url
+
+    @classmethod
+    def create_endpoint(cls, owner, url, events=None):
+        """
+        Business logic: Register a webhook endpoint.
+
+        Args:
+            owner: User who owns the endpoint
+            url: Callback URL
+            events: Subscribed event types (default: all)
+
+        Returns:
+            WebhookEndpoint: Created endpoint, with a fresh signing secret
+        """
+        return cls.objects.create(
+            owner=owner,
+            url=url.strip(),
+            events=list(events) if events else default_events(),
+        )
+
+    def update_endpoint(self, url=None, events=None, is_active=None):
+        """
+        Business logic: Update an endpoint.
+
+        Re-activating an endpoint clears its backoff so pending events are
+        delivered straight away.
+
+        Args:
+            url: Updated callback URL (optional)
+            events: Updated subscribed event types (optional)
+            is_active: Enable or disable delivery (optional)
+
+        Returns:
+            WebhookEndpoint: Updated endpoint
+        """
+        if url is not None:
+            self.url = url.strip()
+        if events is not None:
+            self.events = list(events)
+        if is_active is not None:
+            if is_active and not self.is_active:
+                self.consecutive_failures = 0
+                self.retry_at = None
+            self.is_active = is_active
+        self.save()
+        return self
+
+    def rotate_secret(self):
+        """Business logic: Replace the signing secret."""
+        self.secret = generate_secret()
+        self.save(update_fields=['secret', 'updated_at'])
+        return self.secret
+
+    @classmethod
+    def acquire(cls, endpoint_id, owner, lease_seconds):
+        """
+        Business logic: Try to take the delivery lease for an endpoint.
+
+        The check and the claim are one UPDATE, so at most one worker
+        delivers to an endpoint at a time. Endpoints that are inactive or
+        backing off are not claimable.
+
+        Args:
+            endpoint_id: Endpoint ID
+            owner: Identifier of the delivering worker
+            lease_seconds: How long the lease is held if the worker never reports back
+
+        Returns:
+            WebhookEndpoint or None: Endpoint if the lease was acquired
+        """
+        now = timezone.now()
+        acquired = cls.objects.filter(
+            Q(lease_expires_at__isnull=True) | Q(lease_expires_at__lt=now),
+            Q(retry_at__isnull=True) | Q(retry_at__lte=now),
+            pk=endpoint_id,
+            is_active=True,
+        ).update(lease_owner=owner, lease_expires_at=now + timedelta(seconds=lease_seconds))
+        if not acquired:
+            return None
+        return cls.objects.get(pk=endpoint_id)
+
+    def release(self, owner):
+        """Give up the delivery lease."""
+        WebhookEndpoint.objects.filter(pk=self.pk, lease_owner=owner).update(
+            lease_owner='', lease_expires_at=None,
+        )
+
+    def backoff(self, failures):
+        """Seconds to wait after `failures` consecutive failed deliveries."""
+        config = settings.WEBHOOKS
+        delay = min(config['backoff_base'] * 2 ** (failures - 1), config['backoff_max'])
+        # Jitter spreads retries from endpoints that failed together
+        return delay * random.uniform(0.8, 1.2)
+
+    def pending_events(self, limit):
+        """Oldest undelivered events, in the order they were recorded."""
+        return list(self.outbox.filter(status=WebhookEvent.Status.PENDING).order_by('id')[:limit])
+
+    def record_success(self, events):
+        """
+        Business logic: Mark a delivered batch and reset the backoff.
+
+        Args:
+            events: WebhookEvents in the delivered batch
+        """
+        now = timezone.now()
+        with transaction.atomic():
+            WebhookEvent.objects.filter(pk__in=[event.pk for event in events]).update(
+                status=WebhookEvent.Status.DELIVERED,
+                attempts=models.F('attempts') + 1,
+                delivered_at=now,
+                last_error='',
+            )
+            WebhookEndpoint.objects.filter(pk=self.pk).update(
+                consecutive_failures=0, retry_at=None, last_delivery_at=now, last_error='',
+            )
+
+    def record_failure(self, events, error):
+        """
+        Business logic: Record a failed batch and back the endpoint off.
+
+        The whole batch stays pending and is retried as a unit once retry_at
+        passes, so later events are never delivered ahead of it. Events that
+        have used up WEBHOOKS['max_attempts'] are dead-lettered.
+
+        Args:
+            events: WebhookEvents in the failed batch
+            error: Error description
+
+        Returns:
+            int: Number of events dead-lettered
+        """
+        failures = self.consecutive_failures + 1
+        error = error[:2000]
+        ids = [event.pk for event in events]
+        exhausted = [event.pk for event in events if event.attempts + 1 >= settings.WEBHOOKS['max_attempts']]
+        with transaction.atomic():
+            WebhookEvent.objects.filter(pk__in=ids).update(attempts=models.F('attempts') + 1, last_error=error)
+            WebhookEvent.objects.filter(pk__in=exhausted).update(status=WebhookEvent.Status.DEAD)
+            WebhookEndpoint.objects.filter(pk=self.pk).update(
+                consecutive_failures=failures,
+                retry_at=timezone.now() + timedelta(seconds=self.backoff(failures)),
+                last_error=error,
+            )
+        self.consecutive_failures = failures
+        return len(exhausted)
+
+    @classmethod
+    def due_for_delivery(cls):
+        """Active endpoints with pending events that are not backing off or leased."""
+        now = timezone.now()
+        return cls.objects.filter(
+            Q(lease_expires_at__isnull=True) | Q(lease_expires_at__lt=now),
+            Q(retry_at__isnull=True) | Q(retry_at__lte=now),
+            Exists(WebhookEvent.objects.filter(endpoint=OuterRef('pk'), status=WebhookEvent.Status.PENDING)),
+            is_active=True,
+        )
+
+
+class WebhookEvent(BaseDateTimeModel):
+    """
+    Outbox row: one event awaiting delivery to one endpoint.
+
+    Rows are written in the same transaction as the change that caused them,
+    so an event exists if and only if the change committed. Delivery order
+    per endpoint is id order.
+    """
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        DELIVERED = "delivered", "Delivered"
+        DEAD = "dead", "Dead"
+
+    endpoint = models.ForeignKey(WebhookEndpoint, on_delete=models.CASCADE, related_name="outbox")
+    event_type = models.CharField(max_length=30, choices=EventType.choices)
+    payload = models.JSONField(default=dict)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    delivered_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        ordering = ["-id"]
+        indexes = [
+            # Per-endpoint queue scan: pending events in id order
+            models.Index(fields=["endpoint", "status", "id"], name="webhooks_event_queue_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.event_type} #{self.pk} -> endpoint {self.endpoint_id}"
+
+    def as_message(self):
+        """Event as it appears in a delivery body."""
+        return {
+            'id': self.pk,
+            'type': self.event_type,
+            'created_at': self.created_at.isoformat(),
+            'data': self.payload,
+        }
+
+    @classmethod
+    def record(cls, event_type, payloads_by_owner):
+        """
+        Business logic: Write events to the outbox of every subscribed endpoint.
+
+        Call inside the transaction that makes the change. Delivery jobs are
+        enqueued in the same transaction, so nothing is sent if it rolls back.
+
+        Args:
+            event_type: EventType value
+            payloads_by_owner: Dict of owner ID -> list of event payloads
+
+        Returns:
+            int: Number of outbox rows written
+        """
+        payloads_by_owner = {owner_id: payloads for owner_id, payloads in payloads_by_owner.items() if payloads}
+        if not payloads_by_owner:
+            return 0
+
+        # Subscriptions are filtered here rather than with a JSON lookup,
+        # which SQLite does not support for containment
+        endpoints = [
+            endpoint for endpoint in WebhookEndpoint.objects.filter(
+                owner_id__in=payloads_by_owner, is_active=True,
+            ).only('id', 'owner_id', 'events')
+            if event_type in endpoint.events
+        ]
+        return cls._write(event_type, [
+            (endpoint, payload) for endpoint in endpoints for payload in payloads_by_owner[endpoint.owner_id]
+        ])
+
+    @classmethod
+    def _write(cls, event_type, rows):
+        from .tasks import deliver_webhooks
+
+        if not rows:
+            return 0
+        with transaction.atomic():
+            cls.objects.bulk_create([
+                cls(endpoint_id=endpoint.pk, event_type=event_type, payload=payload)
+                for endpoint, payload in rows
+            ])
+            for endpoint_id in sorted({endpoint.pk for endpoint, _ in rows}):
+                deliver_webhooks.enqueue(endpoint_id=endpoint_id)
+        return len(rows)
+
+    @classmethod
+    def ping(cls, endpoint):
+        """Business logic: Queue a ping event for an endpoint."""
+        return cls._write(EventType.PING, [(endpoint, {'endpoint': endpoint.pk})])
+
+    @classmethod
+    def requeue(cls, events):
+        """
+        Business logic: Put dead events back in their endpoints' queues.
+
+        Args:
+            events: QuerySet of WebhookEvents
+
+        Returns:
+            int: Number of events requeued
+        """
+        from .tasks import deliver_webhooks
+
+        with transaction.atomic():
+            endpoint_ids = set(events.filter(status=cls.Status.DEAD).values_list('endpoint_id', flat=True))
+            count = events.filter(status=cls.Status.DEAD).update(status=cls.Status.PENDING, attempts=0)
+            for endpoint_id in sorted(endpoint_ids):
+                deliver_webhooks.enqueue(endpoint_id=endpoint_id)
+        return count
+
+
+def prospect_hot_payload(prospect_id, full_name, company_name, intent_score, previous_status):
+    return {
+        'prospect': {
+            'id': prospect_id,
+            'full_name': full_name,
+            'company_name': company_name,
+            'intent_score': intent_score,
+            'status': 'hot',
+        },
+        'previous_status': previous_status,
+    }
+
+
+def funding_signal_payload(signal):
+    prospect = signal.prospect
+    return {
+        'signal': {
+            'id': signal.pk,
+            'type': signal.signal_type,
+            'score': signal.score,
+            'reason': signal.reason,
+            'source': signal.source,
+        },
+        'prospect': {
+            'id': prospect.pk,
+            'full_name': prospect.full_name,
+            'company_name': prospect.company_name,
+            'intent_score': prospect.intent_score,
+            'status': prospect.status,
+        },
+    }
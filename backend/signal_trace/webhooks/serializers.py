@@ -0,0 +1,94 @@
+"""
+Webhook Serializers for API
+
+Serializers validate and transform data, then delegate to WebhookEndpoint
+model methods for the actual operations.
+"""
+
+from django.conf import settings
+from rest_framework import serializers
+from .destinations import UnsafeDestination, resolve
+from .models import SUBSCRIBABLE_EVENTS, WebhookEndpoint
+
+
+class WebhookEndpointSerializer(serializers.ModelSerializer):
+    """
+    Serializer for webhook endpoint registration.
+
+    The signing secret is generated by the server and returned read-only.
+    """
+
+    class Meta:
+        model = WebhookEndpoint
+        fields = (
+            'id',
+            'url',
+            'events',
+            'is_active',
+            'secret',
+            'consecutive_failures',
+            'retry_at',
+            'last_delivery_at',
+            'last_error',
+            'created_at',
+            'updated_at',
+        )
+        read_only_fields = (
+            'id',
+            'secret',
+            'consecutive_failures',
+            'retry_at',
+            'last_delivery_at',
+            'last_error',
+            'created_at',
+            'updated_at',
+        )
+        extra_kwargs = {
+            'events': {'required': False},
+            'is_active': {'required': False},
+        }
+
+    def validate_url(self, value):
+        """Require HTTPS outside development, and a host on the public internet."""
+        if not settings.DEBUG and not value.lower().startswith('https://'):
+            raise serializers.ValidationError("Webhook URLs must use HTTPS.")
+        try:
+            resolve(value)
+        except UnsafeDestination as exc:
+            raise serializers.ValidationError(str(exc))
+        return value
+
+    def validate_events(self, value):
+        """Validate subscribed event types."""
+        if not isinstance(value, list) or not value:
+            raise serializers.ValidationError("Subscribe to at least one event.")
+        unknown = [event for event in value if event not in SUBSCRIBABLE_EVENTS]
+        if unknown:
+            raise serializers.ValidationError(
+                f"Invalid events: {', '.join(map(str, unknown))}. Must be one of: {', '.join(SUBSCRIBABLE_EVENTS)}"
+            )
+        return list(dict.fromkeys(value))
+
+    def create(self, validated_data):
+        """
+        Create endpoint using model's business logic.
+
+        Delegates to WebhookEndpoint.create_endpoint() for actual creation.
+        """
+        return WebhookEndpoint.create_endpoint(
+            owner=self.context['request'].user,
+            url=validated_data['url'],
+            events=validated_data.get('events'),
+        )
+
+    def update(self, instance, validated_data):
+        """
+        Update endpoint using model's business logic.
+
+        Delegates to WebhookEndpoint.update_endpoint() for actual update.
+        """
+        return instance.update_endpoint(
+            url=validated_data.get('url'),
+            events=validated_data.get('events'),
+            is_active=validated_data.get('is_active'),
+        )
@@ -0,0 +1,64 @@
+"""
+HMAC signatures for webhook deliveries.
+
+Every delivery carries
+
+    X-Signal-Trace-Signature: t=<unix timestamp>,v1=<hex HMAC-SHA256>
+
+where the HMAC is computed with the endpoint's secret over
+"<timestamp>.<raw request body>". Receivers recompute it, compare in
+constant time, and reject timestamps outside a tolerance window to stop
+replays. verify_signature() is the reference implementation.
+"""
+
+import hashlib
+import hmac
+import time
+
+SIGNATURE_HEADER = 'X-Signal-Trace-Signature'
+DELIVERY_HEADER = 'X-Signal-Trace-Delivery'
+
+
+def compute_signature(secret, timestamp, body):
+    message = f'{timestamp}.'.encode() + body
+    return hmac.new(secret.encode(), message, hashlib.sha256).hexdigest()
+
+
+def sign(secret, body, timestamp=None):
+    """
+    Build the signature header value for a request body.
+
+    Args:
+        secret: Endpoint signing secret
+        body: Raw request body (bytes)
+        timestamp: Unix time to sign with (default: now)
+
+    Returns:
+        str: Header value, "t=...,v1=..."
+    """
+    timestamp = int(time.time() if timestamp is None else timestamp)
+    return f't={timestamp},v1={compute_signature(secret, timestamp, body)}'
+
+
+def verify_signature(secret, header, body, tolerance=300):
+    """
+    Check a signature header against a request body.
+
+    Args:
+        secret: Endpoint signing secret
+        header: Signature header value
+        body: Raw request body (bytes)
+        tolerance: Max age of the signature in seconds
+
+    Returns:
+        bool: True if the signature is valid and fresh
+    """
+    try:
+        parts = dict(item.split('=', 1) for item in header.split(','))
+        timestamp = int(parts['t'])
+        signature = parts['v1']
+    except (AttributeError, KeyError, ValueError):
+        return False
+    if abs(time.time() - timestamp) > tolerance:
+        return False
+    return hmac.compare_digest(signature, compute_signature(secret, timestamp, body))
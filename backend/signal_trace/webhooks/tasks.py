@@ -0,0 +1,30 @@
+"""
+Background tasks for webhook delivery.
+
+A delivery job is enqueued with every outbox write; the sweep picks up
+endpoints whose backoff has expired and anything a job missed.
+"""
+
+from jobs.registry import periodic, task
+
+from .delivery import deliver_endpoint
+from .models import WebhookEndpoint
+
+
+# Failures are retried by the outbox (per-endpoint backoff), not the job queue
+@task(max_attempts=1)
+def deliver_webhooks(endpoint_id):
+    """Drain an endpoint's outbox, re-enqueueing itself while events remain."""
+    result = deliver_endpoint(endpoint_id)
+    if result['more']:
+        deliver_webhooks.enqueue(endpoint_id=endpoint_id)
+    return result
+
+
+@periodic('* * * * *')
+def sweep_webhooks():
+    """Enqueue delivery for endpoints with pending events that are due."""
+    endpoint_ids = list(WebhookEndpoint.due_for_delivery().values_list('id', flat=True))
+    for endpoint_id in endpoint_ids:
+        deliver_webhooks.enqueue(endpoint_id=endpoint_id)
+    return {'endpoints': len(endpoint_ids)}
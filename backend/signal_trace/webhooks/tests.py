@@ -0,0 +1,146 @@
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from django.conf import settings
+from django.test import TestCase, override_settings
+
+from users.models import User
+
+from .delivery import deliver_endpoint
+from .destinations import UnsafeDestination, resolve
+from .models import WebhookEndpoint, WebhookEvent
+from .serializers import WebhookEndpointSerializer
+
+PUBLIC_URL = 'https://93.184.216.34/hooks'
+
+
+def allow_private_networks(allow):
+    return override_settings(WEBHOOKS={**settings.WEBHOOKS, 'allow_private_networks': allow})
+
+
+class StubReceiver:
+    """Local HTTP server answering every POST with a fixed status and body."""
+
+    def __init__(self, status=200, body=b''):
+        receiver = self
+        self.requests = []
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                self.rfile.read(int(self.headers['Content-Length']))
+                receiver.requests.append(dict(self.headers))
+                self.send_response(status)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.port = self.server.server_address[1]
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@allow_private_networks(False)
+class DestinationTests(TestCase):
+    """Webhook URLs must resolve to public addresses only."""
+
+    def setUp(self):
+        self.user = User.create_user_with_email('owner@example.com', 'pass-12345', is_active=True)
+
+    def test_rejects_internal_addresses(self):
+        for url in (
+            'https://127.0.0.1/',
+            'https://localhost:8000/',
+            'https://10.0.0.5/',
+            'https://192.168.1.10/',
+            'https://169.254.169.254/latest/meta-data/',
+            'https://[::1]/',
+            'https://[::ffff:127.0.0.1]/',
+            'https://[fe80::1]/',
+            'https://224.0.0.1/',
+            'https://0.0.0.0/',
+        ):
+            with self.subTest(url=url), self.assertRaises(UnsafeDestination):
+                resolve(url)
+
+    def test_rejects_host_resolving_to_private_address(self):
+        infos = [(socket.AF_INET, socket.SOCK_STREAM, 6, '', ('8.8.8.8', 443)),
+                 (socket.AF_INET, socket.SOCK_STREAM, 6, '', ('10.1.2.3', 443))]
+        with mock.patch('socket.getaddrinfo', return_value=infos), self.assertRaises(UnsafeDestination):
+            resolve('https://hooks.example.com/')
+
+    def test_accepts_public_address(self):
+        self.assertEqual(resolve(PUBLIC_URL), '93.184.216.34')
+
+    def test_serializer_rejects_internal_url(self):
+        request = mock.Mock(user=self.user)
+        serializer = WebhookEndpointSerializer(
+            data={'url': 'https://169.254.169.254/'}, context={'request': request},
+        )
+        self.assertFalse(serializer.is_valid())
+        self.assertIn('url', serializer.errors)
+
+    def test_delivery_rechecks_destination(self):
+        # Registered while public, then pointed at loopback (e.g. by DNS)
+        endpoint = WebhookEndpoint.create_endpoint(self.user, PUBLIC_URL)
+        receiver = StubReceiver()
+        self.addCleanup(receiver.close)
+        WebhookEndpoint.objects.filter(pk=endpoint.pk).update(url=f'http://127.0.0.1:{receiver.port}/')
+        WebhookEvent.objects.create(endpoint=endpoint, event_type='ping')
+
+        result = deliver_endpoint(endpoint.pk)
+
+        self.assertEqual(result['failed'], 1)
+        self.assertEqual(receiver.requests, [])
+        endpoint.refresh_from_db()
+        self.assertTrue(endpoint.last_error.startswith('UnsafeDestination'))
+
+
+@allow_private_networks(True)
+class DeliveryTests(TestCase):
+    """Deliveries go to the checked address and never record response bodies."""
+
+    def setUp(self):
+        self.user = User.create_user_with_email('owner@example.com', 'pass-12345', is_active=True)
+
+    def deliver(self, status, body=b''):
+        receiver = StubReceiver(status, body)
+        self.addCleanup(receiver.close)
+        endpoint = WebhookEndpoint.create_endpoint(self.user, f'http://hooks.example.test:{receiver.port}/')
+        WebhookEvent.objects.create(endpoint=endpoint, event_type='ping')
+        lookups = []
+        real_getaddrinfo = socket.getaddrinfo
+
+        def getaddrinfo(host, port, *args, **kwargs):
+            if host != 'hooks.example.test':
+                return real_getaddrinfo(host, port, *args, **kwargs)
+            lookups.append(host)
+            return [(socket.AF_INET, socket.SOCK_STREAM, 6, '', ('127.0.0.1', port))]
+
+        with mock.patch('socket.getaddrinfo', getaddrinfo):
+            result = deliver_endpoint(endpoint.pk)
+        endpoint.refresh_from_db()
+        return result, endpoint, receiver, lookups
+
+    def test_connects_to_resolved_address_with_original_host(self):
+        result, endpoint, receiver, lookups = self.deliver(200)
+
+        self.assertEqual(result['delivered'], 1)
+        # Resolved once, for the check; the connection reuses that address
+        self.assertEqual(lookups, ['hooks.example.test'])
+        self.assertEqual(receiver.requests[0]['Host'], f'hooks.example.test:{receiver.port}')
+
+    def test_error_omits_response_body(self):
+        result, endpoint, receiver, _ = self.deliver(500, b'internal secret')
+
+        self.assertEqual(result['failed'], 1)
+        self.assertEqual(endpoint.last_error, 'HTTP 500')
+        self.assertEqual(endpoint.outbox.get().last_error, 'HTTP 500')
@@ -0,0 +1,17 @@
+"""
+URL configuration for webhooks app API endpoints.
+
+All views are class-based views following Django REST Framework best practices.
+"""
+
+from django.urls import path
+from . import views
+
+app_name = 'webhooks'
+
+urlpatterns = [
+    path('api/webhooks/', views.WebhookEndpointListView.as_view(), name='endpoint-list'),
+    path('api/webhooks/<int:pk>/', views.WebhookEndpointDetailView.as_view(), name='endpoint-detail'),
+    path('api/webhooks/<int:pk>/ping/', views.WebhookEndpointPingView.as_view(), name='endpoint-ping'),
+    path('api/webhooks/<int:pk>/rotate-secret/', views.WebhookEndpointRotateSecretView.as_view(), name='endpoint-rotate-secret'),
+]
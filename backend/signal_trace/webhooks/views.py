@@ -0,0 +1,141 @@
+"""
+API Views for Webhook Endpoints
+
+ARCHITECTURE NOTE:
+==================
+This project uses CLASS-BASED VIEWS exclusively.
+
+Views should contain minimal code and delegate to:
+- Serializers for validation and data transformation
+- Models for business logic
+
+This keeps views thin and makes the codebase more maintainable.
+Following Django REST Framework best practices with class-based views.
+"""
+
+from rest_framework import status
+from rest_framework.views import APIView
+from rest_framework.permissions import IsAuthenticated
+from django.shortcuts import get_object_or_404
+
+from .serializers import WebhookEndpointSerializer
+from .models import WebhookEndpoint, WebhookEvent
+from users.utils import success_response, error_response
+
+
+class WebhookEndpointListView(APIView):
+    """
+    List the authenticated user's webhook endpoints and register new ones.
+
+    Class-based view that delegates to serializer for validation
+    and model method for business logic.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        """Handle GET request to list the user's webhook endpoints."""
+        endpoints = WebhookEndpoint.objects.filter(owner=request.user)
+        serializer = WebhookEndpointSerializer(endpoints, many=True)
+
+        return success_response(
+            data={'endpoints': serializer.data},
+            message='Webhook endpoints retrieved successfully.'
+        )
+
+    def post(self, request):
+        """Handle POST request to register a webhook endpoint."""
+        serializer = WebhookEndpointSerializer(data=request.data, context={'request': request})
+
+        if serializer.is_valid():
+            # Serializer delegates to model's create_endpoint() method
+            endpoint = serializer.save()
+
+            return success_response(
+                data={'endpoint': WebhookEndpointSerializer(endpoint).data},
+                message='Webhook endpoint registered successfully.',
+                status_code=status.HTTP_201_CREATED
+            )
+
+        return error_response(
+            message='Failed to register webhook endpoint. Please check your information.',
+            errors=serializer.errors,
+            status_code=status.HTTP_400_BAD_REQUEST
+        )
+
+
+class WebhookEndpointDetailView(APIView):
+    """
+    Retrieve, update, or delete a webhook endpoint.
+
+    Class-based view that delegates to serializer for validation
+    and model method for business logic.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        """Handle GET request to retrieve a webhook endpoint."""
+        endpoint = get_object_or_404(WebhookEndpoint, pk=pk, owner=request.user)
+
+        return success_response(
+            data={'endpoint': WebhookEndpointSerializer(endpoint).data},
+            message='Webhook endpoint retrieved successfully.'
+        )
+
+    def patch(self, request, pk):
+        """Handle PATCH request to update a webhook endpoint."""
+        endpoint = get_object_or_404(WebhookEndpoint, pk=pk, owner=request.user)
+        serializer = WebhookEndpointSerializer(endpoint, data=request.data, partial=True, context={'request': request})
+
+        if serializer.is_valid():
+            # Serializer delegates to model's update_endpoint() method
+            endpoint = serializer.save()
+
+            return success_response(
+                data={'endpoint': WebhookEndpointSerializer(endpoint).data},
+                message='Webhook endpoint updated successfully.'
+            )
+
+        return error_response(
+            message='Failed to update webhook endpoint. Please check your information.',
+            errors=serializer.errors,
+            status_code=status.HTTP_400_BAD_REQUEST
+        )
+
+    def delete(self, request, pk):
+        """Handle DELETE request to remove a webhook endpoint and its undelivered events."""
+        endpoint = get_object_or_404(WebhookEndpoint, pk=pk, owner=request.user)
+        endpoint.delete()
+
+        return success_response(
+            message='Webhook endpoint deleted successfully.'
+        )
+
+
+class WebhookEndpointPingView(APIView):
+    """Queue a signed 'ping' event for a webhook endpoint, to test the receiver."""
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, pk):
+        """Handle POST request to send a ping."""
+        endpoint = get_object_or_404(WebhookEndpoint, pk=pk, owner=request.user)
+        WebhookEvent.ping(endpoint)
+
+        return success_response(
+            message='Ping queued for delivery.',
+            status_code=status.HTTP_202_ACCEPTED
+        )
+
+
+class WebhookEndpointRotateSecretView(APIView):
+    """Replace a webhook endpoint's signing secret."""
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, pk):
+        """Handle POST request to rotate the secret."""
+        endpoint = get_object_or_404(WebhookEndpoint, pk=pk, owner=request.user)
+        endpoint.rotate_secret()
+
+        return success_response(
+            data={'endpoint': WebhookEndpointSerializer(endpoint).data},
+            message='Webhook secret rotated successfully.'
+        )